@@ -19,7 +19,7 @@
 
 # -- dataclass definitions --------------------------------
 from iwfm.iwfm_dataclasses import PreprocessorFiles, SimulationFiles, WellInfo
-from iwfm.iwfm_dataclasses import RootzoneFiles, GroundwaterFiles
+from iwfm.iwfm_dataclasses import RootzoneFiles, GroundwaterFiles, LandUseData, TimeSeriesData
 
 # -- IWFM model class -------------------------------------
 from iwfm.iwfm_model import iwfm_model, IWFMModelError
@@ -79,10 +79,15 @@ from iwfm.get_gw_params import get_gw_params
 from iwfm.iwfm_adj_crops import iwfm_adj_crops
 from iwfm.iwfm_lu2sub import iwfm_lu2sub
 from iwfm.read_lu_file import read_lu_file
+from iwfm.lu_data import read_lu_data, write_lu_data, clear_lu_cache, set_lu_cache_size
+from iwfm.lu_data import read_lu_header, iter_lu_data, write_lu_step
+from iwfm.lu_transform import lu_transform, iter_lu_steps, lu_subset, lu_split, lu_zone_change, lu_columns
+from iwfm.lu_transform import read_lu_first_step
+from iwfm.ts_data import read_ts_data, ts_cache_names
 from iwfm.write_lu2file import write_lu2file
 from iwfm.lu2tables import lu2tables
 from iwfm.lu2csv import lu2csv
-from iwfm.refined_lu_factors import refined_lu_factors
+from iwfm.refined_lu_factors import refined_lu_factors, refined_lu_index
 from iwfm.iwfm_lu2refined import iwfm_lu2refined
 from iwfm.tables2lu import tables2lu
 
@@ -91,7 +96,7 @@ from iwfm.iwfm_lu4scenario import iwfm_lu4scenario
 from iwfm.get_change_col import get_change_col
 from iwfm.read_lu_change_zones import read_lu_change_zones
 from iwfm.read_lu_change_factors import read_lu_change_factors
-from iwfm.iwfm_precip_adj import iwfm_precip_adj
+from iwfm.iwfm_precip_adj import iwfm_precip_adj, iwfm_precip_adj_batch
 
 # -- igsm file methods ------------------------------------
 from iwfm.igsm_read_elements import igsm_read_elements
@@ -103,6 +108,7 @@ from iwfm.igsm_read_streams import igsm_read_streams
 
 # -- IWFM budget and zbudget files ------------------------
 from iwfm.budget_info import budget_info
+from iwfm.budget_text import read_budget_text, iter_budget_text
 from iwfm.iwfm_read_bud import iwfm_read_bud
 from iwfm.bud2csv import bud2csv
 from iwfm.zbudget2csv import zbudget2csv
@@ -194,7 +200,7 @@ from iwfm.file_validate_path import file_validate_path
 from iwfm.cfs2afd import cfs2afd
 
 # -- math -------------------------------------------------
-from iwfm.logtrans import logtrans
+from iwfm.logtrans import logtrans, logtrans_array
 
 # -- data file methods ------------------------------------
 from iwfm.cdec2monthly import cdec2monthly
@@ -240,7 +246,10 @@ from iwfm.sub.rz_npc_file import sub_rz_npc_file
 from iwfm.sub.rz_pc_file import sub_rz_pc_file
 from iwfm.sub.rz_urban_file import sub_rz_urban_file
 from iwfm.sub.rz_nv_file import sub_rz_nv_file
-from iwfm.sub.remove_items import sub_remove_items
+from iwfm.sub.remove_items import sub_remove_items, sub_keep_lines, sub_item_set
+from iwfm.sub.points_within import sub_points_within
+from iwfm.sub.manifest import (sub_manifest_name, sub_manifest_write, sub_manifest_read,
+                               sub_manifest_current)
 from iwfm.sub.lu_file import sub_lu_file
 
 from iwfm.new_sim_files import new_sim_files
@@ -0,0 +1,161 @@
+# _text_blocks.py
+# Shared block reader for the columns of numbers in IWFM text input files,
+# used by the land use (lu_data) and time-series (ts_data) readers
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import re
+
+COMMENTS = b'Cc*#'
+
+CHUNK_SIZE = 1 << 26            # bytes of data lines parsed at a time
+
+# patterns start with the newline before a line, which is much faster to scan
+# for than a multiline '^'
+SKIP_LINE = re.compile(rb'\n(?:[Cc*#][^\n]*|[ \t\r]*)(?=\n)')  # comment or blank line
+
+
+def is_comment(line):
+    ''' is_comment() - Test whether a line of bytes is a comment or blank '''
+    return not line.strip() or line[:1] in COMMENTS
+
+
+def read_header(f, skip):
+    ''' read_header() - Read the lines above the first data line of a file
+        opened in binary mode: comment lines and skip specification lines.
+        The file is left at the first data line
+
+    Parameters
+    ----------
+    f : file object
+        File opened with mode 'rb'
+
+    skip : int
+        Number of specification lines (not counting comments) above the data
+
+    Returns
+    -------
+    header : tuple of str
+        Comment and specification lines
+
+    specs : list of str
+        Specification lines
+
+    '''
+    header, specs = [], []
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line:
+            break
+        text = line.decode().rstrip('\r\n')
+        if not is_comment(line):
+            if len(specs) == skip:
+                f.seek(pos)
+                break
+            specs.append(text)
+        header.append(text)
+    return tuple(header), specs
+
+
+def iter_blocks(f):
+    ''' iter_blocks() - Read the rest of a file opened in binary mode a
+        block of complete lines at a time
+
+    Each block is about CHUNK_SIZE bytes, starts with a newline and has
+    comment and blank lines removed, so every line in it is b'\\n' followed
+    by a data line. A last line without a newline is completed.
+
+    Parameters
+    ----------
+    f : file object
+        File opened with mode 'rb', at the first data line
+
+    Returns
+    -------
+    generator of bytes
+        Blocks of data lines
+
+    '''
+    rest = b''
+    while True:
+        block = f.read(CHUNK_SIZE)
+        text = rest + block
+        if block:
+            end = text.rfind(b'\n') + 1
+            text, rest = text[:end], text[end:]
+        elif text and not text.endswith(b'\n'):
+            text += b'\n'
+        if text:
+            yield SKIP_LINE.sub(b'', b'\n' + text)
+        if not block:
+            return
+
+
+def parse_table(text, nline, ncol, filename, kind):
+    ''' parse_table() - Parse lines of numbers into an (nline, ncol) array
+
+    Parameters
+    ----------
+    text : bytes
+        Lines of numbers, e.g. a block from iter_blocks() with the dates
+        removed
+
+    nline : int
+        Number of lines in text
+
+    ncol : int or None
+        Number of values on each line, None to take it from the first line
+
+    filename : str
+        File name for error messages
+
+    kind : str
+        Kind of file for error messages, e.g. 'land use'
+
+    Returns
+    -------
+    table : numpy array of floats
+        Shape (nline, ncol)
+
+    ncol : int
+        Number of values on each line
+
+    Raises
+    ------
+    ValueError
+        If a value is not a number or a line has a different number of values
+
+    '''
+    import io
+    import numpy as np
+
+    if nline == 0:
+        return np.zeros((0, ncol or 0)), ncol
+
+    # np.loadtxt() parses about twice as fast as np.fromstring(), and raises
+    # on values that are not numbers and on lines with other numbers of values
+    try:
+        table = np.loadtxt(io.BytesIO(text), dtype=float, ndmin=2)
+    except ValueError as e:
+        raise ValueError(f'{filename}: bad {kind} data line: {e}') from None
+
+    if ncol is None:
+        ncol = table.shape[1]
+    if not ncol or table.shape != (nline, ncol):
+        raise ValueError(f'{filename}: {kind} data lines must all have {ncol} values '
+                         f'after the date')
+    return table, ncol
@@ -0,0 +1,313 @@
+# budget_text.py
+# Read the tables of an IWFM ASCII Budget output file with fixed-width
+# column splitting, all at once or one table at a time
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def _column_edges(rows):
+    ''' _column_edges() - End positions of the right-aligned fixed-width
+        columns of budget data rows, date column first '''
+    import numpy as np
+
+    width = max(len(row) for row in rows)
+    buf = np.array(rows, dtype=f'S{width}').view(np.uint8).reshape(len(rows), width)
+    filled = ((buf != 32) & (buf != 0)).any(axis=0)
+    return np.flatnonzero(filled & ~np.append(filled[1:], False)) + 1
+
+
+def budget_geometry(budget_lines):
+    ''' budget_geometry() - Find the table layout of an IWFM ASCII Budget file
+
+    Data rows are the lines that start with a digit (the date). Every table
+    has the same number of header lines and data rows, so the tables start
+    at a fixed stride and the column positions of the first table apply
+    to all of them.
+
+    Parameters
+    ----------
+    budget_lines : list of str
+        Contents of an IWFM Budget file, or the lines of its first tables
+
+    Returns
+    -------
+    geometry : dict
+        header       : number of lines above the data rows of each table
+        nrow         : number of data rows (time steps) in each table
+        footer       : number of lines after the data rows of each table
+        table_len    : number of lines from one table to the next
+        ntable       : number of tables in budget_lines
+        starts       : numpy array, line index of the first data row of each table
+        ntitle       : number of title lines above the first dashed line
+        header_lines : header lines of the first table
+        edges        : numpy array, end positions of the columns in the data
+                       rows, date column first
+        Without data rows, nrow and ntable are 0 and all lines are header.
+
+    '''
+    import numpy as np
+
+    data = np.fromiter((line[:1].isdigit() for line in budget_lines), dtype=bool,
+                       count=len(budget_lines))
+    change = np.diff(np.concatenate(([0], data.astype(np.int8), [0])))
+    starts = np.flatnonzero(change == 1)
+    ends = np.flatnonzero(change == -1)
+
+    if len(starts) == 0:
+        header = len(budget_lines)
+        return {'header': header, 'nrow': 0, 'footer': 0, 'table_len': header, 'ntable': 0,
+                'starts': starts, 'ntitle': header, 'header_lines': list(budget_lines),
+                'edges': np.zeros(0, dtype=int)}
+
+    header, nrow = int(starts[0]), int(ends[0] - starts[0])
+    table_len = int(starts[1] - starts[0]) if len(starts) > 1 else header + nrow
+    bad = np.flatnonzero((ends - starts != nrow) | (starts - header != np.arange(len(starts)) * table_len))
+    if len(bad):
+        raise ValueError(f'Budget table {bad[0] + 1} at line {starts[bad[0]] + 1} does not match '
+                         f'the layout of the first table ({header} header lines, {nrow} rows)')
+
+    header_lines = list(budget_lines[:header])
+    ntitle = next((i for i, line in enumerate(header_lines) if line.startswith('-')), header)
+
+    return {'header': header, 'nrow': nrow, 'footer': table_len - header - nrow,
+            'table_len': table_len, 'ntable': len(starts), 'starts': starts, 'ntitle': ntitle,
+            'header_lines': header_lines,
+            'edges': _column_edges(budget_lines[header:header + nrow])}
+
+
+def budget_label_columns(geometry, label, line=None):
+    ''' budget_label_columns() - Find the value columns under a column label
+
+    A label belongs to the column whose span contains the first character
+    of the label; the last column extends to the end of the line.
+
+    Parameters
+    ----------
+    geometry : dict
+        Table layout from budget_geometry()
+
+    label : str
+        Column label text, e.g. 'Gain from GW'
+
+    line : int, default=None
+        Index of the header line in each table to search. None searches all
+        header lines
+
+    Returns
+    -------
+    columns : list of int
+        Value column indexes (0 = first column after the date) of each
+        occurrence of label, in order
+
+    '''
+    import numpy as np
+
+    edges = geometry['edges']
+    lines = geometry['header_lines'] if line is None else [geometry['header_lines'][line]]
+
+    columns = []
+    for text in lines:
+        pos = text.find(label)
+        while pos >= 0:
+            col = min(int(np.searchsorted(edges, pos)), len(edges) - 1) - 1
+            if col >= 0 and col not in columns:
+                columns.append(col)
+            pos = text.find(label, pos + 1)
+    return columns
+
+
+def parse_budget_rows(rows, edges, columns=None):
+    ''' parse_budget_rows() - Split budget data rows at fixed column positions
+
+    Parameters
+    ----------
+    rows : list of str
+        Budget data rows
+
+    edges : numpy array
+        Column end positions from budget_geometry(), date column first
+
+    columns : list of int, default=None
+        Value columns to convert (0 = first column after the date).
+        None converts all of them
+
+    Returns
+    -------
+    dates : numpy array of str
+        Date of each row
+
+    values : numpy array
+        Values, shape (len(rows), number of columns)
+
+    '''
+    import numpy as np
+
+    edges = [int(e) for e in edges]
+    ncol = len(edges) - 1
+    columns = range(ncol) if columns is None else columns
+
+    begins = [0] + edges[:-1]
+    fields = np.dtype({'names': [f'c{j}' for j in range(ncol + 1)],
+                       'formats': [f'S{e - b}' for b, e in zip(begins, edges)],
+                       'offsets': begins, 'itemsize': edges[-1]})
+    table = np.array(rows, dtype=f'S{edges[-1]}').view(fields)
+
+    values = np.empty((len(rows), len(columns)))
+    for k, j in enumerate(columns):
+        values[:, k] = table[f'c{j + 1}'].astype(float)
+    return np.char.strip(table['c0'].astype(str)), values
+
+
+def _read_head(stream):
+    ''' _read_head() - Read lines from a budget file line iterator to the
+        end of the data rows of the second table '''
+    head, runs, in_data = [], 0, False
+    for line in stream:
+        head.append(line)
+        is_data = line[:1].isdigit()
+        if in_data and not is_data:
+            runs += 1
+            if runs == 2:
+                break
+        in_data = is_data
+    return head
+
+
+def read_budget_geometry(budget_file):
+    ''' read_budget_geometry() - Find the table layout of an IWFM ASCII Budget
+        file from its first two tables
+
+    Parameters
+    ----------
+    budget_file : str
+        IWFM Budget file name
+
+    Returns
+    -------
+    geometry : dict
+        Table layout from budget_geometry(); ntable and starts only count
+        the first two tables
+
+    '''
+    with open(budget_file) as f:
+        return budget_geometry(_read_head(line.rstrip('\r\n') for line in f))
+
+
+def read_budget_text(budget_file, columns=None):
+    ''' read_budget_text() - Read all tables of an IWFM ASCII Budget file
+
+    Parameters
+    ----------
+    budget_file : str
+        IWFM Budget file name
+
+    columns : list of int, default=None
+        Value columns to read (0 = first column after the date). None reads
+        all of them
+
+    Returns
+    -------
+    values : numpy array
+        Budget values, shape (ntable, ntime, ncol)
+
+    dates : numpy array of str
+        Date of each row, e.g. '10/31/1973_24:00'
+
+    titles : numpy array of str
+        Title lines of each table, shape (ntable, ntitle)
+
+    geometry : dict
+        Table layout from budget_geometry()
+
+    '''
+    import numpy as np
+
+    with open(budget_file) as f:
+        budget_lines = f.read().splitlines()
+
+    geometry = budget_geometry(budget_lines)
+    if geometry['ntable'] == 0:
+        raise ValueError(f'No budget tables found in {budget_file}')
+
+    starts, nrow, ntitle = geometry['starts'], geometry['nrow'], geometry['ntitle']
+    rows = [budget_lines[i] for i in (starts[:, None] + np.arange(nrow)).ravel()]
+    dates, values = parse_budget_rows(rows, geometry['edges'], columns)
+
+    first = starts - geometry['header']
+    titles = np.array([budget_lines[i] for i in (first[:, None] + np.arange(ntitle)).ravel()],
+                      dtype=str).reshape(len(starts), ntitle)
+
+    return values.reshape(len(starts), nrow, -1), dates[:nrow], titles, geometry
+
+
+def iter_budget_text(budget_file, columns=None):
+    ''' iter_budget_text() - Read an IWFM ASCII Budget file one table at a time
+
+    Only the first two tables are scanned for the table layout; the rest of
+    the file is read in blocks of geometry['table_len'] lines, so memory use
+    does not grow with the number of tables.
+
+    Parameters
+    ----------
+    budget_file : str
+        IWFM Budget file name
+
+    columns : list of int, default=None
+        Value columns to read (0 = first column after the date). None reads
+        all of them
+
+    Yields
+    ------
+    lines : list of str
+        Lines of the table, including the header and the lines that follow
+        the data rows (for the last table, to the end of the file)
+
+    dates : numpy array of str
+        Date of each row
+
+    values : numpy array
+        Budget values, shape (ntime, ncol)
+
+    geometry : dict
+        Table layout from budget_geometry()
+
+    '''
+    import itertools
+
+    with open(budget_file) as f:
+        stream = (line.rstrip('\r\n') for line in f)
+        head = _read_head(stream)
+        geometry = budget_geometry(head)
+        if geometry['ntable'] == 0:
+            raise ValueError(f'No budget tables found in {budget_file}')
+        header, nrow, table_len = geometry['header'], geometry['nrow'], geometry['table_len']
+
+        stream = itertools.chain(head, stream)
+        block = list(itertools.islice(stream, table_len))
+        count = 0
+        while len(block) >= header + nrow:
+            count += 1
+            following = list(itertools.islice(stream, table_len))
+            if len(following) < header + nrow:
+                block += following        # lines after the last table
+                following = []
+            rows = block[header:header + nrow]
+            if not (rows[0][:1].isdigit() and rows[-1][:1].isdigit()):
+                raise ValueError(f'Budget table {count} in {budget_file} does not match '
+                                 f'the layout of the first table')
+            dates, values = parse_budget_rows(rows, geometry['edges'], columns)
+            yield block, dates, values, geometry
+            block = following
@@ -18,17 +18,19 @@
 
 # -- PEST functions ---------------------------------------
 from iwfm.calib.read_settings import read_settings
-from iwfm.calib.fac2iwfm import fac2iwfm
+from iwfm.calib.fac2iwfm import fac2iwfm, fac2iwfm_reals
 from iwfm.calib.iwfm2obs import iwfm2obs
-from iwfm.calib.real2iwfm import real2iwfm
+from iwfm.calib.real2iwfm import real2iwfm, real2iwfm_batch
 from iwfm.calib.par2iwfm import par2iwfm
 from iwfm.calib.ppk2fac_trans import ppk2fac_trans
 from iwfm.calib.stacdep2obs import stacdep2obs
 from iwfm.calib.divshort2obs import divshort2obs
 from iwfm.calib.iwfm_exe_time import iwfm_exe_time
+from iwfm.calib.run_manager import run_manager
 
 # -- supporting functions ---------------------------------------
 from iwfm.calib.krige import krige
+from iwfm.calib.krige_factors import krige_factors
 from iwfm.calib.ltbud import ltbud
 from iwfm.calib.ltsmp import ltsmp
 from iwfm.calib.setrot import setrot
@@ -48,6 +50,7 @@ from iwfm.calib.do_avgonly import do_avgonly
 from iwfm.calib.idw import idw
 from iwfm.calib.interp_val import interp_val
 from iwfm.calib.res_stats import res_stats
+from iwfm.calib.residual_stats import residual_stats, residual_stats_by
 from iwfm.calib.rmse_calc import rmse_calc
 from iwfm.calib.pest_res_stats import pest_res_stats
 from iwfm.calib.sim_equiv import sim_equiv
@@ -18,6 +18,7 @@
 # -----------------------------------------------------------------------------
 
 from iwfm.read_sim_hyd import read_sim_hyd
+from iwfm.calib.residual_stats import residual_stats_by
 from iwfm.debug.logger_setup import logger
 
 
@@ -92,88 +93,25 @@ def calib_stats(pest_smp_file, gwhyd_info_file, gwhyd_file, verbose=False):
     if verbose:
         print(f'  Read {len(simhyd):,} simulated values from {gwhyd_file}\n')
 
-    # == cycle through the list of wells in pest_obs to calculate rmse & bias
-    # -- initialize
-    i = 1
-    dates, meas, sim = [], [], []
-    well_names, rmse_values, bias_values, sim_all = [], [], [], []
-    meas_all, count, dates, meas, dates_all, names_all = [], [], [], [], [], []
-
-    name, date = head_obs[0][0], head_obs[0][1]
-
-    names_all.append(name)
-    dates.append(date)
-    dates_all.append(date)
-    measured = head_obs[0][3]
-    meas.append(measured)
-    meas_all.append(measured)
-
-    # use hyd_dict to find the column no for this obs well in simhyd_obs
-    simhyd_col = int(gw_hyd_dict.get(name).column)
-
-    # calculate the simulated value for this observation
-    sim_head = ical.sim_equiv(simhyd, date, simhyd_col)
-    sim.append(sim_head)
-    sim_all.append(sim_head)
-
-    # move through the head observations
-    j, final = 1, 1
-    while j < len(head_obs):
-        new_name = head_obs[j][0]
-        if new_name != name:  # new well name, finalize info for the last well
-
-            if verbose:
-                print(f'  Calculating RMSE and Bias for {name}')
-            # calculate rmse and bias
-            well_names.append(name)
-
-            rmse = ical.rmse_calc(sim, meas)
-            bias = ical.bias_calc(sim, meas)
-
-            rmse_values.append(rmse)
-            bias_values.append(bias)
-            count.append(len(meas))
-
-            dates, meas, sim = [], [], [] # re-initialize for next observation well
-
-            # find next well from head_obs that is in hyd_dict
-            while new_name not in gw_hyd_dict:
-                j += 1
-                if j >= len(head_obs):
-                    final = 0   # no more wells in hyd_dict, stats for last already calculated
-                    break
-                new_name = head_obs[j][0]
-            if j >= len(head_obs):
-                break
-            name = new_name
-            simhyd_col = int(gw_hyd_dict.get(name).column)
-    
+    # == simulated equivalent of each observation at a well in hyd_dict
+    names_all, dates_all, sim_all, meas_all = [], [], [], []
+    for name, date, _, measured in (obs[:4] for obs in head_obs):
+        if name not in gw_hyd_dict:
+            continue
         names_all.append(name)
-
-        date = head_obs[j][1]
-        dates.append(date)
         dates_all.append(date)
-
-        measured = head_obs[j][3]
-        meas.append(measured)
         meas_all.append(measured)
-
-        sim_head = ical.sim_equiv(simhyd, date, simhyd_col)
-        #simulated = simhyd_obs.sim_head(date,simhyd_col)
-        sim.append(sim_head)
-        sim_all.append(sim_head)
-
-        j += 1
-
-    # calculate final one
-    if final:   # stats for final well not calculated yet
-        rmse = ical.rmse_calc(sim, meas)
-        bias = ical.bias_calc(sim, meas)
-
-        rmse_values.append(rmse)
-        bias_values.append(bias)
-        well_names.append(name)
-        count.append(len(meas))
+        sim_all.append(ical.sim_equiv(simhyd, date, int(gw_hyd_dict[name].column)))
+
+    # == rmse and bias of each well and of all observations in one group-by pass
+    stats = residual_stats_by({'name': names_all, 'observed': meas_all, 'simulated': sim_all},
+                              {'well': 'name'}, overall=True)
+    well_names = stats['well']['name'].to_list()
+    rmse_values = stats['well']['rmse'].to_list()
+    bias_values = stats['well']['bias'].to_list()
+    count = stats['well']['count'].to_list()
+    if verbose:
+        print(f'  Calculated RMSE and Bias for {len(well_names):,} wells')
 
     # write all simulated and measured values to a file
     out_file = gwhyd_file.replace('.out','_sim_obs.txt')
@@ -202,8 +140,8 @@ def calib_stats(pest_smp_file, gwhyd_info_file, gwhyd_file, verbose=False):
     try:
         with open(out_file,'w') as of:
             of.write(f'Filename\tRMSE\tBIAS\n')
-            rmse_all = round(ical.rmse_calc(sim_all,meas_all),2)
-            bias_all = round(ical.bias_calc(sim_all,meas_all),2)
+            rmse_all = round(stats['overall']['rmse'][0],2)
+            bias_all = round(stats['overall']['bias'][0],2)
             of.write(f'{gwhyd_file}\t{rmse_all}\t{bias_all}\n')
     except PermissionError:
         logger.error(f'Permission denied writing file: {out_file}')
@@ -39,10 +39,7 @@ def compare(list1,list2):
 
     '''
 
-    missing, in_both  = [], []
-    for item in list1:
-        if item not in list2:
-            missing.append(item)
-        else:
-            in_both.append(item)
+    in_list2 = set(list2)
+    missing = [item for item in list1 if item not in in_list2]
+    in_both = [item for item in list1 if item in in_list2]
     return missing, in_both
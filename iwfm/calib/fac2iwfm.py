@@ -17,6 +17,165 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
+def read_factors(pp_file_name, verbose=False):
+    ''' read_factors() - Read a pilot point factors file into a sparse matrix
+
+    Node records are read as a stream of tokens, so records on one line
+    (fac2iwfm, krige_factors) and records continued on a second line
+    (ppk2fac) are both accepted.
+
+    Parameters
+    ----------
+    pp_file_name : str
+        File of pilot point factors for nodes
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    nodes : list
+        Node IDs in file order
+
+    factors : scipy.sparse.csr_matrix
+        Interpolation factors, shape (nnode, npp). A row with no stored
+        entries is a node with no pilot points
+
+    '''
+    import numpy as np
+    from scipy import sparse
+    import iwfm
+
+    iwfm.file_test(pp_file_name)
+    with open(pp_file_name) as f:
+        lines = f.read().splitlines()
+    if verbose: print(f'\n Read {pp_file_name}')
+
+    no_nodes = int(lines[1])                    # number of model nodes
+    no_ppts  = int(lines[2])                    # number of pilot points
+    tokens = ' '.join(lines[no_ppts + 3:]).split()
+
+    # record: node, transform flag, number of pilot points, mean, then pairs
+    nodes, starts, counts, pos = [], [], [], 0
+    for _ in range(no_nodes):
+        na = int(tokens[pos + 2])
+        nodes.append(int(tokens[pos]))
+        starts.append(pos + 4)
+        counts.append(na)
+        pos += 4 + 2 * na
+
+    counts = np.array(counts, dtype=int)
+    rows = np.repeat(np.arange(no_nodes), counts)
+    # token position of each pilot point number: record start + 2 * pair index
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pp_pos = np.repeat(np.array(starts, dtype=int), counts) + 2 * offsets
+    pairs = np.array(tokens, dtype=object)
+    cols = pairs[pp_pos].astype(int) - 1
+    vals = pairs[pp_pos + 1].astype(float)
+
+    if len(cols) and (cols.min() < 0 or cols.max() >= no_ppts):
+        raise ValueError(f'Pilot point number out of range 1 to {no_ppts} in {pp_file_name}')
+
+    factors = sparse.csr_matrix((vals, (rows, cols)), shape=(no_nodes, no_ppts))
+    return nodes, factors
+
+
+def read_pp_values(param_file_name, verbose=False):
+    ''' read_pp_values() - Read parameter values at pilot points
+
+    Parameters
+    ----------
+    param_file_name : str
+        File with parameter values at pilot points in the fifth column
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    values : numpy array
+        Parameter value of each pilot point, in file order
+
+    '''
+    import numpy as np
+    import iwfm
+
+    iwfm.file_test(param_file_name)
+    with open(param_file_name) as f:
+        values = [float(items[4]) for items in (line.split() for line in f) if items]
+    if verbose: print(f' Read {param_file_name}')
+    return np.array(values)
+
+
+def apply_factors(factors, values, rlow=0.0, rhigh=1000000.0, empty=-999.0):
+    ''' apply_factors() - Interpolate pilot point values to nodes
+
+    Parameters
+    ----------
+    factors : scipy.sparse matrix
+        Interpolation factors, shape (nnode, npp), from read_factors()
+
+    values : numpy array
+        Pilot point values, shape (npp,), or one column per realization,
+        shape (npp, nreal)
+
+    rlow : float, default=0
+        Lower interpolation limit, smaller nodal values are set to rlow
+
+    rhigh : float, default=1000000
+        Upper interpolation limit, larger nodal values are set to rhigh
+
+    empty : float, default=-999
+        Nodal value for nodes with no pilot points
+
+    Returns
+    -------
+    nodal : numpy array
+        Nodal values, shape (nnode,) or (nnode, nreal)
+
+    '''
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    npp = factors.shape[1]
+    if values.shape[0] < npp:
+        raise ValueError(f'{values.shape[0]} pilot point values for {npp} pilot points')
+
+    nodal = np.clip(factors @ values[:npp], rlow, rhigh)
+    nodal[np.diff(factors.indptr) == 0] = empty
+    return nodal
+
+
+def write_nodal_values(save_name, nodes, nodal):
+    ''' write_nodal_values() - Write nodal parameter values in fac2iwfm format
+
+    Parameters
+    ----------
+    save_name : str
+        Name of output file
+
+    nodes : list
+        Node IDs
+
+    nodal : numpy array
+        Nodal values, same length as nodes
+
+    Returns
+    -------
+    nothing
+
+    '''
+    lines = [f' node:      {str(node).rjust(6)} value:  {str(round(pval, 3)).ljust(8, "0")}\n'
+             for node, pval in zip(nodes, nodal.tolist())]
+    with open(save_name, 'w') as f:
+        f.writelines(lines)
+
+
+def _write_nodal_values(args):
+    write_nodal_values(*args)
+    return args[0]
+
+
 def fac2iwfm(pp_file_name, param_file_name, save_name, rlow=0.0, rhigh=1000000.0, empty=-999.0, verbose=False):
     ''' fac2iwfm() - Transfer parameter values from pilot points to model nodes
         from fac2reali.f90 by M Tonkin
@@ -33,63 +192,101 @@ def fac2iwfm(pp_file_name, param_file_name, save_name, rlow=0.0, rhigh=1000000.0
         Name of output file
 
     rlow : float, default=0
-        Lower inerppolation threshold value
+        Lower interpolation threshold value, smaller nodal values are set to rlow
 
     rhigh : float, default=1000000
-        Upper interpolation threshold value
+        Upper interpolation threshold value, larger nodal values are set to rhigh
 
-    empth : float, default=-999
+    empty : float, default=-999
         Nodal parameter value if no pilot point value
 
+    verbose : bool, default=False
+        Turn command-line output on or off
+
     Returns
     -------
-    count : int
-        Number of PDFs combined
+    nothing
 
     '''
-
-    import iwfm
     if verbose:
         print('\n FAC2IWFM carries out spatial parameter interpolation to IWFM node')
         print(' locations using interpolation factors calculated by PPK2FACI and ')
         print(' pilot point values contained in a pilot points file.')
         print(' From FAC2REALI.F90 by Matt Tonkin, SSPA.')
-    
-    iwfm.file_test(pp_file_name)
-    with open(pp_file_name) as f:
-        pp_file_lines = f.read().splitlines()
-    if verbose: print(f'\n Read {pp_file_name}')
- 
-    no_nodes = int(pp_file_lines[1])            # number of model nodes
-    no_ppts  = int(pp_file_lines[2])            # number of pilot points
-    
-    # put pilot point allocation factors into list
-    pp_factors = pp_file_lines[(no_ppts + 3):(no_ppts + no_nodes + 3)]
 
+    nodes, factors = read_factors(pp_file_name, verbose=verbose)
+    values = read_pp_values(param_file_name, verbose=verbose)
 
-    # read parameter values at pilot points into a dictionary
-    iwfm.file_test(param_file_name)
-    with open(param_file_name) as f:
-        param_file_lines = f.read().splitlines()
-    if verbose: print(f' Read {param_file_name}')
-    pp_params, i = {}, 0
-    for line in param_file_lines:
-        items = line.split()
-        i += 1
-        pp_params[i] = [items[4]]              # dictionary key: pp_name, value: param_value
+    write_nodal_values(save_name, nodes, apply_factors(factors, values, rlow, rhigh, empty))
+    if verbose: print(f' Wrote nodal parameter values to {save_name}')
 
 
-    # parse the spatial interpolation factors and calculate the parameter value
-    with open(save_name, 'w') as f:
-        for item in pp_factors:
-            item = item.split()
-            node, na, pval = int(item[0]), int(item[2]), 0
-            for i in range(0, na):
-                pp, factor = int(item[4 + i * 2]), float(item[4 + i * 2 + 1])
-                pval += float(pp_params[pp][0]) * factor
-            pval_str = str(round(pval,3)).ljust(8, '0')  # left-justify to 8 chars
-            f.write(f' node:      {str(node).rjust(6)} value:  {pval_str}\n')  # right-justify to 6 chars
-    if verbose: print(f' Wrote nodal parameter values to {save_name}')
+def fac2iwfm_reals(pp_file_name, realizations, save_names, rlow=0.0, rhigh=1000000.0,
+                   empty=-999.0, workers=1, verbose=False):
+    ''' fac2iwfm_reals() - Transfer many parameter realizations from pilot points
+        to model nodes
+
+    The factors file is read once, all realizations are interpolated with
+    one sparse matrix product, and the output files are written by a pool
+    of worker processes.
+
+    Parameters
+    ----------
+    pp_file_name : str
+        File of pilot point factors for nodes
+
+    realizations : list or numpy array
+        Parameter value files (one per realization), or pilot point values
+        with shape (nreal, npp)
+
+    save_names : list
+        Output file name for each realization
+
+    rlow : float, default=0
+        Lower interpolation threshold value
+
+    rhigh : float, default=1000000
+        Upper interpolation threshold value
+
+    empty : float, default=-999
+        Nodal parameter value if no pilot point value
+
+    workers : int, default=1
+        Number of worker processes writing output files
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    nodal : numpy array
+        Nodal values, shape (nreal, nnode)
+
+    '''
+    import numpy as np
+
+    nodes, factors = read_factors(pp_file_name, verbose=verbose)
+
+    if len(realizations) and isinstance(realizations[0], str):
+        values = np.array([read_pp_values(name)[:factors.shape[1]] for name in realizations])
+    else:
+        values = np.asarray(realizations, dtype=float).reshape(len(realizations), -1)
+    if len(save_names) != len(values):
+        raise ValueError(f'{len(save_names)} output files for {len(values)} realizations')
+
+    nodal = apply_factors(factors, values.T, rlow, rhigh, empty).T     # (nreal, nnode)
+
+    tasks = [(name, nodes, row) for name, row in zip(save_names, nodal)]
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            list(pool.map(_write_nodal_values, tasks))
+    else:
+        for task in tasks:
+            _write_nodal_values(task)
+
+    if verbose: print(f' Wrote {len(tasks):,} realizations of nodal parameter values')
+    return nodal
 
 
 if __name__ == "__main__":
@@ -72,11 +72,15 @@ def headdiff_hyds(hdiff_pairs, hdiff_data, rthresh, ts_func, start_date, verbose
     sites.append(old_site)
     # now data is a 2d array, each col a different site (indexed with sites), each row date and time
 
+    site_col = {}                                                       # site name -> column of data
+    for col, name in enumerate(sites):
+        site_col.setdefault(name, col)
+
     # now step through hdiff_pairs, and calculate head differences
     for pair in hdiff_pairs:
-        if pair[1] in sites and pair[2] in sites:
+        if pair[1] in site_col and pair[2] in site_col:
             site, left, right = pair[0], pair[1], pair[2]
-            left_col, right_col = sites.index(left), sites.index(right)     # which columns of data
+            left_col, right_col = site_col[left], site_col[right]           # which columns of data
 
             for i in range(0,len(data[left_col])):
                 d_left, d_right = data[left_col][i][0],data[right_col][i][0]
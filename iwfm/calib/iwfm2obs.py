@@ -25,20 +25,405 @@
 #-----------------------------------------------------------------------------
 
 
-def iwfm2obs(verbose=False):
+NAMETYPES = {'Streams': 'st', 'Groundwater': 'gw', 'Subsidence': 'sb', 'Tile drains': 'td'}
+CACHE_VERSION = 1
+
+
+def read_iwfm2obs_config(config_file):
+    ''' read_iwfm2obs_config() - read the TOML file that replaces the iwfm2obs
+        prompts
+
+        Top-level keys are sim_file (IWFM Simulation main file), missing_file
+        (default 'sim_miss.out') and cache_file (default 'iwfm2obs_cache.npz').
+        start_date and end_date (mm/dd/yyyy) may replace sim_file. Each
+        hydrograph type to process has a table named 'Streams',
+        'Groundwater', 'Subsidence' or 'Tile drains' with obs_file, smp_file,
+        and optionally ins_file, rthresh (days), well_pairs_file and
+        hdiff_thresh (Groundwater only), and hyd_file and hyd_names to
+        use instead of the names in the IWFM input files. For example:
+
+            sim_file = "Simulation/C2VSimFG.in"
+
+            [Groundwater]
+            obs_file = "gw_obs.smp"
+            smp_file = "gw_temp.smp"
+            ins_file = "gw_temp.ins"
+
+    Parameters
+    ----------
+    config_file : str
+        TOML configuration file name
+
+    Returns
+    -------
+    config : dict
+        Configuration with defaults filled in
+
+    '''
+    import iwfm
+
+    try:
+        import tomllib
+    except ImportError:   # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError('Reading iwfm2obs configuration files on Python < 3.11 requires '
+                              'the tomli module. Install with: pip install tomli')
+
+    iwfm.file_test(config_file)
+    with open(config_file, 'rb') as f:
+        config = tomllib.load(f)
+
+    config.setdefault('missing_file', 'sim_miss.out')
+    config.setdefault('cache_file', 'iwfm2obs_cache.npz')
+    unknown = [key for key, value in config.items() if isinstance(value, dict) and key not in NAMETYPES]
+    if unknown:
+        raise ValueError(f'Unknown hydrograph type(s) {unknown} in {config_file}, '
+                         f'use {list(NAMETYPES)}')
+    if 'sim_file' not in config and not ('start_date' in config and 'end_date' in config):
+        raise ValueError(f'{config_file} needs sim_file, or start_date and end_date')
+
+    for nt in NAMETYPES:
+        if nt in config:
+            section = config[nt]
+            for key in ('obs_file', 'smp_file'):
+                if key not in section:
+                    raise ValueError(f'[{nt}] in {config_file} has no {key}')
+            section.setdefault('ins_file', 'none')
+            section.setdefault('rthresh', 0.0)
+            section.setdefault('hdiff_thresh', 1)
+    return config
+
+
+def read_sim_array(file_name):
+    ''' read_sim_array() - read an IWFM hydrograph output file into an array
+
+    Parameters
+    ----------
+    file_name : str
+        simulation hydrograph file name
+
+    Returns
+    -------
+    dates : list of str
+        date of each row, mm/dd/yyyy
+
+    values : numpy array
+        simulated values, shape (ntime, nhyd)
+
+    '''
+    import numpy as np
+
+    with open(file_name) as f:
+        hyd_lines = f.read().splitlines()
+
+    start = 1
+    while not hyd_lines[start][:1].isdigit():          # skip to the dates
+        start += 1
+    end = start
+    while end < len(hyd_lines) and hyd_lines[end][:1].isdigit():
+        end += 1
+
+    rows = [line.split(None, 1) for line in hyd_lines[start:end]]
+    dates = [row[0][:10] for row in rows]
+    values = np.array(' '.join(row[1] for row in rows).split(), dtype=float)
+    return dates, values.reshape(len(rows), -1)
+
+
+def _file_signature(file_name):
+    import os
+    st = os.stat(file_name)
+    return [os.path.abspath(file_name), st.st_mtime_ns, st.st_size]
+
+
+def build_obs_weights(config, verbose=False):
+    ''' build_obs_weights() - find the hydrograph column, bracketing time
+        steps and interpolation weights of every observation
+
+        Observations at sites without a simulated hydrograph, after the end
+        of the simulation, or more than rthresh days outside the simulated
+        dates are dropped. Observations within rthresh days of the first or
+        last simulated date take the value at that date.
+
+    Parameters
+    ----------
+    config : dict
+        Configuration from read_iwfm2obs_config()
+
+    verbose : bool, default=False
+        Print to screen?
+
+    Returns
+    -------
+    weights : dict
+        numpy arrays for each hydrograph type code, e.g. 'gw_col', plus
+        the simulation start date and weights_signature()
+
+    '''
+    from datetime import datetime
+    import numpy as np
+    import iwfm
+    import iwfm.calib as calib
+
+    start_date, end_date = config.get('start_date'), config.get('end_date')
+    if 'sim_file' in config:
+        sim_start, sim_end, _ = iwfm.sim_info(config['sim_file'])
+        start_date, end_date = start_date or sim_start, end_date or sim_end
+    start_date = datetime.strptime(start_date[0:10], '%m/%d/%Y')
+    end_date = datetime.strptime(end_date[0:10], '%m/%d/%Y')
+    no_days = (end_date - start_date).days
+
+    file_dict = {}
+    if 'sim_file' in config and any(nt in config and 'hyd_file' not in config[nt] for nt in NAMETYPES):
+        sim_file_d = iwfm.iwfm_read_sim(config['sim_file'])
+        gw_file_d = iwfm.iwfm_read_gw(sim_file_d['gw_file'])[0]
+        main_files = {'Streams': sim_file_d['stream_file'], 'Groundwater': sim_file_d['gw_file'],
+                      'Subsidence': gw_file_d.subs_file, 'Tile drains': gw_file_d.drain_file}
+        # colid and skips as in iwfm2obs()
+        layout = {'Streams': (1, [6, 6]), 'Groundwater': (5, [20, 2]),
+                  'Subsidence': (5, [5, 2]), 'Tile drains': (2, [-1, 3])}
+        for nt, (colid, skips) in layout.items():
+            file_dict[nt] = [main_files[nt], '', '', '', '', True, True, 0, colid, skips]
+
+    weights = {}
+    with open(config['missing_file'], 'w') as fmiss:                 # erase old version
+        fmiss.write('')
+
+    for nt, code in NAMETYPES.items():
+        if nt not in config:
+            continue
+        section = config[nt]
+        if 'hyd_file' in section:
+            hyd_file, sim_sites = section['hyd_file'], list(section['hyd_names'])
+        else:
+            hyd_file, sim_sites = calib.get_hyd_info(nt, file_dict)
+
+        iwfm.file_test(section['obs_file'])
+        obs_sites, obs_data = calib.get_obs_hyd(section['obs_file'], start_date)
+        sim_miss, _ = calib.compare(sim_sites, obs_sites)
+        calib.write_missing(sim_miss, section['obs_file'], fname=config['missing_file'])
+
+        sim_row_dates, _ = read_sim_array(hyd_file)
+        sim_dates = np.array([(datetime.strptime(d, '%m/%d/%Y') - start_date).days
+                              for d in sim_row_dates])
+        rthresh = float(section['rthresh'])
+
+        site_col = {site: i for i, site in enumerate(sim_sites)}
+        keep = [row for row in obs_data
+                if row[0] in site_col and row[1] <= no_days
+                and sim_dates[0] - rthresh <= row[1] <= sim_dates[-1] + rthresh]
+        if verbose:
+            print(f'    {nt}: {len(keep):,} of {len(obs_data):,} observations at simulated sites')
+
+        sites = [row[0] for row in keep]
+        obs_days = np.clip(np.array([row[1] for row in keep], dtype=int), sim_dates[0], sim_dates[-1])
+
+        # same bracketing as scipy interp1d: hi = searchsorted(left), lo = hi - 1
+        hi = np.clip(np.searchsorted(sim_dates, obs_days), 1, len(sim_dates) - 1)
+        lo = hi - 1
+        weights[f'{code}_col'] = np.array([site_col[s] for s in sites], dtype=int)
+        weights[f'{code}_lo'] = lo
+        weights[f'{code}_dx'] = obs_days - sim_dates[lo]
+        weights[f'{code}_span'] = sim_dates[hi] - sim_dates[lo]
+        weights[f'{code}_ts'] = np.ceil((1.0 / weights[f'{code}_span']) * weights[f'{code}_dx']
+                                        + (lo + 1)).astype(int)
+        weights[f'{code}_site'] = np.array(sites, dtype=str)
+        weights[f'{code}_date'] = np.array([row[2].strftime('%m/%d/%Y') for row in keep], dtype=str)
+        weights[f'{code}_hyd_file'] = np.array(hyd_file)
+        weights[f'{code}_sim_dates'] = np.array(sim_row_dates, dtype=str)
+
+    weights['start_date'] = np.array(start_date.strftime('%m/%d/%Y'))
+    weights['signature'] = np.array(weights_signature(config))
+    return weights
+
+
+def weights_signature(config):
+    ''' weights_signature() - identify the configuration and input files the
+        interpolation weights were built from
+
+    Parameters
+    ----------
+    config : dict
+        Configuration from read_iwfm2obs_config()
+
+    Returns
+    -------
+    signature : str
+        JSON string with the configuration and the modification time and
+        size of the simulation, observation and well pairs files
+
+    '''
+    import json
+
+    files = {}
+    if 'sim_file' in config:
+        files['sim_file'] = _file_signature(config['sim_file'])
+    for nt in NAMETYPES:
+        if nt in config:
+            files[nt] = _file_signature(config[nt]['obs_file'])
+            if config[nt].get('well_pairs_file'):
+                files[f'{nt} pairs'] = _file_signature(config[nt]['well_pairs_file'])
+    return json.dumps({'version': CACHE_VERSION, 'config': config, 'files': files},
+                      sort_keys=True, default=str)
+
+
+def apply_obs_weights(config, weights, verbose=False):
+    ''' apply_obs_weights() - interpolate simulated hydrographs to the
+        observations with precomputed weights, and write smp and ins files
+
+    Parameters
+    ----------
+    config : dict
+        Configuration from read_iwfm2obs_config()
+
+    weights : dict
+        Weights from build_obs_weights()
+
+    verbose : bool, default=False
+        Print to screen?
+
+    Returns
+    -------
+    counts : dict
+        Number of simulated values written for each hydrograph type
+
+    '''
+    from datetime import datetime
+    import numpy as np
+    from scipy.interpolate import interp1d
+    import iwfm.calib as calib
+    from iwfm.calib.to_smp_ins import smp_line, ins_line
+
+    start_date = datetime.strptime(str(weights['start_date']), '%m/%d/%Y')
+    counts = {}
+    for nt, code in NAMETYPES.items():
+        if nt not in config:
+            continue
+        section = config[nt]
+        sim_row_dates, sim = read_sim_array(str(weights[f'{code}_hyd_file']))
+        if sim_row_dates != weights[f'{code}_sim_dates'].tolist():
+            raise ValueError(f'Dates in {weights[f"{code}_hyd_file"]} differ from the cached weights')
+
+        col, lo = weights[f'{code}_col'], weights[f'{code}_lo']
+        y_lo = sim[lo, col]
+        obs_val = (sim[lo + 1, col] - y_lo) / weights[f'{code}_span'] * weights[f'{code}_dx'] + y_lo
+
+        sites, dates, ts = (weights[f'{code}_site'].tolist(), weights[f'{code}_date'].tolist(),
+                            weights[f'{code}_ts'].tolist())
+        values = obs_val.tolist()
+        smp_out = [smp_line(site, date, round(v, 3)) for site, date, v in zip(sites, dates, values)]
+        ins_out = [ins_line(site, t) for site, t in zip(sites, ts)]
+
+        if nt == 'Groundwater' and section.get('well_pairs_file'):
+            hdiff_sites, hdiff_pairs, _ = calib.headdiff_read(section['well_pairs_file'])
+            hdiff_sites = set(hdiff_sites)
+            hdiff_data = [[site, datetime.strptime(date, '%m/%d/%Y'), v, t]
+                          for site, date, v, t in zip(sites, dates, values, ts) if site in hdiff_sites]
+            if hdiff_data:
+                sim_dates = [(datetime.strptime(d, '%m/%d/%Y') - start_date).days for d in sim_row_dates]
+                ts_func = interp1d(np.array(sim_dates), np.arange(1, len(sim_dates) + 1), kind='linear')
+                smp, ins = calib.headdiff_hyds(hdiff_pairs, hdiff_data, section['hdiff_thresh'],
+                                               ts_func, start_date, verbose)
+                smp_out.extend(smp)
+                ins_out.extend(ins)
+
+        with open(section['smp_file'], 'w') as f:
+            f.writelines(f'{item}\n' for item in smp_out)
+        if verbose: print(f'    Wrote {len(smp_out):,} simulated {nt.lower()} values to {section["smp_file"]}')
+
+        if section['ins_file'].lower()[0] != 'n':
+            with open(section['ins_file'], 'w') as f:
+                f.write('pif #\n')
+                f.writelines(f'{item}\n' for item in ins_out)
+            if verbose: print(f'    Wrote instructions to {section["ins_file"]}')
+        counts[nt] = len(smp_out)
+    return counts
+
+
+def load_obs_weights(config, rebuild=False, verbose=False):
+    ''' load_obs_weights() - load interpolation weights from the cache file,
+        or build and cache them if the cache is missing or out of date
+
+    Parameters
+    ----------
+    config : dict
+        Configuration from read_iwfm2obs_config()
+
+    rebuild : bool, default=False
+        Build the weights even if the cache is up to date
+
+    verbose : bool, default=False
+        Print to screen?
+
+    Returns
+    -------
+    weights : dict
+        Weights from build_obs_weights()
+
+    from_cache : bool
+        True if the weights were read from the cache file
+
+    '''
+    import os
+    import numpy as np
+
+    cache_file = config['cache_file']
+    if not rebuild and os.path.isfile(cache_file):
+        with np.load(cache_file, allow_pickle=False) as cache:
+            weights = {key: cache[key] for key in cache.files}
+        if str(weights.get('signature')) == weights_signature(config):
+            if verbose: print(f'  Read interpolation weights from {cache_file}')
+            return weights, True
+
+    weights = build_obs_weights(config, verbose=verbose)
+    with open(cache_file, 'wb') as f:
+        np.savez(f, **weights)
+    if verbose: print(f'  Saved interpolation weights to {cache_file}')
+    return weights, False
+
+
+def iwfm2obs(verbose=False, config_file=None, rebuild=False):
     ''' iwfm2obs() interpolates model output to match the times and
         locations of calibration observations and puts them into a PEST-compatible
         smp-formatted output file.
 
+        Without config_file the file names and thresholds are read from
+        prompts. With config_file (see read_iwfm2obs_config()) iwfm2obs runs
+        without prompts: the observation to hydrograph column and time step
+        mapping is built once and cached, so model runs after the first only
+        read the hydrographs and apply the cached weights.
+
     Parameters
     ----------
-    nothing
+    verbose : bool, default=False
+        Print to screen?
+
+    config_file : str, default=None
+        TOML configuration file, None to use prompts
+
+    rebuild : bool, default=False
+        Rebuild the cached weights even if they are up to date
 
     Returns
     -------
-    nothing
+    counts : dict
+        Number of simulated values written for each hydrograph type,
+        with config_file only
 
     '''
+    if config_file is not None:
+        config = read_iwfm2obs_config(config_file)
+        weights, from_cache = load_obs_weights(config, rebuild=rebuild, verbose=verbose)
+        try:
+            return apply_obs_weights(config, weights, verbose=verbose)
+        except ValueError:
+            if not from_cache:
+                raise
+            # hydrograph dates changed since the weights were cached
+            weights, _ = load_obs_weights(config, rebuild=True, verbose=verbose)
+            return apply_obs_weights(config, weights, verbose=verbose)
+
     import sys
     import iwfm
     import iwfm.calib as calib
@@ -221,10 +606,14 @@ if __name__ == "__main__":
     import iwfm.debug as idb
     from iwfm.debug import parse_cli_flags
 
+    import sys
+
     verbose, debug = parse_cli_flags()
 
+    config_file = sys.argv[1] if len(sys.argv) > 1 else None   # configuration file, or prompts
+
     idb.exe_time()  # initialize timer
-    iwfm2obs(verbose=verbose)
+    iwfm2obs(verbose=verbose, config_file=config_file)
 
     print(' ') # clean screen
     idb.exe_time()  # print elapsed time
@@ -0,0 +1,307 @@
+# krige_factors.py
+# Calculate ordinary or universal kriging factors to translate parameter values
+# from pilot points to model nodes, and write them to a factors file
+# Copyright (C) 2020-2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+from iwfm.debug.logger_setup import logger
+
+VARIOGRAMS = ('spherical', 'exponential', 'gaussian')
+
+
+def covariance(h, vtype='spherical', nugget=0.0, sill=1.0, a=1.0):
+    ''' covariance() - Covariance for anisotropy-corrected separation distances
+
+    Uses the PEST PPK2FAC variogram definitions, where sill is the
+    contribution of the structure and nugget + sill is the total variance:
+        spherical:   C(h) = sill * (1 - 1.5 h/a + 0.5 (h/a)**3) for h < a, else 0
+        exponential: C(h) = sill * exp(-h/a)
+        gaussian:    C(h) = sill * exp(-(h/a)**2)
+    with C(0) = nugget + sill.
+
+    Parameters
+    ----------
+    h : numpy array
+        Separation distances
+
+    vtype : str, default='spherical'
+        Variogram type: 'spherical', 'exponential' or 'gaussian'
+
+    nugget : float, default=0.0
+        Nugget variance
+
+    sill : float, default=1.0
+        Sill of the variogram structure (excluding the nugget)
+
+    a : float, default=1.0
+        Variogram range parameter "a"
+
+    Returns
+    -------
+    cov : numpy array
+        Covariances, same shape as h
+
+    '''
+    import numpy as np
+
+    r = np.asarray(h, dtype=float) / a
+    if vtype == 'spherical':
+        cov = np.where(r < 1.0, 1.0 - r * (1.5 - 0.5 * r * r), 0.0)
+    elif vtype == 'exponential':
+        cov = np.exp(-r)
+    elif vtype == 'gaussian':
+        cov = np.exp(-r * r)
+    else:
+        raise ValueError(f"Unknown variogram type '{vtype}', use one of {VARIOGRAMS}")
+
+    cov = sill * cov
+    return np.where(r == 0.0, cov + nugget, cov)
+
+
+def _solve_systems(args):
+    ''' _solve_systems() - Build and solve the kriging systems for a block of
+        targets that all have the same number of neighbors
+
+    Parameters
+    ----------
+    args : tuple
+        (pp_xy, target_xy, neighbors, variogram, universal)
+        pp_xy and target_xy are rotated and scaled for anisotropy,
+        neighbors has shape (ntarget, k), variogram is a dict of
+        covariance() keyword arguments
+
+    Returns
+    -------
+    weights : numpy array
+        Kriging weights, shape (ntarget, k)
+
+    '''
+    import numpy as np
+
+    pp_xy, target_xy, neighbors, variogram, universal = args
+    m, k = neighbors.shape
+    p = 3 if universal else 1                           # unbiasedness (+ linear drift)
+
+    pts = pp_xy[neighbors]                              # (m, k, 2)
+    dpp = np.linalg.norm(pts[:, :, None, :] - pts[:, None, :, :], axis=-1)
+    dtg = np.linalg.norm(pts - target_xy[:, None, :], axis=-1)
+
+    lhs = np.zeros((m, k + p, k + p))
+    rhs = np.zeros((m, k + p))
+    lhs[:, :k, :k] = covariance(dpp, **variogram)
+    rhs[:, :k] = covariance(dtg, **variogram)
+    lhs[:, :k, k] = lhs[:, k, :k] = 1.0
+    rhs[:, k] = 1.0
+    if universal:
+        # linear drift in coordinates centered on and scaled to each target
+        rel = pts - target_xy[:, None, :]
+        scale = np.maximum(np.abs(rel).max(axis=(1, 2)), 1e-12)[:, None, None]
+        rel = rel / scale
+        lhs[:, :k, k + 1:] = rel
+        lhs[:, k + 1:, :k] = rel.transpose(0, 2, 1)
+        # drift terms of the target are zero in these coordinates
+
+    try:
+        solution = np.linalg.solve(lhs, rhs[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        # duplicate pilot points make some systems singular
+        solution = np.array([np.linalg.lstsq(a, b, rcond=None)[0] for a, b in zip(lhs, rhs)])
+
+    return solution[:, :k]
+
+
+def krige_factors(pp_coord, node_coord, vtype='spherical', a=None, nugget=0.0, sill=1.0,
+                  anisotropy=1.0, bearing=0.0, kriging='ordinary', n_ppoints=10,
+                  min_ppoints=1, search_radius=None, workers=1, chunk_size=5000,
+                  verbose=False):
+    ''' krige_factors() - Calculate kriging factors between model nodes and pilot points
+
+    The nearest n_ppoints pilot points to each node (within search_radius)
+    are found with a KD-tree, then the kriging systems of all nodes with the
+    same number of neighbors are solved together with numpy.linalg.solve.
+
+    Parameters
+    ----------
+    pp_coord : numpy array
+        Pilot point coordinates, shape (npp, 2)
+
+    node_coord : numpy array
+        Nodal coordinates, shape (nnode, 2)
+
+    vtype : str, default='spherical'
+        Variogram type: 'spherical', 'exponential' or 'gaussian'
+
+    a : float, default=None
+        Variogram range parameter "a". None uses one third of the
+        diagonal of the pilot point bounding box, and at least 1
+
+    nugget : float, default=0.0
+        Nugget variance
+
+    sill : float, default=1.0
+        Sill of the variogram structure (excluding the nugget)
+
+    anisotropy : float, default=1.0
+        Ratio of the variogram range in the bearing direction to the range
+        in the perpendicular direction
+
+    bearing : float, default=0.0
+        Direction of the principal anisotropy axis, degrees clockwise from north
+
+    kriging : str, default='ordinary'
+        'ordinary' or 'universal' (linear drift in x and y)
+
+    n_ppoints : int, default=10
+        Maximum number of pilot points used for each node
+
+    min_ppoints : int, default=1
+        Nodes with fewer pilot points within search_radius get no factors
+
+    search_radius : float, default=None
+        Only use pilot points within this distance of a node. None searches
+        without a distance limit
+
+    workers : int, default=1
+        Number of worker processes for solving the kriging systems
+
+    chunk_size : int, default=5000
+        Number of nodes per batched solve
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    ppoints : list
+        List of pilot points for each node (0-indexed)
+
+    weights : list
+        List of kriging weights for each node
+
+    '''
+    import numpy as np
+    from scipy.spatial import cKDTree
+    from iwfm.calib.setrot import setrot
+
+    if kriging not in ('ordinary', 'universal'):
+        raise ValueError(f"kriging must be 'ordinary' or 'universal', not '{kriging}'")
+    if vtype not in VARIOGRAMS:
+        raise ValueError(f"Unknown variogram type '{vtype}', use one of {VARIOGRAMS}")
+    if anisotropy <= 0:
+        raise ValueError(f'anisotropy must be positive, got {anisotropy}')
+
+    pp_coord = np.asarray(pp_coord, dtype=float).reshape(-1, 2)
+    node_coord = np.asarray(node_coord, dtype=float).reshape(-1, 2)
+    n_pp, n_node = len(pp_coord), len(node_coord)
+    universal = kriging == 'universal'
+    min_ppoints = max(min_ppoints, 3 if universal else 1)
+    k = min(n_ppoints, n_pp)
+
+    if a is None:
+        a = max(np.hypot(*np.ptp(pp_coord, axis=0)) / 3.0, 1.0)
+    variogram = {'vtype': vtype, 'nugget': nugget, 'sill': sill, 'a': a}
+
+    # Rotate to the bearing and scale the minor axis, so distances in the
+    # transformed coordinates are isotropic
+    rotmat = np.array(setrot(bearing, 0.0, 0.0, 1.0 / anisotropy, 1.0))[:2, :2]
+    pp_xy = pp_coord @ rotmat.T
+    node_xy = node_coord @ rotmat.T
+
+    # neighborhood search in model coordinates
+    upper = np.inf if search_radius is None else float(search_radius)
+    _, index = cKDTree(pp_coord).query(node_coord, k=k, distance_upper_bound=upper)
+    index = index.reshape(n_node, k)
+    found = index < n_pp
+    n_found = found.sum(axis=1)
+
+    # neighbors are sorted by distance, so a node with j neighbors uses the
+    # first j columns; solve all nodes with the same count together
+    tasks, owners = [], []
+    for j in np.unique(n_found):
+        if j < min_ppoints:
+            continue
+        nodes = np.nonzero(n_found == j)[0]
+        for start in range(0, len(nodes), chunk_size):
+            block = nodes[start:start + chunk_size]
+            tasks.append((pp_xy, node_xy[block], index[block, :j], variogram, universal))
+            owners.append(block)
+
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_solve_systems, tasks))
+    else:
+        results = [_solve_systems(task) for task in tasks]
+
+    ppoints = [[] for _ in range(n_node)]
+    weights = [[] for _ in range(n_node)]
+    for block, task, wgt in zip(owners, tasks, results):
+        for node, pp, w in zip(block.tolist(), task[2].tolist(), wgt.tolist()):
+            ppoints[node] = pp
+            weights[node] = w
+
+    n_missing = int((n_found < min_ppoints).sum())
+    logger.debug(f'krige_factors: {n_node} nodes, {len(tasks)} batched solves, '
+                 f'{n_missing} nodes without factors')
+    if verbose and n_missing:
+        print(f'  {n_missing:,} nodes have fewer than {min_ppoints} pilot points within {search_radius}')
+
+    return ppoints, weights
+
+
+if __name__ == '__main__':
+    ''' Run krige_factors() from command line '''
+    import sys
+    import iwfm
+    import iwfm.debug as idb
+    from iwfm.debug import parse_cli_flags
+    from iwfm.calib.ppk2fac import read_pp_file, write_factors
+
+    verbose, debug = parse_cli_flags()
+
+    if len(sys.argv) > 1:  # arguments are listed on the command line
+        pp_file          = sys.argv[1]
+        node_file        = sys.argv[2]
+        factors_outfile  = sys.argv[3]
+        vtype            = sys.argv[4] if len(sys.argv) > 4 else 'spherical'
+        a                = float(sys.argv[5]) if len(sys.argv) > 5 else None
+        n_ppoints        = int(sys.argv[6]) if len(sys.argv) > 6 else 10
+    else:  # ask for file names from terminal
+        pp_file          = input('Pilot points file name: ')
+        node_file        = input('IWFM Node.dat file name: ')
+        factors_outfile  = input('Factors output file name: ')
+        vtype            = input('Variogram type (spherical, exponential, gaussian) [spherical]: ') or 'spherical'
+        a                = input('Variogram range a [auto]: ')
+        a                = float(a) if a else None
+        n_ppoints        = int(input('Maximum pilot points per node [10]: ') or 10)
+
+    iwfm.file_test(pp_file)
+    iwfm.file_test(node_file)
+
+    idb.exe_time()  # initialize timer
+
+    pp_coord, pp_list = read_pp_file(pp_file, verbose=verbose)
+    node_coord, node_list = iwfm.read_nodes(node_file)
+
+    ppoints, weights = krige_factors(pp_coord, node_coord, vtype=vtype, a=a,
+                                     n_ppoints=n_ppoints, verbose=verbose)
+
+    count = write_factors(factors_outfile, pp_file, pp_list, node_list, ppoints, weights,
+                          verbose=verbose, one_line=True)
+
+    if verbose: print(f' Wrote {count:,} factors to {factors_outfile}\n')
+
+    idb.exe_time()  # print elapsed time
@@ -17,6 +17,39 @@
 #-----------------------------------------------------------------------------
 
 
+def _format_rounded(values, width, cache, decimals=3):
+    ''' _format_rounded() - str(round(value, decimals)).rjust(width) for each
+        value in an array, formatting each distinct rounded value once
+
+    Values are keyed by the integer count of 10**-decimals they round to;
+    np.rint() is exact except within rounding error of a tie, where round()
+    is used instead. cache (dict) keeps formatted keys between calls.
+    '''
+    import math
+    import numpy as np
+
+    scale = 10 ** decimals
+    finite = np.isfinite(values)
+    scaled = np.where(finite, values, 0.0) * scale
+    key = np.rint(scaled)
+    near_tie = finite & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if near_tie.any():
+        key[near_tie] = [round(round(v, decimals) * scale) for v in values[near_tie].tolist()]
+    key[(key == 0) & np.signbit(values)] = -0.5          # rounds to -0.0
+    key[~finite] = values[~finite]
+
+    uniq, index = np.unique(key, return_inverse=True)
+    text = []
+    for u in uniq.tolist():
+        if u not in cache:
+            if u == -0.5:
+                cache[u] = '-0.0'.rjust(width)
+            else:
+                cache[u] = str(u / scale if math.isfinite(u) else u).rjust(width)
+        text.append(cache[u])
+    return np.array(text)[index.reshape(values.shape)]
+
+
 def ltbud(budget_file, output_file, zero_offset=2.0, neg_val=1.0e-7):
     ''' ltbud() - Read an IWFM Budget-format output file, and log-transform the values
 
@@ -38,63 +71,25 @@ def ltbud(budget_file, output_file, zero_offset=2.0, neg_val=1.0e-7):
     -------
     nothing
 
-    TOTO: Add error code for too few budget tables
-
     '''
 
-    import iwfm
-
-    with open(budget_file) as f:
-        file_lines = f.read().splitlines()                # open and read input file
-
-    # -- Get the Budget file header and footer lengths, number of budget tables
-    header, footer, table, line, width, i = 0, 0, 1, 0, 0, 16
-    while not file_lines[line][0].isdigit():                          # reads to end of header
-        header += 1                                                   # to get header length
-        line   += 1
-    line += 1
-
-    while file_lines[line][i + width].isspace():                      # count spaces
-        width += 1
-    while not file_lines[line][i + width].isspace():                  # count digits, decimal etc
-        width += 1
-    
-    while file_lines[line][0].isdigit():                              # reads to end of dates
-        table += 1                                                    # to get table length
-        line  += 1
-    line += 1
-
-    if line + 5 < len(file_lines):    # budget file contains more than one table
-        while len(file_lines[line])==0 or not file_lines[line][0].isdigit():     # reads to end of next header
-            footer += 1
-            line   += 1
-    footer = footer + 1 - header                                      # to get footer length
-    tables = round(len(file_lines)/(header + table + footer))         # number of tables in budget file
+    from iwfm.logtrans import logtrans_array
+    from iwfm.budget_text import iter_budget_text
 
     # -- Step through the Budget file, one table at a time
-    line = 0                                                          # reset line to top of budget_table
-    for t in range(0,tables):                                         # cycle through the tables
-        line += header                                                # skip the header lines
-        for j in range(0,table):                                      # each line in the table
-            outstr = file_lines[line][:16]                            # DSS date
-  
-            items  = file_lines[line].split()
-            for item in items[1:]:                                    # skip the date
-                val = float(item)                                     # convert string to float
-                outval = round(iwfm.logtrans(val,zero_offset,neg_val),3)   # log-transform
-                strval = str(outval)  # convert to string
-                while len(strval) < width:
-                    strval = ' ' + strval                              # pad with leading spaces
-                outstr += strval                                       # add to outstr
-  
-            file_lines[line] = outstr                                  # replace
-            line += 1
-        line += footer
-
-    # -- write output file
+    cache = {}
     with open(output_file, 'w') as out_file:
-        for i in range(0,len(file_lines)):
-            out_file.write("{}\n".format(file_lines[i]))
+        for lines, _, values, geometry in iter_budget_text(budget_file):
+            header, edges = geometry['header'], geometry['edges']
+            date_width, width = int(edges[0]), int(edges[1] - edges[0])   # DSS date, value width
+
+            outval = logtrans_array(values, zero_offset, neg_val)     # log-transform
+            cells = _format_rounded(outval, width, cache).tolist()           # pad with leading spaces
+
+            for j, row in enumerate(cells):                           # each line in the table
+                lines[header + j] = lines[header + j][:date_width] + ''.join(row)
+            out_file.write('\n'.join(lines) + '\n')
+
 
 if __name__ == "__main__":
     ''' Run ltsmp() from command line '''
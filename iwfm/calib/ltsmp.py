@@ -44,28 +44,24 @@ def ltsmp(input_file, output_file, zero_offset=36.0, neg_val=0.001):
 
     '''
 
+    import numpy as np
+    from iwfm.logtrans import logtrans_array
+
     with open(input_file) as f:
         file_lines = f.read().splitlines()          # open and read input file
 
-    out_lines = []
-    for line in file_lines:
-        length = len(line)
-        i = len(line) - 1
-        while line[i] == ' ':
-          i -= 1
-        while line[i] != ' ':
-          i -= 1
-        while line[i] == ' ':
-          i -= 1
-        i += 1
-        head = line[0:i]
-        q = float(line[i:])
-        out = f'{head}               {iwfm.logtrans(q, zero_offset, neg_val):.4f}'
-        out_lines.append(out.ljust(length))  # left-justify to length chars
-    
+    # split off the value, the last item on each line
+    items = [line.rstrip().rsplit(None, 1) for line in file_lines]
+    values = np.array([item[1] for item in items], dtype=float)
+    outvals = logtrans_array(values, zero_offset, neg_val).tolist()
+
+    # format all lines at once, then left-justify each to its input length
+    n = len(items)
+    out = ('%s               %.4f\n' * n) % tuple(x for item, q in zip(items, outvals) for x in (item[0], q))
+    out = ('%-*s\n' * n) % tuple(x for line, o in zip(file_lines, out.splitlines()) for x in (len(line), o))
+
     with open(output_file, 'w') as out_file:
-        for i in range(0,len(out_lines)):
-            out_file.write(f'{out_lines[i]}\n')
+        out_file.write(out)
 
 
 if __name__ == "__main__":
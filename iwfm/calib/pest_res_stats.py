@@ -34,7 +34,8 @@ def pest_res_stats(pest_res_file, verbose=False):
     nothing
 
     '''
-    import numpy as np
+    import polars as pl
+    from iwfm.calib.residual_stats import residual_stats
 
     # read pest results file
     with open(pest_res_file) as f:
@@ -43,63 +44,32 @@ def pest_res_stats(pest_res_file, verbose=False):
     header = pest_res.pop(0)                 # remove the first line
 
     # use list comprehension to split each line of pest_res
-    pest_res = [line.split() for line in pest_res]
+    pest_res = [line.split() for line in pest_res if line.strip()]
 
     # observation names have the format 'station_MMYYYY'
-    # split first item into observation and date on '_', and append date to end
-    for i in range(0, len(pest_res)):
-        obs_name, obs_date = pest_res[i][0].split('_')
-        pest_res[i][0] = obs_name
-        pest_res[i].append(obs_date)
-
-    names = list(set([x[0] for x in pest_res]))    # list of all different values of pest_res[0]
-
-    obs = []
-    for name in names:
-        obs.append([name,0,0,0,0,0,''])  # name, n, mean, bias, rmse, stdev, group
-
-    # cycle through pest_res and accumulate values
-    for i in range(0, len(pest_res)):
-        for j in range(0, len(names)):
-            if pest_res[i][0] == names[j]:                          # name
-                obs[j][1] += 1                                      # n
-                obs[j][2] += float(pest_res[i][2])                  # mean accumulator
-                obs[j][3] += float(pest_res[i][3])                  # bias accumulator
-                obs[j][4] += (float(pest_res[i][3]))**2             # rmse accumulator
-                obs[j][6] =  pest_res[i][1]                         # group
-                
-    # calculate mean, bias, rmse
-    for i in range(0, len(obs)):
-        if obs[i][1] > 0:
-            obs[i][2] = obs[i][2]/obs[i][1]                             # mean
-            obs[i][3] = obs[i][3]/obs[i][1]                             # bias
-            obs[i][4] = np.sqrt(obs[i][4]/obs[i][1])                    # rmse
-        else:
-            obs[i][2] = -999                                            # mean
-            obs[i][3] = -999                                            # bias
-            obs[i][4] = -999                                            # rmse
-
-    # cycle through pest_res and calculate stdev
-    for i in range(0, len(pest_res)):
-        for j in range(0, len(names)):
-            if pest_res[i][0] == names[j]:                          # name
-                obs[j][5] += (float(pest_res[i][2])-obs[j][2])**2   # stdev accumulator
-    for i in range(0, len(obs)):
-        if obs[i][1] > 1:
-            obs[i][5] = np.sqrt(obs[i][5]/(obs[i][1]-1))                # stdev
-        else:
-            obs[i][5] = -999
-
-    # sort obs on [6] then [1]
-    obs.sort(key=lambda x: (x[1],x[6]))
+    # columns are Name, Group, Measured, Modelled, Residual, ...
+    data = pl.DataFrame({
+        'name': [item[0].rsplit('_', 1)[0] for item in pest_res],
+        'group': [item[1] for item in pest_res],
+        'measured': [float(item[2]) for item in pest_res],
+        'modelled': [float(item[3]) for item in pest_res],
+    })
+
+    # one group-by pass for n, mean, bias, rmse and stdev of each site,
+    # with residuals as modelled - measured
+    obs = residual_stats(data, by='name', observed='measured', simulated='modelled',
+                         extra=[pl.col('group').last()])
+    obs = (obs.with_columns(pl.col('std').fill_null(-999.0))
+              .sort(['count', 'group'], maintain_order=True))
 
     # write out results
     out_file = pest_res_file.replace('.res','_stats.out')
     print(f'  Writing {out_file}')
     with open(out_file,"w") as of:
         of.write(f'Name\tN\tMean\tBias\tRMSE\tStdev\tGroup\n')
-        for i in range(0, len(obs)):
-            of.write(f'{obs[i][0]}\t{obs[i][1]}\t{obs[i][2]:.2f}\t{obs[i][3]:.2f}\t{obs[i][4]:.2f}\t{obs[i][5]:.2f}\t{obs[i][6]}\n')
+        for name, n, mean, bias, rmse, std, group in obs.select(
+                ['name', 'count', 'mean', 'bias', 'rmse', 'std', 'group']).iter_rows():
+            of.write(f'{name}\t{n}\t{mean:.2f}\t{bias:.2f}\t{rmse:.2f}\t{std:.2f}\t{group}\n')
 
 
 if __name__ == "__main__":
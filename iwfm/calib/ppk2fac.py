@@ -55,10 +55,15 @@ def read_pp_file(pp_file, verbose=False):
     return pp_coord, pp_list
 
 
-def par2fac_idw2(pp_coord, node_coord, n_ppoints=3, min_ppoints=3, max_ppoints=10, verbose=False):
+def par2fac_idw2(pp_coord, node_coord, n_ppoints=3, min_ppoints=3, max_ppoints=10,
+                 search_radius=None, verbose=False):
     ''' par2fac() - Calculate inverse-distance-squared weighting factors between nodes and
                     n_ppoints pilot points.
-    
+
+    The n_ppoints nearest pilot points of all nodes are found with a single
+    KD-tree query. A node that coincides with one or more pilot points takes
+    its value from them alone (equal weights, others zero).
+
     Parameters
     ----------
     pp_coord : list
@@ -76,6 +81,11 @@ def par2fac_idw2(pp_coord, node_coord, n_ppoints=3, min_ppoints=3, max_ppoints=1
     max_ppoints : int; default = 10
         Maximum number of pilot points for interpolation.
 
+    search_radius : float; default = None
+        Only use pilot points within this distance of a node. Nodes with
+        fewer than n_ppoints pilot points in range get fewer pilot points,
+        possibly none. None searches without a distance limit.
+
     verbose : bool, default=False
         Turn command-line output on or off
 
@@ -90,6 +100,7 @@ def par2fac_idw2(pp_coord, node_coord, n_ppoints=3, min_ppoints=3, max_ppoints=1
 
     import numpy as np
     import sys
+    from scipy.spatial import cKDTree
 
     # check that n_ppoints is within range
     if n_ppoints < min_ppoints or n_ppoints > max_ppoints:
@@ -97,31 +108,50 @@ def par2fac_idw2(pp_coord, node_coord, n_ppoints=3, min_ppoints=3, max_ppoints=1
         print(f'  Exiting...')
         sys.exit()
 
-    ppoints, weights = [], []
-    for node in node_coord:
-        #  calculate distance from node to each pilot point
-        dist = np.sqrt((pp_coord[:, 0] - node[0]) ** 2 + (pp_coord[:, 1] - node[1]) ** 2)
-
-        dist_sort = np.sort(dist)                           # sort by distance
-        dist_sort_index = np.argsort(dist)                  # get indices of sorted distances
-
-        pp, wgt, wgt_sum = [], [], 0
-        for n in range(n_ppoints):
-            pp.append(dist_sort_index[n])                   # pilot point
-            wgt.append(1 / dist_sort[n] ** 2)               # inverse distance squared weighting factor
-            wgt_sum += wgt[n]                               # sum of weighting factors
-
-        for n in range(n_ppoints):
-            wgt[n] /= wgt_sum                               # normalize weighting factors
-
-        ppoints.append(pp)                                  # assemble pilot points
-        weights.append(wgt)                                 # assemble weights
+    pp_coord = np.asarray(pp_coord, dtype=float)
+    node_coord = np.asarray(node_coord, dtype=float).reshape(-1, 2)
+    n_pp = len(pp_coord)
+    if n_ppoints > n_pp:
+        print(f'  Error: n_ppoints = {n_ppoints} is more than the {n_pp} pilot points')
+        print(f'  Exiting...')
+        sys.exit()
 
+    upper = np.inf if search_radius is None else float(search_radius)
+    dist, index = cKDTree(pp_coord).query(node_coord, k=n_ppoints, distance_upper_bound=upper)
+    dist = dist.reshape(len(node_coord), n_ppoints)        # k=1 returns 1D arrays
+    index = index.reshape(len(node_coord), n_ppoints)
+    found = index < n_pp                                   # False beyond search_radius
+
+    # inverse distance squared weighting factors, normalized for each node
+    with np.errstate(divide='ignore'):
+        wgt = np.where(found, 1.0 / dist ** 2, 0.0)
+    coincident = found & (dist == 0.0)
+    on_pp = coincident.any(axis=1)
+    wgt[on_pp] = coincident[on_pp]
+    wgt_sum = wgt.sum(axis=1, keepdims=True)
+    wgt = np.divide(wgt, wgt_sum, out=np.zeros_like(wgt), where=wgt_sum > 0)
+
+    if verbose:
+        n_short = int((found.sum(axis=1) < n_ppoints).sum())
+        if n_short:
+            print(f'  {n_short:,} nodes have fewer than {n_ppoints} pilot points within {search_radius}')
+
+    if found.all():
+        return index.tolist(), wgt.tolist()
+
+    # drop pilot points beyond search_radius
+    ppoints = [idx[ok].tolist() for idx, ok in zip(index, found)]
+    weights = [w[ok].tolist() for w, ok in zip(wgt, found)]
     return ppoints, weights
 
 
-def write_factors(factors_outfile, pp_file, pp_list, node_list, ppoints, weights, verbose):
-    """ write_factors() - Write pilot point factors to output file (hard-wired for 3 ppoints).
+def write_factors(factors_outfile, pp_file, pp_list, node_list, ppoints, weights, verbose,
+                  one_line=False):
+    """ write_factors() - Write pilot point factors to output file.
+
+    Each node record lists the number of pilot points and the first
+    pilot point and weight, followed by a line with the remaining pairs
+    (or all on one line with one_line=True, as read by fac2iwfm).
     
     Parameters
     ----------
@@ -138,44 +168,49 @@ def write_factors(factors_outfile, pp_file, pp_list, node_list, ppoints, weights
         List of node IDs.
         
     ppoints : list
-        List of pilot points for each node.
+        List of pilot points for each node (0-indexed), any number per node.
         
     weights : list
         List of pilot point weights for each node.
         
     verbose : bool, default=False
         Turn command-line output on or off
+
+    one_line : bool, default=False
+        Write each node record on a single line
         
     Returns
     -------
     count : int
         Number of factors written to output file.
         """
-    import iwfm
 
     count = 0
+    lines = [f'{pp_file}\n',
+             f'{str(len(node_list)).rjust(12)}\n',    # right-justify to 12 chars
+             f'{str(len(pp_list)).rjust(12)}\n']      # right-justify to 12 chars
+    lines.extend(f'{pp}\n' for pp in pp_list)
+
+    for i in range(len(node_list)):
+        node = f'{str(node_list[i]).rjust(12)}'        # right-justify to 12 chars
+
+        # pilot point (1-indexed) and weight pairs, right-justified to 11 chars
+        pairs = [f'{str(pp + 1).rjust(11)} {str(w).rjust(11)}'
+                 for pp, w in zip(ppoints[i], weights[i])]
+        npp = str(len(pairs)).rjust(11)
+
+        first = pairs[0] if pairs else ''
+        if one_line:
+            first = ' '.join(pairs)
+        lines.append(f'{node}           1 {npp}  0.0000000E+00{first}\n')
+        if len(pairs) > 1 and not one_line:
+            lines.append(' '.join(pairs[1:]) + '\n')
+
+        count += 1
 
     with open(factors_outfile, 'w') as f:
-        f.write(f'{pp_file}\n')
-        f.write(f'{str(len(node_list)).rjust(12)}\n')  # right-justify to 12 chars
-        f.write(f'{str(len(pp_list)).rjust(12)}\n')  # right-justify to 12 chars
-        for i in range(len(pp_list)):
-            f.write(f'{pp_list[i]}\n')
-
-        for i in range(len(node_list)):
-            node = f'{str(node_list[i]).rjust(12)}'  # right-justify to 12 chars
-
-            pp1  = f'{str(ppoints[i][0]+1).rjust(11)}'  # right-justify to 11 chars
-            pp2  = f'{str(ppoints[i][1]+1).rjust(11)}'  # right-justify to 11 chars
-            pp3  = f'{str(ppoints[i][2]+1).rjust(11)}'  # right-justify to 11 chars
-
-            w1   = f'{str(weights[i][0]).rjust(11)}'  # right-justify to 11 chars
-            w2   = f'{str(weights[i][1]).rjust(11)}'  # right-justify to 11 chars
-            w3   = f'{str(weights[i][2]).rjust(11)}'  # right-justify to 11 chars
-
-            f.write(f'{node}           1           3  0.0000000E+00{pp1} {w1}\n{pp2} {w2} {pp3} {w3}\n')
-            
-            count += 1
+        f.writelines(lines)
+
     return count
 
 
@@ -194,11 +229,16 @@ if __name__ == '__main__':
         pp_file          = sys.argv[1]
         node_file        = sys.argv[2]
         factors_outfile  = sys.argv[3]
+        n_ppoints        = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+        search_radius    = float(sys.argv[5]) if len(sys.argv) > 5 else None
 
     else:  # ask for file names from command lline
         pp_file          = input('Pilot points file name: ')
         node_file        = input('IWFM Node.dat file name: ')
         factors_outfile  = input('Factors output file name: ')
+        n_ppoints        = int(input('Number of pilot points per node [3]: ') or 3)
+        search_radius    = input('Search radius [none]: ')
+        search_radius    = float(search_radius) if search_radius else None
 
     iwfm.file_test(pp_file)
     iwfm.file_test(node_file)
@@ -216,7 +256,8 @@ if __name__ == '__main__':
     if verbose: print(f' Read {len(node_list):,} nodes from {node_file}')
 
     #  determine pilot points and weights for each node
-    ppoints, weights = par2fac_idw2(pp_coord, node_coord, verbose=verbose)
+    ppoints, weights = par2fac_idw2(pp_coord, node_coord, n_ppoints=n_ppoints,
+                                    search_radius=search_radius, verbose=verbose)
 
     #  write pilot points and factors to output file
     count = write_factors(factors_outfile, pp_file, pp_list, node_list, ppoints, weights, verbose=verbose)
@@ -19,6 +19,98 @@
 # -----------------------------------------------------------------------------
 
 
+OVERWRITE_FMT = '\t%d\t%d\t%.4f\t%.3E\t%.3f\t%.3E\t%.4f\t%.3E\t%.3E\n'
+
+
+def overwrite_header(in_lines, nwrite, fp, ctime=None):
+    '''  overwrite_header() - build the lines of an IWFM-2015 overwrite file
+         that come before the parameter values, from the template lines
+
+    Parameters
+    ----------
+    in_lines : list
+        each item is one line from the existing (template) overwrite file
+
+    nwrite : int
+        Number of parameter lines
+
+    fp : list
+        Multiplier factors
+
+    ctime : str, default=None
+        Time step in DSS format, None keeps the template value
+
+    Returns
+    -------
+    header : str
+        Header text, ending with a newline
+
+    '''
+    out, line_index = [], 0
+
+    def copy_comments():
+        nonlocal line_index
+        while in_lines[line_index][0] == 'C':           # write comment lines
+            out.append(f'{in_lines[line_index]}\n')
+            line_index += 1
+
+    copy_comments()
+    out.append(f'    {nwrite}                       / NWRITE\n')   # number of parameter lines
+    line_index += 1
+
+    copy_comments()
+    out.append(f'\t{fp[0]}\t{fp[1]}\t{fp[2]}\t{fp[3]}\t{fp[4]}\t{fp[5]}\t{fp[6]}\n')  # factors
+    line_index += 1
+
+    copy_comments()
+    if ctime is None:
+        ctime = in_lines[line_index].split()[0]
+    out.append(f'    {ctime}               / TUNITKH\n')            # time units
+    line_index += 1
+    for i in range(0,2):                                # write remaining DSS time units
+        out.append(f'{in_lines[line_index]}\n')
+        line_index += 1
+
+    copy_comments()
+    return ''.join(out)
+# --------------------------------------------------------------------------------
+
+
+def format_overwrite_values(nodes, parvals):
+    '''  format_overwrite_values() - format parameter values as the data lines
+         of an IWFM-2015 overwrite file, one line per node and layer
+
+    Parameters
+    ----------
+    nodes : array-like
+        Node numbers, shape (nnode,), or one row per layer (nlay, nnode)
+
+    parvals : array-like
+        Parameter values, shape (7, nlay, nnode). Values <= 0 are written as -1
+
+    Returns
+    -------
+    text : str
+        Formatted lines
+
+    '''
+    import numpy as np
+
+    parvals = np.asarray(parvals, dtype=float)
+    ntype, nlay, nnode = parvals.shape
+    nodes = np.broadcast_to(np.asarray(nodes, dtype=float), (nlay, nnode))
+
+    table = np.empty((nnode, nlay, 9))                  # node-major, then layer
+    table[:, :, 0] = nodes.T
+    table[:, :, 1] = np.arange(1, nlay + 1)
+    with np.errstate(invalid='ignore'):
+        table[:, :, 2:] = np.where(parvals > 0, parvals, -1.0).transpose(2, 1, 0)
+
+    # one formatting operation for the whole block
+    return (OVERWRITE_FMT * (nnode * nlay)) % tuple(table.ravel().tolist())
+# --------------------------------------------------------------------------------
+
+
 def write_overwrite_file(overwrite_file, in_lines, parnodes, nlay, parvals, fp, ctime, verbose=False):
     '''  write_overwrite_file() - receive a list of parameters and write them to 
          an IWFM-2015 overwrite file    
@@ -52,52 +144,13 @@ def write_overwrite_file(overwrite_file, in_lines, parnodes, nlay, parvals, fp,
         Print to screen?
 
     '''
+    nnode = len(parnodes[0][0])
+    nodes = [parnodes[0][l][:nnode] for l in range(0, nlay)]
+    parvals = [[parvals[t][l][:nnode] for l in range(0, nlay)] for t in range(0, 7)]
 
-    line_index = 0
     with open(overwrite_file, 'w') as f:
-
-        while in_lines[line_index][0] == 'C':           # write comment lines
-            f.write(f'{in_lines[line_index]}\n')
-            line_index += 1 
-
-        # write number of parameter lines
-        f.write(f'    {len(parnodes[0][0] * nlay)}                       / NWRITE\n')
-        line_index += 1
-
-        while in_lines[line_index][0] == 'C':           # write comment lines
-            f.write(f'{in_lines[line_index]}\n')
-            line_index += 1 
-
-        # write factors
-        f.write(f'\t{fp[0]}\t{fp[1]}\t{fp[2]}\t{fp[3]}\t{fp[4]}\t{fp[5]}\t{fp[6]}\n')
-        line_index += 1
-
-        while in_lines[line_index][0] == 'C':           # write comment lines
-            f.write(f'{in_lines[line_index]}\n')
-            line_index += 1 
-
-        # write time units
-        f.write(f'    {ctime}               / TUNITKH\n')
-        line_index += 1
-        for i in range(0,2):                            # write remaining DSS time units
-            f.write(f'{in_lines[line_index]}\n')
-            line_index += 1 
-
-        while in_lines[line_index][0] == 'C':           # write comment lines
-            f.write(f'{in_lines[line_index]}\n')
-            line_index += 1 
-
-        for n in range(0, len(parnodes[0][1])):         # cycle through nodes
-            for l in range(0, nlay):                    # cycle through layers
-                pkh = parvals[0][l][n] if parvals[0][l][n] > 0 else -1
-                ps  = parvals[1][l][n] if parvals[1][l][n] > 0 else -1
-                pn  = parvals[2][l][n] if parvals[2][l][n] > 0 else -1
-                pv  = parvals[3][l][n] if parvals[3][l][n] > 0 else -1
-                pl  = parvals[4][l][n] if parvals[4][l][n] > 0 else -1
-                sce = parvals[5][l][n] if parvals[5][l][n] > 0 else -1
-                sci = parvals[6][l][n] if parvals[6][l][n] > 0 else -1
-
-                f.write(f'\t{parnodes[0][l][n]}\t{l+1}\t{pkh:.4f}\t{ps:.3E}\t{pn:.3f}\t{pv:.3E}\t{pl:.4f}\t{sce:.3E}\t{sci:.3E}\n')
+        f.write(overwrite_header(in_lines, nnode * nlay, fp, ctime))
+        f.write(format_overwrite_values(nodes, parvals))
 
     return
 # --------------------------------------------------------------------------------
@@ -252,7 +305,7 @@ def real2iwfm(verbose=False):
                 layer_vals, layer_nodes = [], []
                 if param_file == 'none':
                     layer_vals = [-1.0] * nnodes
-                    pnodes.append(list(range(1,nnodes+1)))
+                    layer_nodes = list(range(1,nnodes+1))
 
                 else:
                     iwfm.file_test(param_file)
@@ -287,6 +340,113 @@ def real2iwfm(verbose=False):
 # --------------------------------------------------------------------------------
 
 
+def _render_realization(args):
+    ''' _render_realization() - write one overwrite file from a parameter
+        array or a .npy file holding one '''
+    import numpy as np
+
+    output_file, header, nodes, values = args
+    if isinstance(values, str):
+        values = np.load(values)
+    values = np.asarray(values, dtype=float)
+    if values.shape[0] < 7:                             # missing types are not overwritten
+        values = np.concatenate([values, np.full((7 - values.shape[0],) + values.shape[1:], -1.0)])
+
+    with open(output_file, 'w') as f:
+        f.write(header)
+        f.write(format_overwrite_values(nodes, values))
+    return output_file
+# --------------------------------------------------------------------------------
+
+
+def real2iwfm_batch(overwrite_file, realizations, output, ctime=None, nodes=None, workers=1,
+                    verbose=False):
+    '''  real2iwfm_batch() - write one IWFM-2015 overwrite file for each of
+         many parameter realizations
+
+         The template overwrite file is read once, and the overwrite files
+         are rendered by a pool of worker processes.
+
+    Parameters
+    ----------
+    overwrite_file : str
+        Existing (template) overwrite file name
+
+    realizations : numpy array or str
+        Parameter values with shape (nreal, nparam, nlay, nnode), in the
+        parameter type order PKH, PS, PN, PV, PL, SCE, SCI (types after
+        nparam are written as -1), or a directory of .npy files that each
+        hold one (nparam, nlay, nnode) realization
+
+    output : list or str
+        Output file name for each realization, or a directory to write
+        <name>.dat files to, where name is the .npy file name or
+        real<number> for arrays
+
+    ctime : str, default=None
+        Parameter time-step units, None keeps the template value
+
+    nodes : array-like, default=None
+        Node numbers, None uses 1 to nnode
+
+    workers : int, default=1
+        Number of worker processes
+
+    verbose : bool, default=False
+        Print to screen?
+
+    Returns
+    -------
+    output_files : list
+        Names of the overwrite files written
+
+    '''
+    import os
+    import numpy as np
+
+    if isinstance(realizations, str):
+        names = sorted(n for n in os.listdir(realizations) if n.endswith('.npy'))
+        if not names:
+            raise ValueError(f'No .npy realization files in {realizations}')
+        sources = [os.path.join(realizations, n) for n in names]
+        names = [os.path.splitext(n)[0] for n in names]
+        shape = np.load(sources[0], mmap_mode='r').shape
+    else:
+        sources = np.asarray(realizations, dtype=float)
+        if sources.ndim != 4:
+            raise ValueError(f'realizations must have shape (nreal, nparam, nlay, nnode), not {sources.shape}')
+        names = [f'real{i + 1}' for i in range(len(sources))]
+        shape = sources.shape[1:]
+
+    nparam, nlay, nnode = shape
+    if nparam > 7:
+        raise ValueError(f'At most 7 parameter types, got {nparam}')
+
+    if isinstance(output, str):
+        os.makedirs(output, exist_ok=True)
+        output = [os.path.join(output, f'{name}.dat') for name in names]
+    if len(output) != len(sources):
+        raise ValueError(f'{len(output)} output files for {len(sources)} realizations')
+
+    _, factors, _, in_lines = read_overwrite_file(overwrite_file, nnode, nlay, None, verbose)
+    header = overwrite_header(in_lines, nnode * nlay, factors, ctime)
+    if nodes is None:
+        nodes = np.arange(1, nnode + 1)
+
+    tasks = [(name, header, nodes, values) for name, values in zip(output, sources)]
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            output_files = list(pool.map(_render_realization, tasks))
+    else:
+        output_files = [_render_realization(task) for task in tasks]
+
+    if verbose:
+        print(f' Wrote {len(output_files):,} overwrite files')
+    return output_files
+# --------------------------------------------------------------------------------
+
+
 if __name__ == "__main__":
     ''' Run real2iwfm() from command line '''
     import iwfm.debug as idb
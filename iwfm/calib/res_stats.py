@@ -20,6 +20,7 @@
 
 import iwfm
 import iwfm.calib as icalib
+from iwfm.calib.residual_stats import residual_stats_by
 
 
 def res_stats(pest_smp_file, gwhyd_info_file, gwhyd_file, verbose=False):
@@ -70,66 +71,22 @@ def res_stats(pest_smp_file, gwhyd_info_file, gwhyd_file, verbose=False):
         print(f'  Read {len(simhyd.sim_vals):,} simulated values from {gwhyd_file}')
         print(f'  simhyd.sim_vals[0][0:3]: {simhyd.sim_vals[0][0:3]}\n')
 
-    # == cycle through the list of wells in pest_obs to calculate rmse & bias
-    # -- initialize
-    i = 1
-    dates, meas, sim = [], [], []
-    well_names, rmse_values, bias_values, sim_all = [], [], [], []
-    meas_all, count, dates, meas = [], [], [], []
-
-    name, date = head_obs[0][0], head_obs[0][1]
-    print(f' => name: {name},\tdate: {date}\tmeas: {head_obs[0][3]}')
-    dates.append(date)
-    meas.append(head_obs[0][3])
-
-    # use hyd_dict to find the column no for this obs well in simhyd_obs
-    simhyd_col = int(hyd_dict.get(name).column)
-    print(f' => simhyd_col: {simhyd_col}')
-
-    # calculate the simulated value for this observation
-    print(f'  simhyd.sim_head({date},{simhyd_col}): {simhyd.sim_head(date,simhyd_col)}')
-    sim.append(simhyd.sim_head(date,simhyd_col))    
-
-    # move through the file
-    j = 1
-    while j < len(head_obs):
-        new_name = head_obs[j][0]
-        if new_name != name:  # new well name, finalize info for the last well
-            # calculate rmse and bias
-            well_names.append(name)
-            rmse = icalib.rmse_calc(sim,meas)
-            bias = icalib.bias_calc(sim,meas)
-            rmse_values.append(rmse)
-            bias_values.append(bias)
-            count.append(len(meas))
-
-            dates, meas, sim = [], [], [] # re-initialize for next observation well
-
-            # find next well from head_obs that is in hyd_dict
-            while new_name not in hyd_dict:
-                j += 1
-                new_name = head_obs[j][0]
-            name = new_name
-            simhyd_col = (hyd_dict.get(name).column)
-
-        date = head_obs[j][1]
-        dates.append(date)
-
-        simulated = simhyd.sim_head(date,simhyd_col)  # Fixed: was simhyd_obs (typo)
-        sim.append(simulated)
-        sim_all.append(simulated)
-
-        measured = head_obs[j][3]
-        meas.append(measured)
+    # == simulated equivalent of each observation at a well in hyd_dict
+    names_all, sim_all, meas_all = [], [], []
+    for name, date, _, measured in (obs[:4] for obs in head_obs):
+        if name not in hyd_dict:
+            continue
+        names_all.append(name)
+        sim_all.append(simhyd.sim_head(date, int(hyd_dict.get(name).column)))
         meas_all.append(measured)
 
-        j += 1
-
-    # calculate final one
-    rmse_values.append(icalib.rmse_calc(sim,meas))
-    well_names.append(name)
-    bias_values.append(icalib.bias_calc(sim,meas))
-    count.append(len(meas))
+    # == rmse and bias of each well and of all observations in one group-by pass
+    stats = residual_stats_by({'name': names_all, 'observed': meas_all, 'simulated': sim_all},
+                              {'well': 'name'}, overall=True)
+    well_names = stats['well']['name'].to_list()
+    rmse_values = stats['well']['rmse'].to_list()
+    bias_values = stats['well']['bias'].to_list()
+    count = stats['well']['count'].to_list()
 
     # write out results
     out_file = gwhyd_file.replace('.out','_rmse.txt')
@@ -140,7 +97,7 @@ def res_stats(pest_smp_file, gwhyd_info_file, gwhyd_file, verbose=False):
 
     out_file = gwhyd_file.replace('.out','_rmse_all.txt')
     with open(out_file,'w') as of:
-        of.write('{}\t{}\t{}\n'.format(out_file,icalib.rmse_calc(sim_all,meas_all),icalib.bias_calc(sim_all,meas_all)))
+        of.write('{}\t{}\t{}\n'.format(out_file,stats['overall']['rmse'][0],stats['overall']['bias'][0]))
     if verbose:
         print(f'  Wrote {out_file}')
     return
@@ -0,0 +1,165 @@
+# residual_stats.py
+# Goodness-of-fit statistics of simulated and observed values per site,
+# group, layer or other grouping, calculated with polars group-by
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+STATS = ('count', 'mean', 'bias', 'rmse', 'std', 'nse', 'kge', 'r2')
+
+
+def _import_polars():
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError('Residual statistics require the polars module. '
+                          'Install with: pip install polars')
+    return pl
+
+
+def _stat_exprs(pl, observed, simulated, residual):
+    ''' _stat_exprs() - polars aggregation expressions for STATS '''
+    obs = pl.col(observed)
+    res = pl.col(residual)
+    r = pl.corr(observed, simulated).fill_nan(None)
+    variance = ((obs - obs.mean()) ** 2).sum()
+    alpha = pl.col(simulated).std() / obs.std()
+    beta = pl.col(simulated).mean() / obs.mean()
+    return [
+        pl.len().alias('count'),
+        obs.mean().alias('mean'),
+        res.mean().alias('bias'),
+        (res * res).mean().sqrt().alias('rmse'),
+        obs.std(ddof=1).alias('std'),
+        pl.when(variance > 0).then(1.0 - (res * res).sum() / variance).alias('nse'),
+        (1.0 - ((r - 1.0) ** 2 + (alpha - 1.0) ** 2 + (beta - 1.0) ** 2).sqrt()).alias('kge'),
+        (r * r).alias('r2'),
+    ]
+
+
+def _prepare(pl, data, observed, simulated, residual):
+    ''' _prepare() - lazy frame with observed, simulated and residual columns.
+        Residuals are simulated - observed, so a residual column without
+        simulated values gives simulated = observed + residual. PEST residuals
+        (measured - modelled) have the opposite sign. '''
+    if isinstance(data, pl.LazyFrame):
+        lf = data
+    elif isinstance(data, pl.DataFrame):
+        lf = data.lazy()
+    else:
+        lf = pl.DataFrame(data).lazy()
+
+    columns = lf.collect_schema().names()
+    if residual is None:
+        residual = '_residual'
+        lf = lf.with_columns((pl.col(simulated) - pl.col(observed)).alias(residual))
+    elif simulated not in columns:
+        lf = lf.with_columns((pl.col(observed) + pl.col(residual)).alias(simulated))
+    return lf, residual
+
+
+def residual_stats(data, by=None, observed='observed', simulated='simulated', residual=None,
+                   extra=None):
+    ''' residual_stats() - Calculate goodness-of-fit statistics of simulated
+        and observed values for each group of rows, or for all rows
+
+    Statistics (columns of the result):
+        count : number of values
+        mean  : mean observed value
+        bias  : mean residual
+        rmse  : root mean squared residual
+        std   : standard deviation of observed values (n-1)
+        nse   : Nash-Sutcliffe efficiency
+        kge   : Kling-Gupta efficiency
+        r2    : squared correlation of simulated and observed values
+    Statistics that are undefined for a group (e.g. std of one value) are null.
+
+    Parameters
+    ----------
+    data : polars DataFrame, LazyFrame or dict of columns
+        Observations, one row per value
+
+    by : str or list, default=None
+        Column(s) to group by. None calculates statistics of all rows
+
+    observed : str, default='observed'
+        Observed values column
+
+    simulated : str, default='simulated'
+        Simulated values column. If it is missing and residual is given,
+        simulated = observed + residual
+
+    residual : str, default=None
+        Residual column as simulated - observed, the negative of a PEST
+        residual. None uses simulated - observed
+
+    extra : list, default=None
+        Additional polars aggregation expressions, e.g.
+        [pl.col('group').last()]
+
+    Returns
+    -------
+    stats : polars DataFrame
+        Grouping columns, in order of first appearance, followed by STATS
+
+    '''
+    return residual_stats_by(data, {'stats': by}, observed=observed, simulated=simulated,
+                             residual=residual, extra=extra)['stats']
+
+
+def residual_stats_by(data, groupings, observed='observed', simulated='simulated', residual=None,
+                      extra=None, overall=False):
+    ''' residual_stats_by() - Calculate residual_stats() for several groupings
+        of the same data, e.g. per site, per group and per layer, in one
+        parallel polars query
+
+    Parameters
+    ----------
+    data : polars DataFrame, LazyFrame or dict of columns
+        Observations, one row per value
+
+    groupings : dict
+        key = name of the result, value = column(s) to group by, or None
+        for all rows
+
+    observed, simulated, residual, extra :
+        As for residual_stats()
+
+    overall : bool, default=False
+        Also return statistics of all rows with key 'overall'
+
+    Returns
+    -------
+    stats : dict
+        key = grouping name, value = polars DataFrame from residual_stats()
+
+    '''
+    pl = _import_polars()
+
+    lf, residual = _prepare(pl, data, observed, simulated, residual)
+    exprs = _stat_exprs(pl, observed, simulated, residual) + list(extra or [])
+
+    groupings = dict(groupings)
+    if overall:
+        groupings['overall'] = None
+
+    queries = []
+    for by in groupings.values():
+        if by is None:
+            queries.append(lf.select(exprs))
+        else:
+            queries.append(lf.group_by(by, maintain_order=True).agg(exprs))
+
+    return dict(zip(groupings, pl.collect_all(queries)))
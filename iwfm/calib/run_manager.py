@@ -0,0 +1,364 @@
+# run_manager.py
+# Run a model for many parameter sets in parallel in local copies of a
+# template model directory
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+from iwfm.debug.logger_setup import logger
+
+SUMMARY_COLUMNS = ('run', 'slot', 'returncode', 'wall_time', 'exe_time', 'error')
+
+FICLONE = 0x40049409    # Linux ioctl for copy-on-write file clones
+
+_slot = None            # slot directory of a worker process
+
+
+def _copy_file(src, dst):
+    ''' _copy_file() - Copy a file as a copy-on-write clone (reflink) where
+        the file system supports it, otherwise as a regular copy '''
+    import shutil
+
+    try:
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+    except (ImportError, OSError):
+        shutil.copy2(src, dst)
+
+
+def clone_template(template_dir, slot_dir, link=None):
+    ''' clone_template() - Make a copy of a template model directory, with
+        hard links to read-only files
+
+    Files matching the link patterns are hard links to the template files.
+    A write to a hard-linked file changes the template and every other
+    slot, so only files that no run writes (executables, static input
+    files) should be linked. Other files are copied, as copy-on-write
+    clones on file systems that support them (btrfs, XFS). Files that
+    cannot be linked (e.g. on another file system) are copied.
+
+    Parameters
+    ----------
+    template_dir : str
+        Template model directory
+
+    slot_dir : str
+        New directory, replaced if it exists
+
+    link : list of str, default=None
+        Glob patterns of file paths relative to template_dir (e.g.
+        'Simulation/*.dat', or '*' for all files) to hard-link. None copies
+        all files
+
+    Returns
+    -------
+    nlinked : int
+        Number of files linked
+
+    ncopied : int
+        Number of files copied
+
+    '''
+    import os
+    import shutil
+    from fnmatch import fnmatch
+
+    link = list(link or [])
+    if os.path.exists(slot_dir):
+        shutil.rmtree(slot_dir)
+
+    nlinked, ncopied = 0, 0
+    for root, dirs, files in os.walk(template_dir):
+        rel_root = os.path.relpath(root, template_dir)
+        os.makedirs(os.path.join(slot_dir, rel_root), exist_ok=True)
+        for name in files:
+            rel = os.path.normpath(os.path.join(rel_root, name))
+            src, dst = os.path.join(root, name), os.path.join(slot_dir, rel)
+            if any(fnmatch(rel, pattern) for pattern in link):
+                try:
+                    os.link(src, dst)
+                    nlinked += 1
+                    continue
+                except OSError:
+                    pass
+            _copy_file(src, dst)
+            ncopied += 1
+    return nlinked, ncopied
+
+
+def _init_worker(slots):
+    ''' _init_worker() - Give a pool worker process its own slot directory '''
+    global _slot
+    _slot = slots.get()
+
+
+def _close_slot_hdf(slot):
+    ''' _close_slot_hdf() - Close the pooled HDF5 handles of files in the
+        slot directory, leaving other pooled files open '''
+    import os
+    from iwfm.hdf5 import hdf_pool
+
+    root = os.path.join(os.path.abspath(slot), '')
+    for path in hdf_pool.pool_info()['open_files']:
+        if path.startswith(root):
+            hdf_pool.close_file(path)
+
+
+def _run_one(args):
+    ''' _run_one() - Run the model for one parameter set in the slot of
+        this process
+
+    Parameters
+    ----------
+    args : tuple
+        (run, params, command, param_file, pre, post, timeout, messages_file)
+
+    Returns
+    -------
+    result : dict
+        run, slot, returncode, wall_time, exe_time, error and the value
+        returned by post in 'output'
+
+    '''
+    import os
+    import shutil
+    import subprocess
+    import time
+    from iwfm.calib.iwfm_exe_time import iwfm_exe_time
+
+    run, params, command, param_file, pre, post, timeout, messages_file = args
+    slot = _slot
+    result = {'run': run, 'slot': slot, 'returncode': None, 'wall_time': None,
+              'exe_time': None, 'error': None, 'output': None}
+
+    try:
+        if param_file is not None:
+            dst = os.path.join(slot, param_file)
+            if os.path.exists(dst):
+                os.remove(dst)              # never write through a hard link
+            shutil.copyfile(params, dst)
+        if pre is not None:
+            pre(slot, params)
+
+        env = dict(os.environ, IWFM_RUN=str(run))
+        start = time.perf_counter()
+        with open(os.path.join(slot, 'run_manager.log'), 'w') as log:
+            proc = subprocess.run(command, cwd=slot, shell=isinstance(command, str), env=env,
+                                  stdout=log, stderr=subprocess.STDOUT, timeout=timeout)
+        result['wall_time'] = time.perf_counter() - start
+        result['returncode'] = proc.returncode
+
+        messages = os.path.join(slot, messages_file)
+        if os.path.isfile(messages):
+            exe_time = iwfm_exe_time(messages, os.path.join(slot, 'exe_time.smp'))
+            result['exe_time'] = None if exe_time == -999.0 else exe_time
+
+        if proc.returncode != 0:
+            result['error'] = f'command returned {proc.returncode}'
+        elif post is not None:
+            try:
+                result['output'] = post(slot, params)
+            finally:
+                _close_slot_hdf(slot)       # the next run overwrites HDF5 files in the slot
+    except subprocess.TimeoutExpired:
+        result['error'] = f'timed out after {timeout} seconds'
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+
+    return result
+
+
+def write_run_summary(summary_file, results):
+    ''' write_run_summary() - Write run number, slot, return code and times
+        of each run to a tab-separated file
+
+    Parameters
+    ----------
+    summary_file : str
+        Output file name
+
+    results : list of dict
+        Results from run_manager()
+
+    Returns
+    -------
+    nothing
+
+    '''
+    import os
+
+    with open(summary_file, 'w') as f:
+        f.write('\t'.join(SUMMARY_COLUMNS) + '\n')
+        for r in results:
+            row = [r['run'], os.path.basename(r['slot']), r['returncode'],
+                   '' if r['wall_time'] is None else f"{r['wall_time']:.3f}",
+                   '' if r['exe_time'] is None else r['exe_time'], r['error'] or '']
+            f.write('\t'.join('' if v is None else str(v) for v in row) + '\n')
+
+
+def run_manager(template_dir, work_dir, command, param_sets, workers=None, param_file=None,
+                pre=None, post=None, link=None, timeout=None,
+                messages_file='SimulationMessages.out', summary_file=None, verbose=False):
+    ''' run_manager() - Run a model for many parameter sets in parallel
+
+    The template model directory is cloned into one slot directory per
+    worker with clone_template(). Each worker process keeps its slot and
+    runs the parameter sets given to it, one at a time:
+        1. copy the parameter set to param_file in the slot, if given
+        2. call pre(slot, params), e.g. to write parameters with fac2iwfm()
+           or real2iwfm()
+        3. run command in the slot (environment variable IWFM_RUN = run number)
+        4. read the model run time from messages_file with iwfm_exe_time()
+        5. call post(slot, params), e.g. iwfm2obs() or smp_read(), and
+           keep its return value, then close HDF5 files in the slot that
+           post left open in the pool of iwfm.hdf5
+    A failed run is recorded in its result and does not stop the others.
+
+    Parameters
+    ----------
+    template_dir : str
+        Template model directory, without results of previous runs
+
+    work_dir : str
+        Directory for the slot directories slot_0, slot_1, ...
+
+    command : str or list
+        Model command, run with the slot as working directory. A str is
+        run through the shell
+
+    param_sets : list
+        Parameter sets, one per run. File names when param_file is given,
+        otherwise anything pre() accepts
+
+    workers : int, default=None
+        Number of worker processes and slots. None uses the number of CPUs
+
+    param_file : str, default=None
+        Path in the slot to copy each parameter set file to
+
+    pre, post : functions, default=None
+        Called as f(slot_dir, params) before and after each run. They must
+        be module-level functions so they can be sent to worker processes
+
+    link : list of str, default=None
+        Glob patterns of read-only template files to hard-link instead of
+        copy, see clone_template()
+
+    timeout : float, default=None
+        Maximum seconds for each model run
+
+    messages_file : str, default='SimulationMessages.out'
+        IWFM simulation messages file in the slot, for the model run time
+
+    summary_file : str, default=None
+        Write a table of run times with write_run_summary()
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    results : list of dict
+        One per parameter set, in order, with keys run, slot, returncode,
+        wall_time (seconds), exe_time (seconds reported by the model, or
+        None), error (None for a successful run) and output (from post)
+
+    '''
+    import os
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _slot
+
+    param_sets = list(param_sets)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    nslots = max(1, min(workers, len(param_sets)))
+
+    os.makedirs(work_dir, exist_ok=True)
+    slots = [os.path.abspath(os.path.join(work_dir, f'slot_{i}')) for i in range(nslots)]
+    for slot in slots:
+        clone_template(template_dir, slot, link=link)
+    if verbose:
+        print(f'  Cloned {template_dir} into {nslots} slots in {work_dir}')
+
+    tasks = [(run, params, command, param_file, pre, post, timeout, messages_file)
+             for run, params in enumerate(param_sets)]
+
+    if nslots > 1:
+        with multiprocessing.Manager() as manager:
+            queue = manager.Queue()
+            for slot in slots:
+                queue.put(slot)
+            with ProcessPoolExecutor(max_workers=nslots, initializer=_init_worker,
+                                     initargs=(queue,)) as pool:
+                results = list(pool.map(_run_one, tasks))
+    else:
+        _slot = slots[0] if slots else None
+        results = [_run_one(task) for task in tasks]
+
+    nfailed = sum(r['error'] is not None for r in results)
+    logger.debug(f'run_manager: {len(results)} runs in {nslots} slots, {nfailed} failed')
+    if verbose:
+        print(f'  Completed {len(results) - nfailed:,} of {len(results):,} runs')
+
+    if summary_file is not None:
+        write_run_summary(summary_file, results)
+
+    return results
+
+
+if __name__ == '__main__':
+    ''' Run run_manager() from command line '''
+    import os
+    import sys
+    import glob
+    import iwfm.debug as idb
+    from iwfm.debug import parse_cli_flags
+
+    verbose, debug = parse_cli_flags()
+
+    if len(sys.argv) > 1:  # arguments are listed on the command line
+        template_dir = sys.argv[1]
+        work_dir     = sys.argv[2]
+        param_glob   = sys.argv[3]
+        param_file   = sys.argv[4]
+        command      = sys.argv[5]
+        workers      = int(sys.argv[6]) if len(sys.argv) > 6 else None
+    else:  # ask for file names from terminal
+        template_dir = input('Template model directory: ')
+        work_dir     = input('Working directory for model slots: ')
+        param_glob   = input('Parameter set files (wildcards allowed): ')
+        param_file   = input('Parameter file name in model directory: ')
+        command      = input('Model command: ')
+        workers      = input('Number of workers [all CPUs]: ')
+        workers      = int(workers) if workers else None
+
+    if not os.path.isdir(template_dir):
+        print(f'  Error: template directory {template_dir} not found')
+        sys.exit()
+
+    idb.exe_time()  # initialize timer
+
+    param_sets = sorted(glob.glob(param_glob))
+    summary_file = os.path.join(work_dir, 'run_summary.txt')
+    results = run_manager(template_dir, work_dir, command, param_sets, workers=workers,
+                          param_file=param_file, summary_file=summary_file, verbose=verbose)
+
+    print(f'  Ran {len(results):,} parameter sets and wrote {summary_file}')  # update cli
+
+    idb.exe_time()  # print elapsed time
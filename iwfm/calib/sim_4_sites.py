@@ -40,6 +40,7 @@ def sim_4_sites(sim_data, obs_sites):
 
     '''
     sim_data.sort( key = lambda l: (l[0], l[1]))
+    obs_sites = set(obs_sites)                                          # constant-time lookups
     sim_dates, sim_values, d, v = [], [], [], []
     old_site = sim_data[0][0]                                           # site of first data item
     for item in sim_data:
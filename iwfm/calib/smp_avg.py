@@ -47,28 +47,21 @@ def smp_avg( smp_file, verbose=False):
         smp_lines = f.read().splitlines()
     if verbose: print(f'\n  Read {len(smp_lines):,} lines from {smp_file}')
 
-    sites = []
-    # [site_name, value_sum, value_count]
-    for line in smp_lines:
-        items = line.split()
-        site_name, value = items[0], float(items[3])
+    import numpy as np
 
-        index = name_index(sites, site_name)
+    rows = [line.split() for line in smp_lines]
 
-        if len(index) == 0:
-            sites.append([site_name,items[1],value,1])
-        else:
-            sites[index[0]][2] += value
-            sites[index[0]][3] += 1
+    # index of each site in order of first appearance, then sum and count per site
+    site_index = {}
+    index = np.array([site_index.setdefault(items[0], len(site_index)) for items in rows], dtype=int)
+    values = np.array([float(items[3]) for items in rows])
+    sums = np.bincount(index, weights=values, minlength=len(site_index))
+    counts = np.bincount(index, minlength=len(site_index))
+    site_avg = (sums / np.maximum(counts, 1)).tolist()
 
     averages = []
-    for line in smp_lines:
-        items = line.split()
-        site_name = items[0]
-        index = name_index(sites, site_name)
-
-        # get average for this site
-        average = sites[index[0]][2]/sites[index[0]][3]
+    for items, i in zip(rows, index.tolist()):
+        average = site_avg[i]                                   # average for this site
 
         smp_out = str(f'{items[0].ljust(20)} {items[1]}  0:00:00 {str(round(average,4)).rjust(22)}')  # left-justify to 20 chars, right-justify to 22 chars
         averages.append(smp_out)
@@ -28,7 +28,7 @@ def process_budget(budget_file, cwidth=12):
             Name of IWFM Stream Nodes budget file
 
         cwidth : int, default = 12
-                Width of column in budget file
+                Not used, columns are located from the budget data rows
 
         Returns
         -------
@@ -41,68 +41,19 @@ def process_budget(budget_file, cwidth=12):
         dates, list
             List of dates for budget_table
     """
-    import numpy as np
-
-    with open(budget_file) as f:
-        budget_lines = f.read().splitlines()
-
-    # How many lines per table? ----------------------------------
-    table_len, header_lines, dates = 0, [], []
-    while budget_lines[table_len][0] != '-': # skip label lines
-        table_len += 1
-    table_len += 1                           # top of header
-    while budget_lines[table_len][0] != '-': # read header lines
-        header_lines.append(budget_lines[table_len])
-        table_len += 1
-    table_len += 1                           # skip line
-    header_len = table_len                   # lines to skip when reading each table
-    while len(budget_lines[table_len]) > 10:  # read times
-        dates.append(budget_lines[table_len].split()[0].replace("_24:00",""))
-        table_len += 1
-    table_len += 2                           # padding at end of each table
-
-    # Get reach numbers for tables --------------------------------
-    reach_line, reach_list = 1, []           # first reach number, accumulator
-    while reach_line < len(budget_lines) - 10:
-        reach_list.append(int(budget_lines[reach_line].split()[-1][:-1]))
-        reach_line += table_len              # skip to next one
-
-    # Find Stream-Groundwater Column Indexes ----------------------
-    i, header_indexes = 0, []
-    line = budget_lines[header_len + 3]     # get column widths
-    while i < len(line):
-        while i < len(line) and line[i] != ' ':
-            i += 1
-        header_indexes.append(i)
-        while i < len(line) and line[i] == ' ':
-            i += 1
-    # find index of each instance of 'Gain from GW' 
-    i, loc, hline = 0, [], budget_lines[3] # header line
-    while i < len(hline):
-        if hline[i:i+cwidth] == 'Gain from GW':
-            loc.append(i)
-        i += 1
-    stac_cols = []
-    for item in loc:
-        i = 0
-        while header_indexes[i] < item:
-            i += 1
-        stac_cols.append(i)
-
-    # Read budget tables' stream-gw column ---------------------------
-    budget_table, table_line = [], 0
-    while table_line < len(budget_lines):
-        table_line += header_len
-        temp = []
-        while  len(budget_lines[table_line]) > 1:
-            t, t1 = budget_lines[table_line].split(), 0
-            for i in stac_cols:
-                t1 += float(t[i])    # add inside and outside columns
-            temp.append(t1)
-            table_line += 1
-        temp = np.array(temp)        # convert temp to numpy array
-        budget_table.append(temp)
-        table_line += 2 # skip empty lines
+    from iwfm.budget_text import read_budget_geometry, budget_label_columns, iter_budget_text
+
+    # Find Stream-Groundwater Column Indexes ('Gain from GW' inside and outside model)
+    geometry = read_budget_geometry(budget_file)
+    stac_cols = budget_label_columns(geometry, 'Gain from GW', line=3)
+
+    # Read budget tables' stream-gw columns, one table at a time
+    budget_table, reach_list, dates = [], [], None
+    for lines, table_dates, values, _ in iter_budget_text(budget_file, columns=stac_cols):
+        reach_list.append(int(lines[1].split()[-1][:-1]))
+        budget_table.append(values.sum(axis=1))   # add inside and outside columns
+        if dates is None:
+            dates = [date.replace('_24:00', '') for date in table_dates.tolist()]
 
     return budget_table, reach_list, dates
 
@@ -47,9 +47,52 @@ def to_smp_ins(obs_site,obs_dt,obs_val,ts):   # put into smp and ins strings
 
     '''
 
-    import iwfm
+    smp = smp_line(obs_site, obs_dt.strftime("%m/%d/%Y"), obs_val)
+    ins = ins_line(obs_site, ts)
 
-    smp = str(f'{obs_site.ljust(20)} {obs_dt.strftime("%m/%d/%Y")}  0:00:00 {str(round(obs_val,6)).rjust(22)}')  # left-justify to 20 chars, right-justify to 22 chars
-    ins = str(f'L1  [{obs_site}_{str(ts).rjust(3, "0")}]42:70')  # right-justify to 3 chars
+    return smp, ins
 
-    return smp, ins
\ No newline at end of file
+
+def smp_line(obs_site, obs_date, obs_val):
+    ''' smp_line() - Format one observation as an smp-file line. Shared by
+        to_smp_ins() and the configuration mode of iwfm2obs() so both write
+        identical files.
+
+    Parameters
+    ----------
+    obs_site : str
+        site name
+
+    obs_date : str
+        date as mm/dd/yyyy
+
+    obs_val : float
+        simulated value
+
+    Returns
+    -------
+    smp : string
+        'obs_site             mm/dd/yyyy  0:00:00                obs_val'
+
+    '''
+    return f'{obs_site.ljust(20)} {obs_date}  0:00:00 {str(round(obs_val,6)).rjust(22)}'  # left-justify to 20 chars, right-justify to 22 chars
+
+
+def ins_line(obs_site, ts):
+    ''' ins_line() - Format one observation as an ins-file line
+
+    Parameters
+    ----------
+    obs_site : str
+        site name
+
+    ts : int
+        time step
+
+    Returns
+    -------
+    ins : string
+        'L1  [obs_site_0ts]42:70'
+
+    '''
+    return f'L1  [{obs_site}_{str(ts).rjust(3, "0")}]42:70'  # right-justify to 3 chars
\ No newline at end of file
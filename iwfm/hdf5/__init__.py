@@ -25,6 +25,9 @@ from iwfm.hdf5.hdf_metadata import HdfReader, open_hdf
 from iwfm.hdf5.hdf_metadata_base import HdfMetadata, HdfBackend
 from iwfm.hdf5.hdf_exceptions import HdfError, BackendNotAvailableError, DataSourceError
 
+# -- shared file handle pool -----------------------------
+from iwfm.hdf5.hdf_pool import close_all, close_file, pool_info, set_pool_size
+
 # -- general methods --------------------------------------
 from iwfm.hdf5.read_hdf5 import read_hdf5
 
@@ -50,7 +53,7 @@ except ImportError:
     from iwfm.hdf5.get_zbudget_data_pywfm import get_zbudget_data
 
 try:
-    from iwfm.hdf5.get_zbudget_elem_vals_h5 import get_zbudget_elem_vals
+    from iwfm.hdf5.get_zbudget_elem_vals_h5 import get_zbudget_elem_vals, get_zbudget_elem_array
 except ImportError:
     warnings.warn(
         "h5py not available, falling back to deprecated pywfm implementation. "
@@ -68,6 +71,8 @@ from iwfm.hdf5.hdf5_utils import (
     read_zone_definition,
     get_unit_labels,
     substitute_title_placeholders,
+    timestep_calendar,
+    unit_conversion_factors,
 )
 
 # -- CSV export methods -----------------------------------
@@ -84,6 +89,7 @@ from iwfm.hdf5.hdf2bud_swat import hdf2bud_swat
 from iwfm.hdf5.hdf2bud_unsat import hdf2bud_unsat
 
 # -- HDF to Excel methods ---------------------------------
+from iwfm.hdf5.budget_xlsx_writer import BudgetXlsxWriter
 from iwfm.hdf5.hdf2xlsx_diversions import hdf2xlsx_diversions
 from iwfm.hdf5.hdf2xlsx_gw import hdf2xlsx_gw
 from iwfm.hdf5.hdf2xlsx_lw import hdf2xlsx_lw
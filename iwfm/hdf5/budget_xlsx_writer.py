@@ -0,0 +1,220 @@
+# budget_xlsx_writer.py
+# Write IWFM budget tables to Excel workbooks, optionally in constant memory
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+
+from iwfm.debug.logger_setup import logger
+
+
+DATE_FORMAT = 'mm/dd/yyyy'
+NUMBER_FORMAT = '#,##0.00'
+DATE_WIDTH = 11.0
+NUMBER_WIDTH = 12.0
+
+
+class BudgetXlsxWriter:
+    """Write IWFM budget sheets to an Excel workbook.
+
+    Each sheet has title lines in rows 1-3, one or more bold header rows
+    starting at row 5, then one row per time step with the date in column A
+    and the budget values in the following columns.
+
+    By default the workbook is built in memory with openpyxl. With
+    constant_memory=True it is streamed to disk with XlsxWriter in
+    constant_memory mode: each row is flushed as soon as the next one is
+    started and the cell formats are created once per workbook, so peak
+    memory is bounded by one sheet's data regardless of the number of sheets.
+
+    Parameters
+    ----------
+    output_file : str
+        Path to output Excel file (.xlsx)
+    constant_memory : bool, default=False
+        Stream rows to disk with XlsxWriter instead of building the
+        workbook in memory with openpyxl
+
+    Example
+    -------
+    >>> with BudgetXlsxWriter('budget.xlsx', constant_memory=True) as writer:
+    ...     writer.add_sheet('Subregion 1', [('GW BUDGET', True)], [['Time', 'Flow']],
+    ...                      dates, data)
+    """
+
+    def __init__(self, output_file, constant_memory=False):
+        self.output_file = output_file
+        self.constant_memory = constant_memory
+        self._sheet_names = set()
+
+        if constant_memory:
+            try:
+                import xlsxwriter
+            except ImportError:
+                raise ImportError("constant_memory output requires XlsxWriter: "
+                                  "pip install XlsxWriter")
+
+            self._wb = xlsxwriter.Workbook(output_file, {'constant_memory': True,
+                                                         'nan_inf_to_errors': True})
+            # Formats are workbook objects, so build them once
+            self._bold = self._wb.add_format({'bold': True})
+            self._header = self._wb.add_format({'bold': True, 'align': 'center',
+                                                'valign': 'vcenter', 'text_wrap': True})
+            self._date = self._wb.add_format({'num_format': DATE_FORMAT})
+            self._number = self._wb.add_format({'num_format': NUMBER_FORMAT})
+            self._wb.add_worksheet('Sheet1')
+        else:
+            import openpyxl
+
+            self._wb = openpyxl.Workbook()
+            self._wb.active.title = 'Sheet1'  # First sheet is empty
+
+        self._sheet_names.add('sheet1')
+        logger.debug(f"Writing {output_file} (constant_memory={constant_memory})")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _unique_sheet_name(self, name):
+        """Truncate to Excel's 31 character limit and make the name unique."""
+        title = name[:31]
+        count = 1
+        while title.lower() in self._sheet_names:
+            suffix = str(count)
+            title = name[:31 - len(suffix)] + suffix
+            count += 1
+        self._sheet_names.add(title.lower())
+        return title
+
+    def add_sheet(self, name, title_rows, header_rows, dates, data, merges=()):
+        """Add one budget sheet.
+
+        Parameters
+        ----------
+        name : str
+            Sheet name (truncated to 31 characters)
+        title_rows : list of (str, bool) or None
+            Text and bold flag for rows 1, 2, 3... None leaves a row blank
+        header_rows : list of lists of str
+            Header rows starting at row 5, including the 'Time' column.
+            Non-empty header cells are bold, centered and wrapped
+        dates : list of datetime
+            Date for each time step, written to column A
+        data : numpy.ndarray
+            Budget values, shape (n_timesteps, n_columns)
+        merges : list of (row, first_col, last_col), optional
+            1-based header cell ranges to merge
+        """
+        data = np.asarray(data, dtype=float)
+        title = self._unique_sheet_name(name)
+        first_data_row = 5 + len(header_rows)  # 1-based
+        if self.constant_memory:
+            self._add_sheet_xlsxwriter(title, title_rows, header_rows, dates, data,
+                                       merges, first_data_row)
+        else:
+            self._add_sheet_openpyxl(title, title_rows, header_rows, dates, data,
+                                     merges, first_data_row)
+
+    def _add_sheet_xlsxwriter(self, title, title_rows, header_rows, dates, data,
+                              merges, first_data_row):
+        ws = self._wb.add_worksheet(title)
+        ncols = data.shape[1]
+        ws.set_column(0, 0, DATE_WIDTH)
+        if ncols > 0:
+            ws.set_column(1, ncols, NUMBER_WIDTH)
+
+        # constant_memory requires rows to be written in order
+        for row, item in enumerate(title_rows):
+            if item is not None:
+                text, bold = item
+                ws.write_string(row, 0, text, self._bold if bold else None)
+
+        merge_at = {(row - 1, first - 1): last - 1 for row, first, last in merges}
+        covered = {(row, col) for (row, first), last in merge_at.items()
+                   for col in range(first + 1, last + 1)}
+        for i, headers in enumerate(header_rows):
+            row = 4 + i
+            for col, header in enumerate(headers):
+                fmt = self._header if header else None
+                if (row, col) in merge_at:
+                    ws.merge_range(row, col, row, merge_at[(row, col)], header, fmt)
+                elif (row, col) not in covered:
+                    ws.write(row, col, header, fmt)
+
+        number = self._number
+        date = self._date
+        for t, values in enumerate(data.tolist()):
+            row = first_data_row - 1 + t
+            ws.write_datetime(row, 0, dates[t], date)
+            ws.write_row(row, 1, values, number)
+
+    def _add_sheet_openpyxl(self, title, title_rows, header_rows, dates, data,
+                            merges, first_data_row):
+        from openpyxl.styles import Font, Alignment
+        from openpyxl.utils import get_column_letter
+
+        ws = self._wb.create_sheet(title=title)
+
+        # Write title rows
+        for row, item in enumerate(title_rows):
+            if item is not None:
+                text, bold = item
+                ws.cell(row=row + 1, column=1, value=text)
+                if bold:
+                    ws.cell(row=row + 1, column=1).font = Font(bold=True)
+
+        # Write column headers, bold, centered and wrapped
+        for i, headers in enumerate(header_rows):
+            for col, header in enumerate(headers):
+                ws.cell(row=5 + i, column=col + 1, value=header)
+        for row, first, last in merges:
+            ws.merge_cells(start_row=row, start_column=first, end_row=row, end_column=last)
+        for i in range(len(header_rows)):
+            for cell in ws[5 + i]:
+                if cell.value:
+                    cell.font = Font(bold=True)
+                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+        # Write data rows
+        n_timesteps, ncols = data.shape
+        for time_idx in range(n_timesteps):
+            row_num = time_idx + first_data_row
+            ws.cell(row=row_num, column=1, value=dates[time_idx])
+            for col_idx in range(ncols):
+                ws.cell(row=row_num, column=col_idx + 2, value=data[time_idx, col_idx])
+
+        # Format column A (dates) and the value columns
+        ws.column_dimensions['A'].width = DATE_WIDTH
+        for row_num in range(first_data_row, first_data_row + n_timesteps):
+            ws.cell(row=row_num, column=1).number_format = DATE_FORMAT
+        for col_idx in range(ncols):
+            ws.column_dimensions[get_column_letter(col_idx + 2)].width = NUMBER_WIDTH
+            for row_num in range(first_data_row, first_data_row + n_timesteps):
+                ws.cell(row=row_num, column=col_idx + 2).number_format = NUMBER_FORMAT
+
+    def close(self):
+        """Save and close the workbook."""
+        if self._wb is None:
+            return
+        if self.constant_memory:
+            self._wb.close()
+        else:
+            self._wb.save(self.output_file)
+        self._wb = None
+        logger.debug(f"Saved {self.output_file}")
@@ -24,13 +24,12 @@ try:
 except ImportError:
     h5py = None
 
+from iwfm.hdf5 import hdf_pool
 from iwfm.hdf5.hdf5_utils import (
     apply_unit_conversion,
-    decode_hdf5_string,
-    decode_hdf5_strings,
-    generate_timesteps_from_hdf5,
     get_unit_labels,
     substitute_title_placeholders,
+    unit_conversion_factors,
 )
 
 
@@ -97,81 +96,71 @@ def get_budget_data(bud_file,
     if verbose:
         print(f"  Reading budget data from: {bud_file}")
 
-    with h5py.File(bud_file, 'r') as f:
-        # Get metadata from attributes
-        attrs = f['Attributes'].attrs
+    # Open file and decoded metadata are shared through the HDF5 pool
+    f = hdf_pool.get_handle(bud_file)
+    header = hdf_pool.budget_header(bud_file)
 
-        n_locations = attrs['nLocations']
-        n_timesteps = attrs['NTimeSteps']
+    n_locations = header['n_locations']
+    n_timesteps = header['n_timesteps']
+    timesteps = list(header['timesteps'])
+    loc_names = list(header['loc_names'])
 
-        # Get time step info
-        start_date = decode_hdf5_string(attrs['TimeStep%BeginDateAndTime'])
-        delta_t = attrs['TimeStep%DeltaT']
-        time_unit = decode_hdf5_string(attrs['TimeStep%Unit'])
+    # Convert areas
+    areas = header['areas'] * area_conversion_factor
 
-        # Generate timesteps
-        timesteps = generate_timesteps_from_hdf5(start_date, n_timesteps, delta_t, time_unit)
+    full_headers = list(header['full_headers'])
+    col_types = header['col_types']
+    title_templates = header['title_templates']
 
-        # Get location names
-        loc_names = decode_hdf5_strings(f['Attributes/cLocationNames'][:])
+    # Get unit labels for title substitution
+    area_label, vol_label = get_unit_labels(area_units, volume_units)
 
-        # Get areas and convert
-        areas_raw = f['Attributes/Areas'][:]
-        areas = areas_raw * area_conversion_factor
+    # Process each location
+    column_headers = []
+    loc_values = []
+    titles = []
+    factors = None  # unit conversion factors, built once per file
 
-        # Get column headers
-        full_headers = decode_hdf5_strings(attrs['LocationData1%cFullColumnHeaders'])
+    for loc_idx in range(n_locations):
+        loc_name = loc_names[loc_idx]
+        area = areas[loc_idx]
 
-        # Get column types for unit conversion
-        col_types = attrs['LocationData1%iDataColumnTypes']
+        if verbose:
+            print(f"    Processing location {loc_idx + 1}/{n_locations}: {loc_name}")
 
-        # Get title templates
-        title_templates = decode_hdf5_strings(attrs['ASCIIOutput%cTitles'])
+        # Column headers are the same for all locations (typically)
+        column_headers.append(full_headers)
 
-        # Get unit labels for title substitution
-        area_label, vol_label = get_unit_labels(area_units, volume_units)
+        # Get raw data for this location
+        data_raw = f[loc_name][:].astype(float, copy=False)
 
-        # Process each location
-        column_headers = []
-        loc_values = []
-        titles = []
-
-        for loc_idx in range(n_locations):
-            loc_name = loc_names[loc_idx]
-            area = areas[loc_idx]
-
-            if verbose:
-                print(f"    Processing location {loc_idx + 1}/{n_locations}: {loc_name}")
-
-            # Column headers are the same for all locations (typically)
-            column_headers.append(full_headers)
-
-            # Get raw data for this location
-            data_raw = f[loc_name][:]
-
-            # Apply unit conversions based on column types
-            data_converted = apply_unit_conversion(
-                data_raw, col_types,
+        # Apply unit conversions based on column types
+        if factors is None or len(factors) != data_raw.shape[1]:
+            factors = unit_conversion_factors(
+                col_types, data_raw.shape[1],
                 area_conversion_factor,
                 volume_conversion_factor,
                 len_fact=1.0
             )
+        data_converted = apply_unit_conversion(data_raw, col_types, area_conversion_factor,
+                                               volume_conversion_factor, factors=factors,
+                                               inplace=True)
 
-            # Build DataFrame with Time column
-            df = pd.DataFrame(data_converted, columns=full_headers[1:])  # Skip 'Time' header
-            df.insert(0, 'Time', timesteps[:n_timesteps])
+        # Build DataFrame with Time column
+        df = pd.DataFrame(data_converted, columns=full_headers[1:])  # Skip 'Time' header
+        df.insert(0, 'Time', timesteps[:n_timesteps])
 
-            loc_values.append(df)
+        loc_values.append(df)
 
-            # Build title lines with substitutions
-            loc_titles = []
-            for template in title_templates:
-                title = substitute_title_placeholders(
-                    template, loc_name, area, area_label, vol_label
-                )
-                loc_titles.append(title)
+        # Build title lines with substitutions
+        loc_titles = []
+        for template in title_templates:
+            title = substitute_title_placeholders(
+                template, loc_name, area, area_label, vol_label
+            )
+            loc_titles.append(title)
 
-            titles.append(tuple(loc_titles))
+        titles.append(tuple(loc_titles))
 
     if verbose:
         print(f"  Completed reading {n_locations} locations")
@@ -26,10 +26,8 @@ try:
 except ImportError:
     h5py = None
 
+from iwfm.hdf5 import hdf_pool
 from iwfm.hdf5.hdf5_utils import (
-    decode_hdf5_string,
-    decode_hdf5_strings,
-    generate_timesteps_from_hdf5,
     read_zone_definition,
     get_unit_labels,
 )
@@ -116,128 +114,117 @@ def get_zbudget_data(zbud_file, zone_file,
         print(f"    ZEXTENT: {zextent}")
         print(f"    Zones defined: {len(zone_info)}")
 
-    with h5py.File(zbud_file, 'r') as f:
-        attrs = f['Attributes'].attrs
+    # Open file and decoded metadata are shared through the HDF5 pool
+    f = hdf_pool.get_handle(zbud_file)
+    header = hdf_pool.zbudget_header(zbud_file)
 
-        # Get dimensions
-        n_elements = attrs.get('SystemData%NElements', attrs.get('nLocations', 1))
-        n_timesteps = attrs['NTimeSteps']
-        n_layers = attrs.get('SystemData%NLayers', attrs.get('NLayers', 1))
+    # Get dimensions
+    n_elements = header['n_elements']
+    n_timesteps = header['n_timesteps']
+    n_layers = header['n_layers']
 
-        # Get time step info
-        start_date = decode_hdf5_string(attrs['TimeStep%BeginDateAndTime'])
-        delta_t = attrs['TimeStep%DeltaT']
-        time_unit = decode_hdf5_string(attrs['TimeStep%Unit'])
+    timesteps = list(header['timesteps'])
 
-        # Generate timesteps
-        timesteps = generate_timesteps_from_hdf5(start_date, n_timesteps, delta_t, time_unit)
-
-        if verbose:
-            print(f"    Elements: {n_elements}, Layers: {n_layers}, Timesteps: {n_timesteps}")
-
-        # Get element areas
-        if 'SystemData%ElementAreas' in f['Attributes']:
-            elem_areas = f['Attributes/SystemData%ElementAreas'][:] * area_conversion_factor
-        elif 'Areas' in f['Attributes']:
-            elem_areas = f['Attributes/Areas'][:] * area_conversion_factor
+    if verbose:
+        print(f"    Elements: {n_elements}, Layers: {n_layers}, Timesteps: {n_timesteps}")
+
+    # Get element areas
+    if header['elem_areas'] is not None:
+        elem_areas = header['elem_areas'] * area_conversion_factor
+    else:
+        elem_areas = np.ones(n_elements) * area_conversion_factor
+
+    # Calculate zone areas
+    zone_areas = defaultdict(float)
+    for elem_idx in range(n_elements):
+        element = elem_idx + 1
+        if zextent == 1:
+            zone = element_zones.get(element, -99)
+            if zone != -99:
+                zone_areas[zone] += elem_areas[elem_idx]
         else:
-            elem_areas = np.ones(n_elements) * area_conversion_factor
-
-        # Calculate zone areas
-        zone_areas = defaultdict(float)
-        for elem_idx in range(n_elements):
-            element = elem_idx + 1
-            if zextent == 1:
-                zone = element_zones.get(element, -99)
+            for layer in range(1, n_layers + 1):
+                zone = element_zones.get((element, layer), -99)
                 if zone != -99:
-                    zone_areas[zone] += elem_areas[elem_idx]
-            else:
-                for layer in range(1, n_layers + 1):
-                    zone = element_zones.get((element, layer), -99)
-                    if zone != -99:
-                        zone_areas[zone] += elem_areas[elem_idx] / n_layers
-
-        # Get component names from FullDataNames
-        full_data_names = decode_hdf5_strings(f['Attributes/FullDataNames'][:])
-
-        # Extract unique base component names (remove _Inflow/Outflow suffixes)
-        base_components = []
-        for name in full_data_names:
-            if '_Inflow' in name:
-                base = name.replace('_Inflow (+)', '').strip()
-                if base not in base_components:
-                    base_components.append(base)
-
-        # Get element-to-column mappings for each layer
-        elem_col_maps = {}
-        for layer_idx in range(1, n_layers + 1):
-            map_name = f'Layer{layer_idx}_ElemDataColumns'
-            if map_name in f['Attributes']:
-                elem_col_maps[layer_idx] = f[f'Attributes/{map_name}'][:]
-
-        # Initialize zone data storage
-        # zone_data[zone_id][component][in/out] = array of shape (n_timesteps,)
-        zone_data = defaultdict(lambda: defaultdict(lambda: {
-            'in': np.zeros(n_timesteps),
-            'out': np.zeros(n_timesteps)
-        }))
-
-        # Process data by layer and component
-        for layer_idx in range(1, n_layers + 1):
-            layer_name = f'Layer_{layer_idx}'
-
-            if layer_name not in f or layer_idx not in elem_col_maps:
-                continue
+                    zone_areas[zone] += elem_areas[elem_idx] / n_layers
 
-            if verbose:
-                print(f"    Processing {layer_name}...")
+    # Get component names from FullDataNames
+    full_data_names = header['full_data_names']
 
-            layer_group = f[layer_name]
-            elem_col_map = elem_col_maps[layer_idx]
+    # Extract unique base component names (remove _Inflow/Outflow suffixes)
+    base_components = []
+    for name in full_data_names:
+        if '_Inflow' in name:
+            base = name.replace('_Inflow (+)', '').strip()
+            if base not in base_components:
+                base_components.append(base)
 
-            # Process each component
-            for comp_idx, comp_full_name in enumerate(full_data_names):
-                # Determine if this is inflow or outflow
-                is_inflow = '_Inflow' in comp_full_name or '(+)' in comp_full_name
-                flow_dir = 'in' if is_inflow else 'out'
+    # Get element-to-column mappings for each layer
+    elem_col_maps = header['elem_col_maps']
 
-                # Get the component base name
-                comp_base = comp_full_name.replace('_Inflow (+)', '').replace('_Outflow (-)', '').strip()
+    # Initialize zone data storage
+    # zone_data[zone_id][component][in/out] = array of shape (n_timesteps,)
+    zone_data = defaultdict(lambda: defaultdict(lambda: {
+        'in': np.zeros(n_timesteps),
+        'out': np.zeros(n_timesteps)
+    }))
 
-                # Get dataset path
-                dataset_path = f'{layer_name}/{comp_full_name}'
-                if dataset_path not in f:
-                    continue
+    # Process data by layer and component
+    for layer_idx in range(1, n_layers + 1):
+        layer_name = f'Layer_{layer_idx}'
+
+        if layer_name not in f or layer_idx not in elem_col_maps:
+            continue
 
-                data_array = f[dataset_path][:] * volume_conversion_factor
+        if verbose:
+            print(f"    Processing {layer_name}...")
 
-                # Aggregate to zones
-                for elem_idx in range(n_elements):
-                    element = elem_idx + 1
+        layer_group = f[layer_name]
+        elem_col_map = elem_col_maps[layer_idx]
 
-                    # Get column index for this element
-                    if comp_idx < elem_col_map.shape[0] and elem_idx < elem_col_map.shape[1]:
-                        data_col = elem_col_map[comp_idx, elem_idx]
-                    else:
-                        continue
+        # Process each component
+        for comp_idx, comp_full_name in enumerate(full_data_names):
+            # Determine if this is inflow or outflow
+            is_inflow = '_Inflow' in comp_full_name or '(+)' in comp_full_name
+            flow_dir = 'in' if is_inflow else 'out'
 
-                    if data_col == 0:
-                        continue
+            # Get the component base name
+            comp_base = comp_full_name.replace('_Inflow (+)', '').replace('_Outflow (-)', '').strip()
 
-                    data_col_idx = data_col - 1
+            # Get dataset path
+            dataset_path = f'{layer_name}/{comp_full_name}'
+            if dataset_path not in f:
+                continue
 
-                    # Determine zone
-                    if zextent == 1:
-                        zone = element_zones.get(element, -99)
-                    else:
-                        zone = element_zones.get((element, layer_idx), -99)
+            data_array = f[dataset_path][:] * volume_conversion_factor
 
-                    if zone == -99:
-                        continue
+            # Aggregate to zones
+            for elem_idx in range(n_elements):
+                element = elem_idx + 1
+
+                # Get column index for this element
+                if comp_idx < elem_col_map.shape[0] and elem_idx < elem_col_map.shape[1]:
+                    data_col = elem_col_map[comp_idx, elem_idx]
+                else:
+                    continue
+
+                if data_col == 0:
+                    continue
+
+                data_col_idx = data_col - 1
+
+                # Determine zone
+                if zextent == 1:
+                    zone = element_zones.get(element, -99)
+                else:
+                    zone = element_zones.get((element, layer_idx), -99)
+
+                if zone == -99:
+                    continue
 
-                    # Add to zone total
-                    if data_col_idx < data_array.shape[1]:
-                        zone_data[zone][comp_base][flow_dir] += data_array[:, data_col_idx]
+                # Add to zone total
+                if data_col_idx < data_array.shape[1]:
+                    zone_data[zone][comp_base][flow_dir] += data_array[:, data_col_idx]
 
     # Build output structures
     zone_list = sorted(zone_info.keys())
@@ -25,12 +25,136 @@ try:
 except ImportError:
     h5py = None
 
-from iwfm.hdf5.hdf5_utils import (
-    decode_hdf5_string,
-    decode_hdf5_strings,
-    generate_timesteps_from_hdf5,
-    read_zone_definition,
-)
+from iwfm.hdf5 import hdf_pool
+from iwfm.hdf5.hdf5_utils import read_zone_definition
+
+
+def _resolve_col_id(col_id, full_data_names):
+    """Return (index, name) in FullDataNames for a 1-based IN/OUT column ID.
+
+    col_id 1 = first component IN, 2 = first component OUT, 3 = second
+    component IN, etc. Returns (None, None) if there is no such column.
+    """
+    comp_idx = (col_id - 1) // 2
+    comp_search = '_Inflow' if (col_id - 1) % 2 == 0 else '_Outflow'
+
+    if comp_idx * 2 >= len(full_data_names):
+        return None, None
+
+    matches = [idx for idx, name in enumerate(full_data_names) if comp_search in name]
+    if comp_idx >= len(matches):
+        return None, None
+    return matches[comp_idx], full_data_names[matches[comp_idx]]
+
+
+def _read_columns(dataset, cols):
+    """Read the sorted, unique columns cols from a 2D dataset in one call.
+
+    A sorted fancy-index read is used for sparse selections; when most
+    columns are wanted the whole dataset is read and the columns taken.
+    """
+    if len(cols) * 2 > dataset.shape[1]:
+        return dataset[()][:, cols]
+    return dataset[:, cols]
+
+
+def _layer_elem_values(f, header, col_ids, volume_conversion_factor, layers=None):
+    """Yield (layer, values) with values shaped (n_timesteps, n_elements, n_cols).
+
+    Element positions for every (layer, column) are resolved into index
+    arrays from the element-to-column maps, and each dataset is read once.
+    Elements without data for a column are zero.
+    """
+    n_elements = int(header['n_elements'])
+    n_timesteps = int(header['n_timesteps'])
+    full_data_names = header['full_data_names']
+    elem_col_maps = header['elem_col_maps']
+
+    resolved = [_resolve_col_id(col_id, full_data_names) for col_id in col_ids]
+    if layers is None:
+        layers = range(1, int(header['n_layers']) + 1)
+
+    for layer_idx in layers:
+        layer_name = f'Layer_{layer_idx}'
+        if layer_name not in f or layer_idx not in elem_col_maps:
+            continue
+        elem_col_map = elem_col_maps[layer_idx]
+
+        values = np.zeros((n_timesteps, n_elements, len(col_ids)))
+        for k, (comp_data_idx, comp_full_name) in enumerate(resolved):
+            if comp_full_name is None or comp_data_idx >= elem_col_map.shape[0]:
+                continue
+            dataset_path = f'{layer_name}/{comp_full_name}'
+            if dataset_path not in f:
+                continue
+            dataset = f[dataset_path]
+
+            # 1-based data column of each element, 0 = no data
+            data_cols = np.asarray(elem_col_map[comp_data_idx, :n_elements], dtype=np.int64) - 1
+            elems = np.nonzero((data_cols >= 0) & (data_cols < dataset.shape[1]))[0]
+            if len(elems) == 0:
+                continue
+
+            cols, inverse = np.unique(data_cols[elems], return_inverse=True)
+            block = _read_columns(dataset, cols)
+            values[:, elems, k] = block[:, inverse] * volume_conversion_factor
+
+        yield layer_idx, values
+
+
+def get_zbudget_elem_array(zbud_file, col_ids,
+                           volume_conversion_factor=0.0000229568411,
+                           layers=None,
+                           verbose=False):
+    """Read per-element zone budget values for every time step.
+
+    Parameters
+    ----------
+    zbud_file : str
+        Path to IWFM ZBudget HDF file
+
+    col_ids : list of int
+        Column indices to retrieve (1-indexed, matching pywfm convention:
+        1 = first component IN, 2 = first component OUT, ...)
+
+    volume_conversion_factor : float, default=0.0000229568411
+        Volume conversion factor
+
+    layers : list of int, default=None
+        Layers (1-indexed) to sum over. None uses all layers
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    dates : list
+        Model time steps as date strings
+
+    values : numpy.ndarray
+        Array of shape (n_timesteps, n_elements, len(col_ids)). Element i
+        of axis 1 is element ID i + 1. Elements without data are zero
+    """
+    import iwfm
+
+    if h5py is None:
+        print("Error: h5py module not found")
+        print("Install with: pip install h5py")
+        sys.exit(1)
+
+    iwfm.file_test(zbud_file)
+
+    f = hdf_pool.get_handle(zbud_file)
+    header = hdf_pool.zbudget_header(zbud_file)
+
+    values = np.zeros((int(header['n_timesteps']), int(header['n_elements']), len(col_ids)))
+    for layer_idx, layer_values in _layer_elem_values(f, header, col_ids,
+                                                      volume_conversion_factor, layers):
+        if verbose:
+            print(f"    Processed Layer_{layer_idx}")
+        values += layer_values
+
+    return list(header['timesteps']), values
 
 
 def get_zbudget_elem_vals(zbud_file, zones_file, col_ids,
@@ -99,116 +223,41 @@ def get_zbudget_elem_vals(zbud_file, zones_file, col_ids,
         print(f"  Reading zone budget element values from: {zbud_file}")
         print(f"  Zones defined: {len(zone_info)}")
 
-    with h5py.File(zbud_file, 'r') as f:
-        attrs = f['Attributes'].attrs
-
-        # Get dimensions
-        n_elements = attrs.get('SystemData%NElements', attrs.get('nLocations', 1))
-        n_timesteps = attrs['NTimeSteps']
-        n_layers = attrs.get('SystemData%NLayers', attrs.get('NLayers', 1))
-
-        # Get time step info
-        start_date = decode_hdf5_string(attrs['TimeStep%BeginDateAndTime'])
-        delta_t = attrs['TimeStep%DeltaT']
-        time_unit = decode_hdf5_string(attrs['TimeStep%Unit'])
-
-        # Generate timesteps
-        timesteps = generate_timesteps_from_hdf5(start_date, n_timesteps, delta_t, time_unit)
-
-        # Get component names
-        full_data_names = decode_hdf5_strings(f['Attributes/FullDataNames'][:])
-
-        # Get element-to-column mappings
-        elem_col_maps = {}
-        for layer_idx in range(1, n_layers + 1):
-            map_name = f'Layer{layer_idx}_ElemDataColumns'
-            if map_name in f['Attributes']:
-                elem_col_maps[layer_idx] = f[f'Attributes/{map_name}'][:]
-
-        # Initialize zone data storage for each requested column
-        # zone_sums[zone_id][col_idx] = total sum across all timesteps
-        zone_sums = defaultdict(lambda: defaultdict(float))
+    # Open file and decoded metadata are shared through the HDF5 pool
+    f = hdf_pool.get_handle(zbud_file)
+    header = hdf_pool.zbudget_header(zbud_file)
 
-        # Map col_ids to component indices (col_ids are 1-indexed)
-        # col_ids correspond to columns in the output DataFrame, which alternates IN/OUT
-        # for each component. So col_id 1 = first component IN, 2 = first component OUT, etc.
+    n_elements = int(header['n_elements'])
+    timesteps = list(header['timesteps'])
 
-        # Process data by layer
-        for layer_idx in range(1, n_layers + 1):
-            layer_name = f'Layer_{layer_idx}'
-
-            if layer_name not in f or layer_idx not in elem_col_maps:
-                continue
-
-            if verbose:
-                print(f"    Processing {layer_name}...")
-
-            elem_col_map = elem_col_maps[layer_idx]
-
-            # Process each requested column
-            for col_list_idx, col_id in enumerate(col_ids):
-                # Determine which component and flow direction from col_id
-                # col_id is 1-indexed: 1=comp1_in, 2=comp1_out, 3=comp2_in, 4=comp2_out, etc.
-                comp_idx = (col_id - 1) // 2
-                is_inflow = (col_id - 1) % 2 == 0
-
-                if comp_idx * 2 >= len(full_data_names):
-                    continue
-
-                # Find the corresponding component name
-                if is_inflow:
-                    comp_search = '_Inflow'
-                else:
-                    comp_search = '_Outflow'
-
-                comp_full_name = None
-                comp_name_idx = 0
-                for idx, name in enumerate(full_data_names):
-                    if comp_search in name:
-                        if comp_name_idx == comp_idx:
-                            comp_full_name = name
-                            comp_data_idx = idx
-                            break
-                        comp_name_idx += 1
-
-                if comp_full_name is None:
-                    continue
-
-                # Get dataset
-                dataset_path = f'{layer_name}/{comp_full_name}'
-                if dataset_path not in f:
-                    continue
-
-                data_array = f[dataset_path][:] * volume_conversion_factor
-
-                # Sum across all timesteps and aggregate to zones
-                for elem_idx in range(n_elements):
-                    element = elem_idx + 1
-
-                    # Get column index for this element
-                    if comp_data_idx < elem_col_map.shape[0] and elem_idx < elem_col_map.shape[1]:
-                        data_col = elem_col_map[comp_data_idx, elem_idx]
-                    else:
-                        continue
-
-                    if data_col == 0:
-                        continue
-
-                    data_col_idx = data_col - 1
-
-                    # Determine zone
-                    if zextent == 1:
-                        zone = element_zones.get(element, -99)
-                    else:
-                        zone = element_zones.get((element, layer_idx), -99)
-
-                    if zone == -99:
-                        continue
-
-                    # Sum all timesteps for this element
-                    if data_col_idx < data_array.shape[1]:
-                        total = np.sum(data_array[:, data_col_idx])
-                        zone_sums[zone][col_list_idx] += total
+    # Zone of each element, -99 if not in any zone
+    def elem_zones(layer_idx):
+        if zextent == 1:
+            keys = range(1, n_elements + 1)
+        else:
+            keys = ((element, layer_idx) for element in range(1, n_elements + 1))
+        return np.fromiter((element_zones.get(key, -99) for key in keys),
+                           dtype=np.int64, count=n_elements)
+
+    # zone_sums[zone_id] = array of totals across all timesteps, one per column
+    zone_sums = defaultdict(lambda: np.zeros(len(col_ids)))
+    zones = elem_zones(1) if zextent == 1 else None
+
+    for layer_idx, values in _layer_elem_values(f, header, col_ids, volume_conversion_factor):
+        if verbose:
+            print(f"    Processing Layer_{layer_idx}...")
+
+        if zextent != 1:
+            zones = elem_zones(layer_idx)
+        in_zone = zones != -99
+
+        # Sum all timesteps for each element, then aggregate elements to zones
+        elem_totals = values.sum(axis=0)[in_zone]
+        zone_ids, inverse = np.unique(zones[in_zone], return_inverse=True)
+        totals = np.zeros((len(zone_ids), len(col_ids)))
+        np.add.at(totals, inverse, elem_totals)
+        for zone, total in zip(zone_ids.tolist(), totals):
+            zone_sums[zone] += total
 
     # Build output
     zone_list = sorted(zone_info.keys())
@@ -222,10 +271,7 @@ def get_zbudget_elem_vals(zbud_file, zones_file, col_ids,
         else:
             counter += 1
 
-        row = [zone_id]
-        for col_idx in range(len(col_ids)):
-            row.append(zone_sums[zone_id][col_idx])
-        zone_data.append(row)
+        zone_data.append([zone_id] + zone_sums[zone_id].tolist())
 
     if verbose:
         print(f"  Completed processing {len(zone_list)} zones")
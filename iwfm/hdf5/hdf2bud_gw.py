@@ -29,6 +29,7 @@ except ImportError:
     sys.exit(1)
 
 from iwfm.debug.logger_setup import logger, setup_debug_logger
+from iwfm.hdf5.hdf5_utils import unit_conversion_factors
 
 
 def hdf2bud_gw(hdf_file, output_file,
@@ -141,6 +142,7 @@ def hdf2bud_gw(hdf_file, output_file,
         # Write output file
         with open(output_file, 'w') as out:
             # Process each location
+            factors = None  # unit conversion factors, built once per file
             for loc_idx in range(n_locations):
                 loc_name = location_names[loc_idx]
                 area = areas[loc_idx]
@@ -155,22 +157,11 @@ def hdf2bud_gw(hdf_file, output_file,
                 # Column types: 1=volume/flow, 2=area, 3=volume stored (storage, discrepancy), 4=length
                 # col_types array includes time column (index 0), so data columns start at index 1
                 # All volume types (1 and 3) need conversion from cu ft to output volume units
-                data = np.zeros_like(data_raw)
-                for col_idx in range(data_raw.shape[1]):
-                    # col_types[0] is for time, col_types[1] is for first data column, etc.
-                    if col_idx + 1 < len(col_types):
-                        col_type = col_types[col_idx + 1]
-                        if col_type == 1 or col_type == 3:  # Volume (flow or storage) - convert cu ft to output units
-                            data[:, col_idx] = data_raw[:, col_idx] * volume_conversion
-                        elif col_type == 2:  # Area - convert sq ft to output units
-                            data[:, col_idx] = data_raw[:, col_idx] * area_conversion
-                        elif col_type == 4:  # Length - convert using length factor
-                            data[:, col_idx] = data_raw[:, col_idx] * length_conversion
-                        else:
-                            data[:, col_idx] = data_raw[:, col_idx]
-                    else:
-                        # If no type specified, assume volume/flow
-                        data[:, col_idx] = data_raw[:, col_idx] * volume_conversion
+                if factors is None or len(factors) != data_raw.shape[1]:
+                    factors = unit_conversion_factors(col_types, data_raw.shape[1],
+                                                      area_conversion, volume_conversion,
+                                                      length_conversion, other_fact=1.0)
+                data = data_raw * factors
 
                 # Determine output unit labels
                 if vol_units.upper() in ['ACFT', 'AC-FT', 'ACRE-FT', 'ACRE-FEET']:
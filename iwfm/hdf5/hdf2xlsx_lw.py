@@ -29,21 +29,23 @@ except ImportError:
     sys.exit(1)
 
 from iwfm.debug.logger_setup import logger, setup_debug_logger
+from iwfm.hdf5.hdf5_utils import unit_conversion_factors
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment
 except ImportError:
     print("Error: openpyxl module not found")
     print("Install with: pip install openpyxl")
     sys.exit(1)
 
+from iwfm.hdf5.budget_xlsx_writer import BudgetXlsxWriter
+
 
 def hdf2xlsx_lw(hdf_file, output_file,
              len_fact=1.0, len_units='FEET',
              area_fact=0.000022957, area_units='AC',
              vol_fact=0.000022957, vol_units='ACFT',
-             verbose=False, debug=False):
+             verbose=False, debug=False, constant_memory=False):
     """
     Convert IWFM Land & Water Use Budget HDF5 file to Excel workbook
 
@@ -69,6 +71,9 @@ def hdf2xlsx_lw(hdf_file, output_file,
         Print progress messages
     debug : bool, default=False
         Enable debug output
+    constant_memory : bool, default=False
+        Stream rows to disk with XlsxWriter so memory use is bounded by one
+        sheet's data (for budgets with thousands of locations)
 
     Notes
     -----
@@ -104,14 +109,9 @@ def hdf2xlsx_lw(hdf_file, output_file,
     volume_conversion = vol_fact
     length_conversion = len_fact
 
-    # Create Excel workbook
-    wb = openpyxl.Workbook()
-
-    # First sheet is empty (keep default Sheet)
-    ws_empty = wb.active
-    ws_empty.title = "Sheet1"
-
-    with h5py.File(hdf_file, 'r') as f:
+    # Create Excel workbook (first sheet is empty) and read HDF5 file
+    with BudgetXlsxWriter(output_file, constant_memory=constant_memory) as writer, \
+            h5py.File(hdf_file, 'r') as f:
         # Get metadata
         attrs = f['Attributes'].attrs
 
@@ -170,6 +170,7 @@ def hdf2xlsx_lw(hdf_file, output_file,
         full_headers = [h.replace('@UNITAR@', area_label).replace('@UNITVL@', vol_label) for h in full_headers]
 
         # Process each location
+        factors = None  # unit conversion factors, built once per file
         for loc_idx in range(n_locations):
             loc_name = location_names[loc_idx]
             area = areas[loc_idx]
@@ -178,9 +179,6 @@ def hdf2xlsx_lw(hdf_file, output_file,
                 logger.debug(f"Processing location {loc_idx+1}/{n_locations}: {loc_name}")
                 logger.debug(f"Area: {area:,.2f} {area_units}")
 
-            # Create new sheet for this location
-            ws = wb.create_sheet(title=loc_name[:31])  # Excel sheet name limit is 31 chars
-
             # Get data for this location
             data_raw = f[loc_name][:]
 
@@ -189,77 +187,23 @@ def hdf2xlsx_lw(hdf_file, output_file,
             # Types 1, 3, 8, 9, 10, 11 = Volume/flow
             # Types 2, 6, 7 = Area
             # Type 4 = Length
-            data = np.zeros_like(data_raw)
-            for col_idx in range(data_raw.shape[1]):
-                # col_types[0] is for time, col_types[1] is for first data column, etc.
-                if col_idx + 1 < len(col_types):
-                    col_type = col_types[col_idx + 1]
-                    # Volume/flow types
-                    if col_type in [1, 3, 8, 9, 10, 11]:
-                        data[:, col_idx] = data_raw[:, col_idx] * volume_conversion
-                    # Area types (6, 7 are used in L&WU budgets for area columns)
-                    elif col_type in [2, 6, 7]:
-                        data[:, col_idx] = data_raw[:, col_idx] * area_conversion
-                    # Length type
-                    elif col_type == 4:
-                        data[:, col_idx] = data_raw[:, col_idx] * length_conversion
-                    # No conversion for unknown types
-                    else:
-                        data[:, col_idx] = data_raw[:, col_idx]
-                else:
-                    # If no type specified, assume volume/flow
-                    data[:, col_idx] = data_raw[:, col_idx] * volume_conversion
-
-            # Write title rows
-            ws['A1'] = descriptor
-            ws['A1'].font = Font(bold=True)
-
-            budget_title = f"LAND AND WATER USE BUDGET IN {vol_label} FOR {loc_name}"
-            ws['A2'] = budget_title
-            ws['A2'].font = Font(bold=True)
-
+            if factors is None or len(factors) != data_raw.shape[1]:
+                factors = unit_conversion_factors(col_types, data_raw.shape[1],
+                                                  area_conversion, volume_conversion,
+                                                  length_conversion, other_fact=1.0,
+                                                  volume_types=(1, 3, 8, 9, 10, 11),
+                                                  area_types=(2, 6, 7))
+            data = data_raw * factors
+
+            # Write title rows, column headers (row 5) and data rows (row 6 on)
+            title_rows = [(descriptor, True), (f"LAND AND WATER USE BUDGET IN {vol_label} FOR {loc_name}", True)]
             if area > 0:
-                area_title = f"SUBREGION AREA: {area:,.2f} {area_label}"
-                ws['A3'] = area_title
+                title_rows.append((f"SUBREGION AREA: {area:,.2f} {area_label}", False))
 
-            # Write column headers (row 5)
-            ws.cell(row=5, column=1, value='Time')
             # Skip first header if it's a time/date column (already written)
             headers_to_write = full_headers[1:] if full_headers and full_headers[0].lower() in ['time', 'date', 'datetime'] else full_headers
-            for col_idx, header in enumerate(headers_to_write):
-                ws.cell(row=5, column=col_idx + 2, value=header)
-
-            # Make header row bold, centered, and wrap text
-            for cell in ws[5]:
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-
-            # Write data rows
-            for time_idx in range(n_timesteps):
-                row_num = time_idx + 6  # Data starts at row 6
-
-                # Write datetime
-                ws.cell(row=row_num, column=1, value=datetime_objs[time_idx])
-
-                # Write data values
-                for col_idx in range(data.shape[1]):
-                    val = data[time_idx, col_idx]
-                    ws.cell(row=row_num, column=col_idx + 2, value=val)
-
-            # Format column A (dates): mm/dd/yyyy format, width 11.0
-            ws.column_dimensions['A'].width = 11.0
-            for row_num in range(6, 6 + n_timesteps):
-                ws.cell(row=row_num, column=1).number_format = 'mm/dd/yyyy'
-
-            # Format remaining columns: number format with comma separator and 2 decimals, width 12.0
-            for col_idx in range(data.shape[1]):
-                col_letter = openpyxl.utils.get_column_letter(col_idx + 2)
-                ws.column_dimensions[col_letter].width = 12.0
-                for row_num in range(6, 6 + n_timesteps):
-                    ws.cell(row=row_num, column=col_idx + 2).number_format = '#,##0.00'
-
-    # Save workbook
-    wb.save(output_file)
+            writer.add_sheet(loc_name, title_rows, [['Time'] + headers_to_write],
+                             datetime_objs, data)
 
     if verbose:
         print(f"Excel workbook written to: {output_file}")
@@ -311,6 +255,9 @@ Default conversion factors:
 
     parser.add_argument('--debug', action='store_true', help='Enable debug output')
 
+    parser.add_argument('--constant-memory', action='store_true',
+                        help='Stream rows to disk with XlsxWriter (for very large budgets)')
+
     args = parser.parse_args()
 
     # Get file names
@@ -335,7 +282,8 @@ Default conversion factors:
              len_fact=args.len_fact, len_units=args.len_units,
              area_fact=args.area_fact, area_units=args.area_units,
              vol_fact=args.vol_fact, vol_units=args.vol_units,
-             verbose=not args.quiet, debug=args.debug)
+             verbose=not args.quiet, debug=args.debug,
+             constant_memory=args.constant_memory)
 
 
     idb.exe_time()  # print execution time
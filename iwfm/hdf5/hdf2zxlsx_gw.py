@@ -30,10 +30,10 @@ except ImportError:
     sys.exit(1)
 
 from iwfm.debug.logger_setup import logger, setup_debug_logger
+from iwfm.hdf5.budget_xlsx_writer import BudgetXlsxWriter
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment
 except ImportError:
     print("Error: openpyxl module not found")
     print("Install with: pip install openpyxl")
@@ -131,7 +131,7 @@ def read_zone_definition(zone_file):
 def hdf2zxlsx_gw(hdf_file, zone_file, output_file,
                  area_fact=0.000022957, area_units='AC',
                  vol_fact=0.000022957, vol_units='ACFT',
-                 verbose=False, debug=False):
+                 verbose=False, debug=False, constant_memory=False):
     """
     Convert IWFM Groundwater Zone Budget HDF5 file to Excel workbook
 
@@ -155,6 +155,9 @@ def hdf2zxlsx_gw(hdf_file, zone_file, output_file,
         Print progress messages
     debug : bool, default=False
         Enable debug output (more detailed than verbose)
+    constant_memory : bool, default=False
+        Stream rows to disk with XlsxWriter so memory use is bounded by one
+        sheet's data (for budgets with thousands of locations)
     """
     import iwfm
 
@@ -182,13 +185,6 @@ def hdf2zxlsx_gw(hdf_file, zone_file, output_file,
         logger.debug(f"Zones defined: {len(zone_info)}")
         logger.debug(f"Element assignments: {len(element_zones)}")
 
-    # Create Excel workbook
-    wb = openpyxl.Workbook()
-
-    # First sheet is empty (keep default Sheet)
-    ws_empty = wb.active
-    ws_empty.title = "Sheet1"
-
     # Read HDF5 file
     if debug:
         logger.debug(f"Reading HDF5 file: {hdf_file}")
@@ -388,117 +384,50 @@ def hdf2zxlsx_gw(hdf_file, zone_file, output_file,
     if debug:
         logger.debug(f"Writing Excel workbook: {output_file}")
 
-    for zone_id in sorted(zone_data.keys()):
-        zone_name = zone_info.get(zone_id, f'Zone{zone_id}')
-        zone_area = zone_areas.get(zone_id, 0.0)
+    # Row 5: component names, each merged over its IN/OUT pair; row 6: IN/OUT
+    header_row5 = ['Time']
+    header_row6 = [None]
+    merges = []
+    for i, header in enumerate(full_headers):
+        header_row5 += [header, None]
+        header_row6 += ['IN (+)', 'OUT (-)']
+        merges.append((5, 2 + 2 * i, 3 + 2 * i))
+    header_row5 += ['Discrepancy', 'Absolute Storage']
+    header_row6 += ['(=)', '']
+
+    storage_idx = next((i for i, header in enumerate(full_headers)
+                        if 'Storage' in header or 'STORAGE' in header), None)
+
+    with BudgetXlsxWriter(output_file, constant_memory=constant_memory) as writer:
+        for zone_id in sorted(zone_data.keys()):
+            zone_name = zone_info.get(zone_id, f'Zone{zone_id}')
+            zone_area = zone_areas.get(zone_id, 0.0)
 
-        if debug:
-            logger.debug(f"Zone {zone_id}: {zone_name}")
-
-        # Create new sheet for this zone (max 31 chars for sheet name)
-        sheet_name = f"Zone{zone_id}_{zone_name}"[:31]
-        ws = wb.create_sheet(title=sheet_name)
-
-        # Write title rows
-        ws['A1'] = descriptor
-        ws['A1'].font = Font(bold=True)
-
-        budget_title = f"GROUNDWATER ZONE BUDGET IN {vol_label} FOR ZONE {zone_id} ({zone_name})"
-        ws['A2'] = budget_title
-        ws['A2'].font = Font(bold=True)
-
-        area_title = f"ZONE AREA: {zone_area:,.2f} {area_label}"
-        ws['A3'] = area_title
-
-        # Build column headers with IN/OUT for each component
-        # Row 5: component names (merged cells for each component)
-        # We'll write headers starting at row 5
-        col = 1
-        ws.cell(row=5, column=col, value='Time')
-        col += 1
-
-        for header in full_headers:
-            # Write component name spanning 2 columns
-            ws.cell(row=5, column=col, value=header)
-            ws.merge_cells(start_row=5, start_column=col, end_row=5, end_column=col+1)
-
-            # Write IN/OUT sub-headers
-            ws.cell(row=6, column=col, value='IN (+)')
-            ws.cell(row=6, column=col+1, value='OUT (-)')
-
-            col += 2
-
-        # Add Discrepancy and Absolute Storage columns
-        ws.cell(row=5, column=col, value='Discrepancy')
-        ws.cell(row=6, column=col, value='(=)')
-        col += 1
-
-        ws.cell(row=5, column=col, value='Absolute Storage')
-        ws.cell(row=6, column=col, value='')
-
-        # Make header rows bold, centered, and wrap text
-        for cell in ws[5]:
-            if cell.value:
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        for cell in ws[6]:
-            if cell.value:
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-
-        # Write data rows starting at row 7
-        for time_idx in range(n_timesteps):
-            row_num = time_idx + 7
-            col = 1
-
-            # Write datetime
-            ws.cell(row=row_num, column=col, value=datetime_objs[time_idx])
-            col += 1
+            if debug:
+                logger.debug(f"Zone {zone_id}: {zone_name}")
 
+            budget_title = f"GROUNDWATER ZONE BUDGET IN {vol_label} FOR ZONE {zone_id} ({zone_name})"
+            area_title = f"ZONE AREA: {zone_area:,.2f} {area_label}"
+            title_rows = [(descriptor, True), (budget_title, True), (area_title, False)]
+
+            # Columns: IN/OUT pairs, then discrepancy and absolute storage
+            data = np.zeros((n_timesteps, 2 * len(full_headers) + 2))
             total_in = 0.0
             total_out = 0.0
-
-            # Write IN/OUT values for each component
             for comp_idx in range(len(full_headers)):
-                in_val = zone_data[zone_id][comp_idx]['in'][time_idx]
-                out_val = zone_data[zone_id][comp_idx]['out'][time_idx]
-
-                ws.cell(row=row_num, column=col, value=in_val)
-                ws.cell(row=row_num, column=col+1, value=out_val)
-                col += 2
-
-                total_in += in_val
-                total_out += out_val
-
-            # Calculate discrepancy
-            discrepancy = total_in - total_out
-
-            # Get absolute storage from GW Storage component
-            abs_storage = 0.0
-            for comp_idx, header in enumerate(full_headers):
-                if 'Storage' in header or 'STORAGE' in header:
-                    abs_storage = zone_data[zone_id][comp_idx]['in'][time_idx] - zone_data[zone_id][comp_idx]['out'][time_idx]
-                    break
-
-            ws.cell(row=row_num, column=col, value=discrepancy)
-            col += 1
-            ws.cell(row=row_num, column=col, value=abs_storage)
-
-        # Format column A (dates): mm/dd/yyyy format, width 11.0
-        ws.column_dimensions['A'].width = 11.0
-        for row_num in range(7, 7 + n_timesteps):
-            ws.cell(row=row_num, column=1).number_format = 'mm/dd/yyyy'
-
-        # Format remaining columns: number format with comma separator and 2 decimals, width 12.0
-        total_cols = 1 + (len(full_headers) * 2) + 2  # Time + (IN/OUT pairs) + Disc + Storage
-        for col_idx in range(2, total_cols + 1):
-            col_letter = openpyxl.utils.get_column_letter(col_idx)
-            ws.column_dimensions[col_letter].width = 12.0
-            for row_num in range(7, 7 + n_timesteps):
-                ws.cell(row=row_num, column=col_idx).number_format = '#,##0.00'
-
-    # Save workbook
-    wb.save(output_file)
+                in_vals = zone_data[zone_id][comp_idx]['in']
+                out_vals = zone_data[zone_id][comp_idx]['out']
+                data[:, 2 * comp_idx] = in_vals
+                data[:, 2 * comp_idx + 1] = out_vals
+                total_in = total_in + in_vals
+                total_out = total_out + out_vals
+            data[:, -2] = total_in - total_out
+            if storage_idx is not None:
+                data[:, -1] = (zone_data[zone_id][storage_idx]['in']
+                               - zone_data[zone_id][storage_idx]['out'])
+
+            writer.add_sheet(f"Zone{zone_id}_{zone_name}", title_rows,
+                             [header_row5, header_row6], datetime_objs, data, merges)
 
     if verbose:
         print(f"  Excel workbook written to: {output_file}")
@@ -530,6 +459,9 @@ if __name__ == '__main__':
 
     parser.add_argument('--debug', action='store_true', help='Enable debug output')
 
+    parser.add_argument('--constant-memory', action='store_true',
+                        help='Stream rows to disk with XlsxWriter (for very large budgets)')
+
     args = parser.parse_args()
 
     # Get file names
@@ -559,6 +491,7 @@ if __name__ == '__main__':
     hdf2zxlsx_gw(args.hdf_file, args.zone_file, args.output_file,
                  area_fact=args.area_fact, area_units=args.area_units,
                  vol_fact=args.vol_fact, vol_units=args.vol_units,
-                 verbose=not args.quiet, debug=args.debug)
+                 verbose=not args.quiet, debug=args.debug,
+                 constant_memory=args.constant_memory)
 
     idb.exe_time()  # print execution time
@@ -18,9 +18,63 @@
 
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 
-def apply_unit_conversion(data, col_types, area_fact, vol_fact, len_fact=1.0):
+def unit_conversion_factors(col_types, n_cols, area_fact, vol_fact, len_fact=1.0,
+                            other_fact=None, volume_types=(1, 3), area_types=(2,),
+                            length_types=(4,)):
+    """Build a per-column unit conversion factor vector from column data types.
+
+    Build this once per file and multiply each location's data by it, rather
+    than testing column types for every location.
+
+    Parameters
+    ----------
+    col_types : array-like
+        Array of column type codes. Index 0 is for time column,
+        data columns start at index 1.
+    n_cols : int
+        Number of data columns (excluding time)
+    area_fact : float
+        Area conversion factor
+    vol_fact : float
+        Volume conversion factor
+    len_fact : float, default=1.0
+        Length conversion factor
+    other_fact : float, optional
+        Factor for type codes not in any of the type lists.
+        Default None uses vol_fact.
+    volume_types : tuple, default=(1, 3)
+        Type codes converted with vol_fact (flow and storage)
+    area_types : tuple, default=(2,)
+        Type codes converted with area_fact
+    length_types : tuple, default=(4,)
+        Type codes converted with len_fact
+
+    Returns
+    -------
+    numpy.ndarray
+        1D float array of length n_cols. Columns without a type code
+        are treated as volume/flow.
+    """
+    if other_fact is None:
+        other_fact = vol_fact
+
+    types = np.asarray(col_types)[1:n_cols + 1]
+    factors = np.full(n_cols, vol_fact, dtype=float)
+
+    typed = np.full(len(types), other_fact, dtype=float)
+    typed[np.isin(types, volume_types)] = vol_fact
+    typed[np.isin(types, area_types)] = area_fact
+    typed[np.isin(types, length_types)] = len_fact
+    factors[:len(types)] = typed
+
+    return factors
+
+
+def apply_unit_conversion(data, col_types, area_fact, vol_fact, len_fact=1.0,
+                          factors=None, inplace=False):
     """Apply unit conversions based on column data types.
 
     Parameters
@@ -37,32 +91,25 @@ def apply_unit_conversion(data, col_types, area_fact, vol_fact, len_fact=1.0):
         Volume conversion factor (e.g., 0.0000229568411 for cu ft to acre-ft)
     len_fact : float, default=1.0
         Length conversion factor
+    factors : numpy.ndarray, optional
+        Precomputed factor vector from unit_conversion_factors().
+        When given, col_types and the conversion factors are ignored.
+    inplace : bool, default=False
+        Multiply data in place (data must be a float array)
 
     Returns
     -------
     numpy.ndarray
         Converted data array with same shape as input
     """
-    result = np.zeros_like(data, dtype=float)
-
-    for col_idx in range(data.shape[1]):
-        # col_types[0] is for time, col_types[col_idx+1] is for data column col_idx
-        if col_idx + 1 < len(col_types):
-            col_type = col_types[col_idx + 1]
-            if col_type == 1 or col_type == 3:  # Volume (flow or storage)
-                result[:, col_idx] = data[:, col_idx] * vol_fact
-            elif col_type == 2:  # Area
-                result[:, col_idx] = data[:, col_idx] * area_fact
-            elif col_type == 4:  # Length
-                result[:, col_idx] = data[:, col_idx] * len_fact
-            else:
-                # Default to volume conversion for unknown types
-                result[:, col_idx] = data[:, col_idx] * vol_fact
-        else:
-            # If no type specified, assume volume/flow
-            result[:, col_idx] = data[:, col_idx] * vol_fact
+    if factors is None:
+        factors = unit_conversion_factors(col_types, data.shape[1],
+                                          area_fact, vol_fact, len_fact)
 
-    return result
+    if inplace:
+        data *= factors
+        return data
+    return np.multiply(data, factors, dtype=float)
 
 
 def decode_hdf5_string(value):
@@ -141,6 +188,63 @@ def format_iwfm_date(dt):
     return dt.strftime('%m/%d/%Y_24:00')
 
 
+@lru_cache(maxsize=64)
+def _timestep_calendar(start_date_str, n_timesteps, delta_t, time_unit):
+    """Cached worker for timestep_calendar() with normalized, hashable arguments."""
+    start_dt = parse_iwfm_date(start_date_str)
+    start_day = np.datetime64(start_dt.date(), 'D')
+    steps = np.arange(1, n_timesteps)
+
+    if 'MON' in time_unit or 'MONTH' in time_unit:
+        # Monthly timestep - last day of each month after the start month
+        start_month = np.datetime64(start_dt.strftime('%Y-%m'), 'M')
+        months = start_month + steps * delta_t
+        later = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    elif 'DAY' in time_unit:
+        later = start_day + steps * np.timedelta64(delta_t, 'D')
+    elif 'YEAR' in time_unit:
+        later = np.array([datetime(start_dt.year + int(i) * delta_t, start_dt.month, start_dt.day)
+                          for i in steps], dtype='datetime64[D]')
+    else:
+        # Default to days
+        later = start_day + steps * np.timedelta64(delta_t, 'D')
+
+    dates = np.concatenate(([start_day], later)).astype('datetime64[D]')[:n_timesteps]
+    dates.flags.writeable = False
+
+    date_strings = tuple(f'{d[5:7]}/{d[8:10]}/{d[0:4]}_24:00'
+                         for d in np.datetime_as_string(dates, unit='D'))
+    return dates, date_strings
+
+
+def timestep_calendar(start_date_str, n_timesteps, delta_t, time_unit):
+    """Return the timestep calendar for an HDF5 time specification.
+
+    Results are memoized on (start, n, delta, unit), so readers that loop
+    over many locations or files with the same time axis build it once.
+
+    Parameters
+    ----------
+    start_date_str : str or bytes
+        Starting date string from HDF5 file
+    n_timesteps : int
+        Number of timesteps
+    delta_t : float
+        Time step delta value
+    time_unit : str or bytes
+        Time unit string (e.g., '1MON', 'DAYS', 'MONTH')
+
+    Returns
+    -------
+    dates : numpy.ndarray
+        Read-only datetime64[D] array of timestep dates
+    date_strings : tuple
+        IWFM date strings 'MM/DD/YYYY_24:00' for each timestep
+    """
+    return _timestep_calendar(decode_hdf5_string(start_date_str), int(n_timesteps),
+                              int(delta_t), decode_hdf5_string(time_unit).upper())
+
+
 def generate_timesteps_from_hdf5(start_date_str, n_timesteps, delta_t, time_unit):
     """Generate list of timestep date strings from HDF5 time specification.
 
@@ -160,39 +264,9 @@ def generate_timesteps_from_hdf5(start_date_str, n_timesteps, delta_t, time_unit
     list
         List of date strings for each timestep
     """
-    start_dt = parse_iwfm_date(start_date_str)
-    time_unit = decode_hdf5_string(time_unit).upper().strip()
-
-    timesteps = [format_iwfm_date(start_dt)]
-
-    current_dt = start_dt
-    for _ in range(n_timesteps - 1):
-        if 'MON' in time_unit or 'MONTH' in time_unit:
-            # Monthly timestep
-            month = current_dt.month + int(delta_t)
-            year = current_dt.year
-            while month > 12:
-                month -= 12
-                year += 1
-            # Get last day of month
-            if month == 12:
-                next_month_start = datetime(year + 1, 1, 1)
-            else:
-                next_month_start = datetime(year, month + 1, 1)
-            current_dt = next_month_start - timedelta(days=1)
-            current_dt = datetime(current_dt.year, current_dt.month, current_dt.day)
-        elif 'DAY' in time_unit:
-            current_dt = current_dt + timedelta(days=int(delta_t))
-        elif 'YEAR' in time_unit:
-            current_dt = datetime(current_dt.year + int(delta_t),
-                                  current_dt.month, current_dt.day)
-        else:
-            # Default to days
-            current_dt = current_dt + timedelta(days=int(delta_t))
-
-        timesteps.append(format_iwfm_date(current_dt))
-
-    return timesteps
+    _, date_strings = timestep_calendar(start_date_str, max(int(n_timesteps), 1),
+                                        delta_t, time_unit)
+    return list(date_strings)
 
 
 def read_zone_definition(zone_file):
@@ -42,6 +42,7 @@ from iwfm.debug.logger_setup import logger
 from iwfm.hdf5.hdf_metadata_base import HdfBackend, HdfMetadata
 from iwfm.hdf5.hdf_exceptions import BackendNotAvailableError, DataSourceError
 from iwfm.hdf5.hdf5_utils import decode_hdf5_string
+from iwfm.hdf5 import hdf_pool
 
 
 class HdfReader(HdfBackend):
@@ -57,6 +58,12 @@ class HdfReader(HdfBackend):
         Path to HDF5 file (budget or zone budget file)
     verbose : bool, optional
         If True, print status messages (default False)
+    pooled : bool, optional
+        If True, share an open handle and decoded attributes through
+        iwfm.hdf5.hdf_pool, so opening the same file again is nearly free.
+        close() then releases the reader but leaves the file open in the
+        pool; use hdf_pool.close_all() to close it. If False (default),
+        the reader owns its handle and close() closes the file
 
     Raises
     ------
@@ -72,7 +79,7 @@ class HdfReader(HdfBackend):
     ...     print(f"Elements: {hdf.get_n_elements()}")
     """
 
-    def __init__(self, hdf5_file: str, verbose: bool = False):
+    def __init__(self, hdf5_file: str, verbose: bool = False, pooled: bool = False):
         if h5py is None:
             logger.error("h5py module not available")
             raise BackendNotAvailableError(
@@ -82,13 +89,17 @@ class HdfReader(HdfBackend):
 
         self._hdf5_file = hdf5_file
         self._verbose = verbose
+        self._pooled = pooled
         self._h5file = None
         self._metadata_cache = None
 
         logger.debug(f"Opening HDF5 file: {hdf5_file}")
 
         try:
-            self._h5file = h5py.File(hdf5_file, 'r')
+            if pooled:
+                self._h5file = hdf_pool.get_handle(hdf5_file)
+            else:
+                self._h5file = h5py.File(hdf5_file, 'r')
             if verbose:
                 print(f"Opening HDF5 file: {hdf5_file}")
             logger.info(f"Opened HDF5 file: {hdf5_file}")
@@ -124,7 +135,7 @@ class HdfReader(HdfBackend):
         logger.debug(f"Reading attribute: {attr_name}")
 
         try:
-            attrs = self._h5file['Attributes'].attrs
+            attrs = self._attributes()
             if attr_name in attrs:
                 value = attrs[attr_name]
                 logger.debug(f"  {attr_name}={value}")
@@ -146,6 +157,13 @@ class HdfReader(HdfBackend):
                 f"This may not be a valid IWFM HDF5 file."
             ) from e
 
+    def _attributes(self):
+        """Return the 'Attributes' group attributes, decoded once per file when pooled."""
+        if self._pooled:
+            return hdf_pool.get_cached(self._hdf5_file, 'attributes',
+                                       lambda f: dict(f['Attributes'].attrs))
+        return self._h5file['Attributes'].attrs
+
     def get_n_nodes(self, verbose: bool = False) -> int:
         """Get the number of nodes from HDF5 file.
 
@@ -344,10 +362,16 @@ class HdfReader(HdfBackend):
         return metadata
 
     def close(self):
-        """Close the HDF5 file and release resources."""
+        """Close the HDF5 file and release resources.
+
+        A pooled handle stays open in iwfm.hdf5.hdf_pool for reuse.
+        """
         if self._h5file is not None:
-            logger.info(f"Closing HDF5 file: {self._hdf5_file}")
-            self._h5file.close()
+            if self._pooled:
+                logger.debug(f"Releasing pooled HDF5 file: {self._hdf5_file}")
+            else:
+                logger.info(f"Closing HDF5 file: {self._hdf5_file}")
+                self._h5file.close()
             self._h5file = None
             self._metadata_cache = None
 
@@ -412,7 +436,7 @@ class HdfReader(HdfBackend):
 # Factory Function
 # -----------------------------------------------------------------------------
 
-def open_hdf(hdf5_file: str, verbose: bool = False) -> HdfReader:
+def open_hdf(hdf5_file: str, verbose: bool = False, pooled: bool = False) -> HdfReader:
     """Open an IWFM HDF5 output file for metadata access.
 
     Parameters
@@ -421,6 +445,9 @@ def open_hdf(hdf5_file: str, verbose: bool = False) -> HdfReader:
         Path to HDF5 file (budget or zone budget file)
     verbose : bool, optional
         If True, print status messages (default False)
+    pooled : bool, optional
+        If True, reuse a shared handle from iwfm.hdf5.hdf_pool that stays
+        open after close() (default False)
 
     Returns
     -------
@@ -455,7 +482,7 @@ def open_hdf(hdf5_file: str, verbose: bool = False) -> HdfReader:
         print(f"Opening HDF5 file: {hdf5_file}")
     logger.info(f"Opening HDF5 file via open_hdf(): {hdf5_file}")
 
-    return HdfReader(hdf5_file, verbose=verbose)
+    return HdfReader(hdf5_file, verbose=verbose, pooled=pooled)
 
 
 # -----------------------------------------------------------------------------
@@ -0,0 +1,323 @@
+# hdf_pool.py
+# Process-wide pool of open HDF5 file handles and decoded metadata cache
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+"""
+Process-wide pool of read-only HDF5 file handles.
+
+Opening an HDF5 file and decoding its 'Attributes' group is much more
+expensive than reading a small slice from it. The budget and zone budget
+readers therefore share one pool of open h5py
+handles (least recently used handles are closed when the pool is full)
+and a cache of decoded metadata. HdfReader and read_hdf5 use the pool
+when called with pooled=True.
+
+Entries are keyed by absolute path and validated against the file's
+modification time and size, so a file rewritten by a new model run is
+reopened and its metadata decoded again.
+
+Handles returned by get_handle() are shared: callers must not close them.
+Call close_all() to release every handle, e.g. before IWFM overwrites
+its output files.
+
+Examples
+--------
+>>> from iwfm.hdf5.hdf_pool import get_handle, get_cached, close_all
+>>> from iwfm.hdf5.hdf5_utils import decode_hdf5_strings
+>>> f = get_handle('GW_Budget.hdf')
+>>> names = get_cached('GW_Budget.hdf', 'loc_names',
+...                    lambda f: decode_hdf5_strings(f['Attributes/cLocationNames'][:]))
+>>> close_all()
+"""
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+from iwfm.debug.logger_setup import logger
+from iwfm.hdf5.hdf_exceptions import BackendNotAvailableError
+
+
+DEFAULT_POOL_SIZE = 16
+
+_lock = threading.RLock()
+_handles = OrderedDict()   # path -> (signature, h5py.File), least recently used first
+_metadata = {}             # path -> (signature, {key: value})
+_max_handles = DEFAULT_POOL_SIZE
+
+
+def _signature(path):
+    """File identity used to detect files rewritten since they were opened."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _close_handle(path, handle):
+    try:
+        if handle:  # False once closed by a caller
+            handle.close()
+    except Exception as e:  # pragma: no cover - closing must never raise
+        logger.warning(f"Error closing HDF5 file {path}: {e}")
+
+
+def _evict(max_handles):
+    """Close least recently used handles until at most max_handles remain."""
+    while len(_handles) > max_handles:
+        path, (_, handle) = _handles.popitem(last=False)
+        logger.debug(f"HDF5 pool: evicting {path}")
+        _close_handle(path, handle)
+
+
+def get_handle(path: str):
+    """Return a shared read-only h5py.File for path, opening it if needed.
+
+    Parameters
+    ----------
+    path : str
+        Path to HDF5 file
+
+    Returns
+    -------
+    h5py.File
+        Open file handle owned by the pool. Do not close it
+
+    Raises
+    ------
+    BackendNotAvailableError
+        If h5py is not installed
+    FileNotFoundError
+        If the file does not exist
+    """
+    if h5py is None:
+        raise BackendNotAvailableError(
+            "HDF5 file pool requires h5py module. Install with: pip install h5py")
+
+    key = os.path.abspath(path)
+    signature = _signature(key)
+
+    with _lock:
+        entry = _handles.get(key)
+        if entry is not None:
+            old_signature, handle = entry
+            if old_signature == signature and handle:
+                _handles.move_to_end(key)
+                return handle
+            # File changed on disk or was closed by a caller
+            del _handles[key]
+            _close_handle(key, handle)
+            if old_signature != signature:
+                _metadata.pop(key, None)
+
+        handle = h5py.File(key, 'r')
+        _handles[key] = (signature, handle)
+        logger.debug(f"HDF5 pool: opened {key} ({len(_handles)} open)")
+        _evict(_max_handles)
+        return handle
+
+
+def get_cached(path: str, key: str, loader):
+    """Return decoded metadata for path, calling loader(handle) on a miss.
+
+    Parameters
+    ----------
+    path : str
+        Path to HDF5 file
+    key : str
+        Name of the cached item, e.g. 'loc_names'
+    loader : callable
+        Function taking the open h5py.File and returning the value to cache.
+        Returned arrays are shared between callers, so loaders should
+        return values callers will not modify
+
+    Returns
+    -------
+    any
+        Cached value
+    """
+    abspath = os.path.abspath(path)
+    signature = _signature(abspath)
+
+    with _lock:
+        entry = _metadata.get(abspath)
+        if entry is None or entry[0] != signature:
+            entry = (signature, {})
+            _metadata[abspath] = entry
+        cache = entry[1]
+        if key not in cache:
+            cache[key] = loader(get_handle(abspath))
+        return cache[key]
+
+
+def close_file(path: str):
+    """Close the pooled handle for path and drop its cached metadata."""
+    key = os.path.abspath(path)
+    with _lock:
+        entry = _handles.pop(key, None)
+        _metadata.pop(key, None)
+    if entry is not None:
+        _close_handle(key, entry[1])
+
+
+def close_all():
+    """Close every pooled HDF5 handle and clear the metadata cache."""
+    with _lock:
+        handles = list(_handles.items())
+        _handles.clear()
+        _metadata.clear()
+    for path, (_, handle) in handles:
+        _close_handle(path, handle)
+    if handles:
+        logger.debug(f"HDF5 pool: closed {len(handles)} file(s)")
+
+
+def set_pool_size(max_handles: int):
+    """Set the maximum number of open handles, closing extras if needed.
+
+    Parameters
+    ----------
+    max_handles : int
+        Maximum number of HDF5 files held open at once (at least 1)
+    """
+    global _max_handles
+    if max_handles < 1:
+        raise ValueError(f"max_handles must be at least 1, got {max_handles}")
+    with _lock:
+        _max_handles = int(max_handles)
+        _evict(_max_handles)
+
+
+def pool_info() -> dict:
+    """Return the pool size limit and the paths currently open."""
+    with _lock:
+        return {'max_handles': _max_handles,
+                'open_files': list(_handles.keys()),
+                'cached_files': list(_metadata.keys())}
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+def _load_budget_header(f):
+    from iwfm.hdf5.hdf5_utils import (decode_hdf5_string, decode_hdf5_strings,
+                                      generate_timesteps_from_hdf5)
+
+    attrs = f['Attributes'].attrs
+    n_timesteps = attrs['NTimeSteps']
+    start_date = decode_hdf5_string(attrs['TimeStep%BeginDateAndTime'])
+    delta_t = attrs['TimeStep%DeltaT']
+    time_unit = decode_hdf5_string(attrs['TimeStep%Unit'])
+    return {
+        'n_locations': attrs['nLocations'],
+        'n_timesteps': n_timesteps,
+        'start_date': start_date,
+        'delta_t': delta_t,
+        'time_unit': time_unit,
+        'timesteps': tuple(generate_timesteps_from_hdf5(start_date, n_timesteps,
+                                                        delta_t, time_unit)),
+        'loc_names': tuple(decode_hdf5_strings(f['Attributes/cLocationNames'][:])),
+        'areas': _read_only(f['Attributes/Areas'][:]),
+        'full_headers': tuple(decode_hdf5_strings(attrs['LocationData1%cFullColumnHeaders'])),
+        'col_types': _read_only(attrs['LocationData1%iDataColumnTypes']),
+        'title_templates': tuple(decode_hdf5_strings(attrs['ASCIIOutput%cTitles'])),
+    }
+
+
+def budget_header(path: str) -> dict:
+    """Return the decoded metadata of an IWFM budget HDF5 file, cached.
+
+    Parameters
+    ----------
+    path : str
+        Path to IWFM Budget HDF5 file
+
+    Returns
+    -------
+    dict
+        n_locations, n_timesteps, start_date, delta_t, time_unit,
+        timesteps, loc_names, areas (unconverted), full_headers, col_types
+        and title_templates. Arrays are read-only and sequences are tuples
+    """
+    return get_cached(path, 'budget_header', _load_budget_header)
+
+
+def _load_zbudget_header(f):
+    from iwfm.hdf5.hdf5_utils import (decode_hdf5_string, decode_hdf5_strings,
+                                      generate_timesteps_from_hdf5)
+
+    attrs = f['Attributes'].attrs
+    n_timesteps = attrs['NTimeSteps']
+    n_layers = attrs.get('SystemData%NLayers', attrs.get('NLayers', 1))
+    start_date = decode_hdf5_string(attrs['TimeStep%BeginDateAndTime'])
+    delta_t = attrs['TimeStep%DeltaT']
+    time_unit = decode_hdf5_string(attrs['TimeStep%Unit'])
+
+    if 'SystemData%ElementAreas' in f['Attributes']:
+        elem_areas = _read_only(f['Attributes/SystemData%ElementAreas'][:])
+    elif 'Areas' in f['Attributes']:
+        elem_areas = _read_only(f['Attributes/Areas'][:])
+    else:
+        elem_areas = None
+
+    elem_col_maps = {}
+    for layer_idx in range(1, n_layers + 1):
+        map_name = f'Layer{layer_idx}_ElemDataColumns'
+        if map_name in f['Attributes']:
+            elem_col_maps[layer_idx] = _read_only(f[f'Attributes/{map_name}'][:])
+
+    return {
+        'n_elements': attrs.get('SystemData%NElements', attrs.get('nLocations', 1)),
+        'n_timesteps': n_timesteps,
+        'n_layers': n_layers,
+        'start_date': start_date,
+        'delta_t': delta_t,
+        'time_unit': time_unit,
+        'timesteps': tuple(generate_timesteps_from_hdf5(start_date, n_timesteps,
+                                                        delta_t, time_unit)),
+        'full_data_names': tuple(decode_hdf5_strings(f['Attributes/FullDataNames'][:])),
+        'elem_areas': elem_areas,
+        'elem_col_maps': elem_col_maps,
+    }
+
+
+def zbudget_header(path: str) -> dict:
+    """Return the decoded metadata of an IWFM zone budget HDF5 file, cached.
+
+    Parameters
+    ----------
+    path : str
+        Path to IWFM ZBudget HDF5 file
+
+    Returns
+    -------
+    dict
+        n_elements, n_timesteps, n_layers, start_date, delta_t, time_unit,
+        timesteps, full_data_names, elem_areas (unconverted, or None if
+        the file has none) and elem_col_maps ({layer: column map}).
+        Arrays are read-only and sequences are tuples
+    """
+    return get_cached(path, 'zbudget_header', _load_zbudget_header)
+
+
+atexit.register(close_all)
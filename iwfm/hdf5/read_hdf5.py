@@ -16,14 +16,21 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
-def read_hdf5(filename, verbose=False):
+def read_hdf5(filename, verbose=False, pooled=False):
     '''read_hdf5() - Read an HDF5 file
 
     Parameters
     ----------
     filename : str
         name of hdf5 file
-    
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    pooled : bool, default=False
+        If True, return the shared read-only handle from iwfm.hdf5.hdf_pool,
+        so reading the same file again does not reopen it; do not close it.
+        If False, open a new handle that the caller owns
 
     Returns
     -------
@@ -32,10 +39,14 @@ def read_hdf5(filename, verbose=False):
     '''
     import h5py
     import iwfm
+    from iwfm.hdf5 import hdf_pool
 
     iwfm.file_test(filename)
 
-    f = h5py.File(filename)
+    if pooled:
+        f = hdf_pool.get_handle(filename)
+    else:
+        f = h5py.File(filename, 'r')
 
     if verbose:
         print(f'  Opened {filename}')
@@ -29,6 +29,7 @@ def iwfm_adj_crops(
     skip=4,
     date_head_tail=['09/30/', '_24:00'],
     verbose=False,
+    workers=None,
 ):
     ''' iwfm_adj_crops() - Use change factors to modify IWFM 
         land use files
@@ -68,19 +69,22 @@ def iwfm_adj_crops(
     verbose: bool, default=False
         True = write to cli
 
+    workers : int, default=None
+        number of worker processes to read the land use files. None or 1
+        reads the files one at a time
+
     Returns
     -------
     nothing
     
     '''
+    import numpy as np
     import iwfm
+    from iwfm.lu_data import write_lu_step
+    from iwfm.lu_transform import read_lu_first_step, lu_zone_change
 
     elem_zones = iwfm.read_lu_change_zones(in_zone_file)
 
-    npag_table, dates, elems = iwfm.read_lu_file(in_area_npag, skip) # read ag
-    nvrv_table, _, _ = iwfm.read_lu_file(in_area_nvrv, skip)     # read nv
-    urban_table, _, _ = iwfm.read_lu_file(in_area_urban, skip)   # read urban
-
     changes_NV = iwfm.read_lu_change_factors(in_chg_file_NV)
     changes_UR = iwfm.read_lu_change_factors(in_chg_file_UR)
 
@@ -88,50 +92,38 @@ def iwfm_adj_crops(
     chg_col_nv = iwfm.get_change_col(changes_NV, in_year, in_chg_file_NV)
     chg_col_ur = iwfm.get_change_col(changes_UR, in_year, in_chg_file_UR)
 
-    lu_rows = len(npag_table[0])  # number of rows in land use files
-
-    for i in range(0, len(npag_table)):
-        for j in range(0, len(elem_zones) - 1):  # cycle through elements in zone list
-            elem, zone = elem_zones[j][0], elem_zones[j][1]
-            ag2nv, ag2ur = (
-                1.0 - changes_NV[zone][chg_col_nv],
-                1.0 - changes_UR[zone][chg_col_ur],
-            )  # factors for this zone
-
-            area_ag = round(sum(npag_table[i][elem]), 2)
-            # reduce ag area and add to NV area
-            if ag2nv < 1 and area_ag > 0:
-                ag_start = sum(npag_table[i][elem])
-                temp = [round(j * ag2nv, 2) for k in npag_table[i][elem]]
-                npag_table[i][elem] = temp
-                ag_change = ag_start - sum(npag_table[i][elem])
-                nvrv_table[i][elem][0] = round(nvrv_table[i][elem][0] + ag_change, 2)
-
-            # reduce ag area and add to Urban area
-            if ag2ur < 1 and area_ag > 0:
-                ag_start = sum(npag_table[i][elem])
-                temp = [round(j * ag2ur, 2) for k in npag_table[i][elem]]
-                npag_table[i][elem] = temp
-                ag_change = ag_start - sum(npag_table[i][elem])
-                urban_table[i][elem][0] = round(urban_table[i][elem][0] + ag_change, 2)
+    # - change factor of each zone for water year
+    factors_nv = {row[0]: row[chg_col_nv] for row in changes_NV[1:]}
+    factors_ur = {row[0]: row[chg_col_ur] for row in changes_UR[1:]}
+
+    # -- read the first time step of the ag, native and urban files side by side
+    _, elems, (npag, nvrv, urban) = read_lu_first_step([in_area_npag, in_area_nvrv, in_area_urban],
+                                                       skip, workers=workers)
+    nag, nnv = npag.shape[1], nvrv.shape[1]
+    values = np.hstack((npag, nvrv, urban))
+
+    # -- reduce ag area and add it to the first native and urban columns
+    ag_cols = list(range(nag))
+    for op in (lu_zone_change(elem_zones, factors_nv, ag_cols, nag),
+               lu_zone_change(elem_zones, factors_ur, ag_cols, nag + nnv)):
+        elems, values = op(elems, values)
 
     # -- create the output file names
     out_file_ag = out_basename + '_AG_' + in_year + '.dat'
     out_file_nv = out_basename + '_NV_' + in_year + '.dat'
     out_file_ur = out_basename + '_UR_' + in_year + '.dat'
 
-    # -- test if each output file exists, if so delete
-    iwfm.file_delete(out_file_ag)
-    iwfm.file_delete(out_file_nv)
-    iwfm.file_delete(out_file_ur)
-
-    years = []
-    years.append(in_year)
-
-    # -- write out new data 
-    iwfm.write_lu2file(npag_table, out_file_ag, years, lu_type = 'Ag', verbose=verbose)
-    iwfm.write_lu2file(nvrv_table, out_file_nv, years, lu_type = 'Native', verbose=verbose)
-    iwfm.write_lu2file(urban_table, out_file_ur, years, lu_type = 'Urban', verbose=verbose)
+    date = date_head_tail[0] + str(in_year) + date_head_tail[1]  # date in DSS format
+
+    # -- write out new data
+    parts = np.split(values, [nag, nag + nnv], axis=1)
+    for out_file, part, lu_type in zip((out_file_ag, out_file_nv, out_file_ur), parts,
+                                       ('Ag', 'Native', 'Urban')):
+        iwfm.file_delete(out_file)  # delete the output file if it exists
+        with open(out_file, 'w') as f:
+            write_lu_step(f, date, elems, part, fmt='%.2f')
+        if verbose:
+            print(f'  Wrote {lu_type} land use for {in_year} to {out_file}')
 
     return 
 
@@ -313,3 +313,68 @@ class GroundwaterFiles(_DictAccessMixin):
     pump_file: str = 'none'
     subs_file: str = 'none'
     headall: str = 'none'
+
+
+@dataclass
+class LandUseData:
+    """Land use areas from an IWFM land use file, see read_lu_data().
+
+    Attributes
+    ----------
+    values : numpy array of floats
+        land use areas, shape (time steps, elements, crops or land use types)
+    elems : numpy array of ints
+        element numbers, in file order
+    dates : numpy array of str
+        DSS date of each time step
+    header : tuple of str
+        file lines above the first data line
+    """
+    values: object = None
+    elems: object = None
+    dates: object = None
+    header: tuple = ()
+
+    def select(self, elems):
+        """Return a LandUseData with only the rows of elems, in file order."""
+        import numpy as np
+
+        keep = np.isin(self.elems, np.fromiter((int(e) for e in elems), dtype=np.int64))
+        return LandUseData(values=self.values[:, keep, :], elems=self.elems[keep],
+                           dates=self.dates, header=self.header)
+
+
+@dataclass
+class TimeSeriesData:
+    """Values from an IWFM time-series input file, see read_ts_data().
+
+    Attributes
+    ----------
+    values : numpy array of floats
+        data, shape (time steps, columns)
+    times : numpy array of datetime64[D]
+        day of each time step
+    dates : numpy array of str
+        DSS date of each time step, e.g. '09/30/2000_24:00'
+    ncol : int
+        number of columns from the file header (NCOL)
+    fact : float
+        conversion factor from the file header (FACT)
+    nsp : int
+        number of time steps to update the data (NSP)
+    nfq : int
+        repetition frequency of the data (NFQ)
+    dssfl : str
+        DSS file name, '' if none
+    header : tuple of str
+        file lines above the first data line
+    """
+    values: object = None
+    times: object = None
+    dates: object = None
+    ncol: int = 0
+    fact: float = 1.0
+    nsp: int = 1
+    nfq: int = 0
+    dssfl: str = ''
+    header: tuple = ()
@@ -25,8 +25,9 @@ def iwfm_lu2refined(in_lu_file,lu_factors,verbose=False):
     in_lu_file : str
         IWFM Land Use file name
 
-    lu_factors : list
-        list of land use factors for refined model elements
+    lu_factors : list or tuple
+        list of land use factors for refined model elements from
+        refined_lu_factors(), or the tuple of arrays from refined_lu_index()
 
     verbose : bool, default=False
         True = command-line output on
@@ -37,71 +38,33 @@ def iwfm_lu2refined(in_lu_file,lu_factors,verbose=False):
 
     '''
     import os
-    import re
     import iwfm
-    from iwfm.file_utils import read_next_line_value
+    from iwfm.lu_transform import lu_transform, lu_split
 
-
-    # read the original IWFM Land Use file
     iwfm.file_test(in_lu_file)
-    with open(in_lu_file) as f:
-        lu_lines = f.read().splitlines()  # open and read input file
-    _, line_index = read_next_line_value(lu_lines, -1, column=0, skip_lines=4)  # skip comments and header
 
-    # open the output land use file
+    # the output land use file
     out_lu_file_name = os.path.basename(in_lu_file).split('.')[0]+'_refined.dat'
 
-    # get number of time periods in the original land use file
+    # each refined element gets its share of the original element's land use
+    if isinstance(lu_factors, tuple):
+        refined_elems, orig_elems, area_mults = lu_factors
+    else:
+        refined_elems = [factor[0] for factor in lu_factors]
+        orig_elems = [factor[1] for factor in lu_factors]
+        area_mults = [factor[2] for factor in lu_factors]
+
     ntimes = 0
-    l_index = line_index
-    while l_index < len(lu_lines):
-        if re.search('/', lu_lines[l_index]):
-            ntimes += 1
-        l_index += 1
-
-    # get the number of lines per time period
-    nlines = int((len(lu_lines) - line_index) / ntimes)
-
-    with open(out_lu_file_name, 'w') as out_lu_file:
-        # write the header to the new land use file
-        for line in range(line_index):
-            out_lu_file.write(lu_lines[line]+'\n')
-
-        # step through time periods, reading the original land use file and writing the new land use file
-        for time_period in range(0,ntimes):
-            orig_land_use = {}
-            # get date from the first line of the time period
-            for line in range(0,nlines):
-                this_line = lu_lines[line_index].split()
-
-                if len(orig_land_use) == 0:                 # first line contains date
-                    this_date = this_line.pop(0)
-                    if verbose: print(f'  Processing {this_date}')
-
-                key = int(this_line[0])
-                vals = []
-                for item in this_line[1:]:
-                    vals.append(float(item))
-                orig_land_use[key] = vals
-                line_index += 1
-
-            # write one time period of land use data to the new land use file
-            count = 0
-            for factor in lu_factors:
-                refined_elem, orig_elem, area_mult = factor[0], factor[1], factor[2]
-
-                orig_areas = orig_land_use[orig_elem]
-                new_areas = [round(orig_areas[i]*area_mult,3) for i in range(0,len(orig_areas))]
-
-                new_areas_txt = '\t'.join([str(i) for i in new_areas])
-
-                if count == 0:  # first element -> add date
-                    new_areas_txt = this_date + '\t' + str(refined_elem) + '\t' + new_areas_txt
-                else:
-                    new_areas_txt = '\t' + str(refined_elem) + '\t' + new_areas_txt
-
-                out_lu_file.write(f'{new_areas_txt}\n')
-                count += 1
+
+    def on_step(date):
+        nonlocal ntimes
+        ntimes += 1
+        if verbose: print(f'  Processing {date}')
+
+    # stream the original land use file one time period at a time, with areas
+    # rounded to 3 decimals
+    lu_transform(in_lu_file, out_lu_file_name, [lu_split(refined_elems, orig_elems, area_mults)],
+                 fmt='%.3f', on_step=on_step)
 
     if verbose: print(f'  Wrote {ntimes} time periods of land use data to {out_lu_file_name}')
 
@@ -137,7 +100,7 @@ if __name__ == '__main__':
 
     idb.exe_time()  # initialize timer
 
-    lu_factors = iwfm.refined_lu_factors(orig_elems_file,refined_elems_file,elem2elem_file)
+    lu_factors = iwfm.refined_lu_index(orig_elems_file,refined_elems_file,elem2elem_file)
 
     iwfm_lu2refined(in_lu_file, lu_factors, verbose=verbose)
     
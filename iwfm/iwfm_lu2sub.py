@@ -47,65 +47,42 @@ def iwfm_lu2sub(
     
     Returns
     -------
-    nothing
+    nlines : int
+        number of land use data lines written
     
     '''
-    import sys, re
+    import sys
     import iwfm
-    from iwfm.file_utils import read_next_line_value
+    from iwfm.lu_transform import lu_transform, lu_subset
 
     iwfm.file_test(elem_file)
     elem_ids, _, _ = iwfm.iwfm_read_elements(elem_file)
-    elem_ids.sort()
 
     iwfm.file_test(lu_file)
-    with open(lu_file) as f:
-        lu_lines = f.read().splitlines()  # open and read input file
-    _, line_index = read_next_line_value(lu_lines, -1, column=0, skip_lines=4)  # skip comments
-    header = line_index
 
+    on_step = None
     if verbose:
         outport = iwfm.Unbuffered(sys.stdout)  # to write unbuffered output to console
-
-    out_lines, print_count = [], 0
-    while line_index < len(lu_lines):
-        out = []
-        this_line = lu_lines[line_index].split()
-        if re.search('/', lu_lines[line_index]):  # catch date
-            this_date = this_line.pop(0)
-
-            if verbose:  # write progress to console
-                if print_count > per_line - 2:
-                    outport.write(' ' + this_date[:10])
-                    print_count = 0
+        print_count = 0
+
+        def on_step(date):  # write progress to console
+            nonlocal print_count
+            if print_count > per_line - 2:
+                outport.write(' ' + date[:10])
+                print_count = 0
+            else:
+                if print_count == 0:
+                    outport.write('\n  ' + date[:10])
                 else:
-                    if print_count == 0:
-                        outport.write('\n  ' + this_date[:10])
-                    else:
-                        outport.write(' ' + this_date[:10])
-                    print_count += 1
-
-        # -- build the output line
-        if int(this_line[0]) in elem_ids:
-            if int(this_line[0]) == elem_ids[0]:  # first element -> add date
-                out.append(this_date)
-            for j in range(0, len(this_line)):  # add the rest of the line
-                out.append('\t' + this_line[j])
-            out_lines.append(out)
-        line_index += 1
+                    outport.write(' ' + date[:10])
+                print_count += 1
+
+    # -- stream the land use file one time step at a time, keeping the submodel elements
+    nlines = lu_transform(lu_file, out_file, [lu_subset(elem_ids)], skip=skip, on_step=on_step)
+
     if verbose:
         outport.write('\n')
-
-    with open(out_file, 'w') as f:
-        for i in range(0, header):  # copy top of input file to output
-            f.write(lu_lines[i])
-            f.write('\n')
-        for i in range(0, len(out_lines)):
-            this_line = out_lines[i]
-            for j in range(0, len(this_line)):
-                f.write(this_line[j])
-            f.write('\n')
-    return len(out_lines)
+    return nlines
 
 
 if __name__ == '__main__':
@@ -25,12 +25,12 @@ def iwfm_lu4scenario(
     in_nvrv_file,
     skip=4,
     verbose=False,
+    workers=None,
 ):
     ''' iwfm_lu4scenario() - Modify IWFM land use files for a scenario
 
-    TODO:
-      Each land use file is done in series. Can this be replaced with a function that
-        does one land use file, and use the function for each land use file?
+    The first time step of each file is read with read_lu_first_step(),
+    with the four files read in parallel when workers > 1.
 
     Parameters
     ----------
@@ -55,161 +55,37 @@ def iwfm_lu4scenario(
     verbose : bool, default=False
         True = command-line output on
 
+    workers : int, default=None
+        number of worker processes to read the files. None or 1 reads the
+        files one at a time
+
     Returns
     -------
     nothing
 
     '''
-    comments = 'Cc*#'
-
-    # -- Non-Ponded Area file
-    with open(in_npag_file) as f:
-        npag_data = f.read().splitlines()
-    if verbose:
-        print(f'   Read {len(npag_data):,} lines from {in_npag_file}')
-
-    npag_index = 0
-    while any((c in comments) for c in npag_data[npag_index][0]): 
-        npag_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        npag_index += 1
-    while any((c in comments) for c in npag_data[npag_index][0]):
-        npag_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = npag_data[npag_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    npag_table = []
-    npag_table.append(line)
-    npag_index += 1
-    npag_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while npag_index < len(npag_data):
-        line = npag_data[npag_index].split()
-        elem = line.pop(0)
-        npag_table.append(line)
-        npag_index += 1
-
-    # -- Ponded Area file
-    with open(in_ponded_file) as f:
-        pag_data = f.read().splitlines() 
-    if verbose:
-        print(f'   Read {len(pag_data):,} lines from {in_ponded_file}')
-
-    pag_index = 0
-    while any((c in comments) for c in pag_data[pag_index][0]):
-        pag_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        pag_index += 1
-    while any((c in comments) for c in pag_data[pag_index][0]):
-        pag_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = pag_data[pag_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    pag_table = []
-    pag_table.append(line)
-    pag_index += 1
-    pag_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while pag_index < len(pag_data):
-        line = pag_data[pag_index].split()
-        elem = line.pop(0)
-        pag_table.append(line)
-        pag_index += 1
-
-    # -- Urban Area file
-    with open(in_urban_file) as f:
-        urb_data = f.read().splitlines() 
-    if verbose:
-        print(f'   Read {len(urb_data):,} lines from {in_urban_file}')
-
-    urb_index = 0
-    while any((c in comments) for c in urb_data[urb_index][0]):
-        urb_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        urb_index += 1
-    while any((c in comments) for c in urb_data[urb_index][0]):
-        urb_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = urb_data[urb_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    urb_table = []
-    urb_table.append(line)
-    urb_index += 1
-    urb_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while urb_index < len(urb_data):
-        line = urb_data[urb_index].split()
-        elem = line.pop(0)
-        urb_table.append(line)
-        urb_index += 1
-
-    # -- Native and Riparian Area file
-    with open(in_nvrv_file) as f:
-        nvrv_data = f.read().splitlines()
+    from itertools import chain
+    import numpy as np
+    from iwfm.lu_transform import read_lu_first_step
+
+    # -- read the first time step of the four files: 20 non-ponded, 5 ponded,
+    #    native and riparian, and urban columns
+    in_files = [in_npag_file, in_ponded_file, in_nvrv_file, in_urban_file]
+    date, elems, blocks = read_lu_first_step(in_files, skip, ncols=[20, 5, 2, 1], workers=workers)
     if verbose:
-        print(f'   Read {len(nvrv_data):,} lines from {in_nvrv_file}')
-
-    nvrv_index = 0
-    while any((c in comments) for c in nvrv_data[nvrv_index][0]):
-        nvrv_index += 1
-    for i in range(0, skip):  # skip data spec rows
-        nvrv_index += 1
-    while any((c in comments) for c in nvrv_data[nvrv_index][0]):
-        nvrv_index += 1
-
-    # -- compile the data from the file 
-    # the first line contains the date, elemeno, and land use data
-    line = nvrv_data[nvrv_index].split()
-    date = line.pop(0)
-    elem = line.pop(0)
-    nvrv_table = []
-    nvrv_table.append(line)
-    nvrv_index += 1
-    nvrv_cols = len(line)  # including elem_no column
-    # do the remaining lines
-    while nvrv_index < len(nvrv_data):
-        line = nvrv_data[nvrv_index].split()
-        elem = line.pop(0)
-        nvrv_table.append(line)
-        nvrv_index += 1
-
-    # -- build one table from the four data sets
-    import itertools
-
-    land_use = []
-    for i in range(0, len(npag_table)):
-        npag = npag_table[i][0:20]
-        pag = pag_table[i]
-        urb = urb_table[i][0]
-        nvrv = nvrv_table[i]
-        x = []
-        x.append([str(i + 1)])
-        x.append(npag_table[i][0:20])
-        x.append(pag_table[i][0:5])
-        x.append(nvrv_table[i][0:2])
-        y = list(itertools.chain.from_iterable(x))
-        y.append(urb_table[i][0])
-        land_use.append(y)
+        for in_file, block in zip(in_files, blocks):
+            print(f'   Read {block.shape[0]:,} elements from {in_file}')
 
-    # -- write to file
+    # -- build one table from the four data sets and write to file
+    rows = np.column_stack([elems] + blocks).tolist()
+    block = ('%d' + '\t%s' * (len(rows[0]) - 1) + '\n') * len(rows) if rows else ''
     outFileName = out_base_name + '_Landuse.dat'
     with open(outFileName, 'w', newline='') as outFile:
         outFile.write(f'# Date: {date}\n')
         outFile.write(
             '# Elem\tNPA1\tNPA2\tNPA3\tNPA4\tNPA5\tNPA6\tNPA7\tNPA8\tNPA9\tNPA10\tNPA11\tNPA12\tNPA13\tNPA14\tNPA15\tNPA16\tNPA17\tNPA18\tNPA19\tNPA20\tPA1\tPA2\tPA3\tPA4\tPA5\tNV\tRV\tUrb\n'
         )
-        for i in range(0, len(npag_table)):
-            outFile.write('\t'.join(land_use[i]))
-            outFile.write('\n')
+        outFile.write(block % tuple(chain.from_iterable(rows)))
     if verbose:
         print(f'   Wrote land use data for {date} to {outFileName}')
     return
@@ -229,12 +105,14 @@ if __name__ == '__main__':
         in_ponded_file = sys.argv[3]
         in_urban_file = sys.argv[4]
         in_nvrv_file = sys.argv[5]
+        workers = int(sys.argv[6]) if len(sys.argv) > 6 else None
     else:  # ask for file names from terminal
         out_base_name  = input('Output file basename: ')
         in_npag_file   = input('IWFM Non-Ponded Ag file name: ')
         in_ponded_file = input('IWFM Pondes Ag file name: ')
         in_urban_file  = input('IWFM Urban file name: ')
         in_nvrv_file   = input('IWFM Native file name: ')
+        workers        = None
 
     iwfm.file_test(in_nvrv_file)
     iwfm.file_test(in_npag_file)
@@ -243,6 +121,6 @@ if __name__ == '__main__':
 
     idb.exe_time()  # initialize timer
     iwfm_lu4scenario(out_base_name,in_npag_file,in_ponded_file,
-        in_urban_file,in_nvrv_file,verbose=False)
+        in_urban_file,in_nvrv_file,verbose=False,workers=workers)
 
     idb.exe_time()  # print elapsed time
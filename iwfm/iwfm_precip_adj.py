@@ -18,6 +18,186 @@
 # -----------------------------------------------------------------------------
 
 
+BLOCK_ROWS = 4096               # time steps adjusted and written at a time
+
+
+def _read_elem_vic(elem_VIC_filename, ncol):
+    ''' _read_elem_vic() - Read the VIC grid cell and region of each
+        precipitation column; columns without a VIC cell get cell 0 '''
+    import re
+    import numpy as np
+    import iwfm
+
+    iwfm.file_test(elem_VIC_filename)
+    with open(elem_VIC_filename) as f:
+        elem_vic = f.read().splitlines()[1:]  # remove header line
+
+    vic_ids, regions = np.zeros(ncol, dtype=np.int64), [None] * ncol
+    for line in elem_vic:
+        if not line.strip():
+            continue
+        item = re.split(';|,|\t', line)
+        col = int(item[0])
+        if 1 <= col <= ncol:
+            vic_ids[col - 1], regions[col - 1] = int(item[1]), item[2]
+    return vic_ids, regions, len(elem_vic)
+
+
+def _read_vic_factors(factors_filename):
+    ''' _read_vic_factors() - Read monthly VIC factors into a sorted array of
+        years and a (year, month, vic_cell) array, NaN for months without
+        factors '''
+    import re
+    import numpy as np
+    import iwfm
+
+    iwfm.file_test(factors_filename)
+    with open(factors_filename) as f:
+        factors = f.read().splitlines()[1:]  # remove header row
+
+    keys, rows = [], []
+    for line in factors:
+        if len(line) <= 1:
+            break
+        factor = re.split(';|,|\t', line)
+        mm, dd, yy = re.split('/', factor[0])
+        keys.append((int(yy), int(mm)))
+        rows.append([float(x) for x in factor[1:]])
+
+    years = np.array(sorted({year for year, _ in keys}), dtype=np.int64)
+    table = np.full((len(years), 12, len(rows[0]) if rows else 0), np.nan)
+    for (year, month), row in zip(keys, rows):
+        table[np.searchsorted(years, year), month - 1] = row
+    return years, table
+
+
+def _read_rep_years(years_filename):
+    ''' _read_rep_years() - Read replacement years for years without VIC
+        factors; returns the column of each region and key = year, value =
+        list of replacement years '''
+    import re
+    import iwfm
+
+    iwfm.file_test(years_filename)
+    with open(years_filename) as f:
+        rep_years = f.read().splitlines()
+
+    rep_list = rep_years[0].split(',')  # header
+    d_repyr_col = {rep_list[i]: i - 1 for i in range(1, len(rep_list))}
+
+    d_VICyear = {}
+    for year in rep_years[1:]:
+        if year.strip():
+            item = [int(x) for x in re.split(';|,|\t', year)]
+            d_VICyear[item[0]] = item[1:]
+    return d_repyr_col, d_VICyear
+
+
+def _factor_index(years, vic_ids, regions, fyears, d_repyr_col, d_VICyear):
+    ''' _factor_index() - Row of the factor table year axis for each
+        (precipitation year, column), using replacement years where a year
+        has no VIC factors '''
+    import numpy as np
+
+    has_vic = vic_ids > 0
+    col_year = np.repeat(years[:, None], len(vic_ids), axis=1)
+
+    missing = ~np.isin(years, fyears)
+    if missing.any() and has_vic.any():
+        try:
+            rep = np.array([d_VICyear[year] for year in years[missing].tolist()], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f'year {e.args[0]} has no VIC factors and no replacement year') from None
+        try:
+            region_col = np.array([d_repyr_col[r] if r is not None else 0 for r in regions])
+        except KeyError as e:
+            raise ValueError(f'region {e.args[0]} is not in the replacement years file') from None
+        col_year[missing] = np.where(has_vic, rep[:, region_col], col_year[missing])
+
+    bad = has_vic & ~np.isin(col_year, fyears)
+    if bad.any():
+        raise ValueError(f'no VIC factors for year {col_year[bad][0]}')
+    return np.minimum(np.searchsorted(fyears, col_year), max(len(fyears) - 1, 0))
+
+
+def _precip_adj_write(header, dates, precip, vic_ids, regions, factors_filename,
+                      years_filename, out_filename, factors_out='factors.dat',
+                      verbose=False, per_line=6):
+    ''' _precip_adj_write() - Adjust parsed precipitation rates by one set of
+        VIC factors and write the IWFM precipitation file, see
+        iwfm_precip_adj() '''
+    import sys
+    from contextlib import ExitStack
+    from itertools import chain
+    import numpy as np
+    import iwfm
+
+    fyears, table = _read_vic_factors(factors_filename)
+    d_repyr_col, d_VICyear = _read_rep_years(years_filename)
+
+    nvic = table.shape[2]
+    bad = vic_ids[(vic_ids < 0) | (vic_ids > nvic)]
+    if len(bad):
+        raise ValueError(f'VIC cell {bad[0]} is not in {factors_filename}')
+
+    # factor table with a last cell of 1.0 for columns without a VIC cell,
+    # and the same table rounded for factors_out
+    table = np.concatenate((table, np.ones(table.shape[:2] + (1,))), axis=2)
+    rounded = np.array([round(x, 2) for x in table.ravel().tolist()]).reshape(table.shape)
+    cells = np.where(vic_ids > 0, vic_ids - 1, nvic)
+
+    months = np.array([int(d[:2]) for d in dates], dtype=np.int64)
+    years, year_rows = np.unique(np.array([int(d[6:10]) for d in dates], dtype=np.int64),
+                                 return_inverse=True)
+    year_index = _factor_index(years, vic_ids, regions, fyears, d_repyr_col, d_VICyear)
+
+    if verbose:
+        print(f'  Processing {len(dates):,} precipitation dates...')
+        outport = iwfm.Unbuffered(sys.stdout)
+
+    ncol = precip.shape[1]
+    with ExitStack() as stack:
+        of = stack.enter_context(open(out_filename, 'w'))
+        of.write(''.join(line + '\n' for line in header))
+        factfile = None
+        if factors_out is not None:  # write out the factors to a separate file just in case...
+            factfile = stack.enter_context(open(factors_out, 'w'))
+            factfile.write('Date            \t' + '\t'.join(map(str, range(1, ncol + 1))) + '\n')
+
+        print_count = 0
+        for start in range(0, len(dates), BLOCK_ROWS):
+            block = slice(start, start + BLOCK_ROWS)
+            index = (year_index[year_rows[block]], months[block, None] - 1, cells)
+            factors = table[index]
+            if np.isnan(factors).any():
+                row = np.flatnonzero(np.isnan(factors).any(axis=1))[0]
+                raise ValueError(f'{factors_filename} has no factors for the month of '
+                                 f'{dates[start + row]}')
+
+            new_p = np.round(precip[block] * factors, 2)
+            line_fmt = '%s' + '\t%s' * ncol + '\n'
+            block_dates = dates[block]
+            of.write((line_fmt * len(block_dates)) % tuple(chain.from_iterable(
+                [date] + row for date, row in zip(block_dates, new_p.tolist()))))
+            if factfile is not None:
+                factfile.write((line_fmt * len(block_dates)) % tuple(chain.from_iterable(
+                    [date] + row for date, row in zip(block_dates, rounded[index].tolist()))))
+
+            if verbose:  # write progress to console
+                date = block_dates[-1].replace('_24:00', '')
+                outport.write(('\n  ' if print_count == 0 else ' ') + date)
+                print_count = (print_count + 1) % per_line
+
+    if verbose:
+        outport.write('\n')
+        ex = (np.flatnonzero(vic_ids == 0) + 1).tolist()
+        if len(ex) > 0:
+            print(f'\n  These precipitation columns had no VIC ID and were not changed:')
+            print('   '+','.join([str(i) for i in ex]))
+
+        print(f'\n  Wrote adjusted precipitation rates to {out_filename}\n')
+
+
 def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
     years_filename,out_filename,verbose=False,per_line=6):
     ''' iwfm_precip_adj() - Read an IWFM precipitation file, a list of VIC grid 
@@ -25,6 +205,11 @@ def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
         factors for each VIC grid cell, and writes out an IWFM precipitation 
         file with precipitation rates adjusted by the VIC factors
 
+    The precipitation rates are read into a (time, column) array and the
+    factors into a (year, month, VIC cell) array. Each block of time steps
+    is adjusted with one indexed lookup and multiply and written as it is
+    done. The factors used are also written to factors.dat.
+
     Parameters
     ----------
     precip_filename : str
@@ -53,150 +238,57 @@ def iwfm_precip_adj(precip_filename,elem_VIC_filemane,factors_filename,
     nothing
 
     '''
-    import re, sys
-    import numpy as np
     import iwfm
+    from iwfm.ts_data import read_ts_data
 
-    skip = 5  # skip 5 non-comment lines before reaching data lines
-
-    # -- read precip column-VIC grid linkage ------------------------
-    # data: precip col -> region, VIC ID
-    iwfm.file_test(elem_VIC_filemane)
-    with open(elem_VIC_filemane) as f:
-        elem_vic = f.read().splitlines()
-    elem_vic.pop(0)  # remove header lines
-    vic_rows = len(elem_vic)
-
-    vic_cols = {}
-    for item in elem_vic:
-        item = re.split(';|,|\t', item)
-        vic_cols[int(item[0])]=[int(item[1]),item[2],item[3]]
+    iwfm.file_test(precip_filename)
+    ts = read_ts_data(precip_filename)
+    vic_ids, regions, vic_rows = _read_elem_vic(elem_VIC_filemane, ts.values.shape[1])
     if verbose:
         print(f'  Read VIC grid data for {vic_rows:,} precipitation columns')
 
-    # -- get the climate factors ------------------------------------
-    iwfm.file_test(factors_filename)
-    with open(factors_filename) as f:
-        factors = f.read().splitlines()  # open and read input file
-    factors.pop(0)  # remove header row
-    
-    d_factors, vic_years, i = {}, [], 0
-    while i < len(factors) and len(factors[i]) > 1:  # put factors into a dictionary
-        factor = re.split(';|,|\t', factors[i])
-        mm, dd, yy = re.split('/', factor[0])
-        month = str(yy) + '-' + str(mm)
-        if yy not in vic_years:
-            vic_years.append(yy)  # list of calendar years with factors
-        factor = [float(x) for x in factor[1:]]
-        d_factors[month] = factor
-        i += 1
-
-   # -- replacement years for years without VIC factors ------------
-    iwfm.file_test(years_filename)
-    with open(years_filename) as f:
-        rep_years = f.read().splitlines()  # open and read input file
+    _precip_adj_write(ts.header, ts.dates.tolist(), ts.values, vic_ids, regions, factors_filename,
+                      years_filename, out_filename, verbose=verbose, per_line=per_line)
+    return
 
-    d_repyr_col = {}  # region name -> column of replacement years file
-    rep_list = rep_years[0].split(',') # header
-    for i in range(1, len(rep_list)):
-        d_repyr_col[rep_list[i]] = i - 1
 
-    # create a dictionary of all years and replacement years for missing VIC years
-    rep_years.pop(0)  # remove header line
-    d_VICyear = {}
-    for year in rep_years:
-        item = re.split(';|,|\t', year)
-        item = [int(x) for x in item]
-        d_VICyear[item[0]] = item[1:]
+def iwfm_precip_adj_batch(precip_filename, elem_VIC_filename, scenarios, verbose=False):
+    ''' iwfm_precip_adj_batch() - Write adjusted IWFM precipitation files for
+        several climate scenarios from one read of the precipitation file
 
-    # -- read IWFM precipitation file ------------------------------------
-    iwfm.file_test(precip_filename)
-    with open(precip_filename) as f:
-        precip = f.read().splitlines()  # open and read input file
-
-    with open(out_filename, 'w') as of: # open output file for copy of header info
-
-        # find line with first data set, get month and year
-        pline, status = 0, 1  # pline = line being processed, continue until status < 1
-        while status > 0:
-            if precip[pline][0] == 'C':  # skip lines that begin with 'C', 'c' or '*'
-                of.write(precip[pline] + '\n')
-                pline += 1
-            elif precip[pline][0] != 'C':
-                if skip > 0:  # also handle the other header lines
-                    of.write(precip[pline] + '\n')
-                    skip -= 1
-                    pline += 1
-                else:
-                    items = precip[pline].split()
-                    pmonth = int(items[0][0:2])
-                    pyear = int(items[0][6:10])
-                    cols = len(items)
-                    status = 0
-
-        # -- do the work -------------------------------------------------
-        if verbose:
-            print(f'  Processing {len(precip) - pline :,} precipitation dates...')
+    Parameters
+    ----------
+    precip_filename : str
+      Name of existing IWFM precipitation file
 
-        if verbose:  # create outport to write unbuffered output to console
-            outport = iwfm.Unbuffered(sys.stdout)
+    elem_VIC_filename : str
+      Name of file linking model elements to VIC elements
 
-        print_count = 0
-        # write out the factors to a separate file just in case...
-        with open('factors.dat', 'w') as factfile:  
-            factfile.write('Date            \t' + '\t'.join(map(str, [i for i in range(1,cols+1)])) + '\n')
-
-            # process each row of the precipitation file, replacing adjusted values
-            while pline < len(precip) and len(precip[pline]) > 10:
-                items = precip[pline].split()
-                pline += 1
-
-                p = [float(x) for x in items[1:]] # precip
-
-                date = items[0].replace('_24:00', '')
-                if verbose:  # write progress to console
-                    if print_count > per_line - 2:
-                        outport.write(' ' + date)
-                        print_count = 0
-                    else:
-                        if print_count == 0:
-                            outport.write('\n  ' + date)
-                        else:
-                            outport.write(' ' + date)
-                        print_count += 1
-
-                f, ex = [], []
-                for e in range(1, len(items)):  # cycle through precip columns
-                    try:
-                        vic_id = vic_cols[e][0]  # precip column -> VIC_ID
-                    except (KeyError, IndexError):
-                        # No VIC ID for this column - use factor of 1.0 (no change)
-                        f.append(1.0)  # factor of precip column
-                        ex.append(e)
-                    else:
-                        mm, dd, yy = re.split('/', date)
-                        month = str(yy) + '-' + str(int(mm))
-
-                        if yy not in vic_years:  # use replacement years
-                            # replacement year can vary by precip column
-                            repyr = d_VICyear[int(yy)]     # replacement year as string
-                            yy = repyr[d_repyr_col[vic_cols[e][1]]]
-                            month = str(yy) + '-' + str(int(mm))
-
-                        f.append(d_factors[month][vic_id-1])  # factor of precip column
-
-                new_p = np.round(np.array(p) * np.array(f), 2)
-                of.write(items[0] + '\t' + '\t'.join(map(str, new_p)) + '\n')
-                factfile.write(items[0] + '\t' + '\t'.join(map(str, [round(F,2) for F in f])) + '\n')
-
-
-    if verbose:  # write progress to console
-        outport.write('\n')
-        if len(ex) > 0:
-            print(f'\n  These precipitation columns had no VIC ID and were not changed:')
-            print('   '+','.join([str(i) for i in ex]))
+    scenarios : list of tuples
+      (factors_filename, years_filename, out_filename) of each scenario,
+      see iwfm_precip_adj()
 
-        print(f'\n  Wrote adjusted precipitation rates to {out_filename}\n')
+    verbose : bool, default=False
+     Turn command-line output on or off
+
+    Returns
+    -------
+    nothing
+
+    '''
+    import iwfm
+    from iwfm.ts_data import read_ts_data
+
+    iwfm.file_test(precip_filename)
+    ts = read_ts_data(precip_filename)
+    vic_ids, regions, _ = _read_elem_vic(elem_VIC_filename, ts.values.shape[1])
+    dates = ts.dates.tolist()
+
+    for factors_filename, years_filename, out_filename in scenarios:
+        _precip_adj_write(ts.header, dates, ts.values, vic_ids, regions, factors_filename,
+                          years_filename, out_filename, factors_out=None)
+        if verbose:
+            print(f'  Wrote adjusted precipitation rates to {out_filename}')
     return
 
 
@@ -89,7 +89,7 @@ def read_param_table_floats(file_lines, line_index, lines):
     return params, line_index
 
 
-def iwfm_read_et_vals(et_file, verbose=False):
+def iwfm_read_et_vals(et_file, verbose=False, cache=False):
     """iwfm_read_et_vals() - Read evapotranspiration from a file and organize them into lists.
 
     Parameters
@@ -100,6 +100,10 @@ def iwfm_read_et_vals(et_file, verbose=False):
     verbose : bool, default = False
         If True, print status messages.
 
+    cache : bool, default = False
+        If True, keep a binary copy of the file to read next time, see
+        read_ts_data()
+
     Returns
     -------
 
@@ -108,38 +112,11 @@ def iwfm_read_et_vals(et_file, verbose=False):
 
     """
     import iwfm
-    from iwfm.file_utils import read_next_line_value
+    from iwfm.ts_data import read_ts_data
 
     iwfm.file_test(et_file)
-    with open(et_file) as f:
-        et_lines = f.read().splitlines()                   # open and read input file
-
-    nevap, line_index = read_next_line_value(et_lines, -1, column=0)  # skip to next value line
-    nevap = int(nevap)                                          # number of columns
-
-    factet, line_index = read_next_line_value(et_lines, line_index, column=0)  # skip to next value line
-    factet = float(factet)                                      # conversion factor
-
-    nspet, line_index = read_next_line_value(et_lines, line_index, column=0)  # skip to next value line
-    nspet = int(nspet)                                          # number of timesteps to update et data
-
-    nfqet, line_index = read_next_line_value(et_lines, line_index, column=0)  # skip to next value line
-    nfqet = int(nfqet)                                          # repetition requency of et data
-
-    dssfl, line_index = read_next_line_value(et_lines, line_index, column=0)  # skip to next value line
-                                                                # dss file name
-
-    _, line_index = read_next_line_value(et_lines, line_index, column=0)  # skip to next value line
-
-    # evapotranspiration data
-    et = []
-    while line_index < len(et_lines) and len(et_lines[line_index]) > 10:
-        t = et_lines[line_index].split()
-        for i in range(1,nevap):
-            t[i] = float(t[i])
-        et.append(t)
-        line_index += 1
-
-    params = et
+    ts = read_ts_data(et_file, cache=cache)
+    if verbose:
+        print(f'  Read {len(ts.dates):,} time steps of evapotranspiration from {et_file}')
 
-    return params
+    return [[date] + row for date, row in zip(ts.dates.tolist(), ts.values.tolist())]
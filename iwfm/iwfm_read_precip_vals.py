@@ -16,7 +16,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
-def iwfm_read_precip_vals(precip_file, verbose=False):
+def iwfm_read_precip_vals(precip_file, verbose=False, cache=False):
     """iwfm_read_precip_vals() - Read precipitation from a file and organize them into lists.
 
     Parameters
@@ -27,6 +27,10 @@ def iwfm_read_precip_vals(precip_file, verbose=False):
     verbose : bool, default = False
         If True, print status messages.
 
+    cache : bool, default = False
+        If True, keep a binary copy of the file to read next time, see
+        read_ts_data()
+
     Returns
     -------
 
@@ -35,35 +39,11 @@ def iwfm_read_precip_vals(precip_file, verbose=False):
 
     """
     import iwfm
-    from iwfm.file_utils import read_next_line_value
+    from iwfm.ts_data import read_ts_data
 
     iwfm.file_test(precip_file)
-    with open(precip_file) as f:
-        pr_lines = f.read().splitlines()                                # open and read input file
-
-    nrain, line_index = read_next_line_value(pr_lines, -1)              # number of columns
-    nrain = int(nrain)
-
-    factrn, line_index = read_next_line_value(pr_lines, line_index)     # conversion factor
-    factrn = float(factrn)
-
-    nsprn, line_index = read_next_line_value(pr_lines, line_index)      # number of timesteps to update et data
-    nsprn = int(nsprn)
-
-    nfqrn, line_index = read_next_line_value(pr_lines, line_index)      # repetition frequency of et data
-    nfqrn = int(nfqrn)
-
-    dssfl, line_index = read_next_line_value(pr_lines, line_index)      # dss file name
-
-    _, line_index = read_next_line_value(pr_lines, line_index)          # skip to first data line
-
-    # precipitation data
-    precip = []
-    while line_index < len(pr_lines) and len(pr_lines[line_index]) > 10:
-        t = pr_lines[line_index].split()
-        for i in range(1, nrain):
-            t[i] = float(t[i])
-        precip.append(t)
-        line_index += 1
+    ts = read_ts_data(precip_file, cache=cache)
+    if verbose:
+        print(f'  Read {len(ts.dates):,} time steps of precipitation from {precip_file}')
 
-    return precip
+    return [[date] + row for date, row in zip(ts.dates.tolist(), ts.values.tolist())]
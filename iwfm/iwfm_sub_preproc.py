@@ -20,11 +20,12 @@
 
 
 def iwfm_sub_preproc(
-    in_pp_file, elem_pairs_file, out_base_name, verbose=False):
+    in_pp_file, elem_pairs_file, out_base_name, verbose=False, reuse=True):
     ''' iwfm_sub_preproc() - Read in the Preprocessor main file of a model and a list
     of element pairs for a submodel. Use existing model Elements, Nodes, Stream
     specification, Lake and Stratigraphy files to produce new preprocessor files for
-    the submodel, and pickle files of submodel nodes, stream nodes and lakes
+    the submodel, a submodel manifest file (see sub_manifest_write()) and pickle
+    files of submodel nodes, stream nodes and lakes
 
     Parameters
     ----------
@@ -40,6 +41,11 @@ def iwfm_sub_preproc(
     verbose : bool, default=False
         turn command-line output on or off
 
+    reuse : bool, default=True
+        if the manifest was made from the same unchanged input files and the
+        submodel preprocessor files exist, return the results from the
+        manifest instead of processing the input files again
+
     Returns
     -------
     pre_files_new : PreprocessorFiles
@@ -64,9 +70,11 @@ def iwfm_sub_preproc(
         description of each lake in the submodel
 
     '''
+    import os
     import iwfm
     import pickle
     import polars as pl
+    from iwfm.gis.elem2boundingpoly import elem2boundingpoly
     from iwfm.debug.logger_setup import logger
 
     # -- get list of file names from preprocessor input file
@@ -77,6 +85,26 @@ def iwfm_sub_preproc(
     # -- create list of new file names
     pre_files_new = iwfm.new_pp_files(out_base_name)
 
+    # -- skip processing if the manifest is up to date
+    manifest_file = iwfm.sub_manifest_name(out_base_name)
+    sources = [in_pp_file, elem_pairs_file, pre_files.node_file, pre_files.elem_file,
+               pre_files.strat_file, pre_files.stream_file]
+    if have_lake:
+        sources.append(pre_files.lake_file)
+    new_files = [pre_files_new.prename, pre_files_new.node_file, pre_files_new.elem_file,
+                 pre_files_new.strat_file, pre_files_new.stream_file]
+    if have_lake:
+        new_files.append(pre_files_new.lake_file)
+    if reuse and iwfm.sub_manifest_current(manifest_file, sources) \
+            and all(os.path.isfile(name) for name in new_files):
+        manifest = iwfm.sub_manifest_read(manifest_file)
+        sub_elem_list, new_srs, elem_dict, rev_elem_dict = iwfm.get_elem_list(elem_pairs_file)
+        logger.info(f'Submodel manifest {manifest_file} is up to date, skipped preprocessing')
+        if verbose:
+            print(f'  Input files unchanged, read submodel manifest {manifest_file}')
+        return (pre_files_new, sub_elem_list, new_srs, elem_dict, manifest['node_list'],
+                manifest['snode_dict'], manifest['lake_info'])
+
     # -- read submodel elements
     sub_elem_list, new_srs, elem_dict, rev_elem_dict = iwfm.get_elem_list(elem_pairs_file)
     try:
@@ -235,6 +263,17 @@ def iwfm_sub_preproc(
 
     if have_lake == False:
         lake_info=[]
+
+    # -- write the submodel manifest, used by iwfm_sub_sim() and to skip unchanged rebuilds
+    bounding_poly = elem2boundingpoly(elem_nodes, node_coord)
+    try:
+        iwfm.sub_manifest_write(manifest_file, sub_elem_list, sub_node_list, node_coord, elem_nodes,
+                                snode_dict, sub_snodes, lake_info=lake_info,
+                                bounding_poly=bounding_poly, sources=sources)
+    except (PermissionError, OSError) as e:
+        logger.error(f'Failed to write submodel manifest {manifest_file}: {e}')
+        raise
+    logger.debug(f'Wrote submodel manifest {manifest_file}')
     logger.info(f'Completed submodel preprocessing for {out_base_name}')
     return pre_files_new, sub_elem_list, new_srs, elem_dict, sub_node_list, snode_dict, lake_info
     
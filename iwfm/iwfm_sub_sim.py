@@ -21,87 +21,101 @@
 from iwfm.debug.logger_setup import logger
 
 
-def iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=False, debug=False):
-    '''iwfm_sub_sim.py - Read in a list of element pairs for a submodel.
-    Use existing model Elements, Nodes, Stream specification and stratigraphy
-    files to produce new preprocessor files for the submodel and a list of
-    model node pairs
+def _sub_sim_tasks(sim_files, sim_files_new, node_list, elem_list, snode_dict, sub_snodes,
+                   bounding_poly, sim_base_path, verbose=False):
+    ''' _sub_sim_tasks() - Plan the submodel component file writers
 
-    *** INCOMPLETE - UNDER DEVELOPMENT ***
+    Each writer reads its own existing model files and writes its own
+    submodel files, so they are independent once the element, node and
+    stream node lists and the bounding polygon are known. Writers that
+    process the most files come first, so they start first in a pool.
 
-    Parameters
-    ----------
-    in_sim_file : str
-        name of existing simulation main input file
+    Returns
+    -------
+    tasks : list of tuples
+        (name, function, args, kwargs) for each writer
 
-    elem_pairs_file : str
-        name of file listing elements of existing nmodel and submodel
+    '''
+    import iwfm
 
-    out_base_name : str
-        root of submodel output file names
+    return [
+        ('rootzone', iwfm.sub_rootzone_file,
+            (sim_files, sim_files_new, elem_list, sub_snodes, sim_base_path, verbose), {}),
+        ('groundwater', iwfm.sub_gw_file,
+            (sim_files, sim_files_new, node_list, elem_list, bounding_poly, sim_base_path),
+            {'verbose': verbose}),
+        ('streams', iwfm.sub_streams_file,
+            (sim_files, sim_files_new, elem_list, sub_snodes, sim_base_path, verbose), {}),
+        ('small watersheds', iwfm.sub_swhed_file,
+            (sim_files.swshed_file, sim_files_new.swshed_file, node_list, snode_dict, verbose), {}),
+        ('unsaturated zone', iwfm.sub_unsat_file,
+            (sim_files.unsat_file, sim_files_new.unsat_file, elem_list, verbose), {}),
+    ]
 
-    verbose : bool, default=False
-        turn command-line output on or off
 
-    debug : bool, default=False
-        turn debugging output on or off
+def _timed_task(task):
+    ''' _timed_task() - Run one planned writer and return its name and run time '''
+    import time
 
-    Returns:
-      # -- to be determined --
+    name, function, args, kwargs = task
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return name, time.perf_counter() - start
 
-    TODO:
-      - test for nodes pickle file, read info from source if not present, error if no source
-      - test for node_coords pickle file, read info from source if not present, error if no source
-      - test for elem_list pickle file, read info from source if not present, error if no source
-      - test for lake_info pickle file, read info from source if not present, error if no source
-      - test for geopandas dataframe pickle file, create from node_coords if not present, error if no source
-      - process Lake files
+
+def _run_sub_tasks(tasks, workers=None, verbose=False):
+    ''' _run_sub_tasks() - Run planned writers, in a process pool if workers > 1
+
+    Parameters
+    ----------
+    tasks : list of tuples
+        (name, function, args, kwargs) from _sub_sim_tasks()
+
+    workers : int, default=None
+        Number of worker processes. None or 1 runs the writers one at a time
+
+    verbose : bool, default=False
+        Print each writer's run time as it finishes
+
+    Returns
+    -------
+    timing : dict
+        key = writer name, value = run time in seconds, in task order
 
     '''
-    import iwfm
-    import iwfm.gis as gis
-    import pickle
-    from pathlib import Path
+    timing = {}
 
-    # -- get list of file names from preprocessor input file
-    sim_files, have_lake = iwfm.iwfm_read_sim_file(in_sim_file)
-    if verbose:
-        print(f'  Read simulation file {in_sim_file}')
+    def report(name, seconds):
+        timing[name] = seconds
+        logger.debug(f'iwfm_sub_sim: {name} files in {seconds:.2f} s')
+        if verbose:
+            print(f'  Finished {name} files in {seconds:.2f} seconds ({len(timing)} of {len(tasks)})')
 
-    # -- resolve relative paths in sim_files to absolute paths
-    sim_base_path = Path(in_sim_file).resolve().parent
-    for key in sim_files:
-        if isinstance(sim_files[key], str) and key.endswith('_file'):
-            # Convert Windows backslashes and resolve relative to simulation file directory
-            sim_files[key] = str(sim_base_path / sim_files[key].replace('\\', '/'))
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(_timed_task, task) for task in tasks]
+            for future in as_completed(futures):
+                report(*future.result())
+    else:
+        for task in tasks:
+            report(*_timed_task(task))
 
-    # -- verify that required input files exist
-    import os
-    import sys
-    missing_files = []
-    required_files = ['gw_file', 'swshed_file', 'unsat_file']
+    return {name: timing[name] for name, *_ in tasks}
 
-    for key in required_files:
-        if key not in sim_files:
-            missing_files.append(f'  - {key}: Not specified in simulation input file')
-        elif not os.path.exists(sim_files[key]):
-            missing_files.append(f'  - {key}: {sim_files[key]}')
 
-    if missing_files:
-        missing_list = '\n'.join(missing_files)
-        message = (
-            f'Required input file(s) not found:\n{missing_list}\n'
-            f'Please check:\n'
-            f'  1. The simulation input file contains correct file paths\n'
-            f'  2. All referenced files exist at the specified locations\n'
-            f'  3. File paths are correct relative to the simulation input file location\n'
-            f'Simulation file location: {sim_base_path}'
-        )
-        logger.error(message)
-        raise FileNotFoundError(message)
+def _read_sub_pickles(out_base_name, have_lake, verbose=False):
+    ''' _read_sub_pickles() - Read submodel elements, nodes, stream nodes and
+        lakes from the pickle files of iwfm_sub_preproc(), for submodels
+        without a manifest file
 
-    # -- create list of new file names
-    sim_files_new = iwfm.new_sim_files(out_base_name)
+    Returns
+    -------
+    elem_list, node_list, elem_nodes, node_coords, snode_dict, sub_snodes, lake_info
+
+    '''
+    import os
+    import pickle
 
     # ** TODO: test for pickle files, read info from source if not present, error if no source
     # Check that required pickle files exist
@@ -188,6 +202,7 @@ def iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=False, deb
     if verbose:
         print('  Read model elements, nodes, node coordinates and stream nodes')
 
+    lake_info = []
     if have_lake:
         try:
             with open(out_base_name + '_lakes.bin', 'rb') as f:
@@ -199,23 +214,123 @@ def iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=False, deb
         if verbose:
             print('  Read model lakes')
 
-    # -- create bounding polygon
-    bounding_poly = gis.elem2boundingpoly(elem_nodes, node_coords)
+    return elem_list, node_list, elem_nodes, node_coords, snode_dict, sub_snodes, lake_info
+
 
-    # -- create submodel Small Watersheds file
-    iwfm.sub_swhed_file(sim_files.swshed_file, sim_files_new.swshed_file, node_list, snode_dict, verbose)
+def iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=False, debug=False, workers=None):
+    '''iwfm_sub_sim.py - Read in a list of element pairs for a submodel.
+    Use existing model Elements, Nodes, Stream specification and stratigraphy
+    files to produce new preprocessor files for the submodel and a list of
+    model node pairs
+
+    *** INCOMPLETE - UNDER DEVELOPMENT ***
+
+    Parameters
+    ----------
+    in_sim_file : str
+        name of existing simulation main input file
+
+    elem_pairs_file : str
+        name of file listing elements of existing nmodel and submodel
+
+    out_base_name : str
+        root of submodel output file names
+
+    verbose : bool, default=False
+        turn command-line output on or off
+
+    debug : bool, default=False
+        turn debugging output on or off
+
+    workers : int, default=None
+        number of processes for the groundwater, streams, root zone, small
+        watershed and unsaturated zone writers, which run concurrently.
+        None or 1 runs them one after another
+
+    Returns
+    -------
+    timing : dict
+        key = component name, value = time to write its submodel files in seconds
+
+    TODO:
+      - test for nodes pickle file, read info from source if not present, error if no source
+      - test for node_coords pickle file, read info from source if not present, error if no source
+      - test for elem_list pickle file, read info from source if not present, error if no source
+      - test for lake_info pickle file, read info from source if not present, error if no source
+      - test for geopandas dataframe pickle file, create from node_coords if not present, error if no source
+      - process Lake files
+
+    '''
+    import iwfm
+    import iwfm.gis as gis
+    from pathlib import Path
+
+    # -- get list of file names from preprocessor input file
+    sim_files, have_lake = iwfm.iwfm_read_sim_file(in_sim_file)
+    if verbose:
+        print(f'  Read simulation file {in_sim_file}')
+
+    # -- resolve relative paths in sim_files to absolute paths
+    sim_base_path = Path(in_sim_file).resolve().parent
+    for key in sim_files:
+        if isinstance(sim_files[key], str) and key.endswith('_file'):
+            # Convert Windows backslashes and resolve relative to simulation file directory
+            sim_files[key] = str(sim_base_path / sim_files[key].replace('\\', '/'))
+
+    # -- verify that required input files exist
+    import os
+    import sys
+    missing_files = []
+    required_files = ['gw_file', 'swshed_file', 'unsat_file']
+
+    for key in required_files:
+        if key not in sim_files:
+            missing_files.append(f'  - {key}: Not specified in simulation input file')
+        elif not os.path.exists(sim_files[key]):
+            missing_files.append(f'  - {key}: {sim_files[key]}')
+
+    if missing_files:
+        missing_list = '\n'.join(missing_files)
+        message = (
+            f'Required input file(s) not found:\n{missing_list}\n'
+            f'Please check:\n'
+            f'  1. The simulation input file contains correct file paths\n'
+            f'  2. All referenced files exist at the specified locations\n'
+            f'  3. File paths are correct relative to the simulation input file location\n'
+            f'Simulation file location: {sim_base_path}'
+        )
+        logger.error(message)
+        raise FileNotFoundError(message)
 
-    # -- create submodel Unsaturated Zone file
-    iwfm.sub_unsat_file(sim_files.unsat_file, sim_files_new.unsat_file, elem_list, verbose)
+    # -- create list of new file names
+    sim_files_new = iwfm.new_sim_files(out_base_name)
 
-    # -- process submodel Groundwater files
-    iwfm.sub_gw_file(sim_files, sim_files_new, node_list, elem_list, bounding_poly, sim_base_path, verbose=verbose)
+    # -- read submodel elements, nodes, stream nodes, lakes and boundary from the
+    # -- manifest written by iwfm_sub_preproc(), or from older pickle files
+    manifest_file = iwfm.sub_manifest_name(out_base_name)
+    if os.path.isfile(manifest_file):
+        manifest = iwfm.sub_manifest_read(manifest_file)
+        elem_list, node_list = manifest['elem_list'], manifest['node_list']
+        elem_nodes, node_coords = manifest['elem_nodes'], manifest['node_coords']
+        snode_dict, sub_snodes = manifest['snode_dict'], manifest['sub_snodes']
+        lake_info, bounding_poly = manifest['lake_info'], manifest['bounding_poly']
+        logger.debug(f'Loaded submodel manifest {manifest_file}')
+        if verbose:
+            print(f'  Read submodel manifest {manifest_file}')
+    else:
+        (elem_list, node_list, elem_nodes, node_coords, snode_dict, sub_snodes,
+         lake_info) = _read_sub_pickles(out_base_name, have_lake, verbose=verbose)
+        bounding_poly = None
 
-    # -- process submodel Streams file
-    iwfm.sub_streams_file(sim_files, sim_files_new, elem_list, sub_snodes, sim_base_path, verbose)
+    # -- create bounding polygon
+    if bounding_poly is None:
+        bounding_poly = gis.elem2boundingpoly(elem_nodes, node_coords)
 
-    # -- process submodel Rootzone file
-    iwfm.sub_rootzone_file(sim_files, sim_files_new, elem_list, sub_snodes, sim_base_path, verbose)
+    # -- create the submodel Groundwater, Streams, Rootzone, Small Watersheds
+    # -- and Unsaturated Zone files (with the files they refer to) concurrently
+    tasks = _sub_sim_tasks(sim_files, sim_files_new, node_list, elem_list, snode_dict, sub_snodes,
+                           bounding_poly, sim_base_path, verbose=verbose)
+    timing = _run_sub_tasks(tasks, workers=workers, verbose=verbose)
 
     # -- process submodel Lake file
     if have_lake:
@@ -230,12 +345,12 @@ def iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=False, deb
     if verbose:
         print(f'  Wrote submodel simulation file {sim_files_new.sim_name}')
 
-    return  # ================================================================
-    return
+    return timing
 
 
 if __name__ == "__main__":
     ''' Run iwfm_sub_sim() from command line '''
+    import os
     import sys
     import iwfm.debug as idb
     import iwfm
@@ -248,17 +363,20 @@ if __name__ == "__main__":
         in_sim_file = sys.argv[1]      # old model simulaiton.in file
         elem_pairs_file = sys.argv[2]  # file with element pairs
         out_base_name = sys.argv[3]    # output file base name
+        workers = int(sys.argv[4]) if len(sys.argv) > 4 else os.cpu_count()
     else:  # ask for file names from terminal
         in_sim_file     = input('Existing IWFM Simulation.in file: ')
         elem_pairs_file = input('Element pairs file: ')
         out_base_name   = input('Output file base name: ')
+        workers         = input('Number of processes [all CPUs]: ')
+        workers         = int(workers) if workers else os.cpu_count()
 
     # == test that the input files exist
     iwfm.file_test(in_sim_file)
     iwfm.file_test(elem_pairs_file)
 
     idb.exe_time()  # initialize timer
-    iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, verbose=verbose)
+    iwfm_sub_sim(in_sim_file, elem_pairs_file, out_base_name, workers=workers, verbose=verbose)
 
     if verbose:
         print(' ')
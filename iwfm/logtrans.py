@@ -1,6 +1,6 @@
 # logtrans.py
-# log-transform a value
-# Copyright (C) 2020-2021 University of California
+# log-transform a value or an array of values
+# Copyright (C) 2020-2026 University of California
 # -----------------------------------------------------------------------------
 # This information is free; you can redistribute it and/or modify it
 # under the terms of the GNU General Public License as published by
@@ -54,6 +54,51 @@ def logtrans(q, zero_offset=-2.0, neg_val=1e-9, roundoff=4):
     return outval
 
 
+def logtrans_array(q, zero_offset=-2.0, neg_val=1e-9, roundoff=4):
+    ''' logtrans_array() - Log-transform an array of values with the rules of
+        logtrans()
+
+    The result is identical to applying logtrans() to each value. np.round()
+    can differ from round() when a value is within rounding error of a tie,
+    so those few values are recalculated with logtrans().
+
+    Parameters
+    ----------
+    q : array_like
+        values to be log-transformed
+
+    zero_offset : float, default=-2.0
+        value to return where q == 0
+
+    neg_val : float, default=1e-9
+        value to return where q < 0
+
+    roundoff : int, default=4
+        decimal places to round results for positive q
+
+    Returns
+    -------
+    outval : numpy array of float
+        log-transformed values, same shape as q
+
+    '''
+    import numpy as np
+
+    q = np.asarray(q, dtype=float)
+    positive = ~(q <= 0)                  # includes NaN, as in logtrans()
+
+    logq = np.log10(q, out=np.zeros_like(q), where=positive)
+    outval = np.round(logq, roundoff)
+    outval = np.where(positive, outval, np.where(q == 0, zero_offset, neg_val))
+
+    with np.errstate(invalid='ignore'):
+        scaled = logq * 10.0 ** roundoff
+        near_tie = positive & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    if near_tie.any():
+        outval[near_tie] = [logtrans(v, zero_offset, neg_val, roundoff) for v in q[near_tie].tolist()]
+    return outval
+
+
 if __name__ == '__main__':
     ' Run logtrans() from command line '
     import sys
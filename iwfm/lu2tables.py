@@ -48,8 +48,8 @@ def lu2tables(land_use_file, output_file_type, verbose=False, debug=1):
 
     '''
     import datetime
-    import sys
     import iwfm
+    from iwfm.lu_data import read_lu_data
 
     # find the base name and extension
     land_use_file_base = land_use_file[0 : land_use_file.find('.')]
@@ -68,8 +68,7 @@ def lu2tables(land_use_file, output_file_type, verbose=False, debug=1):
         print(f'  Creating land use area tables from {land_use_file}')  
 
     try:
-        with open(land_use_file) as f:
-            file_lines = f.read().splitlines()  # open input file
+        lu = read_lu_data(land_use_file)
     except FileNotFoundError as e:
         logger.error(f'lu2tables: file not found {land_use_file}: {e}')
         raise
@@ -77,110 +76,23 @@ def lu2tables(land_use_file, output_file_type, verbose=False, debug=1):
         logger.error(f'lu2tables: failed to read {land_use_file}: {e}')
         raise
 
-    # determine how many data lines per time step
-    # Check lines starting at the bottom, find first line with length > 5
-    # If there's a change something else is at the bottom,
-    # then change to either skip_back(n) or test for int
-    i = len(file_lines) - 1                         # start at the bottom# last line of file
-    while i > 0 and len(file_lines[i]) < 5:         # find last line with data (skip empty lines)
-        i -= 1
-
-    # Check if we found a valid data line
-    if i <= 0:
-        msg = f'Could not find data lines in land use file {land_use_file}: all lines appear to be empty or too short (< 5 characters)'
-        logger.error(f'lu2tables: {msg}')
-        raise ValueError(msg)
-
-    # the first item on this line is the largest element number
-    last_data_line_no = i
-
-    # move up the file to a line with a date, counting lines
-    no_elems = 0          # will count elements as we go backwards
-    # Count backwards until we find a line with a date (contains '/' and '_')
-    while i > 0:
-        first_field = file_lines[i].split()[0] if len(file_lines[i].split()) > 0 else ''
-        if '/' in first_field and '_' in first_field:
-            # Found a line with a date field (start of this time step)
-            no_elems += 1  # Count this line too
-            break
-        no_elems += 1
-        i -= 1
-
-    # Check if we found a valid date line
-    if i <= 0:
-        msg = f'Could not find a date line in land use file {land_use_file}, searched from line {last_data_line_no} to line {i}'
-        logger.error(f'lu2tables: {msg}')
-        raise ValueError(msg)
-
-    # determine number of time steps and crops
-    # Find the first data line by searching for a line that starts with a date (MM/DD/YYYY_HH:MM)
-    line_index = 0
-    while line_index < len(file_lines):
-        stripped = file_lines[line_index].strip()
-        # Check if line starts with a date pattern (at least 2 slashes and underscore for time)
-        if (len(stripped) > 0 and stripped[0].isdigit() and
-            stripped.count('/') >= 2 and '_' in stripped):
-            # Verify it looks like a date by checking first field
-            first_field = stripped.split()[0] if len(stripped.split()) > 0 else ''
-            if '/' in first_field and '_' in first_field:
-                # Found a line that starts with a date in DSS format
-                break
-        line_index += 1
-
-    if line_index >= len(file_lines):
-        msg = f'Could not find the start of data in land use file {land_use_file}: expected a line starting with a date (MM/DD/YYYY_HH:MM)'
-        logger.error(f'lu2tables: {msg}')
-        raise ValueError(msg)
-
-    no_time_steps = int((last_data_line_no - line_index)/no_elems + 1)
-    no_crops = (len(file_lines[line_index].split()) - 2)  # number of crops/land use types (subtract date and element number)
-
-    dates = ['' for x in range(no_time_steps)]  # empty list
-
-    # get list of element numbers
-    elem_list, ts_line_index, l_index = [], 0, line_index
-    first_data_line = line_index  # Save the position of the first data line
-    while ts_line_index < no_elems:  # iterate through each element
-        this_line = file_lines[l_index].split()  # line to list
-        if (ts_line_index == 0):  # first line has an extra item, the date in DSS format
-            date = this_line.pop(0)  # remove the date
-        elem = int(this_line.pop(0))  # get the element number
-        elem_list.append(elem)
-        ts_line_index += 1
-        l_index += 1
-
-    # create empty 3D list for data
-    data = [[['0' for z in range(no_time_steps)] for y in range(no_elems)] for x in range(no_crops) ]  # empty array
-
-    # Reset line_index to the start of the data for the main loop
-    line_index = first_data_line
-    ts_index = 0
-    # fill the data and years arrays
-    while ts_index < no_time_steps:  # iterate through each time step
-        ts_line_index = 0
-        while ts_line_index < no_elems:  # iterate through each element
-            this_line = file_lines[line_index].split()  # line to list
-            if (ts_line_index == 0):  # first line has an extra item, the date in DSS format
-                import iwfm
-                date = this_line.pop(0)  # Get the date
-                try:
-                    month, day, year, hr, minute = iwfm.validate_dss_date_format(date, f'line {line_index+1} date')
-                except ValueError as e:
-                    raise ValueError(f"Error parsing DSS date at line {line_index+1}: {str(e)}") from e
-
-                # DSS midnight = '24', datetime midnight = 0
-                if hr == 24:
-                    hr = 0
-
-                dates[ts_index] = datetime.datetime(year, month, day, hr, minute)
-            elem = int(this_line.pop(0))  # pop the element number
-            for crop in range(0, no_crops):
-                data[crop][ts_line_index][ts_index] = this_line[crop]  # assign values to data array
-            ts_line_index += 1
-            line_index += 1
-            # ----- end of (while ts_line_index) loop -----
-        ts_index += 1
-        # ----- end of (while ts_index) loop -----
+    no_time_steps, no_elems, no_crops = lu.values.shape
+    elem_list = lu.elems.tolist()
+
+    dates = []
+    for date in lu.dates.tolist():
+        try:
+            month, day, year, hr, minute = iwfm.validate_dss_date_format(date, 'land use date')
+        except ValueError as e:
+            raise ValueError(f"Error parsing DSS date {date}: {str(e)}") from e
+
+        # DSS midnight = '24', datetime midnight = 0
+        if hr == 24:
+            hr = 0
+
+        dates.append(datetime.datetime(year, month, day, hr, minute))
+
+    data = lu.values.transpose(2, 1, 0)  # (crop, element, time step)
 
     # write to text files
     crops = [x+1 for x in range(no_crops)]  # integer crop numbers
@@ -0,0 +1,467 @@
+# lu_data.py
+# Read an IWFM land use file into a (time, element, crop) array, with a
+# cache of parsed files, and write land use arrays back to IWFM format
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import re
+from collections import OrderedDict
+
+from iwfm import _text_blocks
+from iwfm.debug.logger_setup import logger
+
+_DATE = re.compile(rb'\n[ \t]*(\S+/\S+)')                       # DSS date at start of line
+
+_FIXED_FMT = re.compile(r'%\.(\d+)f')                            # formats write_lu_step() does with numpy
+
+LU_CACHE_BYTES = 1 << 30        # default limit of the read_lu_data() cache
+
+_lu_cache = OrderedDict()       # (path, skip): (size, mtime, LandUseData), least recently used first
+_lu_cache_bytes = LU_CACHE_BYTES
+
+
+def clear_lu_cache():
+    ''' clear_lu_cache() - Remove all files from the read_lu_data() cache '''
+    _lu_cache.clear()
+
+
+def set_lu_cache_size(max_bytes):
+    ''' set_lu_cache_size() - Set the maximum bytes of land use arrays kept
+        by read_lu_data(), removing least recently used files to fit. 0
+        turns the cache off
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum total size of the cached arrays
+
+    Returns
+    -------
+    nothing
+
+    '''
+    global _lu_cache_bytes
+    if max_bytes < 0:
+        raise ValueError(f'max_bytes must not be negative, got {max_bytes}')
+    _lu_cache_bytes = int(max_bytes)
+    _trim_lu_cache()
+
+
+def _lu_nbytes(lu):
+    ''' _lu_nbytes() - Memory held by the arrays of a LandUseData '''
+    return lu.values.nbytes + lu.elems.nbytes + lu.dates.nbytes
+
+
+def _trim_lu_cache():
+    ''' _trim_lu_cache() - Remove least recently used files until the cache
+        fits in the size limit '''
+    total = sum(_lu_nbytes(entry[2]) for entry in _lu_cache.values())
+    while _lu_cache and total > _lu_cache_bytes:
+        key, (_, _, lu) = _lu_cache.popitem(last=False)
+        total -= _lu_nbytes(lu)
+        logger.debug(f'read_lu_data: removed {key[0]} from the cache')
+
+
+def _parse_lu_chunk(text, ncol, filename):
+    ''' _parse_lu_chunk() - Parse a block of data lines of a land use file
+
+    Parameters
+    ----------
+    text : bytes
+        Data lines from _text_blocks.iter_blocks()
+
+    ncol : int or None
+        Number of values (element and crops) on each line, None to count
+        them on the first line
+
+    filename : str
+        File name for error messages
+
+    Returns
+    -------
+    table : numpy array of floats
+        Shape (lines, ncol)
+
+    dates : list of bytes
+        DSS dates in text
+
+    date_rows : numpy array of ints
+        Index of the line of each date in table
+
+    ncol : int
+        Number of values on each line
+
+    '''
+    import numpy as np
+
+    matches = list(_DATE.finditer(text))
+    newlines = np.flatnonzero(np.frombuffer(text, dtype=np.uint8) == 10)
+    date_rows = np.searchsorted(newlines, [m.start() for m in matches])
+    dates = [m.group(1) for m in matches]
+    text = _DATE.sub(b'\n', text)
+
+    table, ncol = _text_blocks.parse_table(text, len(newlines) - 1, ncol, filename, 'land use')
+    return table, dates, date_rows, ncol
+
+
+def _iter_lu_chunks(f, filename):
+    ''' _iter_lu_chunks() - Parse the data lines of an open land use file a
+        block at a time, yielding (table, dates, date_rows) for each block,
+        see _parse_lu_chunk() '''
+    ncol = None
+    for text in _text_blocks.iter_blocks(f):
+        table, dates, date_rows, ncol = _parse_lu_chunk(text, ncol, filename)
+        yield table, dates, date_rows
+
+
+def read_lu_header(filename, skip=4):
+    ''' read_lu_header() - Read the lines of an IWFM land use file above the
+        first data line
+
+    Parameters
+    ----------
+    filename : str
+        IWFM land use file name
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    Returns
+    -------
+    header : tuple of str
+        Comment and specification lines
+
+    '''
+    with open(filename, 'rb') as f:
+        return _text_blocks.read_header(f, skip)[0]
+
+
+def read_lu_data(filename, skip=4, cache=True):
+    ''' read_lu_data() - Read an IWFM land use file into a (time, element,
+        crop) array
+
+    Data lines are parsed a block at a time with regular expressions and
+    numpy, without splitting the file into lines. Every time step must
+    list the same elements in the same order. The returned arrays are
+    read-only; copy them before making changes.
+
+    Parameters
+    ----------
+    filename : str
+        IWFM land use file name
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    cache : bool, default=True
+        Keep the parsed file in memory and return it again while the file
+        size and modification time are unchanged. The cache keeps the
+        most recently used files up to LU_CACHE_BYTES, see
+        set_lu_cache_size()
+
+    Returns
+    -------
+    lu : LandUseData
+        values (ntime, nelem, ncrop), elems, dates and header lines
+
+    Raises
+    ------
+    ValueError
+        If the file has no data lines or the time steps do not all list
+        the same elements
+
+    '''
+    import os
+    import numpy as np
+    from iwfm.iwfm_dataclasses import LandUseData
+
+    key = (os.path.abspath(filename), skip)
+    stat = os.stat(filename)
+    if cache and key in _lu_cache:
+        size, mtime, lu = _lu_cache[key]
+        if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
+            _lu_cache.move_to_end(key)
+            return lu
+
+    tables, dates, date_rows, nrow = [], [], [], 0
+    with open(filename, 'rb') as f:
+        header, _ = _text_blocks.read_header(f, skip)
+        for table, chunk_dates, chunk_rows in _iter_lu_chunks(f, filename):
+            if len(table):
+                tables.append(table)
+            dates += chunk_dates
+            date_rows.append(chunk_rows + nrow)
+            nrow += len(table)
+
+    ntime = len(dates)
+    if ntime == 0 or nrow == 0:
+        msg = f'{filename}: no land use data found after {skip} specification lines'
+        logger.error(f'read_lu_data: {msg}')
+        raise ValueError(msg)
+
+    nelem, ncol = nrow // ntime, tables[0].shape[1]
+    date_rows = np.concatenate(date_rows)
+    if nrow % ntime or not np.array_equal(date_rows, np.arange(ntime) * nelem):
+        msg = f'{filename}: time steps do not all have the same number of elements'
+        logger.error(f'read_lu_data: {msg}')
+        raise ValueError(msg)
+
+    table = (tables[0] if len(tables) == 1 else np.concatenate(tables)).reshape(ntime, nelem, ncol)
+    elems = table[0, :, 0].astype(np.int64)
+    if not (table[:, :, 0] == elems).all():
+        msg = f'{filename}: time steps do not all list the same elements in the same order'
+        logger.error(f'read_lu_data: {msg}')
+        raise ValueError(msg)
+
+    lu = LandUseData(values=table[:, :, 1:], elems=elems,
+                     dates=np.array([d.decode() for d in dates]), header=header)
+    for array in (lu.values, lu.elems, lu.dates):
+        array.flags.writeable = False
+
+    logger.debug(f'read_lu_data: read {filename} with {ntime} time steps, {nelem} elements, '
+                 f'{ncol - 1} crops')
+
+    if cache:
+        _lu_cache[key] = (stat.st_size, stat.st_mtime_ns, lu)
+        _lu_cache.move_to_end(key)
+        _trim_lu_cache()
+    return lu
+
+
+def iter_lu_data(filename, skip=4):
+    ''' iter_lu_data() - Read an IWFM land use file one time step at a time
+
+    Only one block of the file and one time step are held in memory, so
+    files of any length can be processed. Every time step must list the
+    same elements in the same order; the same read-only element array is
+    returned for every time step.
+
+    Parameters
+    ----------
+    filename : str
+        IWFM land use file name
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    Returns
+    -------
+    generator of tuples
+        (date, elems, values) for each time step: DSS date str, numpy array
+        of element numbers, numpy array of floats (nelem, ncrop)
+
+    Raises
+    ------
+    ValueError
+        If the file has no data lines or the time steps do not all list
+        the same elements
+
+    '''
+    import numpy as np
+
+    elems = None
+
+    def finish(date, parts):
+        nonlocal elems
+        table = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if elems is None:
+            elems = table[:, 0].astype(np.int64)
+            elems.flags.writeable = False
+        elif not np.array_equal(table[:, 0], elems):
+            msg = f'{filename}: time step {date} does not list the same elements as the first'
+            logger.error(f'iter_lu_data: {msg}')
+            raise ValueError(msg)
+        return date, elems, table[:, 1:]
+
+    with open(filename, 'rb') as f:
+        _text_blocks.read_header(f, skip)
+        date, parts = None, []
+        for table, dates, date_rows in _iter_lu_chunks(f, filename):
+            starts = date_rows.tolist() + [len(table)]
+            if date is None and starts[0] > 0:
+                msg = f'{filename}: the first land use data line has no date'
+                logger.error(f'iter_lu_data: {msg}')
+                raise ValueError(msg)
+            if starts[0] > 0:
+                parts.append(table[:starts[0]])     # continues the time step of the last block
+            for i, next_date in enumerate(dates):
+                if date is not None:
+                    yield finish(date, parts)
+                date, parts = next_date.decode(), [table[starts[i]:starts[i + 1]]]
+
+    if date is None:
+        msg = f'{filename}: no land use data found after {skip} specification lines'
+        logger.error(f'iter_lu_data: {msg}')
+        raise ValueError(msg)
+    yield finish(date, parts)
+
+
+def _fixed_digits(x, decimals):
+    ''' _fixed_digits() - Format numbers like '%.<decimals>f' into an
+        (n, width) grid of ASCII codes, padded with spaces
+
+    Values are scaled to integers and split into digits with numpy. Values
+    within a rounding error of a tie are formatted by Python, so the text
+    is always the same as from the % operator once the padding spaces are
+    removed; a '-' sign is in the first column. Returns None if a value is
+    not finite or too large to scale exactly.
+    '''
+    import numpy as np
+
+    x = np.asarray(x).ravel()
+    if x.dtype.kind in 'iu':
+        k, neg = np.abs(x.astype(np.int64)), x < 0
+    else:
+        a = np.abs(x)
+        if not np.isfinite(a).all() or (len(a) and a.max() * 10.0 ** decimals >= 2 ** 52):
+            return None
+        r = a * 10.0 ** decimals
+        k = np.rint(r).astype(np.int64)
+        near = np.flatnonzero(np.abs(r - np.floor(r) - 0.5) <= 2 * np.spacing(r))
+        if len(near):
+            k[near] = [int((f'%.{decimals}f' % v).replace('.', '')) for v in a[near].tolist()]
+        neg = np.signbit(x)
+
+    kmax = int(k.max()) if len(k) else 0
+    if kmax < 2 ** 31:
+        k = k.astype(np.int32)    # faster to divide
+    ndig = len(str(kmax // 10 ** decimals))
+    width = 1 + ndig + (decimals + 1 if decimals else 0)
+
+    # one row per column of text, filled from the right
+    grid = np.empty((width, len(k)), dtype=np.uint8)
+    grid[0] = np.where(neg, 45, 32)
+    col = width - 1
+    for _ in range(decimals):
+        k, digit = np.divmod(k, 10)
+        grid[col] = digit + 48
+        col -= 1
+    if decimals:
+        grid[col] = 46
+        col -= 1
+    for j in range(ndig):
+        blank = k == 0
+        k, digit = np.divmod(k, 10)
+        grid[col] = np.where(blank, 32, digit + 48) if j else digit + 48
+        col -= 1
+    return grid.T
+
+
+def _lu_step_text(elems, values, decimals):
+    ''' _lu_step_text() - Lines of one land use time step, without the date,
+        with values formatted like '%.<decimals>f'; None if a value cannot
+        be formatted by _fixed_digits() '''
+    import numpy as np
+
+    nelem, ncrop = values.shape
+    elem_grid = _fixed_digits(elems, 0)
+    value_grid = _fixed_digits(values, decimals)
+    if value_grid is None:
+        return None
+
+    # '\t' elem '\t' value '\t' ... value '\t' '\n', then drop the padding
+    we, wv = elem_grid.shape[1], value_grid.shape[1]
+    lines = np.empty((nelem, we + ncrop * (wv + 1) + 3), dtype=np.uint8)
+    lines[:, 0] = lines[:, we + 1] = 9
+    lines[:, 1:we + 1] = elem_grid
+    fields = lines[:, we + 2:-1].reshape(nelem, ncrop, wv + 1)
+    fields[:, :, :wv] = value_grid.reshape(nelem, ncrop, wv)
+    fields[:, :, wv] = 9
+    lines[:, -1] = 10
+    return lines[lines != 32].tobytes().decode('ascii')
+
+
+def write_lu_step(f, date, elems, values, fmt='%s'):
+    ''' write_lu_step() - Write one time step of land use data to an open
+        IWFM land use file with one string format operation
+
+    Lines are 'date<tab>elem<tab>value<tab>...' for the first element and
+    '<tab>elem<tab>value<tab>...' for the others. Fixed-decimal formats
+    such as '%.3f' are done with numpy on a fixed-width grid of digits, so
+    large time steps are written at about disk speed; the text is the same
+    as with the % operator.
+
+    Parameters
+    ----------
+    f : file object
+        Output file, open for writing text
+
+    date : str
+        DSS date
+
+    elems : numpy array of ints
+        Element numbers
+
+    values : numpy array of floats
+        Land use areas (nelem, ncrop)
+
+    fmt : str, default='%s'
+        Format of each value, e.g. '%.2f'
+
+    Returns
+    -------
+    nothing
+
+    '''
+    from itertools import chain
+    import numpy as np
+
+    nelem, ncrop = np.shape(values)
+    if nelem == 0:
+        return
+    fixed = _FIXED_FMT.fullmatch(fmt)
+    if fixed is not None and ncrop > 0:
+        text = _lu_step_text(np.asarray(elems), np.asarray(values, dtype=float),
+                             int(fixed.group(1)))
+        if text is not None:
+            f.write(date + text)
+            return
+    block = ('\t%d\t' + (fmt + '\t') * ncrop + '\n') * nelem
+    rows = np.column_stack((elems, values)).tolist()
+    f.write(date + block % tuple(chain.from_iterable(rows)))
+
+
+def write_lu_data(lu, out_file, header=None, fmt='%s'):
+    ''' write_lu_data() - Write land use data to an IWFM land use file
+
+    Each time step is written with write_lu_step().
+
+    Parameters
+    ----------
+    lu : LandUseData
+        Land use data, e.g. from read_lu_data()
+
+    out_file : str
+        Output file name
+
+    header : list of str, default=None
+        Lines above the data, None for lu.header
+
+    fmt : str, default='%s'
+        Format of each value, e.g. '%.2f'
+
+    Returns
+    -------
+    nothing
+
+    '''
+    header = lu.header if header is None else header
+
+    with open(out_file, 'w') as f:
+        for line in header:
+            f.write(line + '\n')
+        for date, values in zip(lu.dates.tolist(), lu.values):
+            write_lu_step(f, date, lu.elems, values, fmt=fmt)
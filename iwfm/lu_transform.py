@@ -0,0 +1,409 @@
+# lu_transform.py
+# Stream IWFM land use files one time step at a time through a pipeline of
+# vectorized operations: element subset, element split, zone change
+# factors and column selection
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+from iwfm.debug.logger_setup import logger
+
+
+def _elem_rows(elems, items, source='the land use file'):
+    ''' _elem_rows() - Row of each item in the element array elems, read
+        from source. An element listed more than once gives its first row
+
+    Raises
+    ------
+    ValueError
+        If an item is not in elems
+
+    '''
+    import numpy as np
+
+    items = np.asarray(items, dtype=np.int64)
+    order = np.argsort(elems, kind='stable')
+    pos = np.minimum(np.searchsorted(elems, items, sorter=order), max(len(elems) - 1, 0))
+    rows = order[pos] if len(elems) else pos
+    missing = items if len(elems) == 0 else items[elems[rows] != items]
+    if len(missing):
+        raise ValueError(f'element {missing[0]} is not in {source}')
+    return rows
+
+
+def _round(values, decimals):
+    ''' _round() - Round an array like Python round(), from the exact value
+        of each float; np.round() can round values near a tie the other way '''
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values.copy()
+    text = ' '.join([f'%.{decimals}f'] * values.size) % tuple(values.ravel().tolist())
+    return np.fromstring(text, sep=' ').reshape(values.shape)
+
+
+def lu_subset(elems):
+    ''' lu_subset() - Land use operation that keeps only some elements, in
+        file order
+
+    Parameters
+    ----------
+    elems : list or set of ints
+        Elements to keep
+
+    Returns
+    -------
+    operation : function
+        op(elems, values) -> (elems, values), for lu_transform()
+
+    '''
+    import numpy as np
+
+    keep_elems = np.fromiter((int(e) for e in elems), dtype=np.int64)
+    cache = {}
+
+    def op(elems, values):
+        if cache.get('elems') is not elems:
+            cache.update(elems=elems, keep=np.isin(elems, keep_elems))
+        keep = cache['keep']
+        return elems[keep], values[keep]
+
+    return op
+
+
+def lu_split(new_elems, orig_elems, factors):
+    ''' lu_split() - Land use operation that makes new elements from parts
+        of existing elements, e.g. for a refined model
+
+    Each new element gets the land use areas of its original element times
+    its area factor, as one fancy-index multiply for the whole time step.
+
+    Parameters
+    ----------
+    new_elems : list of ints
+        New element numbers, in output order
+
+    orig_elems : list of ints
+        Original element of each new element
+
+    factors : list of floats
+        Fraction of the original element area in each new element
+
+    Returns
+    -------
+    operation : function
+        op(elems, values) -> (elems, values), for lu_transform()
+
+    '''
+    import numpy as np
+
+    new_elems = np.asarray(new_elems, dtype=np.int64)
+    orig_elems = np.asarray(orig_elems, dtype=np.int64)
+    factors = np.asarray(factors, dtype=float)[:, None]
+    cache = {}
+
+    def op(elems, values):
+        if cache.get('elems') is not elems:
+            cache.update(elems=elems, rows=_elem_rows(elems, orig_elems))
+        return new_elems, values[cache['rows']] * factors
+
+    return op
+
+
+def lu_zone_change(elem_zones, zone_factors, from_cols, to_col, decimals=2):
+    ''' lu_zone_change() - Land use operation that moves a fraction of the
+        area of some land use columns to another column, by change zone
+
+    For each element in a zone with a change factor above zero, the areas
+    in from_cols are multiplied by (1 - factor) and the area removed is
+    added to to_col. Elements without area in from_cols are unchanged.
+
+    Parameters
+    ----------
+    elem_zones : list
+        [element, zone] pairs, e.g. from read_lu_change_zones()
+
+    zone_factors : dict
+        key = zone, value = fraction of the from_cols area to move
+
+    from_cols : list of ints
+        Columns (crops) to take area from
+
+    to_col : int
+        Column to add the area to
+
+    decimals : int, default=2
+        Round changed areas to this many decimals
+
+    Returns
+    -------
+    operation : function
+        op(elems, values) -> (elems, values), for lu_transform()
+
+    '''
+    import numpy as np
+
+    zone_elems = np.array([row[0] for row in elem_zones], dtype=np.int64)
+    keep = np.array([1.0 - zone_factors[row[1]] for row in elem_zones], dtype=float)
+    from_cols = np.asarray(from_cols, dtype=np.int64)
+    cache = {}
+
+    def op(elems, values):
+        if cache.get('elems') is not elems:
+            present = np.isin(zone_elems, elems)
+            cache.update(elems=elems, rows=_elem_rows(elems, zone_elems[present]),
+                         keep=keep[present])
+        rows, fraction = cache['rows'], cache['keep']
+
+        area = values[rows][:, from_cols]
+        start = area.sum(axis=1)
+        change = (fraction < 1) & (_round(start, decimals) > 0)
+        rows, fraction, area, start = rows[change], fraction[change], area[change], start[change]
+
+        new_area = _round(area * fraction[:, None], decimals)
+        values = values.copy()
+        values[np.ix_(rows, from_cols)] = new_area
+        values[rows, to_col] = _round(values[rows, to_col] + start - new_area.sum(axis=1), decimals)
+        return elems, values
+
+    return op
+
+
+def lu_columns(cols):
+    ''' lu_columns() - Land use operation that keeps some columns (crops),
+        in the given order
+
+    Parameters
+    ----------
+    cols : list of ints
+        Columns to keep
+
+    Returns
+    -------
+    operation : function
+        op(elems, values) -> (elems, values), for lu_transform()
+
+    '''
+    import numpy as np
+
+    cols = np.asarray(cols, dtype=np.int64)
+
+    def op(elems, values):
+        return elems, values[:, cols]
+
+    return op
+
+
+def _match_lu_steps(in_files, steps):
+    ''' _match_lu_steps() - Check that time steps of several land use files
+        have the same date and elements, and return (date, elems, blocks) '''
+    import numpy as np
+
+    date, elems, _ = steps[0]
+    for name, (other_date, other_elems, _) in zip(in_files[1:], steps[1:]):
+        if other_date != date or not np.array_equal(other_elems, elems):
+            msg = f'{name} does not have the dates and elements of {in_files[0]} at {date}'
+            logger.error(f'iter_lu_steps: {msg}')
+            raise ValueError(msg)
+    return date, elems, [values for _, _, values in steps]
+
+
+def _first_lu_step(args):
+    ''' _first_lu_step() - Read the first time step of one land use file,
+        keeping the first ncol columns (all if None) '''
+    from iwfm.lu_data import iter_lu_data
+
+    in_file, skip, ncol = args
+    steps = iter_lu_data(in_file, skip)
+    try:
+        date, elems, values = next(steps)
+    finally:
+        steps.close()
+    return date, elems, values[:, :ncol]
+
+
+def read_lu_first_step(in_files, skip=4, ncols=None, workers=None):
+    ''' read_lu_first_step() - Read the first time step of several IWFM land
+        use files, each file in its own worker process
+
+    Only the first block of each file is parsed. With workers > 1 the
+    files are read at the same time, so the wall time is about that of
+    the largest file.
+
+    Parameters
+    ----------
+    in_files : list of str
+        IWFM land use file names. All files must have the same first date
+        and elements
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    ncols : list of ints, default=None
+        Number of columns (crops) to keep from each file, None keeps all
+
+    workers : int, default=None
+        Number of worker processes. None or 1 reads the files one at a time
+
+    Returns
+    -------
+    date : str
+        DSS date of the first time step
+
+    elems : numpy array of ints
+        Element numbers
+
+    blocks : list of numpy arrays
+        (nelem, ncol) land use areas of each file
+
+    '''
+    in_files = list(in_files)
+    ncols = [None] * len(in_files) if ncols is None else list(ncols)
+    tasks = [(name, skip, ncol) for name, ncol in zip(in_files, ncols)]
+
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            steps = list(pool.map(_first_lu_step, tasks))
+    else:
+        steps = [_first_lu_step(task) for task in tasks]
+
+    return _match_lu_steps(in_files, steps)
+
+
+def iter_lu_steps(in_files, skip=4):
+    ''' iter_lu_steps() - Read one or more IWFM land use files together, one
+        time step at a time
+
+    Parameters
+    ----------
+    in_files : str or list of str
+        IWFM land use file names. All files must have the same dates and
+        elements
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    Returns
+    -------
+    generator of tuples
+        (date, elems, blocks) for each time step, where blocks is a list
+        with the (nelem, ncrop) array of each file
+
+    Raises
+    ------
+    ValueError
+        If the files have different dates, elements or numbers of time steps
+
+    '''
+    from itertools import zip_longest
+    from iwfm.lu_data import iter_lu_data
+
+    in_files = [in_files] if isinstance(in_files, str) else list(in_files)
+    readers = [iter_lu_data(name, skip) for name in in_files]
+
+    for steps in zip_longest(*readers):
+        if any(step is None for step in steps):
+            msg = f'land use files {in_files} have different numbers of time steps'
+            logger.error(f'iter_lu_steps: {msg}')
+            raise ValueError(msg)
+        yield _match_lu_steps(in_files, steps)
+
+
+def lu_transform(in_files, out_files, operations, skip=4, fmt='%s', headers=None, on_step=None):
+    ''' lu_transform() - Stream IWFM land use files through a pipeline of
+        operations, writing each time step as it is done
+
+    The files are read one time step at a time with iter_lu_steps(), and
+    the areas of all input files are put side by side in one (nelem, ncrop)
+    array. Each operation is a function op(elems, values) -> (elems,
+    values), e.g. from lu_subset(), lu_split(), lu_zone_change() or
+    lu_columns(), applied in order. Memory use does not depend on the
+    number of time steps.
+
+    Parameters
+    ----------
+    in_files : str or list of str
+        IWFM land use file names
+
+    out_files : str or list of str
+        Output file name, or one per input file. With one output file per
+        input file the operations must keep the number of columns, and
+        the columns of each input file go to its output file
+
+    operations : list of functions
+        Operations applied to each time step
+
+    skip : int, default=4
+        Number of specification lines (not counting comments) above the data
+
+    fmt : str, default='%s'
+        Format of each value, see write_lu_step()
+
+    headers : list, default=None
+        List of header lines for each output file, None to copy the
+        header of the input file
+
+    on_step : function, default=None
+        Called with the date after each time step is written, e.g. to
+        report progress
+
+    Returns
+    -------
+    nlines : int
+        Number of data lines written to each output file
+
+    '''
+    from contextlib import ExitStack
+    import numpy as np
+    from iwfm.lu_data import read_lu_header, write_lu_step
+
+    in_files = [in_files] if isinstance(in_files, str) else list(in_files)
+    out_files = [out_files] if isinstance(out_files, str) else list(out_files)
+    if len(out_files) not in (1, len(in_files)):
+        raise ValueError(f'lu_transform: {len(out_files)} output files for {len(in_files)} input files')
+    if headers is None:
+        headers = [read_lu_header(name, skip) for name in in_files[:len(out_files)]]
+
+    nlines = 0
+    with ExitStack() as stack:
+        outs = [stack.enter_context(open(name, 'w')) for name in out_files]
+        for out, header in zip(outs, headers):
+            for line in header:
+                out.write(line + '\n')
+
+        for date, elems, blocks in iter_lu_steps(in_files, skip):
+            widths = np.cumsum([block.shape[1] for block in blocks])
+            values = blocks[0] if len(blocks) == 1 else np.hstack(blocks)
+            for op in operations:
+                elems, values = op(elems, values)
+
+            if len(outs) == 1:
+                parts = [values]
+            elif values.shape[1] == widths[-1]:
+                parts = np.split(values, widths[:-1], axis=1)
+            else:
+                raise ValueError(f'lu_transform: the operations changed the number of columns '
+                                 f'from {widths[-1]} to {values.shape[1]}')
+            for out, part in zip(outs, parts):
+                write_lu_step(out, date, elems, part, fmt=fmt)
+            nlines += len(elems)
+
+            if on_step is not None:
+                on_step(date)
+
+    logger.debug(f'lu_transform: wrote {nlines} lines to {out_files}')
+    return nlines
@@ -37,46 +37,19 @@ def read_lu_file(filename, skip=4):
     
     dates : list
         DSS dates for each time step
-    
+
+    elems : list
+        element numbers for each time step
+
     '''
     import iwfm
-
-    comments = 'Cc*#'
+    from iwfm.lu_data import read_lu_data
 
     iwfm.file_test(filename)
-    with open(filename) as f:
-        data = f.read().splitlines()
-
-    # -- find the file line with the first element's data
-    index = 0
-    while any((c in comments) for c in data[index][0]):
-        index += 1
-    index += skip  # skip data spec rows
-    while any((c in comments) for c in data[index][0]): 
-        index += 1
-
-    # -- compile the data from the file
-    table, elems, dates, temp_elems, temp_table = [], [], [], [], []
-    line = data[index].split()
-
-    while index < len(data):
-        line = data[index].split()
-        # if first item is a date, then clean up and start a new table
+    lu = read_lu_data(filename, skip=skip)
 
-        if '24:00' in line[0]:  # finish the last time period and start a new one
-            date = line.pop(0)  # remove the date
-            dates.append(date)
-            if len(temp_table) > 0:  # temp_table is empty for the first time period
-                table.append(temp_table)
-                elems.append(temp_elems)
-            temp_table, temp_elems = [], []
-        elem = int(line.pop(0))
-        temp_elems.append(elem)
-        for j in range(0, len(line)):
-            line[j] = float(line[j])
-        temp_table.append(line)
-        index += 1
-    elems.append(temp_elems)  # for the last time period
-    table.append(temp_table)  # for the last time period
+    table = lu.values.tolist()
+    dates = lu.dates.tolist()
+    elems = [lu.elems.tolist() for _ in dates]
 
     return table, dates, elems
@@ -16,6 +16,81 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # -----------------------------------------------------------------------------
 
+from iwfm.debug.logger_setup import logger
+
+
+def _read_elem_csv(filename):
+    ''' _read_elem_csv() - Read the first two columns of a csv file with one
+        header line into an array of element numbers and an array of floats '''
+    import numpy as np
+    import iwfm
+
+    iwfm.file_test(filename)
+    table = np.loadtxt(filename, delimiter=',', skiprows=1, usecols=(0, 1), ndmin=2,
+                       quotechar='"')
+    return table[:, 0].astype(np.int64), table[:, 1]
+
+
+def _check_unique(elems, filename):
+    ''' _check_unique() - Raise ValueError if an element is listed more than
+        once in a lookup file '''
+    import numpy as np
+
+    ordered = np.sort(elems)
+    repeated = ordered[1:][ordered[1:] == ordered[:-1]]
+    if len(repeated):
+        msg = f'element {repeated[0]} is listed more than once in {filename}'
+        logger.error(f'refined_lu_factors: {msg}')
+        raise ValueError(msg)
+
+
+def refined_lu_index(orig_areas_file, refined_areas_file, elem2elem_file):
+    ''' refined_lu_index() - Calculate the original element and area ratio of
+        each refined model element, as arrays
+
+    Parameters
+    ----------
+    orig_areas_file : str
+        original model element areas file name
+
+    refined_areas_file : str
+        refined model element areas file name
+
+    elem2elem_file : str
+        element to element file name
+
+    Returns
+    -------
+    refined_elems : numpy array of ints
+        refined model elements, in the order of refined_areas_file
+
+    orig_elems : numpy array of ints
+        original model element of each refined element
+
+    ratios : numpy array of floats
+        refined element area / original element area
+
+    Raises
+    ------
+    ValueError
+        If an element is missing from, or listed more than once in,
+        elem2elem_file or orig_areas_file
+
+    '''
+    from iwfm.lu_transform import _elem_rows
+
+    orig_ids, orig_areas = _read_elem_csv(orig_areas_file)
+    refined_elems, refined_areas = _read_elem_csv(refined_areas_file)
+    e2e_refined, e2e_orig = _read_elem_csv(elem2elem_file)
+    _check_unique(orig_ids, orig_areas_file)
+    _check_unique(e2e_refined, elem2elem_file)
+
+    orig_elems = e2e_orig.astype(refined_elems.dtype)[_elem_rows(e2e_refined, refined_elems,
+                                                                 elem2elem_file)]
+    ratios = refined_areas / orig_areas[_elem_rows(orig_ids, orig_elems, orig_areas_file)]
+    return refined_elems, orig_elems, ratios
+
+
 def refined_lu_factors(orig_areas_file,refined_areas_file,elem2elem_file):
     ''' refined_lu_factors() - Calculate land use factors for refined model elements
 
@@ -36,40 +111,6 @@ def refined_lu_factors(orig_areas_file,refined_areas_file,elem2elem_file):
         list of land use factors for refined model elements
 
     '''
-
-    import csv
-    import iwfm
-
-    # -- read the original model element areas file
-    iwfm.file_test(orig_areas_file)
-    with open(orig_areas_file, 'r') as file:
-        orig_areas = list(csv.reader(file))[1:]
-    for line in orig_areas:
-        line[0], line[1] = int(line[0]), float(line[1])
-    orig_areas_d = dict(orig_areas)
-
-    # -- read the refined model element areas file
-    iwfm.file_test(refined_areas_file)
-    with open(refined_areas_file, 'r') as file:
-        refined_areas = list(csv.reader(file))[1:]
-    for line in refined_areas:
-        line[0], line[1] = int(line[0]), float(line[1])
-
-    # -- read the element to element file
-    iwfm.file_test(elem2elem_file)
-    with open(elem2elem_file, 'r') as file:
-        elem2elem = list(csv.reader(file))[1:]
-    for line in elem2elem:
-        line[0], line[1] = int(line[0]), int(line[1])
-    elem2elem_d = dict(elem2elem)
-
-    # -- calculate the land use factors
-    lu_factors = []
-    for elem in refined_areas:
-        refined_elem, refined_area = elem[0], elem[1]
-        orig_elem = elem2elem_d[refined_elem]
-        orig_area = orig_areas_d[orig_elem]
-        lu_factors.append([refined_elem, orig_elem, refined_area / orig_area ]) 
-
-    return lu_factors
-
+    refined_elems, orig_elems, ratios = refined_lu_index(orig_areas_file, refined_areas_file,
+                                                         elem2elem_file)
+    return [list(row) for row in zip(refined_elems.tolist(), orig_elems.tolist(), ratios.tolist())]
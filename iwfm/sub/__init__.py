@@ -43,4 +43,7 @@ from iwfm.sub.rz_nv_file import sub_rz_nv_file
 
 # -- land use and utilities ---
 from iwfm.sub.lu_file import sub_lu_file
-from iwfm.sub.remove_items import sub_remove_items
+from iwfm.sub.remove_items import sub_remove_items, sub_keep_lines, sub_item_set
+from iwfm.sub.points_within import sub_points_within
+from iwfm.sub.manifest import (sub_manifest_name, sub_manifest_write, sub_manifest_read,
+                               sub_manifest_current)
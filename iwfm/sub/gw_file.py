@@ -54,7 +54,7 @@ def sub_gw_file(sim_files, sim_files_new, node_list, elem_list, bounding_poly, s
     '''
     import iwfm
     from iwfm.file_utils import read_next_line_value
-    from shapely.geometry import Point
+    import numpy as np
     from pathlib import Path
     import sys
 
@@ -162,17 +162,14 @@ def sub_gw_file(sim_files, sim_files_new, node_list, elem_list, bounding_poly, s
     # skip 3 lines (NOUTH, FACTXY, GWHYDOUTFL) to get to hydrograph data
     _, line_index = read_next_line_value(gw_lines, line_index, skip_lines=2)
 
-    # check each hydrographs and remove the hydrographs outside the submodel boundary
-    new_hyds = 0
-    for i in range(0, nhyds):
-        t = gw_lines[line_index].split()
-        point = Point(float(t[3]), float(t[4]))
-
-        if not point.within(bounding_poly):
-            del gw_lines[line_index]
-        else:
-            new_hyds += 1
-            line_index += 1
+    # check all hydrographs at once and remove the hydrographs outside the submodel boundary
+    hyd_block = gw_lines[line_index:line_index + nhyds]
+    xy = np.array([line.split()[3:5] for line in hyd_block], dtype=float).reshape(-1, 2)
+    inside = iwfm.sub_points_within(xy[:, 0], xy[:, 1], bounding_poly)
+    kept = [line for line, keep in zip(hyd_block, inside) if keep]
+    gw_lines[line_index:line_index + nhyds] = kept
+    new_hyds = len(kept)
+    line_index += new_hyds
 
     # update the number of hydrographs
     gw_lines[hyds_line] = '     ' + str(new_hyds) + '        / NOUTH'
@@ -47,7 +47,7 @@ def sub_gw_pump_well_file(old_filename, new_filename, elems, bounding_poly, verb
     '''
     import iwfm
     from iwfm.file_utils import read_next_line_value
-    from shapely.geometry import Point
+    import numpy as np
 
     if verbose: print(f"Entered sub_gw_pump_well_file() with {old_filename}")
 
@@ -66,28 +66,23 @@ def sub_gw_pump_well_file(old_filename, new_filename, elems, bounding_poly, verb
     # Skip factors (4 data lines) to reach well location data
     _, line_index = read_next_line_value(well_lines, line_index, column=0, skip_lines=3)
 
-    keep_wells = []
-    for l in range(0, nwells):
-        t = well_lines[line_index].split()
-        id = int(t[0])
-        point = Point(float(t[1]), float(t[2]))
-        if not point.within(bounding_poly):
-            del well_lines[line_index]
-        else:
-            keep_wells.append(id)
-            new_nwells += 1
-            line_index += 1
+    # keep the wells inside the submodel area, replacing the block in one step
+    well_block = well_lines[line_index:line_index + nwells]
+    xy = np.array([line.split()[1:3] for line in well_block], dtype=float).reshape(-1, 2)
+    inside = iwfm.sub_points_within(xy[:, 0], xy[:, 1], bounding_poly)
+    kept = [line for line, keep in zip(well_block, inside) if keep]
+    well_lines[line_index:line_index + nwells] = kept
+    new_nwells = len(kept)
+    keep_wells = {int(line.split()[0]) for line in kept}
+    line_index += new_nwells
 
     well_lines[nwells_line] = '         ' + str(new_nwells) + '                       / NWELL'
     # Skip comments to well pumping characteristics section
     line_index = iwfm.skip_ahead(line_index, well_lines, 0)
 
-    for l in range(0, nwells):
-        t = well_lines[line_index].split()
-        if int(t[0]) not in keep_wells:
-            del well_lines[line_index]
-        else:
-            line_index += 1
+    kept = iwfm.sub_keep_lines(well_lines[line_index:line_index + nwells], keep_wells)
+    well_lines[line_index:line_index + nwells] = kept
+    line_index += len(kept)
 
     # -- delivery element groups
     # Skip comments and read ngrp (number of element groups)
@@ -100,9 +95,9 @@ def sub_gw_pump_well_file(old_filename, new_filename, elems, bounding_poly, verb
     # Skip to first group (1 data line after ngrp)
     if ngrp > 0:
         _, line_index = read_next_line_value(well_lines, line_index, column=0, skip_lines=0)
+    elems = iwfm.sub_item_set(elems)
+    groups_start, group_lines = line_index, []
     for id in range(0, ngrp):
-        grp_line, ielems = line_index, []
-
         # Parse element group line with error checking
         line_data = well_lines[line_index].split()
         if len(line_data) < 3:
@@ -120,7 +115,6 @@ def sub_gw_pump_well_file(old_filename, new_filename, elems, bounding_poly, verb
             print('\n    This error may occur if:')
             print('      1. The number of element groups (NGRP) is wrong')
             print('      2. The number of elements (NELEM) in a previous group was incorrect')
-            print('      3. There is a bug in the line deletion logic when filtering groups')
             print('\n    Please verify:')
             print('      - The NGRP value matches the actual number of groups in the file')
             print('      - Each group header has the correct NELEM value')
@@ -128,33 +122,17 @@ def sub_gw_pump_well_file(old_filename, new_filename, elems, bounding_poly, verb
             sys.exit(1)
 
         grp_id, nelem, ielem, *z = [int(e) for e in line_data]
-        if ielem in elems:  # keep the item
-            ielems.append(ielem)
-        line_index += 1
-        for j in range(1, nelem):
-            ielem = int(well_lines[line_index].split()[0])
-            if ielem in elems:  # keep the item
-                ielems.append(ielem)
-            line_index += 1
-        # after reading all ielem in group
-        if len(ielems) == 0:   # delete the lines for this element group
-            for j in range(grp_line, line_index):
-                del well_lines[grp_line]
-            line_index = grp_line
-        elif len(ielems) > 0:
+        ielems = [ielem] + [int(line.split()[0]) for line in well_lines[line_index + 1:line_index + nelem]]
+        line_index += nelem
+        ielems = [e for e in ielems if e in elems]    # keep the items in the submodel
+
+        # write the reduced group, or nothing if no elements are in the submodel
+        if len(ielems) > 0:
             new_ngrp += 1
-            well_lines[ngrp_line] = '\t' + str(new_ngrp)
-            well_lines[grp_line] = str(id+1) + '\t' + str(len(ielems)) + '\t' + str(ielems[0])
-            if len(ielems) > 1:
-                for j in range(1,len(ielems)):
-                    well_lines[grp_line + j] = '\t\t' + str(ielems[j])
-            if len(ielems) < nelem:
-                # Delete extra lines - always delete at the same position since list shrinks
-                for j in range(len(ielems), nelem):
-                    del well_lines[grp_line + len(ielems)]
-            # line_index was pointing past the old group, adjust to point past the new smaller group
-            # The new group has len(ielems) total lines (1 header + len(ielems)-1 element lines)
-            line_index = grp_line + len(ielems)
+            group_lines.append(str(id+1) + '\t' + str(len(ielems)) + '\t' + str(ielems[0]))
+            group_lines.extend('\t\t' + str(e) for e in ielems[1:])
+
+    well_lines[groups_start:line_index] = group_lines
 
     well_lines[ngrp_line] = '         ' + str(new_ngrp) + '                       / NGRP'
     well_lines.append('')
@@ -46,7 +46,7 @@ def sub_gw_subs_file(old_filename, new_filename, node_list, bounding_poly, verbo
     '''
     import iwfm
     from iwfm.file_utils import read_next_line_value
-    from shapely.geometry import Point
+    import numpy as np
 
     if verbose: print(f"Entered sub_gw_subs_file() with {old_filename}")
 
@@ -66,19 +66,21 @@ def sub_gw_subs_file(old_filename, new_filename, node_list, bounding_poly, verbo
     # Skip factors (3 data lines) to reach hydrograph locations
     line_index = iwfm.skip_ahead(line_index, subs_lines, 3)
 
-    # remove hydrographs that are not in the submodel
-    keep_hyd = []
+    # find the hydrograph lines, which may have comments between them
+    hyd_index = []
     for l in range(0, nouts):
-        t = subs_lines[line_index].split()
-        id = int(t[0])
-        point = Point(float(t[3]), float(t[4]))
-        if not point.within(bounding_poly):
-            del subs_lines[line_index]
-        else:
-            new_nouts += 1
-            keep_hyd.append(id)
-            line_index += 1
-        line_index = iwfm.skip_ahead(line_index, subs_lines, 0)       # skip comments to next section
+        hyd_index.append(line_index)
+        line_index = iwfm.skip_ahead(line_index + 1, subs_lines, 0)   # skip comments to next line or section
+
+    # remove hydrographs that are not in the submodel, testing all locations at once
+    if nouts > 0:
+        xy = np.array([subs_lines[i].split()[3:5] for i in hyd_index], dtype=float)
+        inside = iwfm.sub_points_within(xy[:, 0], xy[:, 1], bounding_poly)
+        drop = {i for i, keep in zip(hyd_index, inside) if not keep}
+        new_nouts = nouts - len(drop)
+        start = hyd_index[0]
+        subs_lines[start:line_index] = [subs_lines[i] for i in range(start, line_index) if i not in drop]
+        line_index -= len(drop)
 
     subs_lines[nouts_line] = '         ' + str(new_nouts) + '                       / NOUTS'
 
@@ -33,7 +33,7 @@ def sub_lu_file(in_filename, out_filename, elems, verbose=False):
     out_filename : str
         name of new land use file
 
-    elems : list of ints
+    elems : list or set of ints
         list of existing model elements in submodel
 
     verbose : bool, default=False
@@ -44,15 +44,14 @@ def sub_lu_file(in_filename, out_filename, elems, verbose=False):
 
     '''
     import iwfm
-    from iwfm.file_utils import read_next_line_value
+    from iwfm.lu_data import read_lu_data, write_lu_data
 
     # Use iwfm utility for file validation
     iwfm.file_test(in_filename)
 
-    # -- read the land use file into array lu_lines
+    # -- read the land use file, with the header lines above the data
     try:
-        with open(in_filename) as f:
-            lu_lines = f.read().splitlines()  # open and read input file
+        lu = read_lu_data(in_filename)
     except FileNotFoundError as e:
         logger.error(f'sub_lu_file: file not found {in_filename}: {e}')
         raise
@@ -60,51 +59,21 @@ def sub_lu_file(in_filename, out_filename, elems, verbose=False):
         logger.error(f'sub_lu_file: failed to read {in_filename}: {e}')
         raise
 
-    # Skip comments and spec lines (4 data lines) to reach land use data
-    # read_next_line_value skips skip_lines, then reads the next line
-    # We need to skip 4 spec lines and position at the first data line
-    _, line_index = read_next_line_value(lu_lines, -1, column=0, skip_lines=4)
-
-    # read the land use data into lists
-    lu_table, lu_dates, lu_elems = iwfm.read_lu_file(in_filename)
-
-    lu_elems = lu_elems[0]
-
-    # remove data for elements that are not in the submodel
-    for row in reversed(range(len(lu_table[0]))):
-        if int(lu_elems[row]) not in elems:
-            del lu_elems[row]
-            for t in range(len(lu_table)):
-                del lu_table[t][row]
-
-    for i in range(len(lu_table)):
-        # convert lu_table list entry to output format
-        table_data = ''
-        for t in lu_table[i][0]:
-            table_data = table_data + str(t) + '\t'
-        lu_lines[line_index] = lu_dates[i] + '\t' + str(lu_elems[0]) + '\t' + table_data
-        line_index += 1
-
-        for j in range(1, len(lu_elems)): 
-            # convert lu_table list entry to output format
-            table_data = ''
-            for t in lu_table[i][j]:
-                table_data = table_data + str(t) + '\t'
-            lu_lines[line_index] = '\t' + str(lu_elems[j]) + '\t' + table_data
-            line_index += 1
-
-    del lu_lines[line_index:]
-    lu_lines.append('')
-
-    # -- write new preprocessor input file
+    # keep the rows of elements in the submodel
+    lu = lu.select(iwfm.sub_item_set(elems))
+    if len(lu.elems) == 0:
+        msg = f'no elements of {in_filename} are in the submodel'
+        logger.error(f'sub_lu_file: {msg}')
+        raise IndexError(msg)
+
+    # -- write new land use file
     try:
-        with open(out_filename, 'w') as outfile:
-            outfile.write('\n'.join(lu_lines))
+        write_lu_data(lu, out_filename)
     except (PermissionError, OSError) as e:
         logger.error(f'sub_lu_file: failed to write {out_filename}: {e}')
         raise
 
-    logger.debug(f'sub_lu_file: wrote submodel land use file {out_filename} with {len(elems)} elements')
+    logger.debug(f'sub_lu_file: wrote submodel land use file {out_filename} with {len(lu.elems)} elements')
 
     if verbose:
         print(f'      Wrote submodel land use area file {out_filename}')
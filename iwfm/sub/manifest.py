@@ -0,0 +1,228 @@
+# sub_manifest.py
+# Read and write the submodel manifest, a versioned NumPy .npz file with the
+# submodel elements, nodes, stream nodes, lakes and boundary polygon
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+SUB_MANIFEST_VERSION = 1
+
+
+def sub_manifest_name(out_base_name):
+    ''' sub_manifest_name() - Return the manifest file name for a submodel '''
+    return out_base_name + '_manifest.npz'
+
+
+def sub_source_stamps(files):
+    ''' sub_source_stamps() - Identify the current version of source files by
+        path, size and modification time
+
+    Parameters
+    ----------
+    files : list of str
+        Source file names
+
+    Returns
+    -------
+    stamps : list of tuples
+        (absolute path, size in bytes, modification time in ns) of each
+        file; size and time are -1 for a missing file
+
+    '''
+    import os
+
+    stamps = []
+    for name in files:
+        path = os.path.abspath(name)
+        try:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stamps.append((path, -1, -1))
+    return stamps
+
+
+def sub_manifest_write(manifest_file, elem_list, node_list, node_coords, elem_nodes,
+                       snode_dict, sub_snodes, lake_info=None, bounding_poly=None, sources=None):
+    ''' sub_manifest_write() - Write the submodel manifest
+
+    All items are stored as typed NumPy arrays, without pickled objects, in
+    one uncompressed .npz file with the schema version SUB_MANIFEST_VERSION.
+
+    Parameters
+    ----------
+    manifest_file : str
+        Output file name, see sub_manifest_name()
+
+    elem_list : list
+        Submodel element rows from get_elem_list()
+
+    node_list : list of ints
+        Existing model nodes in submodel
+
+    node_coords : list
+        [node, x, y] of each submodel node
+
+    elem_nodes : list
+        Element rows of the submodel element file [elem, node1, ..., subregion]
+
+    snode_dict : dict
+        key = stream node, value = groundwater node
+
+    sub_snodes : list of ints
+        Existing model stream nodes in submodel
+
+    lake_info : list, default=None
+        Lakes in the submodel from sub_pp_lakes(); the text fields of each
+        lake are stored as strings and its list of elements as integers
+
+    bounding_poly : shapely Polygon, default=None
+        Submodel boundary, stored as WKB
+
+    sources : list of str, default=None
+        Files the manifest was made from, stamped with sub_source_stamps()
+
+    Returns
+    -------
+    nothing
+
+    '''
+    import numpy as np
+
+    lake_info = lake_info or []
+    stamps = sub_source_stamps(sources or [])
+
+    node_coords = list(node_coords)
+    lake_fields = ['\t'.join(str(v) for v in lake if not isinstance(v, list)) for lake in lake_info]
+    lake_elems = [next((v for v in lake if isinstance(v, list)), []) for lake in lake_info]
+    wkb = b''
+    if bounding_poly is not None:
+        wkb = bounding_poly.wkb                 # Shapely 1.x and 2.x
+
+    arrays = {
+        'schema_version': np.array(SUB_MANIFEST_VERSION),
+        'elem_list': np.array(elem_list, dtype=np.int64),
+        'node_list': np.array(node_list, dtype=np.int64),
+        'node_ids': np.array([row[0] for row in node_coords], dtype=np.int64),
+        'node_xy': np.array([row[1:3] for row in node_coords], dtype=float).reshape(-1, 2),
+        'elem_nodes': np.array(elem_nodes, dtype=np.int64),
+        'snode_keys': np.array(list(snode_dict.keys()), dtype=np.int64),
+        'snode_values': np.array(list(snode_dict.values()), dtype=np.int64),
+        'sub_snodes': np.array(sub_snodes, dtype=np.int64),
+        'lake_fields': np.array(lake_fields, dtype=str),
+        'lake_elems': np.array([e for elems in lake_elems for e in elems], dtype=np.int64),
+        'lake_counts': np.array([len(elems) for elems in lake_elems], dtype=np.int64),
+        'boundary_wkb': np.frombuffer(wkb, dtype=np.uint8),
+        'source_paths': np.array([s[0] for s in stamps], dtype=str),
+        'source_stamps': np.array([s[1:] for s in stamps], dtype=np.int64).reshape(-1, 2),
+    }
+
+    with open(manifest_file, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def sub_manifest_read(manifest_file):
+    ''' sub_manifest_read() - Read the submodel manifest
+
+    Parameters
+    ----------
+    manifest_file : str
+        Manifest file name
+
+    Returns
+    -------
+    manifest : dict
+        elem_list, node_list, node_coords, elem_nodes, snode_dict,
+        sub_snodes and lake_info as the lists and dicts that
+        iwfm_sub_preproc() creates, bounding_poly (shapely Polygon, or None)
+        and sources (list of (path, size, time) tuples)
+
+    Raises
+    ------
+    ValueError
+        If the manifest has a different schema version
+
+    '''
+    import numpy as np
+
+    with np.load(manifest_file, allow_pickle=False) as data:
+        version = int(data['schema_version'])
+        if version != SUB_MANIFEST_VERSION:
+            raise ValueError(f'{manifest_file} has submodel manifest version {version}, '
+                             f'expected {SUB_MANIFEST_VERSION}')
+        arrays = {key: data[key] for key in data.files}
+
+    lake_elems = np.split(arrays['lake_elems'], np.cumsum(arrays['lake_counts'])[:-1]) \
+        if len(arrays['lake_counts']) else []
+    lake_info = [fields.split('\t') + [elems.tolist()]
+                 for fields, elems in zip(arrays['lake_fields'].tolist(), lake_elems)]
+
+    bounding_poly = None
+    if len(arrays['boundary_wkb']):
+        from shapely import wkb
+        bounding_poly = wkb.loads(arrays['boundary_wkb'].tobytes())
+
+    return {
+        'elem_list': arrays['elem_list'].tolist(),
+        'node_list': arrays['node_list'].tolist(),
+        'node_coords': [[i, x, y] for i, (x, y) in zip(arrays['node_ids'].tolist(),
+                                                      arrays['node_xy'].tolist())],
+        'elem_nodes': arrays['elem_nodes'].tolist(),
+        'snode_dict': dict(zip(arrays['snode_keys'].tolist(), arrays['snode_values'].tolist())),
+        'sub_snodes': arrays['sub_snodes'].tolist(),
+        'lake_info': lake_info,
+        'bounding_poly': bounding_poly,
+        'sources': [(path, int(size), int(mtime)) for path, (size, mtime)
+                    in zip(arrays['source_paths'].tolist(), arrays['source_stamps'].tolist())],
+    }
+
+
+def sub_manifest_current(manifest_file, sources):
+    ''' sub_manifest_current() - Test whether a submodel manifest exists, has
+        the current schema version and was made from the same unchanged
+        source files
+
+    Parameters
+    ----------
+    manifest_file : str
+        Manifest file name
+
+    sources : list of str
+        Source files, as given to sub_manifest_write()
+
+    Returns
+    -------
+    current : bool
+        True if the manifest can be used instead of processing the sources
+
+    '''
+    import os
+    import numpy as np
+
+    if not os.path.isfile(manifest_file):
+        return False
+    try:
+        with np.load(manifest_file, allow_pickle=False) as data:
+            if int(data['schema_version']) != SUB_MANIFEST_VERSION:
+                return False
+            stored = list(zip(data['source_paths'].tolist(),
+                              (tuple(s) for s in data['source_stamps'].tolist())))
+    except (OSError, KeyError, ValueError):
+        return False
+
+    stamps = sub_source_stamps(sources)
+    if any(size < 0 for _, size, _ in stamps):
+        return False
+    return stored == [(path, (size, mtime)) for path, size, mtime in stamps]
@@ -0,0 +1,72 @@
+# sub_points_within.py
+# Test which points (wells, hydrographs, subsidence sites) are inside the
+# submodel area, all at once
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+
+def _path_contains(x, y, bounding_poly):
+    ''' _path_contains() - Point-in-polygon test with matplotlib paths, for
+        shapely versions without contains_xy() '''
+    import numpy as np
+    from matplotlib.path import Path
+
+    points = np.column_stack((x, y))
+    polys = getattr(bounding_poly, 'geoms', [bounding_poly])    # Polygon or MultiPolygon
+
+    inside = np.zeros(len(points), dtype=bool)
+    for poly in polys:
+        in_poly = Path(np.asarray(poly.exterior.coords)).contains_points(points)
+        for hole in poly.interiors:
+            in_poly &= ~Path(np.asarray(hole.coords)).contains_points(points)
+        inside |= in_poly
+    return inside
+
+
+def sub_points_within(x, y, bounding_poly):
+    ''' sub_points_within() - Test which points are inside the submodel area
+
+    Same result as Point(x, y).within(bounding_poly) for each point: points
+    on the boundary are outside. With shapely 2 the polygon is prepared and
+    all points are tested in one vectorized contains_xy() call; older
+    shapely versions use matplotlib Path.contains_points().
+
+    Parameters
+    ----------
+    x, y : list or numpy array of floats
+        Point coordinates
+
+    bounding_poly : shapely Polygon or MultiPolygon
+        submodel area
+
+    Returns
+    -------
+    inside : numpy array of bools
+        True for points inside bounding_poly
+
+    '''
+    import numpy as np
+    import shapely
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) == 0:
+        return np.zeros(0, dtype=bool)
+
+    if hasattr(shapely, 'contains_xy'):
+        shapely.prepare(bounding_poly)
+        return shapely.contains_xy(bounding_poly, x, y)
+    return _path_contains(x, y, bounding_poly)
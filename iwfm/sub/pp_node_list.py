@@ -39,9 +39,7 @@ def sub_pp_node_list(elem_file, elem_list):
     from iwfm.file_utils import read_next_line_value
 
     comments = ['Cc*#']
-    elems = []
-    for e in elem_list:
-        elems.append(int(e[0]))
+    elems = {int(e[0]) for e in elem_list}
 
     iwfm.file_test(elem_file)
     with open(elem_file) as f:
@@ -62,16 +60,12 @@ def sub_pp_node_list(elem_file, elem_list):
     _, line_index = read_next_line_value(elem_lines, line_index, column=0, skip_lines=subs - 1)
 
     # -- get node list from element list
-    node_list = []
+    nodes = set()
     for i in range(line_index, len(elem_lines)):
-        temp = [int(n) for n in elem_lines[i].split()]
-        elem = temp[0]
-        nodes = temp[1:5]
-        if elem in elems:
-            for node in nodes:
-                if node not in node_list:
-                    node_list.append(node)
-    node_list.sort()
+        temp = elem_lines[i].split()
+        if int(temp[0]) in elems:
+            nodes.update(int(n) for n in temp[1:5])
+    node_list = sorted(nodes)
     # remove 0, it is not a node number, just indicates a triangular element
     if (node_list[0] == 0):
         node_list.pop(0)
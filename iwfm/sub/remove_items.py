@@ -18,6 +18,51 @@
 # -----------------------------------------------------------------------------
 
 
+def sub_item_set(items):
+    '''sub_item_set() - Return submodel component numbers as a set, for
+       constant-time membership tests when filtering file lines
+
+    Parameters
+    ----------
+    items : list, set or numpy array of ints
+        existing model components (elements, nodes, stream nodes, etc) in submodel
+
+    Returns
+    -------
+    items : set or frozenset of ints
+        items, unchanged if already a set
+
+    '''
+    if isinstance(items, (set, frozenset)):
+        return items
+    return {int(item) for item in items}
+
+
+def sub_keep_lines(lines, items, column=0):
+    '''sub_keep_lines() - Return the lines whose component number is in the
+       submodel
+
+    Parameters
+    ----------
+    lines : list of strings
+        data lines, each with a component number in column
+
+    items : list or set of ints
+        existing model components (elements, nodes, stream nodes, etc) in submodel
+
+    column : int, default=0
+        whitespace-separated column with the component number
+
+    Returns
+    -------
+    kept : list of strings
+        lines for components in items, in order
+
+    '''
+    items = sub_item_set(items)
+    return [line for line in lines if int(line.split()[column]) in items]
+
+
 def sub_remove_items(file_lines, line_index, items, skip=0):
     '''sub_remove_items() - Remove lines for components (elements, nodes, stream 
        nodes, etc) that are not in the submodel
@@ -25,12 +70,12 @@ def sub_remove_items(file_lines, line_index, items, skip=0):
     Parameters
     ----------
     file_lines : list of strings
-        each element is a line from the input file
+        each element is a line from the input file, modified in place
 
     line_index : int
         starting line number for processing
 
-    items : list of ints
+    items : list or set of ints
         list of existing model compnents (elements, nodes, stream nodes, etc) in submodel
 
     skip : int, default=0
@@ -49,11 +94,13 @@ def sub_remove_items(file_lines, line_index, items, skip=0):
     # Skip comments and additional lines
     _, line_index = read_next_line_value(file_lines, line_index - 1, column=0, skip_lines=skip)
     if int(file_lines[line_index].split()[0]) > 0:
-        while file_lines[line_index][0] not in comments:
-            if int(file_lines[line_index].split()[0]) not in items:
-                del file_lines[line_index]
-            else:
-                line_index += 1
+        # find the end of the block, then replace it with the kept lines in one step
+        end = line_index
+        while file_lines[end][0] not in comments:
+            end += 1
+        kept = sub_keep_lines(file_lines[line_index:end], items)
+        file_lines[line_index:end] = kept
+        line_index += len(kept)
     else:
         line_index += 1
 
@@ -30,7 +30,7 @@ def sub_st_inflow_file(old_filename, new_filename, snode_list, verbose=False):
     new_filename : str
         name of new subnmodel element pumpgin file
 
-    snode_list : list of ints
+    snode_list : list or set of ints
         list of existing model stream nodes in submodel
 
     verbose : bool, default=False
@@ -61,9 +61,10 @@ def sub_st_inflow_file(old_filename, new_filename, snode_list, verbose=False):
     new_ninflows, ninflows_line = 0, line_index
     _, line_index = read_next_line_value(inflow_lines, line_index - 1, column=0, skip_lines=5)  # skip factors
 
+    snodes = iwfm.sub_item_set(snode_list)
     for j in range(0, ninflows):
         t = inflow_lines[line_index].split()
-        if int(t[0]) not in snode_list:
+        if int(t[0]) not in snodes:
             t[0] = '0'
             inflow_lines[line_index] = '\t' + ' '.join(t)
         line_index += 1
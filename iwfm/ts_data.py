@@ -0,0 +1,205 @@
+# ts_data.py
+# Read an IWFM time-series input file (precipitation, ET, diversions, stream
+# inflows, pumping, ...) into a (time, column) array, with an optional
+# memory-mapped binary cache
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import re
+
+from iwfm import _text_blocks
+from iwfm.debug.logger_setup import logger
+
+TS_CACHE_VERSION = 1
+
+_FIRST = re.compile(rb'\n[ \t]*(\S+)')                          # first item on a line
+
+
+def ts_cache_names(filename):
+    ''' ts_cache_names() - Return the metadata and values file names of the
+        binary cache of a time-series input file '''
+    return filename + '_cache.npz', filename + '_cache.npy'
+
+
+def _read_ts_header(f, skip):
+    ''' _read_ts_header() - Read the lines above the first data line and the
+        first item of each of the skip specification lines. The file is left
+        at the first data line '''
+    header, lines = _text_blocks.read_header(f, skip)
+    specs = [line.split()[0] for line in lines]
+    return header, ['' if item.startswith('/') else item for item in specs]
+
+
+def _parse_ts_chunk(text, ncol, filename):
+    ''' _parse_ts_chunk() - Parse a block of data lines of a time-series file
+        from _text_blocks.iter_blocks() into (dates, (lines, ncol) array,
+        ncol), counting ncol on the first line if None '''
+    dates = _FIRST.findall(text)
+    if not all(b'/' in date for date in dates):
+        raise ValueError(f'{filename}: every data line must start with a date')
+    text = _FIRST.sub(b'\n', text, count=len(dates))
+
+    table, ncol = _text_blocks.parse_table(text, len(dates), ncol, filename, 'time-series')
+    return [date.decode() for date in dates], table, ncol
+
+
+def _ts_times(dates):
+    ''' _ts_times() - Day of each DSS date, e.g. 2000-09-30 for
+        '09/30/2000_24:00' '''
+    import numpy as np
+
+    days = []
+    for date in dates:
+        month, day, year = date.split('_')[0].split('/')
+        days.append(f'{year}-{month:0>2}-{day:0>2}')
+    return np.array(days, dtype='datetime64[D]')
+
+
+def _spec(specs, i, kind, default):
+    ''' _spec() - Specification item i as an int or float, or the default
+        if it is missing or not a number '''
+    try:
+        return kind(specs[i])
+    except (IndexError, ValueError):
+        return default
+
+
+def _read_ts_text(filename, skip):
+    ''' _read_ts_text() - Parse a time-series input file, see read_ts_data() '''
+    import numpy as np
+    from iwfm.iwfm_dataclasses import TimeSeriesData
+
+    dates, tables, ncol = [], [], None
+    with open(filename, 'rb') as f:
+        header, specs = _read_ts_header(f, skip)
+        for text in _text_blocks.iter_blocks(f):
+            chunk_dates, table, ncol = _parse_ts_chunk(text, ncol, filename)
+            dates += chunk_dates
+            tables.append(table)
+
+    if not dates:
+        msg = f'{filename}: no time-series data found after {skip} specification lines'
+        logger.error(f'read_ts_data: {msg}')
+        raise ValueError(msg)
+
+    values = np.concatenate([table for table in tables if len(table)])
+    return TimeSeriesData(values=values, times=_ts_times(dates), dates=np.array(dates),
+                          ncol=_spec(specs, 0, int, 0), fact=_spec(specs, 1, float, 1.0),
+                          nsp=_spec(specs, 2, int, 1), nfq=_spec(specs, 3, int, 0),
+                          dssfl=specs[4] if len(specs) > 4 else '', header=header)
+
+
+def _write_ts_cache(filename, ts, stamp):
+    ''' _write_ts_cache() - Write the binary cache of a time-series input
+        file; the metadata file is written last, so it only exists with a
+        complete values file '''
+    import os
+    import numpy as np
+
+    meta_file, values_file = ts_cache_names(filename)
+    if os.path.exists(meta_file):
+        os.remove(meta_file)
+    np.save(values_file, ts.values)
+    with open(meta_file, 'wb') as f:
+        np.savez(f, schema_version=np.array(TS_CACHE_VERSION),
+                 source_stamp=np.array(stamp, dtype=np.int64),
+                 times=ts.times, dates=ts.dates, header=np.array(ts.header, dtype=str),
+                 specs=np.array([ts.ncol, ts.nsp, ts.nfq], dtype=np.int64),
+                 fact=np.array(ts.fact), dssfl=np.array(ts.dssfl))
+
+
+def _read_ts_cache(filename, stamp):
+    ''' _read_ts_cache() - Read the binary cache of a time-series input file
+        with the values memory-mapped, or None if there is no current cache '''
+    import os
+    import numpy as np
+    from iwfm.iwfm_dataclasses import TimeSeriesData
+
+    meta_file, values_file = ts_cache_names(filename)
+    if not (os.path.isfile(meta_file) and os.path.isfile(values_file)):
+        return None
+    try:
+        with np.load(meta_file, allow_pickle=False) as data:
+            if (int(data['schema_version']) != TS_CACHE_VERSION
+                    or data['source_stamp'].tolist() != list(stamp)):
+                return None
+            meta = {key: data[key] for key in data.files}
+        values = np.load(values_file, mmap_mode='r')
+    except (OSError, KeyError, ValueError):
+        return None
+
+    ncol, nsp, nfq = meta['specs'].tolist()
+    return TimeSeriesData(values=values, times=meta['times'], dates=meta['dates'],
+                          ncol=ncol, fact=float(meta['fact']), nsp=nsp, nfq=nfq,
+                          dssfl=str(meta['dssfl']), header=tuple(meta['header'].tolist()))
+
+
+def read_ts_data(filename, skip=5, cache=False):
+    ''' read_ts_data() - Read an IWFM time-series input file into a (time,
+        column) array
+
+    Works for the files with NCOL, FACT, NSP, NFQ and DSSFL specification
+    lines followed by one line per time step: precipitation, ET,
+    diversions, stream inflows, pumping and others. Data lines are parsed
+    a block at a time with regular expressions and numpy; comment and
+    blank lines are skipped to the end of the file. The returned arrays
+    are read-only; copy them before making changes.
+
+    Parameters
+    ----------
+    filename : str
+        IWFM time-series input file name
+
+    skip : int, default=5
+        Number of specification lines (not counting comments) above the data
+
+    cache : bool, default=False
+        Keep a binary copy of the file next to it (see ts_cache_names()) and
+        use it while the file size and modification time are unchanged.
+        Values read from the cache are memory-mapped, so only the parts
+        used are read from disk
+
+    Returns
+    -------
+    ts : TimeSeriesData
+        values (ntime, ncol), times, dates and header metadata
+
+    Raises
+    ------
+    ValueError
+        If the file has no data lines or data lines with different
+        numbers of values
+
+    '''
+    import os
+
+    stat = os.stat(filename)
+    stamp = (skip, stat.st_size, stat.st_mtime_ns)
+    if cache:
+        ts = _read_ts_cache(filename, stamp)
+        if ts is not None:
+            logger.debug(f'read_ts_data: read {filename} from cache')
+            return ts
+
+    ts = _read_ts_text(filename, skip)
+    for array in (ts.values, ts.times, ts.dates):
+        array.flags.writeable = False
+    logger.debug(f'read_ts_data: read {filename} with {ts.values.shape[0]} time steps, '
+                 f'{ts.values.shape[1]} columns')
+
+    if cache:
+        _write_ts_cache(filename, ts, stamp)
+    return ts
@@ -25,6 +25,7 @@ on Windows if openpyxl is not installed.
 New API (recommended):
     create_workbook, open_workbook, save_workbook, close_workbook
     add_worksheet, get_worksheet, write_cells, write_budget_data
+    buds2xl, bud2xl_file, buds2xl_parallel
 
 Legacy API (deprecated):
     excel_init, excel_new_workbook, excel_kill
@@ -86,12 +87,19 @@ write_cells = _backend_module.write_cells
 write_budget_data = _backend_module.write_budget_data
 
 
+# -----------------------------------------------------------------------------
+# Budget conversion
+# -----------------------------------------------------------------------------
+
+from iwfm.xls.buds2xl import buds2xl, bud2xl_file
+from iwfm.xls.buds2xl_parallel import buds2xl_parallel
+
+
 # -----------------------------------------------------------------------------
 # Deprecated Functions (backward compatibility)
 # These issue warnings and delegate to the backend
 # -----------------------------------------------------------------------------
 
-from iwfm.xls.buds2xl import buds2xl
 from iwfm.xls.excel_init import excel_init
 from iwfm.xls.excel_new_workbook import excel_new_workbook
 from iwfm.xls.excel_kill import excel_kill
@@ -38,46 +38,80 @@ def buds2xl(bud_file, type='xlsx', verbose=False):
 
     '''
 
-    import os
     import iwfm
-    import iwfm.hdf5 as hdf5
-    from iwfm.xls import create_workbook, write_budget_data, save_workbook, close_workbook
 
     budget_list, factors = iwfm.iwfm_read_bud(bud_file, verbose=verbose)  # read budget file
-    nbudget, factlou, unitlou, factarou, unitarou, factvolou, unitvolou, bdt, edt = factors
+    nbudget = factors[0]
 
     if verbose: print(f'   {nbudget} budgets found in {bud_file}')
 
     for budget in range(nbudget):
-        hdffile, outfile, intprnt, nlprint, lprint = budget_list[budget]
-        if verbose: print(f'   Processing {hdffile}')
+        bud2xl_file(budget_list[budget], factors, type=type, verbose=verbose)
+
+
+def bud2xl_file(budget, factors, type='xlsx', verbose=False):
+    ''' bud2xl_file() - Convert one budget listed in an IWFM Budget.in file
+        to an Excel or csv file
+
+    Parameters
+    ----------
+    budget : list
+        One item from the budget list returned by iwfm_read_bud():
+        [hdffile, outfile, intprnt, nlprint, lprint]
+
+    factors : list
+        Conversion factors and units returned by iwfm_read_bud()
+
+    type : string, default='xlsx'
+        Output file style
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    outfile : str or None
+        Name of the file written, or None if nothing was written
+
+    '''
+
+    import os
+    import iwfm.hdf5 as hdf5
+    from iwfm.xls import create_workbook, write_budget_data, save_workbook, close_workbook
+
+    nbudget, factlou, unitlou, factarou, unitarou, factvolou, unitvolou, bdt, edt = factors
+    hdffile, outfile, intprnt, nlprint, lprint = budget
+    if verbose: print(f'   Processing {hdffile}')
+
+    budget_data   = hdf5.get_budget_data(hdffile,
+                            area_conversion_factor=factarou,
+                            volume_conversion_factor=factvolou,
+                            length_units=unitlou,
+                            area_units=unitarou,
+                            volume_units=unitvolou,
+                            verbose=verbose) # (loc_names, column_headers, loc_values, titles)
 
-        budget_data   = hdf5.get_budget_data(hdffile,
-                                area_conversion_factor=factarou,
-                                volume_conversion_factor=factvolou,
-                                length_units=unitlou,
-                                area_units=unitarou,
-                                volume_units=unitvolou,
-                                verbose=verbose) # (loc_names, column_headers, loc_values, titles)
+    if type=='xlsx':   # default type is Excel
+        xlfile = outfile[:outfile.index('.bud')] + '.xlsx'  # Excel file name
 
-        if type=='xlsx':   # default type is Excel
-            xlfile = outfile[:outfile.index('.bud')] + '.xlsx'  # Excel file name
+        # Create workbook with filename
+        workbook = create_workbook(os.path.abspath(xlfile))
 
-            # Create workbook with filename
-            workbook = create_workbook(os.path.abspath(xlfile))
+        # Write budget data to workbook
+        write_budget_data(workbook, budget_data)
 
-            # Write budget data to workbook
-            write_budget_data(workbook, budget_data)
+        # Save and close workbook
+        save_workbook(workbook)
+        close_workbook(workbook)
+        return xlfile
 
-            # Save and close workbook
-            save_workbook(workbook)
-            close_workbook(workbook)
+    elif type=='csv':     # for future use?
+        pass
 
-        elif type=='csv':     # for future use?
-            pass
+    else:
+        pass
 
-        else:
-            pass
+    return None
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+# buds2xl_parallel.py
+# Read information from an IWFM Budget.in file and convert every listed
+# budget to an Excel file using a pool of worker processes
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+from iwfm.debug.logger_setup import logger
+
+
+def _bud2xl_worker(budget, factors, type):
+    ''' _bud2xl_worker() - Convert one budget and time it. Runs in a worker
+        process, so failures are returned instead of raised.
+
+    Returns
+    -------
+    result : dict
+        hdffile, outfile, seconds, error (None on success)
+
+    '''
+    import time
+    from iwfm.xls.buds2xl import bud2xl_file
+
+    start = time.perf_counter()
+    outfile, error = None, None
+    try:
+        outfile = bud2xl_file(budget, factors, type=type, verbose=False)
+    except (Exception, SystemExit) as e:  # file_missing() calls sys.exit()
+        error = f'{e.__class__.__name__}: {e}' if str(e) else e.__class__.__name__
+
+    return {'hdffile': budget[0], 'outfile': outfile,
+            'seconds': time.perf_counter() - start, 'error': error}
+
+
+def buds2xl_parallel(bud_file, type='xlsx', workers=None, verbose=False):
+    ''' buds2xl_parallel() - Read IWFM Budget.in file and convert each listed
+        budget to an Excel file, one budget per worker process
+
+    Parameters
+    ----------
+    bud_file : string
+        IWFM Budget.in file name
+
+    type : string, default='xlsx'
+        Output file style
+
+    workers : int, default=None
+        Number of worker processes. None uses one per CPU (capped at the
+        number of budgets); 1 runs the budgets serially in this process
+
+    verbose : bool, default=False
+        Turn command-line output on or off
+
+    Returns
+    -------
+    results : list of dicts
+        One dict per budget in Budget.in order with keys 'hdffile',
+        'outfile', 'seconds' and 'error' (None on success)
+
+    '''
+    import os
+    import iwfm
+    from concurrent.futures import ProcessPoolExecutor
+
+    budget_list, factors = iwfm.iwfm_read_bud(bud_file, verbose=verbose)  # read budget file
+    nbudget = factors[0]
+
+    if verbose: print(f'   {nbudget} budgets found in {bud_file}')
+    if nbudget == 0:
+        return []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), nbudget))
+    logger.info(f'Converting {nbudget} budgets with {workers} worker(s)')
+
+    if workers == 1:
+        results = [_bud2xl_worker(budget, factors, type) for budget in budget_list]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_bud2xl_worker, budget, factors, type)
+                       for budget in budget_list]
+            results = [future.result() for future in futures]
+
+    for result in results:
+        if result['error'] is None:
+            logger.info(f"{result['hdffile']}: {result['seconds']:.2f} s")
+        else:
+            logger.warning(f"{result['hdffile']} failed: {result['error']}")
+        if verbose:
+            status = 'ok' if result['error'] is None else f"FAILED ({result['error']})"
+            print(f"   {result['hdffile']}: {result['seconds']:.2f} s  {status}")
+
+    return results
+
+
+if __name__ == '__main__':
+    ' Run from command line '
+    import sys
+    import iwfm.debug as idb
+    from iwfm.debug import parse_cli_flags
+
+    verbose, debug = parse_cli_flags()
+
+    if len(sys.argv) > 1:  # arguments are listed on the command line
+        bud_file = sys.argv[1]
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    else:  # ask for file names from terminal
+        bud_file = input('IWFM Budget file name: ')
+        workers = None
+        print('')
+
+    idb.exe_time()  # initialize timer
+
+    buds2xl_parallel(bud_file, workers=workers, verbose=verbose)
+
+    idb.exe_time()  # print elapsed time
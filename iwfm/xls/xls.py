@@ -0,0 +1,49 @@
+# xls.py
+# Command line interface for iwfm.xls Excel utilities
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+"""
+Excel command group for the unified iwfm CLI.
+
+Registered by iwfm.cli.main as 'iwfm xls'.
+"""
+
+from __future__ import annotations
+
+import typer
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command("buds")
+def buds(
+    bud_file: str = typer.Argument(..., help="IWFM Budget.in file name"),
+    workers: int = typer.Option(None, "--workers", "-w",
+                                help="Worker processes (default: one per CPU)"),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress progress messages"),
+):
+    """
+    Convert every budget listed in a Budget.in file to Excel in parallel.
+    """
+    from iwfm.xls.buds2xl_parallel import buds2xl_parallel
+
+    results = buds2xl_parallel(bud_file, workers=workers, verbose=not quiet)
+
+    failed = [r for r in results if r['error'] is not None]
+    if failed:
+        typer.echo(f"{len(failed)} of {len(results)} budgets failed", err=True)
+        raise typer.Exit(code=1)
@@ -0,0 +1,55 @@
+# conftest.py
+# Shared pytest fixtures
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+# data columns of test budgets after Time: (header, column type, title line)
+BUDGET_COLUMNS = [(b'Inflow (@UNITVL@)', 1, None),
+                  (b'Area (@UNITAR@)', 2, b'AREA @AREA@ @UNITAR@')]
+
+
+def _write_budget_hdf(path, loc_names=('Subregion 1', 'Subregion 2'), n_timesteps=3,
+                      n_columns=1):
+    """Write a minimal IWFM budget HDF5 file with the first n_columns of
+    BUDGET_COLUMNS, every value 43560.0."""
+    import h5py
+
+    columns = BUDGET_COLUMNS[:n_columns]
+    with h5py.File(path, 'w') as f:
+        grp = f.create_group('Attributes')
+        grp.attrs['nLocations'] = len(loc_names)
+        grp.attrs['NTimeSteps'] = n_timesteps
+        grp.attrs['TimeStep%BeginDateAndTime'] = np.bytes_(b'10/31/1973_24:00')
+        grp.attrs['TimeStep%DeltaT'] = 1.0
+        grp.attrs['TimeStep%Unit'] = np.bytes_(b'1MON')
+        grp.attrs['LocationData1%cFullColumnHeaders'] = [b'Time'] + [c[0] for c in columns]
+        grp.attrs['LocationData1%iDataColumnTypes'] = np.array([0] + [c[1] for c in columns])
+        grp.attrs['ASCIIOutput%cTitles'] = ([b'TEST BUDGET', b'FOR @LOCNAME@']
+                                            + [c[2] for c in columns if c[2]])
+        grp.create_dataset('cLocationNames', data=np.array([n.encode() for n in loc_names]))
+        grp.create_dataset('Areas', data=np.full(len(loc_names), 43560.0))
+        for name in loc_names:
+            f.create_dataset(name, data=np.ones((n_timesteps, len(columns))) * 43560.0)
+
+
+@pytest.fixture
+def write_budget_hdf():
+    """Function that writes a minimal IWFM budget HDF5 file, see _write_budget_hdf()."""
+    pytest.importorskip('h5py')
+    return _write_budget_hdf
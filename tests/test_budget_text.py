@@ -0,0 +1,162 @@
+# test_budget_text.py
+# Unit tests for budget_text.py - IWFM ASCII Budget table parser
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from iwfm.budget_text import (budget_geometry, budget_label_columns, parse_budget_rows,
+                              read_budget_geometry, read_budget_text, iter_budget_text)
+
+DATES = ['10/31/1973_24:00', '11/30/1973_24:00', '12/31/1973_24:00', '01/31/1974_24:00']
+
+
+def budget_lines(ntable=3, nrow=4, blank=''):
+    """Stream budget tables with two 'Gain from GW' columns; value = table*100 + row*10 + column."""
+    lines = []
+    for t in range(ntable):
+        lines += ['                        IWFM STREAM PACKAGE (v4.2.0106)',
+                  f'         STREAM FLOW BUDGET IN AC.FT. FOR Reach {t + 1}(REACH {t + 1})',
+                  '-' * 72,
+                  ' ' * 16 + ''.join(f'{label:>14}' for label in
+                                     ('Upstream', 'Gain from GW', 'Gain from GW', 'Runoff')),
+                  '      Time' + ' ' * 6 + ''.join(f'{label:>14}' for label in
+                                                ('Inflow', 'Inside Model', 'Outside Model')),
+                  '-' * 72]
+        for r in range(nrow):
+            values = [t * 100 + r * 10 + c for c in range(4)]
+            lines.append(DATES[r] + ''.join(f'{v:14.1f}' for v in values))
+        lines += [blank, blank]
+    return lines
+
+
+@pytest.fixture
+def budget_file(tmp_path):
+    path = tmp_path / 'streams.bud'
+    path.write_text('\n'.join(budget_lines()) + '\n')
+    return str(path)
+
+
+class TestBudgetGeometry:
+    """Tests for budget_geometry() and budget_label_columns()."""
+
+    def test_layout(self):
+        """Test header, rows, footer, stride and columns."""
+        geometry = budget_geometry(budget_lines())
+
+        assert geometry['header'] == 6
+        assert geometry['nrow'] == 4
+        assert geometry['footer'] == 2
+        assert geometry['table_len'] == 12
+        assert geometry['ntable'] == 3
+        assert geometry['starts'].tolist() == [6, 18, 30]
+        assert geometry['ntitle'] == 2
+        assert geometry['edges'].tolist() == [16, 30, 44, 58, 72]
+
+    def test_no_data_rows(self):
+        """Test that lines without data rows are all header."""
+        geometry = budget_geometry(['Title', '-----'])
+        assert geometry['ntable'] == 0
+        assert geometry['header'] == 2
+
+    def test_irregular_table(self):
+        """Test that a table with a different number of rows raises ValueError."""
+        lines = budget_lines()
+        del lines[20]
+        with pytest.raises(ValueError):
+            budget_geometry(lines)
+
+    def test_label_columns(self):
+        """Test that each label occurrence maps to the value column below it."""
+        geometry = budget_geometry(budget_lines())
+        assert budget_label_columns(geometry, 'Gain from GW', line=3) == [1, 2]
+        assert budget_label_columns(geometry, 'Runoff') == [3]
+        assert budget_label_columns(geometry, 'Missing') == []
+
+
+class TestReadBudgetText:
+    """Tests for parse_budget_rows(), read_budget_text() and iter_budget_text()."""
+
+    def test_parse_rows(self):
+        """Test fixed-width splitting of data rows, including wide negative values."""
+        rows = ['10/31/1973_24:00      -12345.6           0.0',
+                '11/30/1973_24:00           1.5  -1.2345E+06']
+        dates, values = parse_budget_rows(rows, [16, 30, 44])
+        assert dates.tolist() == DATES[:2]
+        assert values.tolist() == [[-12345.6, 0.0], [1.5, -1.2345e6]]
+
+    def test_read_all_tables(self, budget_file):
+        """Test the (ntable, ntime, ncol) array and side arrays."""
+        values, dates, titles, geometry = read_budget_text(budget_file)
+
+        assert values.shape == (3, 4, 4)
+        assert values[2, 3, 1] == 231.0
+        assert dates.tolist() == DATES
+        assert titles.shape == (3, 2)
+        assert titles[1, 1].endswith('(REACH 2)')
+
+    def test_selected_columns(self, budget_file):
+        """Test that only the requested columns are returned."""
+        values, _, _, _ = read_budget_text(budget_file, columns=[3, 1])
+        assert values[1, 0].tolist() == [103.0, 101.0]
+
+    def test_iter_matches_read(self, budget_file):
+        """Test that streaming gives the same tables and keeps all lines."""
+        values, _, _, _ = read_budget_text(budget_file)
+        tables = list(iter_budget_text(budget_file))
+
+        assert np.array_equal(np.stack([t[2] for t in tables]), values)
+        assert sum(len(t[0]) for t in tables) == len(budget_lines())
+
+    def test_single_table(self, tmp_path):
+        """Test a file with one table and no trailing lines."""
+        path = tmp_path / 'one.bud'
+        path.write_text('\n'.join(budget_lines(ntable=1)[:-2]))
+
+        tables = list(iter_budget_text(str(path)))
+        assert len(tables) == 1
+        assert read_budget_geometry(str(path))['ntable'] == 1
+
+    def test_no_tables(self, tmp_path):
+        """Test that a file without data rows raises ValueError."""
+        path = tmp_path / 'empty.bud'
+        path.write_text('Title\n')
+        with pytest.raises(ValueError):
+            read_budget_text(str(path))
+
+
+class TestBudgetTextUsers:
+    """Tests for the budget tools built on the parser."""
+
+    def test_stacdep_process_budget(self, budget_file):
+        """Test that both 'Gain from GW' columns are added for each reach."""
+        from iwfm.calib.stacdep2obs import process_budget
+
+        budget_table, reach_list, dates = process_budget(budget_file)
+
+        assert reach_list == [1, 2, 3]
+        assert dates[0] == '10/31/1973'
+        assert budget_table[1].tolist() == [203.0, 223.0, 243.0, 263.0]
+
+    def test_budget_info_counts_tables(self):
+        """Test the number of tables and lines between tables."""
+        import iwfm
+        assert iwfm.budget_info(budget_lines(ntable=5)) == (5, 6, 2)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,158 @@
+# test_buds2xl_parallel.py
+# Unit tests for the buds2xl_parallel function in the iwfm package
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+import pytest
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+from iwfm.xls.buds2xl_parallel import buds2xl_parallel
+
+
+def write_budget_in(path, budgets):
+    """Write a minimal IWFM Budget.in file listing (hdffile, outfile) pairs."""
+    lines = ['C IWFM Budget Input File',
+             '    1.0        / FACTLTOU',
+             '    FEET       / UNITLTOU',
+             '    0.0000229568411   / FACTAROU',
+             '    ACRES      / UNITAROU',
+             '    0.0000229568411   / FACTVLOU',
+             '    AC.FT.     / UNITVLOU',
+             '    500000     / CACHE',
+             '    10/31/1973_24:00  / BDT',
+             '    12/31/1973_24:00  / EDT',
+             f'    {len(budgets)}    / NBUDGET']
+    for hdffile, outfile in budgets:
+        lines += [f'  {hdffile}   / HDFFILE', f'  {outfile}   / OUTFILE',
+                  '  1MON   / INTPRNT', '  1   / NLPRNT', '  -1   / LPRNT[1]']
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+class TestBuds2xlParallelFunctionExists:
+    """Test that buds2xl_parallel exists and is exported."""
+
+    def test_buds2xl_parallel_exists(self):
+        """Test that buds2xl_parallel function exists and is callable."""
+        assert callable(buds2xl_parallel)
+
+    def test_exported_from_xls(self):
+        """Test that buds2xl_parallel is exported from iwfm.xls."""
+        from iwfm.xls import buds2xl_parallel as exported
+        assert exported is buds2xl_parallel
+
+
+@pytest.mark.skipif(not HAS_H5PY, reason="h5py not installed")
+class TestBuds2xlParallelConversion:
+    """Test conversion of several budgets."""
+
+    @pytest.fixture
+    def budget_files(self, tmp_path, write_budget_hdf):
+        """Create two budget HDF files and a Budget.in listing them."""
+        budgets = []
+        for name in ('GW', 'RZ'):
+            hdffile = str(tmp_path / f'{name}_Budget.hdf')
+            write_budget_hdf(hdffile, n_columns=2)
+            budgets.append((hdffile, str(tmp_path / f'{name}_Budget.bud')))
+        bud_file = str(tmp_path / 'Budget.in')
+        write_budget_in(bud_file, budgets)
+        return bud_file, tmp_path
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_writes_all_workbooks(self, budget_files, workers):
+        """Test that one workbook is written per budget."""
+        bud_file, tmp_path = budget_files
+
+        results = buds2xl_parallel(bud_file, workers=workers)
+
+        assert len(results) == 2
+        for name, result in zip(('GW', 'RZ'), results):
+            assert result['error'] is None
+            assert result['outfile'] == str(tmp_path / f'{name}_Budget.xlsx')
+            assert os.path.exists(result['outfile'])
+            assert result['seconds'] >= 0.0
+
+    def test_workbook_contents(self, budget_files):
+        """Test that workbook contents match the serial converter."""
+        from openpyxl import load_workbook
+        bud_file, tmp_path = budget_files
+
+        results = buds2xl_parallel(bud_file, workers=2)
+
+        wb = load_workbook(results[0]['outfile'])
+        ws = wb['Subregion 1']
+        assert ws.cell(row=2, column=1).value == 'FOR Subregion 1'
+        assert ws.cell(row=6, column=2).value == pytest.approx(1.0)
+
+    def test_reports_failures(self, tmp_path, write_budget_hdf):
+        """Test that a missing HDF file is reported without stopping the batch."""
+        hdffile = str(tmp_path / 'GW_Budget.hdf')
+        write_budget_hdf(hdffile, n_columns=2)
+        bud_file = str(tmp_path / 'Budget.in')
+        write_budget_in(bud_file, [(str(tmp_path / 'missing.hdf'), str(tmp_path / 'missing.bud')),
+                                   (hdffile, str(tmp_path / 'GW_Budget.bud'))])
+
+        results = buds2xl_parallel(bud_file, workers=2)
+
+        assert results[0]['error'] is not None
+        assert results[0]['outfile'] is None
+        assert results[1]['error'] is None
+        assert os.path.exists(results[1]['outfile'])
+
+    def test_empty_budget_list(self, tmp_path):
+        """Test that a Budget.in file with no budgets returns an empty list."""
+        bud_file = str(tmp_path / 'Budget.in')
+        write_budget_in(bud_file, [])
+
+        assert buds2xl_parallel(bud_file) == []
+
+
+@pytest.mark.skipif(not HAS_H5PY, reason="h5py not installed")
+class TestBuds2xlParallelCLI:
+    """Test the 'iwfm xls buds' command."""
+
+    def test_cli_exit_code_on_failure(self, tmp_path):
+        """Test that the command exits with 1 when a budget fails."""
+        from typer.testing import CliRunner
+        from iwfm.xls.xls import app
+
+        bud_file = str(tmp_path / 'Budget.in')
+        write_budget_in(bud_file, [(str(tmp_path / 'missing.hdf'), str(tmp_path / 'missing.bud'))])
+
+        result = CliRunner().invoke(app, [bud_file, '--workers', '1', '--quiet'])
+
+        assert result.exit_code == 1
+
+    def test_cli_success(self, tmp_path, write_budget_hdf):
+        """Test that the command converts budgets and exits with 0."""
+        from typer.testing import CliRunner
+        from iwfm.xls.xls import app
+
+        hdffile = str(tmp_path / 'GW_Budget.hdf')
+        write_budget_hdf(hdffile, n_columns=2)
+        bud_file = str(tmp_path / 'Budget.in')
+        write_budget_in(bud_file, [(hdffile, str(tmp_path / 'GW_Budget.bud'))])
+
+        result = CliRunner().invoke(app, [bud_file, '-w', '1', '-q'])
+
+        assert result.exit_code == 0
+        assert os.path.exists(tmp_path / 'GW_Budget.xlsx')
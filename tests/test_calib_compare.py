@@ -290,5 +290,23 @@ class TestCompareImport:
         assert callable(compare)
 
 
+class TestCompareLarge:
+    """Tests for compare() with large site lists."""
+
+    def test_large_site_lists(self):
+        """Test 40,000 shuffled sites against 20,000, keeping the order of list1."""
+        import random
+        from iwfm.calib.compare import compare
+
+        list1 = [f'S{i:06d}' for i in range(40000)]
+        random.Random(3).shuffle(list1)
+        list2 = sorted(list1[::2])
+
+        missing, in_both = compare(list1, list2)
+
+        assert missing == list1[1::2]
+        assert in_both == list1[::2]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -505,5 +505,81 @@ class TestFac2IwfmImports:
         assert sig.parameters['verbose'].default == False
 
 
+
+class TestFac2IwfmSparse:
+    """Tests for the sparse factor matrix, thresholds and realizations."""
+
+    def write_factors(self, tmp_path, wrapped=False):
+        """Write factors for 3 nodes and 3 pilot points; node 3 has none."""
+        from iwfm.calib.ppk2fac import write_factors
+        pp_file = str(tmp_path / 'factors.dat')
+        write_factors(pp_file, 'pp.dat', ['PP_1', 'PP_2', 'PP_3'], [1, 2, 3],
+                      [[0, 1, 2], [2], []], [[0.5, 0.25, 0.25], [1.0], []],
+                      verbose=False, one_line=not wrapped)
+        return pp_file
+
+    def read_values(self, output_file):
+        return [float(line.split()[-1]) for line in open(output_file)]
+
+    @pytest.mark.parametrize('wrapped', [False, True])
+    def test_read_factors(self, tmp_path, wrapped):
+        """Test one-line and wrapped factor records give the same matrix."""
+        from iwfm.calib.fac2iwfm import read_factors
+
+        nodes, factors = read_factors(self.write_factors(tmp_path, wrapped))
+
+        assert nodes == [1, 2, 3]
+        assert factors.shape == (3, 3)
+        assert factors.toarray().tolist() == [[0.5, 0.25, 0.25], [0, 0, 1.0], [0, 0, 0]]
+
+    def test_thresholds_and_empty(self, tmp_path):
+        """Test rlow/rhigh clip nodal values and empty fills nodes without factors."""
+        from iwfm.calib.fac2iwfm import fac2iwfm
+
+        param_file = tmp_path / 'params.dat'
+        param_file.write_text('PP_1 0 0 1 10.0\nPP_2 0 0 1 30.0\nPP_3 0 0 1 500.0\n')
+        output_file = str(tmp_path / 'output.dat')
+
+        fac2iwfm(self.write_factors(tmp_path), str(param_file), output_file,
+                 rlow=1.0, rhigh=100.0, empty=-1.0)
+
+        assert self.read_values(output_file) == [100.0, 100.0, -1.0]
+
+    def test_realizations_match_single_runs(self, tmp_path):
+        """Test that batch output equals one fac2iwfm() call per realization."""
+        import numpy as np
+        from iwfm.calib.fac2iwfm import fac2iwfm, fac2iwfm_reals
+
+        pp_file = self.write_factors(tmp_path)
+        values = np.random.default_rng(1).random((4, 3)) * 100.0
+        param_files = []
+        for i, row in enumerate(values):
+            name = tmp_path / f'params{i}.dat'
+            name.write_text(''.join(f'PP_{j+1} 0 0 1 {v!r}\n' for j, v in enumerate(row.tolist())))
+            param_files.append(str(name))
+        singles = [str(tmp_path / f'single{i}.out') for i in range(4)]
+        for param_file, single in zip(param_files, singles):
+            fac2iwfm(pp_file, param_file, single)
+
+        from_files = [str(tmp_path / f'files{i}.out') for i in range(4)]
+        from_array = [str(tmp_path / f'array{i}.out') for i in range(4)]
+        nodal = fac2iwfm_reals(pp_file, param_files, from_files, workers=2)
+        fac2iwfm_reals(pp_file, values, from_array)
+
+        assert nodal.shape == (4, 3)
+        assert np.allclose(nodal[:, 1], values[:, 2])
+        for single, a, b in zip(singles, from_files, from_array):
+            assert open(single).read() == open(a).read() == open(b).read()
+
+    def test_realizations_output_count_mismatch(self, tmp_path):
+        """Test that the number of output files must match the realizations."""
+        import numpy as np
+        from iwfm.calib.fac2iwfm import fac2iwfm_reals
+
+        with pytest.raises(ValueError):
+            fac2iwfm_reals(self.write_factors(tmp_path), np.ones((2, 3)),
+                           [str(tmp_path / 'a.out')])
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
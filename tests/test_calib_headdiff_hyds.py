@@ -47,3 +47,28 @@ def test_headdiff_hyds_function_signature():
 
     # Check for expected parameters
     assert 'hobs_file' in params or len(params) > 0
+
+
+def test_headdiff_hyds_many_pairs():
+    '''Test 10,000 well pairs against head differences calculated directly.'''
+    from datetime import datetime, timedelta
+    from math import ceil
+    from iwfm.calib.headdiff_hyds import headdiff_hyds
+    from iwfm.calib.to_smp_ins import to_smp_ins
+
+    start_date = datetime(2000, 1, 1)
+    sites = [f'W{i:06d}' for i in range(20000)]
+    head = {(site, k): float((i * 5 + k) % 7) for i, site in enumerate(sites) for k in range(2)}
+    hdiff_data = [[site, start_date + timedelta(days=30 * k), head[(site, k)], 1]
+                  for i, site in enumerate(sites) for k in range(2)]
+    hdiff_pairs = [[f'P{i}', sites[i], sites[i + 1]] for i in range(0, len(sites), 2)]
+    hdiff_pairs.append(['PX', sites[0], 'NOT_A_WELL'])          # skipped
+
+    smp_out, ins_out = headdiff_hyds(hdiff_pairs, hdiff_data, 1, lambda days: days / 30.0 + 1,
+                                     start_date)
+
+    expected = [to_smp_ins(name, start_date + timedelta(days=30 * k),
+                           head[(left, k)] - head[(right, k)], ceil(k + 1.0))
+                for name, left, right in hdiff_pairs[:-1] for k in range(2)]
+    assert smp_out == [smp for smp, _ in expected]
+    assert ins_out == [ins for _, ins in expected]
@@ -0,0 +1,181 @@
+# test_calib_krige_factors.py
+# Unit tests for calib/krige_factors.py - Kriging factors from pilot points to nodes
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import pytest
+import numpy as np
+
+from iwfm.calib.krige_factors import covariance, krige_factors
+
+
+@pytest.fixture
+def points():
+    """Random pilot points and nodes, plus three nodes on pilot points."""
+    rng = np.random.default_rng(3)
+    pp_coord = rng.random((40, 2)) * 1000.0
+    node_coord = np.vstack([rng.random((50, 2)) * 1000.0, pp_coord[:3]])
+    return pp_coord, node_coord
+
+
+class TestCovariance:
+    """Tests for the variogram covariance models."""
+
+    @pytest.mark.parametrize('vtype', ['spherical', 'exponential', 'gaussian'])
+    def test_zero_distance_is_total_sill(self, vtype):
+        """Test that C(0) = nugget + sill."""
+        assert covariance(np.array([0.0]), vtype, nugget=0.5, sill=2.0, a=10.0)[0] == pytest.approx(2.5)
+
+    def test_spherical_reaches_zero_at_range(self):
+        """Test that spherical covariance is zero beyond a."""
+        cov = covariance(np.array([5.0, 10.0, 20.0]), 'spherical', sill=1.0, a=10.0)
+        assert cov[0] == pytest.approx(1.0 - 1.5 * 0.5 + 0.5 * 0.125)
+        assert cov[1] == pytest.approx(0.0)
+        assert cov[2] == 0.0
+
+    def test_exponential_and_gaussian(self):
+        """Test the exponential and Gaussian definitions."""
+        assert covariance(np.array([10.0]), 'exponential', a=10.0)[0] == pytest.approx(np.exp(-1.0))
+        assert covariance(np.array([20.0]), 'gaussian', a=10.0)[0] == pytest.approx(np.exp(-4.0))
+
+    def test_unknown_model(self):
+        """Test that an unknown variogram type raises ValueError."""
+        with pytest.raises(ValueError):
+            covariance(np.array([1.0]), 'cubic')
+
+
+class TestKrigeFactors:
+    """Tests for krige_factors()."""
+
+    @pytest.mark.parametrize('vtype', ['spherical', 'exponential', 'gaussian'])
+    def test_ordinary_weights_sum_to_one(self, points, vtype):
+        """Test the ordinary kriging unbiasedness condition."""
+        pp_coord, node_coord = points
+        ppoints, weights = krige_factors(pp_coord, node_coord, vtype=vtype, a=400.0,
+                                         nugget=0.01, n_ppoints=8)
+
+        assert all(len(p) == 8 for p in ppoints)
+        assert np.allclose([sum(w) for w in weights], 1.0)
+
+    def test_exact_at_pilot_points(self, points):
+        """Test that a node on a pilot point takes its value without a nugget."""
+        pp_coord, node_coord = points
+        ppoints, weights = krige_factors(pp_coord, node_coord, a=400.0)
+
+        for i in range(3):
+            assert ppoints[-3 + i][0] == i
+            assert weights[-3 + i][0] == pytest.approx(1.0)
+
+    def test_matches_direct_solve(self, points):
+        """Test one node against an explicitly assembled kriging system."""
+        pp_coord, node_coord = points
+        ppoints, weights = krige_factors(pp_coord, node_coord, vtype='exponential', a=300.0,
+                                         n_ppoints=5)
+
+        pp = pp_coord[ppoints[0]]
+        dist = np.linalg.norm(pp[:, None] - pp[None], axis=-1)
+        lhs = np.ones((6, 6))
+        lhs[:5, :5] = covariance(dist, 'exponential', a=300.0)
+        lhs[5, 5] = 0.0
+        rhs = np.append(covariance(np.linalg.norm(pp - node_coord[0], axis=1), 'exponential', a=300.0), 1.0)
+        assert np.allclose(weights[0], np.linalg.solve(lhs, rhs)[:5])
+
+    def test_default_range_is_third_of_diagonal(self, points):
+        """Test the default range on a pilot point bounding box that is not square."""
+        pp_coord, node_coord = points
+        pp_coord = pp_coord * [1.0, 0.25]
+        pp_coord[:2] = [[0.0, 0.0], [1000.0, 250.0]]       # bounding box 1000 x 250
+        expected = krige_factors(pp_coord, node_coord, a=np.hypot(1000.0, 250.0) / 3.0)[1]
+        weights = krige_factors(pp_coord, node_coord)[1]
+        assert np.allclose(np.concatenate(weights), np.concatenate(expected))
+
+    def test_universal_reproduces_linear_trend(self, points):
+        """Test that universal kriging interpolates a plane exactly."""
+        pp_coord, node_coord = points
+        plane = lambda xy: 3.0 + 2.0 * xy[..., 0] - xy[..., 1]
+
+        ppoints, weights = krige_factors(pp_coord, node_coord, a=400.0, kriging='universal',
+                                         n_ppoints=10)
+
+        est = [np.dot(w, plane(pp_coord[p])) for p, w in zip(ppoints, weights)]
+        assert np.allclose(est, plane(node_coord))
+
+    def test_anisotropy_favors_bearing_direction(self):
+        """Test that a pilot point along the bearing gets more weight."""
+        pp_coord = np.array([[0.0, 100.0], [100.0, 0.0]])   # north, east of node
+        node_coord = np.array([[0.0, 0.0]])
+
+        def weight_of(bearing):
+            ppoints, weights = krige_factors(pp_coord, node_coord, a=500.0, anisotropy=4.0,
+                                             bearing=bearing)
+            return dict(zip(ppoints[0], weights[0]))
+
+        north = weight_of(0.0)
+        east = weight_of(90.0)
+
+        assert north[0] > north[1]
+        assert east[1] > east[0]
+
+    def test_search_radius_and_min_ppoints(self, points):
+        """Test that nodes with too few pilot points in range get no factors."""
+        pp_coord, node_coord = points
+        ppoints, weights = krige_factors(pp_coord, node_coord, a=400.0, search_radius=80.0,
+                                         min_ppoints=2)
+
+        for p, w in zip(ppoints, weights):
+            assert len(p) == len(w)
+            assert len(p) == 0 or len(p) >= 2
+        assert any(len(p) == 0 for p in ppoints)
+
+    def test_process_pool_matches_serial(self, points):
+        """Test that workers > 1 gives the same factors."""
+        pp_coord, node_coord = points
+        serial = krige_factors(pp_coord, node_coord, a=400.0, chunk_size=10)
+        pooled = krige_factors(pp_coord, node_coord, a=400.0, chunk_size=10, workers=2)
+
+        assert serial[0] == pooled[0]
+        assert np.allclose(np.concatenate(serial[1]), np.concatenate(pooled[1]))
+
+    def test_invalid_kriging_type(self, points):
+        """Test that an unknown kriging type raises ValueError."""
+        pp_coord, node_coord = points
+        with pytest.raises(ValueError):
+            krige_factors(pp_coord, node_coord, kriging='simple')
+
+
+class TestKrigeFactorsFile:
+    """Tests for writing kriging factors for fac2iwfm."""
+
+    def test_fac2iwfm_reads_factors(self, tmp_path, points):
+        """Test that fac2iwfm applies one-line kriging factor records."""
+        from iwfm.calib.ppk2fac import write_factors
+        from iwfm.calib.fac2iwfm import fac2iwfm
+
+        pp_coord, node_coord = points
+        ppoints, weights = krige_factors(pp_coord, node_coord, a=400.0, n_ppoints=6)
+        pp_list = [f'PP{i + 1}' for i in range(len(pp_coord))]
+        factors_file = str(tmp_path / 'factors.dat')
+        write_factors(factors_file, 'pp.dat', pp_list, list(range(1, len(node_coord) + 1)),
+                      ppoints, weights, verbose=False, one_line=True)
+
+        param_file = tmp_path / 'params.dat'
+        param_file.write_text('\n'.join(f'{name}  0.0  0.0  1  25.0' for name in pp_list))
+        out_file = str(tmp_path / 'nodes.out')
+        fac2iwfm(factors_file, str(param_file), out_file)
+
+        values = [float(line.split()[-1]) for line in open(out_file)]
+        assert len(values) == len(node_coord)
+        assert np.allclose(values, 25.0)
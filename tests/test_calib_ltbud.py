@@ -201,6 +201,33 @@ class TestLtbud:
         assert sig.parameters['neg_val'].default == 1.0e-7
 
 
+class TestLtbudValues:
+    """Tests for the array log-transform and formatting in ltbud."""
+
+    def test_matches_scalar_logtrans(self, tmp_path):
+        """Test values against logtrans() and str(round()) formatting, incl. zero and negatives."""
+        import iwfm
+        from iwfm.calib.ltbud import ltbud
+
+        values = [0.0, -3.0, 1.0, 0.9999, 1.0001, 12345.6, 10 ** 0.12345]
+        lines = ['  IWFM BUDGET', '-' * 20, '     Time   Values', '-' * 20]
+        for d in range(1, 3):
+            lines.append(f'10/{d:02d}/2020_24:00' + ''.join(f'{v:14.4f}' for v in values))
+        budget_file = tmp_path / 'budget.out'
+        budget_file.write_text('\n'.join(lines) + '\n')
+        output_file = tmp_path / 'output.out'
+
+        ltbud(str(budget_file), str(output_file), zero_offset=2.0, neg_val=-0.0001)
+
+        out_lines = output_file.read_text().splitlines()
+        parsed = [float(f'{v:.4f}') for v in values]
+        expected = lines[4][:16] + ''.join(str(round(iwfm.logtrans(v, 2.0, -0.0001), 3)).rjust(14)
+                                           for v in parsed)
+        assert out_lines[4] == expected
+        assert '-0.0' in expected
+        assert out_lines[:4] == lines[:4]
+
+
 class TestLtbudImports:
     """Tests for function imports."""
 
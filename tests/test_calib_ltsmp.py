@@ -199,6 +199,29 @@ class TestLtsmp:
         assert sig.parameters['neg_val'].default == 0.001
 
 
+class TestLtsmpValues:
+    """Tests for the array log-transform in ltsmp."""
+
+    def test_matches_scalar_logtrans(self, tmp_path):
+        """Test each output line against logtrans() of its value."""
+        import iwfm
+        from iwfm.calib.ltsmp import ltsmp
+
+        values = [0.0, -5.0, 0.5, 1.0, 12345.678, 10 ** 0.12345]
+        lines = [f'SITE_{i:03d}             01/15/2020  0:00:00   {v:12.4f}' for i, v in enumerate(values)]
+        input_file = tmp_path / 'input.smp'
+        input_file.write_text('\n'.join(lines))
+        output_file = tmp_path / 'output.smp'
+
+        ltsmp(str(input_file), str(output_file))
+
+        out_lines = output_file.read_text().splitlines()
+        for line, out in zip(lines, out_lines):
+            head, value = line.rsplit(None, 1)
+            expected = f'{head.rstrip()}               {iwfm.logtrans(float(value), 36.0, 0.001):.4f}'
+            assert out == expected.ljust(len(line))
+
+
 class TestLtsmpImports:
     """Tests for function imports."""
 
@@ -29,13 +29,15 @@ class TestPestResStats:
         
         PEST .res file format:
         - Header line
-        - Data lines: obs_name  group  measured  residual  weight
+        - Data lines: obs_name  group  measured  modelled  residual  weight
         
         Parameters
         ----------
         observations : list of tuples
             Each tuple is (name_date, group, measured, residual, weight)
             name_date format: 'STATION_MMYYYY'
+            residual is modelled - measured, the statistics convention;
+            the file gets the PEST residual measured - modelled
         """
         res_file = tmp_path / 'test.res'
         
@@ -46,7 +48,8 @@ class TestPestResStats:
         # Data lines
         for obs in observations:
             name, group, measured, residual, weight = obs
-            lines.append(f'{name}  {group}  {measured}  {residual}  {weight}')
+            modelled = float(measured) + float(residual)
+            lines.append(f'{name}  {group}  {measured}  {modelled}  {-float(residual)}  {weight}')
         
         res_file.write_text('\n'.join(lines))
         return str(res_file)
@@ -292,7 +295,8 @@ class TestPestResStatsEdgeCases:
         lines = ['Name                          Group          Measured         Modelled         Residual           Weight']
         for obs in observations:
             name, group, measured, residual, weight = obs
-            lines.append(f'{name}  {group}  {measured}  {residual}  {weight}')
+            modelled = float(measured) + float(residual)
+            lines.append(f'{name}  {group}  {measured}  {modelled}  {-float(residual)}  {weight}')
         res_file.write_text('\n'.join(lines))
         return str(res_file)
 
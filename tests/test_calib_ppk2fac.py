@@ -252,6 +252,64 @@ class TestPar2FacIdw2:
         # Ratio w1/w2 should be (1/1²)/(1/2²) = 4
         assert np.isclose(w1 / w2, 4.0, rtol=0.01)
 
+    def test_coincident_node_takes_pilot_point_value(self):
+        """Test that a node on a pilot point gets weight 1 for that point."""
+        from iwfm.calib.ppk2fac import par2fac_idw2
+
+        pp_coord = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0], [10.0, 10.0]])
+        node_coord = np.array([[10.0, 0.0], [4.0, 4.0]])
+
+        ppoints, weights = par2fac_idw2(pp_coord, node_coord)
+
+        assert ppoints[0][0] == 1
+        assert weights[0] == [1.0, 0.0, 0.0]
+        assert np.all(np.isfinite(weights[1]))
+
+    def test_configurable_n_ppoints(self):
+        """Test more and fewer neighbors than the default."""
+        from iwfm.calib.ppk2fac import par2fac_idw2
+
+        pp_coord = np.array([[float(i), 0.0] for i in range(8)])
+        node_coord = np.array([[2.2, 1.0], [6.1, -1.0]])
+
+        ppoints, weights = par2fac_idw2(pp_coord, node_coord, n_ppoints=6)
+        assert [len(p) for p in ppoints] == [6, 6]
+        assert np.allclose([sum(w) for w in weights], 1.0)
+
+        ppoints, weights = par2fac_idw2(pp_coord, node_coord, n_ppoints=1, min_ppoints=1)
+        assert ppoints == [[2], [6]]
+        assert weights == [[1.0], [1.0]]
+
+    def test_search_radius(self):
+        """Test that pilot points beyond the search radius are dropped."""
+        from iwfm.calib.ppk2fac import par2fac_idw2
+
+        pp_coord = np.array([[0.0, 0.0], [1.0, 0.0], [50.0, 0.0], [60.0, 0.0]])
+        node_coord = np.array([[0.5, 0.0], [100.0, 100.0]])
+
+        ppoints, weights = par2fac_idw2(pp_coord, node_coord, search_radius=5.0)
+
+        assert sorted(ppoints[0]) == [0, 1]
+        assert np.isclose(sum(weights[0]), 1.0)
+        assert ppoints[1] == [] and weights[1] == []
+
+    def test_matches_brute_force(self):
+        """Test KD-tree neighbors and weights against a full distance sort."""
+        from iwfm.calib.ppk2fac import par2fac_idw2
+
+        rng = np.random.default_rng(1)
+        pp_coord = rng.random((40, 2)) * 1000.0
+        node_coord = rng.random((25, 2)) * 1000.0
+
+        ppoints, weights = par2fac_idw2(pp_coord, node_coord, n_ppoints=4)
+
+        for node, pp, wgt in zip(node_coord, ppoints, weights):
+            dist = np.hypot(*(pp_coord - node).T)
+            nearest = np.argsort(dist)[:4]
+            expected = 1.0 / dist[nearest] ** 2
+            assert list(pp) == list(nearest)
+            assert np.allclose(wgt, expected / expected.sum())
+
 
 class TestWriteFactors:
     """Tests for write_factors function"""
@@ -321,6 +379,37 @@ class TestWriteFactors:
 
         assert count == 5
 
+    def test_three_ppoint_record_layout(self, tmp_path):
+        """Test the node record layout for three pilot points."""
+        from iwfm.calib.ppk2fac import write_factors
+
+        outfile = str(tmp_path / 'factors.out')
+        write_factors(outfile, 'pp.dat', ['PP1', 'PP2', 'PP3'], [7], [[0, 1, 2]],
+                      [[0.5, 0.3, 0.2]], verbose=False)
+
+        lines = open(outfile).read().splitlines()
+        assert lines[6] == '           7           1           3  0.0000000E+00          1         0.5'
+        assert lines[7] == '          2         0.3           3         0.2'
+
+    def test_any_number_of_ppoints(self, tmp_path):
+        """Test node records with five, one and no pilot points."""
+        from iwfm.calib.ppk2fac import write_factors
+
+        outfile = str(tmp_path / 'factors.out')
+        pp_list = [f'PP{i}' for i in range(5)]
+        ppoints = [[4, 3, 2, 1, 0], [2], []]
+        weights = [[0.2] * 5, [1.0], []]
+
+        count = write_factors(outfile, 'pp.dat', pp_list, [1, 2, 3], ppoints, weights, verbose=False)
+
+        lines = open(outfile).read().splitlines()[8:]
+        assert count == 3
+        assert lines[0].split()[:5] == ['1', '1', '5', '0.0000000E+00', '5']
+        assert lines[1].split() == ['4', '0.2', '3', '0.2', '2', '0.2', '1', '0.2']
+        assert lines[2].split() == ['2', '1', '1', '0.0000000E+00', '3', '1.0']
+        assert lines[3].split() == ['3', '1', '0', '0.0000000E+00']
+        assert len(lines) == 4
+
 
 class TestPpk2FacImports:
     """Tests for module imports."""
@@ -415,5 +415,68 @@ class TestReadOverwriteFile:
             assert len(value) == 9  # 9 fields: node, layer, and 7 parameters
 
 
+class TestReal2IwfmBatch:
+    """Tests for real2iwfm_batch() and the overwrite file writer"""
+
+    def write_template(self, tmp_path):
+        content = create_overwrite_test_file(
+            nwrite=1, factors=[1.0] * 7, time_units=['1mon', '1mon', '1mon'],
+            param_data=[(1, 1, 1000.0, 1.0e-5, 0.15, 0.1, 1.5, 1.0e-6, 1.0e-4)])
+        template = tmp_path / 'template.dat'
+        template.write_text(content)
+        return str(template)
+
+    def test_matches_write_overwrite_file(self, tmp_path):
+        """Test that batch output equals write_overwrite_file() for each realization"""
+        import numpy as np
+        from iwfm.calib.real2iwfm import real2iwfm_batch, write_overwrite_file
+
+        template = self.write_template(tmp_path)
+        rng = np.random.default_rng(0)
+        values = rng.random((3, 7, 2, 4)) * 100.0
+        values[0, 1, 0, 2] = 0.0                        # written as -1
+
+        output_files = real2iwfm_batch(template, values, str(tmp_path / 'out'), ctime='1DAY',
+                                       workers=2)
+
+        _, factors, _, in_lines = read_overwrite_file(template, 4, 2, None)
+        nodes = [[1, 2, 3, 4]] * 2
+        for out, real in zip(output_files, values):
+            expected = str(tmp_path / 'expected.dat')
+            write_overwrite_file(expected, in_lines, [nodes] * 7, 2, real.tolist(), factors, '1DAY')
+            assert open(out).read() == open(expected).read()
+        assert os.path.basename(output_files[2]) == 'real3.dat'
+
+    def test_directory_of_realizations(self, tmp_path):
+        """Test reading .npy realizations with fewer than 7 parameter types"""
+        import numpy as np
+        from iwfm.calib.real2iwfm import real2iwfm_batch
+
+        template = self.write_template(tmp_path)
+        real_dir = tmp_path / 'reals'
+        real_dir.mkdir()
+        np.save(real_dir / 'r001.npy', np.full((2, 1, 3), 5.0))
+        np.save(real_dir / 'r002.npy', np.full((2, 1, 3), 7.0))
+        out_files = [str(tmp_path / 'a.dat'), str(tmp_path / 'b.dat')]
+
+        assert real2iwfm_batch(template, str(real_dir), out_files, nodes=[10, 20, 30]) == out_files
+
+        lines = open(out_files[1]).read().splitlines()
+        assert any('/ NWRITE' in line and line.split()[0] == '3' for line in lines)
+        assert any('1mon' in line and 'TUNITKH' in line for line in lines)
+        data = [line.split() for line in lines if line.startswith('\t')][1:]
+        assert [row[0] for row in data] == ['10', '20', '30']
+        assert data[0][2:5] == ['7.0000', '7.000E+00', '-1.000']
+
+    def test_output_count_mismatch(self, tmp_path):
+        """Test that the number of output files must match the realizations"""
+        import numpy as np
+        from iwfm.calib.real2iwfm import real2iwfm_batch
+
+        with pytest.raises(ValueError):
+            real2iwfm_batch(self.write_template(tmp_path), np.ones((2, 7, 1, 3)),
+                            [str(tmp_path / 'a.dat')])
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,125 @@
+# test_calib_residual_stats.py
+# Unit tests for calib/residual_stats.py - Group-by goodness-of-fit statistics
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+pl = pytest.importorskip('polars')
+
+from iwfm.calib.residual_stats import STATS, residual_stats, residual_stats_by
+
+
+@pytest.fixture
+def data():
+    """Residual table with three sites in two layers."""
+    rng = np.random.default_rng(4)
+    n = 300
+    observed = rng.random(n) * 50.0 + 100.0
+    return pl.DataFrame({
+        'site': rng.choice(['W1', 'W2', 'W3'], n),
+        'layer': rng.integers(1, 3, n),
+        'observed': observed,
+        'simulated': observed + rng.normal(0.5, 3.0, n),
+    })
+
+
+def reference(obs, sim):
+    """Statistics calculated directly with numpy."""
+    res = sim - obs
+    r = np.corrcoef(obs, sim)[0, 1]
+    kge = 1.0 - np.sqrt((r - 1.0) ** 2 + (sim.std(ddof=1) / obs.std(ddof=1) - 1.0) ** 2
+                        + (sim.mean() / obs.mean() - 1.0) ** 2)
+    return {'count': len(obs), 'mean': obs.mean(), 'bias': res.mean(),
+            'rmse': np.sqrt(np.mean(res ** 2)), 'std': obs.std(ddof=1),
+            'nse': 1.0 - np.sum(res ** 2) / np.sum((obs - obs.mean()) ** 2),
+            'kge': kge, 'r2': r ** 2}
+
+
+class TestResidualStats:
+    """Tests for residual_stats()."""
+
+    def test_overall_matches_numpy(self, data):
+        """Test every statistic of all rows against numpy."""
+        stats = residual_stats(data)
+        expected = reference(data['observed'].to_numpy(), data['simulated'].to_numpy())
+
+        assert stats.columns == list(STATS)
+        for key in STATS:
+            assert stats[key][0] == pytest.approx(expected[key])
+
+    def test_per_site_matches_numpy(self, data):
+        """Test per-site statistics, in order of first appearance."""
+        stats = residual_stats(data, by='site')
+
+        assert stats['site'].to_list() == data['site'].unique(maintain_order=True).to_list()
+        for row in stats.iter_rows(named=True):
+            sub = data.filter(pl.col('site') == row['site'])
+            expected = reference(sub['observed'].to_numpy(), sub['simulated'].to_numpy())
+            for key in STATS:
+                assert row[key] == pytest.approx(expected[key])
+
+    def test_residual_column(self):
+        """Test bias and rmse from a residual column without simulated values."""
+        stats = residual_stats({'observed': [100.0, 110.0, 120.0], 'res': [5.0, 3.0, 4.0]},
+                               residual='res')
+
+        assert stats['bias'][0] == pytest.approx(4.0)
+        assert stats['rmse'][0] == pytest.approx(np.sqrt(50.0 / 3.0))
+        assert stats['mean'][0] == pytest.approx(110.0)
+
+    def test_residual_matches_simulated(self, data):
+        """Test that a residual column gives the same statistics as simulated values."""
+        res = data.select('site', 'observed',
+                          (pl.col('simulated') - pl.col('observed')).alias('res'))
+
+        expected = residual_stats(data, by='site')
+        stats = residual_stats(res, by='site', residual='res')
+
+        assert stats['site'].to_list() == expected['site'].to_list()
+        for key in STATS:
+            assert stats[key].to_list() == pytest.approx(expected[key].to_list())
+
+    def test_undefined_statistics_are_null(self):
+        """Test that a single value gives null std, nse, kge and r2."""
+        stats = residual_stats({'observed': [1.0], 'simulated': [2.0]})
+
+        assert stats['count'][0] == 1
+        assert all(stats[key][0] is None for key in ('std', 'nse', 'kge', 'r2'))
+
+
+class TestResidualStatsBy:
+    """Tests for residual_stats_by()."""
+
+    def test_groupings_and_overall(self, data):
+        """Test several groupings computed together."""
+        stats = residual_stats_by(data, {'site': 'site', 'layer': 'layer',
+                                         'site_layer': ['site', 'layer']}, overall=True)
+
+        assert set(stats) == {'site', 'layer', 'site_layer', 'overall'}
+        assert stats['overall']['count'][0] == len(data)
+        assert stats['site']['count'].sum() == len(data)
+        assert len(stats['site_layer']) == 6
+        assert stats['layer'].sort('layer')['rmse'].to_list() == pytest.approx(
+            [residual_stats(data.filter(pl.col('layer') == k))['rmse'][0] for k in (1, 2)])
+
+    def test_extra_aggregations(self, data):
+        """Test that extra expressions are added to the result."""
+        stats = residual_stats_by(data, {'site': 'site'},
+                                  extra=[pl.col('layer').max().alias('max_layer')])
+
+        assert stats['site']['max_layer'].to_list() == [2, 2, 2]
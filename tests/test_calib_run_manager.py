@@ -0,0 +1,188 @@
+# test_calib_run_manager.py
+# Unit tests for calib/run_manager.py - Local parallel model runs
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+
+import pytest
+
+from iwfm.calib.run_manager import clone_template, run_manager
+
+# Stand-in model: reads Simulation/params.dat, fails for negative values,
+# writes results.out and an IWFM-style SimulationMessages.out
+MODEL = '''
+import os
+with open(os.path.join('Simulation', 'params.dat')) as f:
+    value = float(f.read())
+if value < 0:
+    raise SystemExit(3)
+with open('results.out', 'w') as f:
+    f.write(f"{value * 2} {os.environ['IWFM_RUN']} {os.path.basename(os.getcwd())}")
+with open('SimulationMessages.out', 'w') as f:
+    f.write('  TOTAL RUN TIME:  1 MINUTES  2.5 SECONDS\\n')
+'''
+
+
+def write_params(slot, value):
+    """Pre-processor: write the parameter value into the slot."""
+    with open(os.path.join(slot, 'Simulation', 'params.dat'), 'w') as f:
+        f.write(str(value))
+
+
+def read_results(slot, value):
+    """Post-processor: read the stand-in model output."""
+    with open(os.path.join(slot, 'results.out')) as f:
+        result, run, slot_name = f.read().split()
+    return float(result), int(run), slot_name
+
+
+# Stand-in model that writes its result to an HDF5 file
+HDF_MODEL = '''
+import os
+import h5py
+with open(os.path.join('Simulation', 'params.dat')) as f:
+    value = float(f.read())
+with h5py.File('budget.hdf', 'w') as f:
+    f['value'] = value * 2
+'''
+
+
+def read_hdf_results(slot, value):
+    """Post-processor: read the model output through the HDF5 handle pool."""
+    from iwfm.hdf5 import hdf_pool
+    open_files = hdf_pool.pool_info()['open_files']
+    handle = hdf_pool.get_handle(os.path.join(slot, 'budget.hdf'))
+    return float(handle['value'][()]), open_files
+
+
+@pytest.fixture
+def template(tmp_path):
+    """Template model directory with the stand-in model."""
+    template = tmp_path / 'template'
+    (template / 'Simulation').mkdir(parents=True)
+    (template / 'model.py').write_text(MODEL)
+    (template / 'Simulation' / 'input.dat').write_text('static input\n')
+    (template / 'Simulation' / 'params.dat').write_text('0.0')
+    return str(template)
+
+
+class TestCloneTemplate:
+    """Tests for clone_template()."""
+
+    def test_links_and_copies(self, template, tmp_path):
+        """Test that files matching the link patterns are hard-linked and others copied."""
+        slot = str(tmp_path / 'slot')
+        nlinked, ncopied = clone_template(template, slot, link=['model.py', 'Simulation/input.dat'])
+
+        assert (nlinked, ncopied) == (2, 1)
+        assert os.path.samefile(os.path.join(slot, 'model.py'), os.path.join(template, 'model.py'))
+        assert not os.path.samefile(os.path.join(slot, 'Simulation', 'params.dat'),
+                                    os.path.join(template, 'Simulation', 'params.dat'))
+
+    def test_copy_all(self, template, tmp_path):
+        """Test that without link patterns every file is copied and an old slot is replaced."""
+        slot = tmp_path / 'slot'
+        slot.mkdir()
+        (slot / 'stale.out').write_text('old')
+
+        assert clone_template(template, str(slot)) == (0, 3)
+        assert not (slot / 'stale.out').exists()
+
+
+class TestRunManager:
+    """Tests for run_manager() with a stand-in model."""
+
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_runs_all_parameter_sets(self, template, tmp_path, workers):
+        """Test results, order, timing and that the template is unchanged."""
+        values = [1.0, 2.5, 4.0, 8.0, 16.0]
+        summary = str(tmp_path / 'summary.txt')
+
+        results = run_manager(template, str(tmp_path / 'work'), [sys.executable, 'model.py'], values,
+                              workers=workers, pre=write_params, post=read_results,
+                              link=['model.py', 'Simulation/input.dat'], summary_file=summary)
+
+        assert [r['run'] for r in results] == list(range(5))
+        assert [r['output'][0] for r in results] == [2 * v for v in values]
+        assert [r['output'][1] for r in results] == list(range(5))
+        assert all(r['error'] is None and r['returncode'] == 0 for r in results)
+        assert all(r['exe_time'] == 62.5 and r['wall_time'] > 0 for r in results)
+        assert len({r['slot'] for r in results}) <= workers
+        assert {r['output'][2] for r in results} <= {f'slot_{i}' for i in range(workers)}
+        assert open(os.path.join(template, 'Simulation', 'params.dat')).read() == '0.0'
+
+        lines = open(summary).read().splitlines()
+        assert lines[0].split('\t')[:3] == ['run', 'slot', 'returncode']
+        assert len(lines) == 6
+
+    def test_param_file_and_failures(self, template, tmp_path):
+        """Test parameter files replacing linked files in the slot, and a failed run."""
+        param_sets = []
+        for i, value in enumerate([3.0, -1.0]):
+            path = tmp_path / f'par{i}.dat'
+            path.write_text(str(value))
+            param_sets.append(str(path))
+
+        results = run_manager(template, str(tmp_path / 'work'), f'"{sys.executable}" model.py',
+                              param_sets, workers=2, param_file='Simulation/params.dat',
+                              post=read_results, link=['*'])
+
+        assert results[0]['output'][0] == 6.0
+        assert results[1]['returncode'] == 3
+        assert results[1]['error'] == 'command returned 3'
+        assert results[1]['output'] is None
+        assert open(os.path.join(template, 'Simulation', 'params.dat')).read() == '0.0'
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_post_hdf_files_closed(self, template, tmp_path, workers):
+        """Test that HDF5 files post opened in the slot are closed before the next run,
+        and pooled files of the caller stay open."""
+        h5py = pytest.importorskip('h5py')
+        from iwfm.hdf5 import hdf_pool
+        (tmp_path / 'template' / 'hdf_model.py').write_text(HDF_MODEL)
+        own_file = str(tmp_path / 'own.hdf')
+        with h5py.File(own_file, 'w') as f:
+            f['value'] = 1.0
+        own = hdf_pool.get_handle(own_file)
+        values = [1.0, 2.0, 3.0, 4.0]
+        work = os.path.join(str(tmp_path / 'work'), '')
+
+        try:
+            results = run_manager(template, work, [sys.executable, 'hdf_model.py'], values,
+                                  workers=workers, pre=write_params, post=read_hdf_results)
+
+            assert all(r['error'] is None for r in results)
+            assert [r['output'][0] for r in results] == [2 * v for v in values]
+            assert all(not any(path.startswith(work) for path in r['output'][1]) for r in results)
+            open_files = hdf_pool.pool_info()['open_files']
+            assert os.path.abspath(own_file) in open_files and own
+            assert not any(path.startswith(work) for path in open_files)
+        finally:
+            hdf_pool.close_all()
+
+    def test_timeout(self, template, tmp_path):
+        """Test that a run over the time limit is recorded as an error."""
+        results = run_manager(template, str(tmp_path / 'work'),
+                              [sys.executable, '-c', 'import time; time.sleep(10)'], [1.0],
+                              workers=1, timeout=0.5)
+
+        assert results[0]['error'].startswith('timed out')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -151,5 +151,28 @@ class TestSim4SitesImports:
         assert sim_4_sites.__doc__ is not None
 
 
+class TestSim4SitesLarge:
+    """Tests for sim_4_sites() with large site lists."""
+
+    def test_large_site_lists(self):
+        """Test 20,000 simulated sites against 10,000 observed sites."""
+        import random
+        from iwfm.calib.sim_4_sites import sim_4_sites
+
+        sites = [f'S{i:06d}' for i in range(20000)]
+        sim_data = [[site, date(2000, month, 1), float(i + month)]
+                    for i, site in enumerate(sites) for month in (1, 2)]
+        random.Random(3).shuffle(sim_data)
+        obs_sites = sites[::2]
+
+        sim_dates, sim_values = sim_4_sites(sim_data, obs_sites)
+
+        # reference: observed sites in name order, each with its dates in order
+        expected_dates = [[date(2000, 1, 1), date(2000, 2, 1)] for _ in obs_sites]
+        expected_values = [[float(i + 1), float(i + 2)] for i in range(0, 20000, 2)]
+        assert sim_dates == expected_dates
+        assert sim_values == expected_values
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
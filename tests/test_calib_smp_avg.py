@@ -197,5 +197,29 @@ class TestSmpAvgImports:
         assert 'average' in smp_avg.__doc__.lower()
 
 
+class TestSmpAvgLarge:
+    """Tests for smp_avg() with many sites."""
+
+    def test_many_sites(self, tmp_path):
+        """Test 20,000 interleaved sites with three observations each."""
+        from statistics import mean
+        from iwfm.calib.smp_avg import smp_avg
+
+        rows = [(f'S{i:06d}', f'0{k + 1}/15/2000', (i * 7 + k * 3) % 101 / 4.0)
+                for k in range(3) for i in range(20000)]
+        smp_file = tmp_path / 'many.smp'
+        smp_file.write_text(''.join(f'{site}  {d}  0:00:00  {v}\n' for site, d, v in rows))
+
+        averages = smp_avg(str(smp_file))
+
+        # reference: mean of each site's values, one line per input line
+        site_mean = {site: mean(v for s, _, v in rows if s == site)
+                     for site in {'S000000', 'S000001', 'S019999'}}
+        assert len(averages) == len(rows)
+        for line, (site, d, _) in zip(averages, rows):
+            if site in site_mean:
+                assert line == f'{site.ljust(20)} {d}  0:00:00 {str(round(site_mean[site], 4)).rjust(22)}'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
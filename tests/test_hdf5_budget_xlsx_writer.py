@@ -0,0 +1,127 @@
+# test_hdf5_budget_xlsx_writer.py
+# Tests for hdf5/budget_xlsx_writer.py - Write IWFM budget tables to Excel
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+from iwfm.hdf5.budget_xlsx_writer import BudgetXlsxWriter
+
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+MODES = [False,
+         pytest.param(True, marks=pytest.mark.skipif(not HAS_XLSXWRITER,
+                                                     reason="XlsxWriter not installed"))]
+
+DATES = [datetime(1973, 10, 31), datetime(1973, 11, 30), datetime(1973, 12, 31)]
+
+
+def write_sample(path, constant_memory):
+    """Write a workbook with one simple sheet and one with two header rows."""
+    data = np.arange(6, dtype=float).reshape(3, 2) * 1000.5
+    with BudgetXlsxWriter(path, constant_memory=constant_memory) as writer:
+        writer.add_sheet('Subregion 1', [('GW BUDGET', True), ('IN AC.FT.', True), ('AREA', False)],
+                         [['Time', 'Inflow', 'Outflow']], DATES, data)
+        writer.add_sheet('Zone1_North', [('ZONE BUDGET', True)],
+                         [['Time', 'Streams', None], [None, 'IN (+)', 'OUT (-)']],
+                         DATES, data, merges=[(5, 2, 3)])
+
+
+class TestBudgetXlsxWriterImports:
+    """Tests for BudgetXlsxWriter imports."""
+
+    def test_import_from_hdf5(self):
+        """Test import from iwfm.hdf5."""
+        from iwfm.hdf5 import BudgetXlsxWriter as exported
+        assert exported is BudgetXlsxWriter
+
+
+@pytest.mark.parametrize('constant_memory', MODES)
+class TestBudgetXlsxWriterOutput:
+    """Tests for workbook contents in both writer modes."""
+
+    def test_sheet_names(self, tmp_path, constant_memory):
+        """Test that an empty Sheet1 comes first, then one sheet per call."""
+        path = str(tmp_path / 'out.xlsx')
+        write_sample(path, constant_memory)
+
+        wb = openpyxl.load_workbook(path)
+        assert wb.sheetnames == ['Sheet1', 'Subregion 1', 'Zone1_North']
+        assert wb['Sheet1'].max_row == 1 and wb['Sheet1']['A1'].value is None
+
+    def test_titles_and_headers(self, tmp_path, constant_memory):
+        """Test title rows and bold centered header row."""
+        path = str(tmp_path / 'out.xlsx')
+        write_sample(path, constant_memory)
+
+        ws = openpyxl.load_workbook(path)['Subregion 1']
+        assert ws['A1'].value == 'GW BUDGET' and ws['A1'].font.b
+        assert ws['A3'].value == 'AREA' and not ws['A3'].font.b
+        assert [c.value for c in ws[5]] == ['Time', 'Inflow', 'Outflow']
+        assert ws['B5'].font.b
+        assert ws['B5'].alignment.horizontal == 'center'
+        assert ws['B5'].alignment.wrap_text
+
+    def test_data_rows(self, tmp_path, constant_memory):
+        """Test dates and values with their number formats."""
+        path = str(tmp_path / 'out.xlsx')
+        write_sample(path, constant_memory)
+
+        ws = openpyxl.load_workbook(path)['Subregion 1']
+        assert ws['A6'].value == DATES[0]
+        assert ws['A8'].value == DATES[2]
+        assert ws['A6'].number_format == 'mm/dd/yyyy'
+        assert ws['C8'].value == pytest.approx(5 * 1000.5)
+        assert ws['B6'].number_format == '#,##0.00'
+        assert ws.max_row == 8
+
+    def test_two_header_rows_and_merge(self, tmp_path, constant_memory):
+        """Test that data starts after the second header row and merges apply."""
+        path = str(tmp_path / 'out.xlsx')
+        write_sample(path, constant_memory)
+
+        ws = openpyxl.load_workbook(path)['Zone1_North']
+        assert 'B5:C5' in [str(r) for r in ws.merged_cells.ranges]
+        assert ws['B5'].value == 'Streams'
+        assert ws['C6'].value == 'OUT (-)'
+        assert ws['A7'].value == DATES[0]
+        assert ws['B7'].value == pytest.approx(0.0)
+
+
+class TestBudgetXlsxWriterSheetNames:
+    """Tests for sheet name handling."""
+
+    def test_long_and_duplicate_names(self, tmp_path):
+        """Test truncation to 31 characters and unique suffixes."""
+        path = str(tmp_path / 'out.xlsx')
+        name = 'A very long location name exceeding the limit'
+        with BudgetXlsxWriter(path) as writer:
+            for _ in range(2):
+                writer.add_sheet(name, [], [['Time', 'Flow']], DATES[:1], np.ones((1, 1)))
+
+        names = openpyxl.load_workbook(path).sheetnames
+        assert names[1] == name[:31]
+        assert names[2] == name[:30] + '1'
+        assert all(len(n) <= 31 for n in names)
@@ -18,9 +18,16 @@
 
 import pytest
 from unittest.mock import Mock
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
 # Check if pywfm is available
 try:
     import pywfm  # noqa: F401
@@ -201,5 +208,96 @@ class TestGetZbudgetElemValsMockedPywfm:
         assert zone_data[0][0] == 1
 
 
+def write_zbudget_hdf(path):
+    """Write a two-layer zone budget HDF5 file with 4 elements and 3 time steps.
+
+    Component values are 100 * element + time step index, so each element's
+    value can be checked directly. Element 3 has no data for Streams.
+    """
+    comps = ['GW Storage_Inflow (+)', 'GW Storage_Outflow (-)',
+             'Streams_Inflow (+)', 'Streams_Outflow (-)']
+    n_elem, n_time = 4, 3
+    with h5py.File(path, 'w') as f:
+        grp = f.create_group('Attributes')
+        grp.attrs['SystemData%NElements'] = n_elem
+        grp.attrs['NTimeSteps'] = n_time
+        grp.attrs['SystemData%NLayers'] = 2
+        grp.attrs['TimeStep%BeginDateAndTime'] = np.bytes_(b'10/31/1973_24:00')
+        grp.attrs['TimeStep%DeltaT'] = 1.0
+        grp.attrs['TimeStep%Unit'] = np.bytes_(b'1MON')
+        grp.create_dataset('FullDataNames', data=np.array([c.encode() for c in comps]))
+        for layer in (1, 2):
+            col_map = np.zeros((len(comps), n_elem), dtype=int)
+            for c, comp in enumerate(comps):
+                elems = [e for e in range(n_elem) if not (c >= 2 and e == 2)]
+                # Store elements in reverse column order to exercise the index mapping
+                for col, e in enumerate(reversed(elems)):
+                    col_map[c, e] = col + 1
+                data = np.zeros((n_time, len(elems)))
+                for col, e in enumerate(reversed(elems)):
+                    data[:, col] = layer * (100.0 * (e + 1) + np.arange(n_time)) * (c + 1)
+                f.create_dataset(f'Layer_{layer}/{comp}', data=data)
+            grp.create_dataset(f'Layer{layer}_ElemDataColumns', data=col_map)
+
+
+@pytest.mark.skipif(not HAS_H5PY, reason="h5py not installed")
+class TestGetZbudgetElemArrayH5:
+    """Tests for the h5py per-element array reader."""
+
+    def test_shape_and_values(self, tmp_path):
+        """Test (ntime, nelem, ncols) output summed over layers."""
+        from iwfm.hdf5.get_zbudget_elem_vals_h5 import get_zbudget_elem_array
+        path = str(tmp_path / 'zb.hdf')
+        write_zbudget_hdf(path)
+
+        dates, values = get_zbudget_elem_array(path, [1, 3], volume_conversion_factor=1.0)
+
+        assert len(dates) == 3
+        assert values.shape == (3, 4, 2)
+        # layer 1 + layer 2 = 3 * base value; Streams IN is component 3
+        assert values[1, 0, 0] == pytest.approx(3 * 101.0)
+        assert values[2, 3, 1] == pytest.approx(3 * 402.0 * 3)
+        assert np.all(values[:, 2, 1] == 0.0)
+
+    def test_single_layer_and_factor(self, tmp_path):
+        """Test layer selection and volume conversion."""
+        from iwfm.hdf5.get_zbudget_elem_vals_h5 import get_zbudget_elem_array
+        path = str(tmp_path / 'zb.hdf')
+        write_zbudget_hdf(path)
+
+        _, values = get_zbudget_elem_array(path, [2], volume_conversion_factor=0.5, layers=[2])
+
+        assert values[0, 1, 0] == pytest.approx(0.5 * 2 * 200.0 * 2)
+
+    def test_zone_sums_match_array(self, tmp_path):
+        """Test that zone totals equal the per-element array summed by zone."""
+        from iwfm.hdf5.get_zbudget_elem_vals_h5 import (get_zbudget_elem_array,
+                                                         get_zbudget_elem_vals)
+        path = str(tmp_path / 'zb.hdf')
+        write_zbudget_hdf(path)
+        zone_file = tmp_path / 'zones.dat'
+        zone_file.write_text('C zones\n1\nC  ZID  ZNAME\n1  North\n2  South\n'
+                             'C  IE  ZONE\n1 1\n2 1\n3 2\n')
+
+        _, zone_data = get_zbudget_elem_vals(path, str(zone_file), [1, 3],
+                                             volume_conversion_factor=1.0)
+        _, values = get_zbudget_elem_array(path, [1, 3], volume_conversion_factor=1.0)
+
+        totals = values.sum(axis=0)
+        assert zone_data[0][0] == 1
+        assert zone_data[0][1:] == pytest.approx(list(totals[0] + totals[1]))
+        assert zone_data[1][1:] == pytest.approx(list(totals[2]))
+
+    def test_unknown_column_is_zero(self, tmp_path):
+        """Test that a column ID past the last component gives zeros."""
+        from iwfm.hdf5.get_zbudget_elem_vals_h5 import get_zbudget_elem_array
+        path = str(tmp_path / 'zb.hdf')
+        write_zbudget_hdf(path)
+
+        _, values = get_zbudget_elem_array(path, [99])
+
+        assert not values.any()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
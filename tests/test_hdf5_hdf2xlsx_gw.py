@@ -121,6 +121,13 @@ class TestHdf2xlsxGwSignature:
         sig = inspect.signature(hdf2xlsx_gw)
         assert sig.parameters['debug'].default == False
 
+    def test_default_constant_memory(self):
+        """Test that constant_memory defaults to False."""
+        from iwfm.hdf5.hdf2xlsx_gw import hdf2xlsx_gw
+
+        sig = inspect.signature(hdf2xlsx_gw)
+        assert sig.parameters['constant_memory'].default is False
+
 
 class TestHdf2xlsxGwDependencies:
     """Tests for hdf2xlsx_gw dependencies."""
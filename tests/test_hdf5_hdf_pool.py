@@ -0,0 +1,219 @@
+# test_hdf5_hdf_pool.py
+# Tests for hdf5/hdf_pool.py - Pool of open HDF5 file handles and metadata cache
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+
+import pytest
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+from iwfm.hdf5 import hdf_pool
+
+pytestmark = pytest.mark.skipif(not HAS_H5PY, reason="h5py not installed")
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    """Start and finish every test with an empty pool."""
+    hdf_pool.close_all()
+    hdf_pool.set_pool_size(hdf_pool.DEFAULT_POOL_SIZE)
+    yield
+    hdf_pool.close_all()
+    hdf_pool.set_pool_size(hdf_pool.DEFAULT_POOL_SIZE)
+
+
+class TestGetHandle:
+    """Tests for get_handle()."""
+
+    def test_same_handle_reused(self, tmp_path, write_budget_hdf):
+        """Test that repeated calls return the same open handle."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        f1 = hdf_pool.get_handle(path)
+        f2 = hdf_pool.get_handle(path)
+
+        assert f1 is f2
+        assert f1.mode == 'r'
+        assert hdf_pool.pool_info()['open_files'] == [os.path.abspath(path)]
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            hdf_pool.get_handle(str(tmp_path / 'missing.hdf'))
+
+    def test_least_recently_used_evicted(self, tmp_path, write_budget_hdf):
+        """Test that the least recently used handle is closed when full."""
+        paths = [str(tmp_path / f'{i}.hdf') for i in range(3)]
+        for path in paths:
+            write_budget_hdf(path)
+        hdf_pool.set_pool_size(2)
+
+        f0 = hdf_pool.get_handle(paths[0])
+        hdf_pool.get_handle(paths[1])
+        hdf_pool.get_handle(paths[0])   # paths[1] is now least recently used
+        hdf_pool.get_handle(paths[2])
+
+        open_files = hdf_pool.pool_info()['open_files']
+        assert os.path.abspath(paths[1]) not in open_files
+        assert len(open_files) == 2
+        assert f0  # still open
+
+    def test_handle_closed_by_caller_is_reopened(self, tmp_path, write_budget_hdf):
+        """Test that a handle closed outside the pool is replaced."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        f1 = hdf_pool.get_handle(path)
+        f1.close()
+        f2 = hdf_pool.get_handle(path)
+
+        assert f2
+        assert 'Attributes' in f2
+
+    def test_rewritten_file_is_reopened(self, tmp_path, write_budget_hdf):
+        """Test that a file replaced on disk is reopened with new metadata."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path, loc_names=('A',))
+        assert hdf_pool.budget_header(path)['loc_names'] == ('A',)
+
+        new_path = str(tmp_path / 'b.hdf')
+        write_budget_hdf(new_path, loc_names=('A', 'B'), n_timesteps=5)
+        os.replace(new_path, path)
+
+        header = hdf_pool.budget_header(path)
+        assert header['loc_names'] == ('A', 'B')
+        assert hdf_pool.get_handle(path)['Attributes'].attrs['NTimeSteps'] == 5
+
+    def test_invalid_pool_size(self):
+        """Test that a pool size below 1 is rejected."""
+        with pytest.raises(ValueError):
+            hdf_pool.set_pool_size(0)
+
+
+class TestMetadataCache:
+    """Tests for get_cached() and the budget header cache."""
+
+    def test_loader_called_once(self, tmp_path, write_budget_hdf):
+        """Test that the loader runs only on the first request."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+        calls = []
+
+        def loader(f):
+            calls.append(1)
+            return int(f['Attributes'].attrs['nLocations'])
+
+        assert hdf_pool.get_cached(path, 'n', loader) == 2
+        assert hdf_pool.get_cached(path, 'n', loader) == 2
+        assert len(calls) == 1
+
+    def test_budget_header(self, tmp_path, write_budget_hdf):
+        """Test decoded budget metadata."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        header = hdf_pool.budget_header(path)
+
+        assert header['loc_names'] == ('Subregion 1', 'Subregion 2')
+        assert header['full_headers'] == ('Time', 'Inflow (@UNITVL@)')
+        assert header['timesteps'][1] == '12/31/1973_24:00'
+        assert len(header['timesteps']) == 3
+        assert not header['areas'].flags.writeable
+        assert hdf_pool.budget_header(path) is header
+
+    def test_close_all(self, tmp_path, write_budget_hdf):
+        """Test that close_all() closes handles and clears the cache."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+        f = hdf_pool.get_handle(path)
+        hdf_pool.budget_header(path)
+
+        hdf_pool.close_all()
+
+        assert not f
+        info = hdf_pool.pool_info()
+        assert info['open_files'] == [] and info['cached_files'] == []
+
+    def test_close_file(self, tmp_path, write_budget_hdf):
+        """Test that close_file() releases a single file."""
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+        f = hdf_pool.get_handle(path)
+
+        hdf_pool.close_file(path)
+
+        assert not f
+        assert hdf_pool.pool_info()['open_files'] == []
+
+
+class TestPoolUsers:
+    """Tests for readers that share the pool."""
+
+    def test_get_budget_data_uses_pool(self, tmp_path, write_budget_hdf):
+        """Test that get_budget_data() leaves the file open in the pool."""
+        from iwfm.hdf5.get_budget_data_h5 import get_budget_data
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        loc_names, _, loc_values, titles = get_budget_data(path)
+        loc_names2, _, loc_values2, _ = get_budget_data(path)
+
+        assert loc_names == loc_names2 == ['Subregion 1', 'Subregion 2']
+        assert loc_values[0].iloc[0, 1] == pytest.approx(1.0)
+        assert titles[0][1] == 'FOR Subregion 1'
+        assert os.path.abspath(path) in hdf_pool.pool_info()['open_files']
+
+    def test_read_hdf5_pooled(self, tmp_path, write_budget_hdf):
+        """Test that read_hdf5() returns the pooled handle only when asked."""
+        from iwfm.hdf5.read_hdf5 import read_hdf5
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        assert read_hdf5(path, pooled=True) is hdf_pool.get_handle(path)
+        f = read_hdf5(path)
+        assert f is not hdf_pool.get_handle(path)
+        f.close()
+
+    def test_hdf_reader_close_keeps_pooled_handle(self, tmp_path, write_budget_hdf):
+        """Test that closing a pooled HdfReader leaves the pool handle open."""
+        from iwfm.hdf5.hdf_metadata import HdfReader
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        with HdfReader(path, pooled=True) as reader:
+            assert reader.get_n_timesteps() == 3
+
+        assert hdf_pool.get_handle(path)
+
+    def test_open_hdf_closes_by_default(self, tmp_path, write_budget_hdf):
+        """Test that open_hdf() as a context manager closes the file and skips the pool."""
+        from iwfm.hdf5.hdf_metadata import open_hdf
+        path = str(tmp_path / 'a.hdf')
+        write_budget_hdf(path)
+
+        with open_hdf(path) as reader:
+            handle = reader._h5file
+            assert reader.get_n_elements() == 2
+
+        assert not handle
+        assert hdf_pool.pool_info()['open_files'] == []
@@ -69,6 +69,70 @@ class TestApplyUnitConversion:
 
         np.testing.assert_array_almost_equal(result, [[200.0]])
 
+    def test_mixed_and_untyped_columns(self):
+        """Test mixed types; columns without a type code use the volume factor."""
+        from iwfm.hdf5.hdf5_utils import apply_unit_conversion
+
+        data = np.ones((2, 5)) * 100.0
+        col_types = [0, 1, 2, 4, 9]  # Unknown type 9, last column untyped
+        result = apply_unit_conversion(data, col_types, area_fact=0.25, vol_fact=0.5, len_fact=2.0)
+
+        np.testing.assert_array_almost_equal(result[0], [50.0, 25.0, 200.0, 50.0, 50.0])
+
+    def test_inplace(self):
+        """Test in-place conversion returns the input array."""
+        from iwfm.hdf5.hdf5_utils import apply_unit_conversion
+
+        data = np.array([[100.0, 200.0]])
+        result = apply_unit_conversion(data, [0, 1, 2], area_fact=0.1, vol_fact=0.5, inplace=True)
+
+        assert result is data
+        np.testing.assert_array_almost_equal(data, [[50.0, 20.0]])
+
+    def test_precomputed_factors(self):
+        """Test that precomputed factors are used as given."""
+        from iwfm.hdf5.hdf5_utils import apply_unit_conversion
+
+        data = np.array([[100.0, 200.0]])
+        result = apply_unit_conversion(data, None, None, None, factors=np.array([2.0, 3.0]))
+
+        np.testing.assert_array_almost_equal(result, [[200.0, 600.0]])
+
+
+class TestUnitConversionFactors:
+    """Tests for unit_conversion_factors function."""
+
+    def test_import(self):
+        """Test that function can be imported from iwfm.hdf5."""
+        from iwfm.hdf5 import unit_conversion_factors
+        assert callable(unit_conversion_factors)
+
+    def test_factor_vector(self):
+        """Test factor vector for each type code."""
+        from iwfm.hdf5.hdf5_utils import unit_conversion_factors
+
+        factors = unit_conversion_factors([0, 1, 2, 3, 4, 7], 6, area_fact=0.25, vol_fact=0.5, len_fact=2.0)
+
+        np.testing.assert_array_almost_equal(factors, [0.5, 0.25, 0.5, 2.0, 0.5, 0.5])
+
+    def test_other_fact(self):
+        """Test factor for unknown type codes."""
+        from iwfm.hdf5.hdf5_utils import unit_conversion_factors
+
+        factors = unit_conversion_factors([0, 7, 1], 2, area_fact=0.25, vol_fact=0.5, other_fact=1.0)
+
+        np.testing.assert_array_almost_equal(factors, [1.0, 0.5])
+
+    def test_custom_type_lists(self):
+        """Test extended type lists such as those in L&WU budgets."""
+        from iwfm.hdf5.hdf5_utils import unit_conversion_factors
+
+        factors = unit_conversion_factors([0, 8, 6, 5], 3, area_fact=0.25, vol_fact=0.5,
+                                          other_fact=1.0, volume_types=(1, 3, 8, 9, 10, 11),
+                                          area_types=(2, 6, 7))
+
+        np.testing.assert_array_almost_equal(factors, [0.5, 0.25, 1.0])
+
 
 class TestDecodeHdf5String:
     """Tests for decode_hdf5_string function."""
@@ -181,6 +245,60 @@ class TestGenerateTimestepsFromHdf5:
         assert len(result) == 3
 
 
+class TestTimestepCalendar:
+    """Tests for timestep_calendar function."""
+
+    def test_import(self):
+        """Test that function can be imported from iwfm.hdf5."""
+        from iwfm.hdf5 import timestep_calendar
+        assert callable(timestep_calendar)
+
+    def test_monthly_calendar(self):
+        """Test monthly calendar dates and strings."""
+        from iwfm.hdf5.hdf5_utils import timestep_calendar
+
+        dates, date_strings = timestep_calendar('09/30/1973_24:00', 4, 1.0, '1MON')
+
+        assert dates.dtype == np.dtype('datetime64[D]')
+        assert list(dates.astype(str)) == ['1973-10-01', '1973-11-30', '1973-12-31', '1974-01-31']
+        assert date_strings == ('10/01/1973_24:00', '11/30/1973_24:00',
+                                '12/31/1973_24:00', '01/31/1974_24:00')
+
+    def test_leap_year_february(self):
+        """Test month-end stepping through a leap-year February."""
+        from iwfm.hdf5.hdf5_utils import timestep_calendar
+
+        _, date_strings = timestep_calendar('12/31/1999', 3, 1.0, '1MON')
+
+        assert date_strings[2] == '02/29/2000_24:00'
+
+    def test_daily_calendar(self):
+        """Test daily calendar with a multi-day step."""
+        from iwfm.hdf5.hdf5_utils import timestep_calendar
+
+        _, date_strings = timestep_calendar(b'02/27/2000', 3, 2, b'1DAY')
+
+        assert date_strings == ('02/27/2000_24:00', '02/29/2000_24:00', '03/02/2000_24:00')
+
+    def test_memoized(self):
+        """Test that repeated calls return the cached, read-only result."""
+        from iwfm.hdf5.hdf5_utils import timestep_calendar
+
+        first = timestep_calendar('10/31/1973_24:00', 12, 1.0, '1MON')
+        second = timestep_calendar(b'10/31/1973_24:00', 12, 1, b'1mon')
+
+        assert first[0] is second[0]
+        assert not first[0].flags.writeable
+
+    def test_matches_generate_timesteps(self):
+        """Test that generate_timesteps_from_hdf5 returns the calendar strings."""
+        from iwfm.hdf5.hdf5_utils import timestep_calendar, generate_timesteps_from_hdf5
+
+        _, date_strings = timestep_calendar('10/31/1973_24:00', 25, 1.0, '1MON')
+
+        assert generate_timesteps_from_hdf5('10/31/1973_24:00', 25, 1.0, '1MON') == list(date_strings)
+
+
 class TestReadZoneDefinition:
     """Tests for read_zone_definition function."""
 
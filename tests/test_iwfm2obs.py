@@ -261,3 +261,117 @@ class TestIwfm2obsEdgeCases:
         assert 'WELL_01' in smp
         assert '123.456' in smp
         assert 'WELL_01' in ins
+
+
+class TestIwfm2obsConfig:
+    """Tests for the configuration-driven iwfm2obs with cached weights."""
+
+    def write_hyd(self, tmp_path, scale=1.0):
+        """Write a groundwater hydrograph file with 12 monthly rows."""
+        from datetime import datetime, timedelta
+        start = datetime(2000, 1, 1)
+        dates = [start + timedelta(days=30 * i) for i in range(12)]
+        values = np.random.default_rng(5).random((12, 3)) * 100.0 * scale
+        lines = ['* IWFM groundwater hydrographs', '* TIME  W1  W2  W3']
+        lines += [f'{d.strftime("%m/%d/%Y")}_24:00' + ''.join(f'{v:14.4f}' for v in row)
+                  for d, row in zip(dates, values)]
+        (tmp_path / 'gw_hyd.out').write_text('\n'.join(lines) + '\n')
+        return dates, np.round(values, 4)
+
+    def write_inputs(self, tmp_path):
+        """Write a hydrograph file, an observation smp file and a config file."""
+        dates, values = self.write_hyd(tmp_path)
+
+        obs = ['W2  02/14/2000  0:00:00  1.0', 'W1  03/01/2000  0:00:00  1.0',
+               'W1  01/31/2000  0:00:00  1.0', 'W3  09/20/2000  0:00:00  1.0',
+               'W9  03/01/2000  0:00:00  1.0',                 # no hydrograph
+               'W1  06/01/2003  0:00:00  1.0']                 # after the simulation
+        (tmp_path / 'gw_obs.smp').write_text('\n'.join(obs) + '\n')
+
+        config = tmp_path / 'iwfm2obs.toml'
+        config.write_text(
+            'start_date = "01/01/2000"\n'
+            'end_date = "12/31/2000"\n'
+            f'missing_file = "{(tmp_path / "miss.out").as_posix()}"\n'
+            f'cache_file = "{(tmp_path / "cache.npz").as_posix()}"\n'
+            '[Groundwater]\n'
+            f'obs_file = "{(tmp_path / "gw_obs.smp").as_posix()}"\n'
+            f'smp_file = "{(tmp_path / "gw_temp.smp").as_posix()}"\n'
+            f'ins_file = "{(tmp_path / "gw_temp.ins").as_posix()}"\n'
+            f'hyd_file = "{(tmp_path / "gw_hyd.out").as_posix()}"\n'
+            'hyd_names = ["W1", "W2", "W3"]\n')
+        return str(config), dates, values
+
+    def expected_lines(self, dates, values):
+        """Build smp and ins lines the way the interactive loop does."""
+        from datetime import datetime
+        from math import ceil
+        from iwfm.calib.to_smp_ins import to_smp_ins
+        start = datetime(2000, 1, 1)
+        days = np.array([(d - start).days for d in dates])
+        ts_func = interp1d(days, np.arange(1, 13), kind='linear')
+        smp, ins = [], []
+        for site, col, date in [('W1', 0, '01/31/2000'), ('W1', 0, '03/01/2000'),
+                                ('W2', 1, '02/14/2000'), ('W3', 2, '09/20/2000')]:
+            obs_dt = datetime.strptime(date, '%m/%d/%Y')
+            d = (obs_dt - start).days
+            val = float(interp1d(days, values[:, col], kind='linear')(d))
+            s, i = to_smp_ins(site, obs_dt, round(val, 3), ceil(float(ts_func(d))))
+            smp.append(s)
+            ins.append(i)
+        return smp, ins
+
+    def test_matches_interactive_interpolation(self, tmp_path):
+        """Test smp and ins output against the interp1d loop."""
+        config, dates, values = self.write_inputs(tmp_path)
+
+        counts = iwfm2obs(config_file=config)
+
+        smp, ins = self.expected_lines(dates, values)
+        assert counts == {'Groundwater': 4}
+        assert (tmp_path / 'gw_temp.smp').read_text().splitlines() == smp
+        assert (tmp_path / 'gw_temp.ins').read_text().splitlines() == ['pif #'] + ins
+        assert 'W9' not in (tmp_path / 'gw_temp.smp').read_text()
+
+    def test_config_matches_interactive_files(self, tmp_path, monkeypatch):
+        """Test that config mode and prompt mode write identical smp and ins files."""
+        config, _, _ = self.write_inputs(tmp_path)
+        iwfm2obs(config_file=config)
+
+        monkeypatch.chdir(tmp_path)
+        answers = ['sim.dat', 'gw_obs.smp', '0', 'n', 'gw_int.smp', 'gw_int.ins']
+        gw_files = GroundwaterFiles(subs_file='none', drain_file='none')
+        with patch('builtins.input', side_effect=answers), \
+             patch('iwfm.sim_info', return_value=('01/01/2000_24:00', '12/31/2000_24:00', '1MON')), \
+             patch('iwfm.iwfm_read_sim', return_value={'stream_file': 'none', 'gw_file': 'gw.dat'}), \
+             patch('iwfm.iwfm_read_gw', return_value=(gw_files,) + (None,) * 11), \
+             patch('iwfm.file_test'), \
+             patch('iwfm.calib.get_hyd_info', return_value=('gw_hyd.out', ['W1', 'W2', 'W3'])):
+            iwfm2obs()
+
+        assert (tmp_path / 'gw_int.smp').read_text() == (tmp_path / 'gw_temp.smp').read_text()
+        assert (tmp_path / 'gw_int.ins').read_text() == (tmp_path / 'gw_temp.ins').read_text()
+
+    def test_cached_weights_reused(self, tmp_path):
+        """Test that a second run uses the cache and new hydrograph values."""
+        from unittest.mock import patch
+        config, dates, _ = self.write_inputs(tmp_path)
+        iwfm2obs(config_file=config)
+        assert (tmp_path / 'cache.npz').exists()
+
+        dates, values = self.write_hyd(tmp_path, scale=2.0)     # new model run
+        with patch.dict(iwfm2obs.__globals__, {'build_obs_weights': MagicMock(side_effect=AssertionError)}):
+            iwfm2obs(config_file=config)
+
+        smp, _ = self.expected_lines(dates, values)
+        assert (tmp_path / 'gw_temp.smp').read_text().splitlines() == smp
+
+    def test_config_requires_dates_or_sim_file(self, tmp_path):
+        """Test that a configuration without sim_file or dates is rejected."""
+        import pytest
+        from iwfm.calib.iwfm2obs import read_iwfm2obs_config
+        config = tmp_path / 'bad.toml'
+        config.write_text('[Groundwater]\nobs_file = "a.smp"\nsmp_file = "b.smp"\n')
+
+        with pytest.raises(ValueError):
+            read_iwfm2obs_config(str(config))
@@ -474,5 +474,82 @@ def test_iwfm_precip_adj_rounds_output_correctly(tmp_path):
         assert len(decimal_part) <= 2
 
 
+def _write_scenario_inputs(tmp_path, factors_content):
+    '''Write a two-month precipitation file, element-VIC file and years file.'''
+    precip_file = tmp_path / 'precip.dat'
+    precip_lines = [
+        'C Precipitation file',
+        '     2.000000                                 / FACT',
+        '     1                                        / NFQCP',
+        '     0                                        / Header 3',
+        '     0                                        / Header 4',
+        '     0                                        / Header 5',
+        '01/31/1990_24:00\t10.0\t20.0\t30.0',
+        '02/28/1990_24:00\t1.0\t2.0\t3.0',
+        '01/31/1991_24:00\t4.0\t5.0\t6.0',
+    ]
+    precip_file.write_text('\n'.join(precip_lines) + '\n')
+
+    elem_vic_file = tmp_path / 'elem_vic.csv'
+    elem_vic_file.write_text('Column,VIC_ID,Region,Name\n1,2,Region1,VIC2\n2,1,Region2,VIC1\n')
+
+    factors_file = tmp_path / 'factors.csv'
+    factors_file.write_text(factors_content)
+
+    years_file = tmp_path / 'years.csv'
+    years_file.write_text('Year,Region1,Region2\n1990,1990,1990\n1991,1990,1990\n')
+    return str(precip_file), str(elem_vic_file), str(factors_file), str(years_file)
+
+
+def _data_rows(out_file):
+    '''Return the adjusted values of each data line of an output file.'''
+    lines = out_file.read_text().splitlines()
+    return [[float(v) for v in line.split()[1:]] for line in lines if '_24:00' in line]
+
+
+def test_iwfm_precip_adj_by_month(tmp_path, monkeypatch):
+    '''Test zero-padded months, the VIC cell of each column and a column without a cell.'''
+    monkeypatch.chdir(tmp_path)
+    factors = 'Date,VIC1,VIC2\n01/01/1990,2.0,3.0\n02/01/1990,0.5,0.25\n01/01/1991,4.0,5.0\n'
+    precip_file, elem_vic_file, factors_file, years_file = _write_scenario_inputs(tmp_path, factors)
+    output_file = tmp_path / 'out.dat'
+
+    iwfm.iwfm_precip_adj(precip_file, elem_vic_file, factors_file, years_file, str(output_file))
+
+    # 1991 has factors, so no replacement; column 3 has no VIC cell
+    assert _data_rows(output_file) == [[30.0, 40.0, 30.0], [0.25, 1.0, 3.0], [20.0, 20.0, 6.0]]
+    assert (tmp_path / 'factors.dat').read_text().splitlines()[1] == '01/31/1990_24:00\t3.0\t2.0\t1.0'
+
+
+def test_iwfm_precip_adj_missing_month(tmp_path):
+    '''Test that a month without factors raises ValueError.'''
+    factors = 'Date,VIC1,VIC2\n01/01/1990,2.0,3.0\n01/01/1991,4.0,5.0\n'
+    precip_file, elem_vic_file, factors_file, years_file = _write_scenario_inputs(tmp_path, factors)
+
+    with pytest.raises(ValueError):
+        iwfm.iwfm_precip_adj_batch(precip_file, elem_vic_file,
+                                   [(factors_file, years_file, str(tmp_path / 'out.dat'))])
+
+
+def test_iwfm_precip_adj_batch(tmp_path, monkeypatch):
+    '''Test that each batch scenario matches a single run, with replacement years.'''
+    monkeypatch.chdir(tmp_path)
+    factors = 'Date,VIC1,VIC2\n01/01/1990,2.0,3.0\n02/01/1990,0.5,0.25\n'
+    precip_file, elem_vic_file, factors_file, years_file = _write_scenario_inputs(tmp_path, factors)
+    other_factors = tmp_path / 'other.csv'
+    other_factors.write_text('Date,VIC1,VIC2\n1/01/1990,1.0,1.0\n2/01/1990,1.5,1.5\n')
+
+    scenarios = [(factors_file, years_file, str(tmp_path / 'a.dat')),
+                 (str(other_factors), years_file, str(tmp_path / 'b.dat'))]
+    iwfm.iwfm_precip_adj_batch(precip_file, elem_vic_file, scenarios)
+    iwfm.iwfm_precip_adj(precip_file, elem_vic_file, factors_file, years_file,
+                         str(tmp_path / 'single.dat'))
+
+    assert (tmp_path / 'a.dat').read_text() == (tmp_path / 'single.dat').read_text()
+    # 1991 uses 1990 factors in both regions
+    assert _data_rows(tmp_path / 'a.dat')[2] == [12.0, 10.0, 6.0]
+    assert _data_rows(tmp_path / 'b.dat') == [[10.0, 20.0, 30.0], [1.5, 3.0, 3.0], [4.0, 5.0, 6.0]]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -319,3 +319,112 @@ class TestIwfmSubPreproc:
         captured = capsys.readouterr()
         assert "Read preprocessor file" in captured.out
         assert "Read submodel element pairs file" in captured.out
+
+
+    @patch('iwfm.iwfm_read_preproc')
+    @patch('iwfm.new_pp_files')
+    @patch('iwfm.get_elem_list')
+    @patch('iwfm.sub_pp_node_list')
+    @patch('iwfm.iwfm_read_nodes')
+    @patch('iwfm.sub_pp_streams')
+    @patch('iwfm.sub_pp_node_file')
+    @patch('iwfm.sub_pp_elem_file')
+    @patch('iwfm.sub_pp_strat_file')
+    @patch('iwfm.sub_pp_stream_file')
+    @patch('iwfm.sub_pp_file')
+    def test_reuses_current_manifest(self, mock_sub_pp_file, mock_stream_file,
+                                     mock_strat_file, mock_elem_file, mock_node_file,
+                                     mock_sub_streams, mock_read_nodes, mock_node_list,
+                                     mock_elem_list, mock_new_dict, mock_read_preproc,
+                                     tmp_path):
+        """Test that a rebuild with unchanged input files reads the manifest."""
+        names = {key: str(tmp_path / f'{key}.dat') for key in
+                 ('nodes', 'elems', 'strat', 'streams', 'sub_pre', 'sub_nodes', 'sub_elems',
+                  'sub_strat', 'sub_streams')}
+        for name in names.values():
+            Path(name).write_text('C file')
+        mock_read_preproc.return_value = (PreprocessorFiles(
+            node_file=names['nodes'], elem_file=names['elems'], strat_file=names['strat'],
+            stream_file=names['streams'], lake_file='none',
+        ), False)
+        mock_new_dict.return_value = PreprocessorFiles(
+            prename=names['sub_pre'], node_file=names['sub_nodes'], elem_file=names['sub_elems'],
+            strat_file=names['sub_strat'], stream_file=names['sub_streams'], lake_file='none',
+        )
+        mock_elem_list.return_value = ([1], [1], {1: 1}, {1: 1})
+        mock_node_list.return_value = [1, 2]
+        mock_read_nodes.return_value = ([[1, 100.0, 200.0], [2, 110.0, 210.0]], [1, 2], 1.0)
+        mock_sub_streams.return_value = ([], {7: 2}, {}, '', [], [7])
+        mock_elem_file.return_value = [[1, 1, 2, 3, 4]]
+
+        pp_file = tmp_path / "preproc.dat"
+        pp_file.write_text("C preprocessor")
+        elem_pairs = tmp_path / "elem_pairs.dat"
+        elem_pairs.write_text("1,1")
+        out_base = str(tmp_path / "submodel")
+
+        first = iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+        second = iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+
+        assert (tmp_path / "submodel_manifest.npz").exists()
+        assert mock_node_file.call_count == 1
+        assert second[4:] == first[4:] == ([1, 2], {7: 2}, [])
+
+        elem_pairs.write_text("1,1\n2,2")
+        iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+        assert mock_node_file.call_count == 2
+
+    @patch('iwfm.iwfm_read_preproc')
+    @patch('iwfm.new_pp_files')
+    @patch('iwfm.get_elem_list')
+    @patch('iwfm.sub_pp_node_list')
+    @patch('iwfm.iwfm_read_nodes')
+    @patch('iwfm.sub_pp_streams')
+    @patch('iwfm.sub_pp_lakes')
+    @patch('iwfm.sub_pp_node_file')
+    @patch('iwfm.sub_pp_elem_file')
+    @patch('iwfm.sub_pp_strat_file')
+    @patch('iwfm.sub_pp_stream_file')
+    @patch('iwfm.sub_pp_lake_file')
+    @patch('iwfm.sub_pp_file')
+    def test_rewrites_missing_lake_file(self, mock_sub_pp_file, mock_lake_file, mock_stream_file,
+                                        mock_strat_file, mock_elem_file, mock_node_file,
+                                        mock_sub_lakes, mock_sub_streams, mock_read_nodes,
+                                        mock_node_list, mock_elem_list, mock_new_dict,
+                                        mock_read_preproc, tmp_path):
+        """Test that a deleted submodel lake file is rebuilt despite a current manifest."""
+        names = {key: str(tmp_path / f'{key}.dat') for key in
+                 ('nodes', 'elems', 'strat', 'streams', 'lakes', 'sub_pre', 'sub_nodes',
+                  'sub_elems', 'sub_strat', 'sub_streams', 'sub_lakes')}
+        for name in names.values():
+            Path(name).write_text('C file')
+        mock_read_preproc.return_value = (PreprocessorFiles(
+            node_file=names['nodes'], elem_file=names['elems'], strat_file=names['strat'],
+            stream_file=names['streams'], lake_file=names['lakes'],
+        ), True)
+        mock_new_dict.return_value = PreprocessorFiles(
+            prename=names['sub_pre'], node_file=names['sub_nodes'], elem_file=names['sub_elems'],
+            strat_file=names['sub_strat'], stream_file=names['sub_streams'],
+            lake_file=names['sub_lakes'],
+        )
+        mock_elem_list.return_value = ([1], [1], {1: 1}, {1: 1})
+        mock_node_list.return_value = [1]
+        mock_read_nodes.return_value = ([[1, 100.0, 200.0]], [1], 1.0)
+        mock_sub_streams.return_value = ([], {}, {}, '', [], [])
+        mock_sub_lakes.return_value = ([[1, 'Lake1', 100.0]], True)
+        mock_elem_file.return_value = [[1, 1, 2, 3, 4]]
+
+        pp_file = tmp_path / "preproc.dat"
+        pp_file.write_text("C preprocessor")
+        elem_pairs = tmp_path / "elem_pairs.dat"
+        elem_pairs.write_text("1,1")
+        out_base = str(tmp_path / "submodel")
+
+        iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+        iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+        assert mock_lake_file.call_count == 1
+
+        Path(names['sub_lakes']).unlink()
+        iwfm_sub_preproc(str(pp_file), str(elem_pairs), out_base)
+        assert mock_lake_file.call_count == 2
+
@@ -0,0 +1,85 @@
+# test_iwfm_sub_sim.py
+# Unit tests for the submodel writer planner in iwfm_sub_sim.py
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import iwfm
+from iwfm.iwfm_sub_sim import _sub_sim_tasks, _run_sub_tasks
+
+
+def write_file(filename, text, suffix=''):
+    """Stand-in writer: write one file and record the process that wrote it."""
+    with open(filename, 'w') as f:
+        f.write(f'{text}{suffix} {os.getpid()}')
+
+
+def fail(message):
+    """Stand-in writer that fails."""
+    raise ValueError(message)
+
+
+class TestSubSimTasks:
+    """Tests for _sub_sim_tasks()."""
+
+    def test_plan(self):
+        """Test that every top-level writer is planned once with its own output files."""
+        sim_files = SimpleNamespace(swshed_file='old_sw.dat', unsat_file='old_us.dat')
+        sim_files_new = SimpleNamespace(swshed_file='new_sw.dat', unsat_file='new_us.dat')
+
+        tasks = _sub_sim_tasks(sim_files, sim_files_new, [1, 2], [[1, 1]], {}, [5], None, '.')
+
+        assert [t[0] for t in tasks] == ['rootzone', 'groundwater', 'streams',
+                                         'small watersheds', 'unsaturated zone']
+        assert tasks[1][1] is iwfm.sub_gw_file
+        assert tasks[3][2][:2] == ('old_sw.dat', 'new_sw.dat')
+        assert tasks[4][2][:2] == ('old_us.dat', 'new_us.dat')
+
+
+class TestRunSubTasks:
+    """Tests for _run_sub_tasks() with stand-in writers."""
+
+    @pytest.mark.parametrize('workers', [None, 3])
+    def test_runs_all_tasks(self, tmp_path, workers):
+        """Test that all writers run, serially or in a pool, with timing in task order."""
+        names = ['rootzone', 'groundwater', 'streams', 'unsaturated zone']
+        tasks = [(name, write_file, (str(tmp_path / f'{i}.dat'), name), {'suffix': '!'})
+                 for i, name in enumerate(names)]
+
+        timing = _run_sub_tasks(tasks, workers=workers)
+
+        assert list(timing) == names
+        assert all(seconds >= 0 for seconds in timing.values())
+        contents = [(tmp_path / f'{i}.dat').read_text().split() for i in range(len(names))]
+        assert [' '.join(c[:-1]) for c in contents] == [f'{name}!' for name in names]
+        pids = {c[-1] for c in contents}
+        assert (pids == {str(os.getpid())}) == (workers is None)
+
+    def test_failure_raises(self, tmp_path):
+        """Test that an error in a pool worker reaches the caller."""
+        tasks = [('streams', fail, ('bad streams file',), {}),
+                 ('unsaturated zone', write_file, (str(tmp_path / 'u.dat'), 'ok'), {})]
+
+        with pytest.raises(ValueError, match='bad streams file'):
+            _run_sub_tasks(tasks, workers=2)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,226 @@
+# test_lu_data.py
+# Unit tests for lu_data.py - Land use time-series store
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+
+import numpy as np
+import pytest
+
+import iwfm._text_blocks
+from iwfm.lu_data import (read_lu_data, write_lu_data, clear_lu_cache, iter_lu_data,
+                          read_lu_header, write_lu_step, set_lu_cache_size, LU_CACHE_BYTES,
+                          _lu_cache, _lu_nbytes)
+
+HEADER = ['C IWFM land use area file',
+          'C*****',
+          '    43560.0                 / FACTLN',
+          '    1                       / NSPLN',
+          'C  comment between specification lines',
+          '    0                       / NFQLN',
+          '                            / DSSFL',
+          'C-----',
+          'C   ITLN               IE       A1       A2       A3']
+
+DATES = ['09/30/1974_24:00', '09/30/1975_24:00', '09/30/1976_24:00']
+
+
+def lu_lines(elems=(3, 1, 2), ncrop=3):
+    """Land use file lines; value = time*100 + element + crop/10."""
+    lines = list(HEADER)
+    for t, date in enumerate(DATES):
+        for i, elem in enumerate(elems):
+            values = '\t'.join(f'{t * 100 + elem + c / 10:g}' for c in range(ncrop))
+            lines.append(f'{date if i == 0 else "":16}\t{elem}\t{values}')
+        lines.append('C end of year')
+    return lines
+
+
+@pytest.fixture
+def lu_file(tmp_path):
+    path = tmp_path / 'landuse.dat'
+    path.write_text('\n'.join(lu_lines()) + '\n')
+    return str(path)
+
+
+class TestReadLuData:
+    """Tests for read_lu_data()."""
+
+    def test_arrays(self, lu_file):
+        """Test values, element numbers, dates and header lines."""
+        lu = read_lu_data(lu_file, cache=False)
+
+        assert lu.values.shape == (3, 3, 3)
+        assert lu.values[2, 0].tolist() == [203.0, 203.1, 203.2]
+        assert lu.elems.tolist() == [3, 1, 2]
+        assert lu.dates.tolist() == DATES
+        assert list(lu.header) == HEADER
+        assert not lu.values.flags.writeable
+
+    def test_small_blocks(self, lu_file, monkeypatch):
+        """Test that parsing in blocks gives the same result."""
+        whole = read_lu_data(lu_file, cache=False)
+        monkeypatch.setattr(iwfm._text_blocks, 'CHUNK_SIZE', 37)
+        blocks = read_lu_data(lu_file, cache=False)
+
+        assert np.array_equal(blocks.values, whole.values)
+        assert blocks.dates.tolist() == DATES
+
+    def test_cache(self, lu_file):
+        """Test that an unchanged file is parsed once and a changed file again."""
+        clear_lu_cache()
+        first = read_lu_data(lu_file)
+        assert read_lu_data(lu_file) is first
+
+        lines = lu_lines(elems=(1, 2))
+        with open(lu_file, 'w') as f:
+            f.write('\n'.join(lines))
+        stat = os.stat(lu_file)
+        os.utime(lu_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = read_lu_data(lu_file)
+        assert second is not first
+        assert second.elems.tolist() == [1, 2]
+        clear_lu_cache()
+
+    def test_cache_size_limit(self, tmp_path):
+        """Test that the cache keeps the most recently used files within its size limit."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f'lu{i}.dat'
+            path.write_text('\n'.join(lu_lines()))
+            paths.append(str(path))
+        clear_lu_cache()
+        nbytes = _lu_nbytes(read_lu_data(paths[0], cache=False))
+        try:
+            set_lu_cache_size(2 * nbytes)
+            first = read_lu_data(paths[0])
+            read_lu_data(paths[1])
+            assert read_lu_data(paths[0]) is first       # most recently used
+            read_lu_data(paths[2])                       # removes paths[1]
+            assert [key[0] for key in _lu_cache] == [os.path.abspath(p) for p in (paths[0], paths[2])]
+
+            set_lu_cache_size(0)
+            assert len(_lu_cache) == 0
+            assert read_lu_data(paths[0]) is not read_lu_data(paths[0])
+        finally:
+            set_lu_cache_size(LU_CACHE_BYTES)
+            clear_lu_cache()
+
+    def test_different_elements(self, tmp_path):
+        """Test that time steps with different elements raise ValueError."""
+        lines = lu_lines()
+        lines[-2] = '\t4\t1\t2\t3'
+        path = tmp_path / 'bad.dat'
+        path.write_text('\n'.join(lines))
+
+        with pytest.raises(ValueError):
+            read_lu_data(str(path), cache=False)
+
+    def test_not_a_number(self, tmp_path):
+        """Test that a bad value raises ValueError."""
+        lines = lu_lines()
+        lines[-2] = '\t2\t1\tx\t3'
+        path = tmp_path / 'bad.dat'
+        path.write_text('\n'.join(lines))
+
+        with pytest.raises(ValueError):
+            read_lu_data(str(path), cache=False)
+
+    def test_no_data(self, tmp_path):
+        """Test that a file with only header lines raises ValueError."""
+        path = tmp_path / 'empty.dat'
+        path.write_text('\n'.join(HEADER))
+
+        with pytest.raises(ValueError):
+            read_lu_data(str(path), cache=False)
+
+
+
+class TestIterLuData:
+    """Tests for iter_lu_data() and read_lu_header()."""
+
+    def test_steps_match_read(self, lu_file, monkeypatch):
+        """Test that streaming in small blocks gives the time steps of read_lu_data()."""
+        lu = read_lu_data(lu_file, cache=False)
+        monkeypatch.setattr(iwfm._text_blocks, 'CHUNK_SIZE', 29)
+        steps = list(iter_lu_data(lu_file))
+
+        assert [date for date, _, _ in steps] == DATES
+        assert all(elems is steps[0][1] for _, elems, _ in steps)
+        assert np.array_equal(np.stack([values for _, _, values in steps]), lu.values)
+        assert list(read_lu_header(lu_file)) == HEADER
+
+    def test_different_elements(self, tmp_path):
+        """Test that a time step with other elements raises ValueError."""
+        lines = lu_lines()
+        lines[-2] = '\t4\t1\t2\t3'
+        path = tmp_path / 'bad.dat'
+        path.write_text('\n'.join(lines))
+
+        with pytest.raises(ValueError):
+            list(iter_lu_data(str(path)))
+
+class TestWriteLuData:
+    """Tests for write_lu_data() and LandUseData.select()."""
+
+    def test_round_trip(self, lu_file, tmp_path):
+        """Test that a written file reads back the same."""
+        lu = read_lu_data(lu_file, cache=False)
+        out_file = str(tmp_path / 'out.dat')
+        write_lu_data(lu, out_file)
+
+        lines = open(out_file).read().splitlines()
+        assert lines[:len(HEADER)] == HEADER
+        assert lines[len(HEADER)] == '09/30/1974_24:00\t3\t3.0\t3.1\t3.2\t'
+        assert lines[len(HEADER) + 1] == '\t1\t1.0\t1.1\t1.2\t'
+
+        again = read_lu_data(out_file, cache=False)
+        assert np.array_equal(again.values, lu.values)
+        assert again.elems.tolist() == lu.elems.tolist()
+
+    def test_select_and_format(self, lu_file, tmp_path):
+        """Test selecting elements in file order and a value format."""
+        lu = read_lu_data(lu_file, cache=False).select({2, 3})
+        assert lu.elems.tolist() == [3, 2]
+        assert lu.values[1, 1].tolist() == [102.0, 102.1, 102.2]
+
+        out_file = str(tmp_path / 'out.dat')
+        write_lu_data(lu, out_file, header=[], fmt='%.2f')
+        lines = open(out_file).read().splitlines()
+        assert len(lines) == 6
+        assert lines[2] == '09/30/1975_24:00\t3\t103.00\t103.10\t103.20\t'
+
+    def test_fixed_decimals(self):
+        """Test that numpy formatting of '%.3f' gives the text of the % operator."""
+        import io
+        from itertools import chain
+
+        elems = np.array([5, 12345, 7])
+        values = np.array([[2.675, -0.0004, 1e9 / 3, 0.0625],
+                           [-12.5, 0.0, 1.0005, 99.9995],
+                           [3.14159, -0.0, 0.1 + 0.2, 123456.789]])
+        f = io.StringIO()
+        write_lu_step(f, '09/30/1974_24:00', elems, values, fmt='%.3f')
+
+        rows = np.column_stack((elems, values)).tolist()
+        expected = ('\t%d\t' + '%.3f\t' * 4 + '\n') * 3 % tuple(chain.from_iterable(rows))
+        assert f.getvalue() == '09/30/1974_24:00' + expected
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
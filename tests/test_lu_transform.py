@@ -0,0 +1,144 @@
+# test_lu_transform.py
+# Unit tests for lu_transform.py - Streaming land use file transformer
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from iwfm.lu_data import read_lu_data
+from iwfm.lu_transform import (lu_transform, iter_lu_steps, lu_subset, lu_split,
+                               lu_zone_change, lu_columns, read_lu_first_step)
+
+HEADER = ['C land use file', '    43560.0   / FACT', '    1   / NSP', '    0   / NFQ',
+          '          / DSSFL', 'C data']
+
+DATES = ['09/30/2000_24:00', '09/30/2001_24:00']
+
+
+def write_lu(path, table, dates=DATES):
+    """Write a land use file; table[t] is a list of [elem, values...] rows."""
+    lines = list(HEADER)
+    for date, rows in zip(dates, table):
+        for i, row in enumerate(rows):
+            lines.append(('\t'.join([date if i == 0 else ''] + [str(v) for v in row])))
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def ag_file(tmp_path):
+    table = [[[1, 10.0, 30.0], [2, 20.0, 20.0], [3, 0.0, 0.0]],
+             [[1, 11.0, 31.0], [2, 21.0, 21.0], [3, 5.0, 5.0]]]
+    return write_lu(tmp_path / 'ag.dat', table)
+
+
+@pytest.fixture
+def nv_file(tmp_path):
+    table = [[[1, 1.0], [2, 2.0], [3, 3.0]], [[1, 4.0], [2, 5.0], [3, 6.0]]]
+    return write_lu(tmp_path / 'nv.dat', table)
+
+
+class TestOperations:
+    """Tests for the land use operations."""
+
+    def test_subset(self):
+        """Test that elements are kept in file order."""
+        elems, values = lu_subset({3, 1})(np.array([3, 2, 1]), np.arange(6.0).reshape(3, 2))
+        assert elems.tolist() == [3, 1]
+        assert values.tolist() == [[0.0, 1.0], [4.0, 5.0]]
+
+    def test_split(self):
+        """Test new elements from fractions of original elements."""
+        op = lu_split([11, 12, 20], [1, 1, 2], [0.25, 0.75, 1.0])
+        elems, values = op(np.array([2, 1]), np.array([[8.0, 4.0], [100.0, 40.0]]))
+        assert elems.tolist() == [11, 12, 20]
+        assert values.tolist() == [[25.0, 10.0], [75.0, 30.0], [8.0, 4.0]]
+
+    def test_split_missing_element(self):
+        """Test that an original element not in the file raises ValueError."""
+        with pytest.raises(ValueError):
+            lu_split([11], [5], [1.0])(np.array([1, 2]), np.ones((2, 2)))
+
+    def test_zone_change(self):
+        """Test moving a fraction of columns 0-1 to column 2, by zone."""
+        op = lu_zone_change([[1, 1], [2, 2], [3, 1]], {1: 0.25, 2: 0.0}, [0, 1], 2)
+        values = np.array([[10.0, 30.0, 1.0], [20.0, 20.0, 2.0], [0.0, 0.0, 3.0]])
+        elems, new_values = op(np.array([1, 2, 3]), values)
+
+        assert new_values.tolist() == [[7.5, 22.5, 11.0], [20.0, 20.0, 2.0], [0.0, 0.0, 3.0]]
+        assert values[0, 0] == 10.0
+
+    def test_columns(self):
+        """Test column selection in order."""
+        _, values = lu_columns([2, 0])(np.array([1]), np.array([[1.0, 2.0, 3.0]]))
+        assert values.tolist() == [[3.0, 1.0]]
+
+
+class TestLuTransform:
+    """Tests for iter_lu_steps() and lu_transform()."""
+
+    def test_subset_file(self, ag_file, tmp_path):
+        """Test streaming a file through a subset, with the header copied."""
+        out_file = str(tmp_path / 'out.dat')
+        dates = []
+        nlines = lu_transform(ag_file, out_file, [lu_subset([2, 3])], on_step=dates.append)
+
+        assert nlines == 4
+        assert dates == DATES
+        lu = read_lu_data(out_file, cache=False)
+        assert list(lu.header) == HEADER
+        assert lu.elems.tolist() == [2, 3]
+        assert lu.values[1].tolist() == [[21.0, 21.0], [5.0, 5.0]]
+
+    def test_files_side_by_side(self, ag_file, nv_file, tmp_path):
+        """Test two files changed together and written to their own outputs."""
+        out_files = [str(tmp_path / 'ag_out.dat'), str(tmp_path / 'nv_out.dat')]
+        op = lu_zone_change([[1, 1], [2, 1], [3, 1]], {1: 0.5}, [0, 1], 2)
+        lu_transform([ag_file, nv_file], out_files, [op], fmt='%.2f')
+
+        ag = read_lu_data(out_files[0], cache=False)
+        nv = read_lu_data(out_files[1], cache=False)
+        assert ag.values[0].tolist() == [[5.0, 15.0], [10.0, 10.0], [0.0, 0.0]]
+        assert nv.values[1].tolist() == [[25.0], [26.0], [11.0]]
+        assert open(out_files[1]).read().splitlines()[len(HEADER)] == '09/30/2000_24:00\t1\t21.00\t'
+
+    def test_columns_changed(self, ag_file, nv_file, tmp_path):
+        """Test that dropping columns with one output per input raises ValueError."""
+        out_files = [str(tmp_path / 'a.dat'), str(tmp_path / 'b.dat')]
+        with pytest.raises(ValueError):
+            lu_transform([ag_file, nv_file], out_files, [lu_columns([0])])
+
+    def test_different_files(self, ag_file, tmp_path):
+        """Test that files with different elements raise ValueError."""
+        other = write_lu(tmp_path / 'other.dat', [[[1, 1.0], [4, 2.0]], [[1, 1.0], [4, 2.0]]])
+        with pytest.raises(ValueError):
+            list(iter_lu_steps([ag_file, other]))
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_first_step(self, ag_file, nv_file, workers):
+        """Test reading the first time step of two files, in worker processes or not."""
+        date, elems, blocks = read_lu_first_step([ag_file, nv_file], ncols=[1, None],
+                                                 workers=workers)
+
+        assert date == DATES[0]
+        assert elems.tolist() == [1, 2, 3]
+        assert blocks[0].tolist() == [[10.0], [20.0], [0.0]]
+        assert blocks[1].tolist() == [[1.0], [2.0], [3.0]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -70,3 +70,26 @@ class TestLogTrans:
         assert result == 1.0
 
 
+
+
+class TestLogTransArray:
+    """Test the logtrans_array function."""
+
+    def test_matches_logtrans(self):
+        """Test that every value matches logtrans(), including near-ties."""
+        import numpy as np
+        rng = np.random.default_rng(0)
+        q = np.concatenate([10 ** rng.uniform(-5, 8, 20000), [0.0, -3.0, 1.0, 10 ** 0.12345]])
+
+        result = iwfm.logtrans_array(q, zero_offset=2.0, neg_val=1e-7)
+
+        assert result.tolist() == [iwfm.logtrans(v, 2.0, 1e-7) for v in q.tolist()]
+
+    def test_shape_and_special_values(self):
+        """Test that shape is kept and zero and negative values are replaced."""
+        import numpy as np
+        result = iwfm.logtrans_array([[0.0, -1.0], [100.0, 0.5]], zero_offset=-5.0, neg_val=1e-6)
+
+        assert result.shape == (2, 2)
+        assert result.tolist() == [[-5.0, 1e-6], [2.0, round(math.log10(0.5), 4)]]
+        assert np.isnan(iwfm.logtrans_array([np.nan]))[0]
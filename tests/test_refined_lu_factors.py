@@ -232,3 +232,51 @@ class TestRefinedLuFactorsEdgeCases:
 
         # file_test should be called 3 times (once per file)
         assert mock_file_test.call_count == 3
+
+
+class TestRefinedLuIndex:
+    """Tests for the refined_lu_index function."""
+
+    def _write_files(self, tmp_path, elem2elem):
+        orig_areas_file = tmp_path / "orig.csv"
+        orig_areas_file.write_text("elem,area\n7,400.0\n3,1000.0\n")
+        refined_areas_file = tmp_path / "refined.csv"
+        refined_areas_file.write_text("elem,area\n31,250.0\n71,100.0\n32,750.0\n72,300.0\n")
+        elem2elem_file = tmp_path / "elem2elem.csv"
+        elem2elem_file.write_text(elem2elem)
+        return str(orig_areas_file), str(refined_areas_file), str(elem2elem_file)
+
+    def test_arrays(self, tmp_path):
+        """Test original elements and area ratios as arrays, in refined file order."""
+        from iwfm.refined_lu_factors import refined_lu_index
+
+        files = self._write_files(tmp_path, "refined,original\n72,7\n71,7\n32,3\n31,3\n")
+        refined_elems, orig_elems, ratios = refined_lu_index(*files)
+
+        assert refined_elems.tolist() == [31, 71, 32, 72]
+        assert orig_elems.tolist() == [3, 7, 3, 7]
+        assert ratios.tolist() == [0.25, 0.25, 0.75, 0.75]
+        assert refined_lu_factors(*files)[1] == [71, 7, 0.25]
+
+    def test_missing_element(self, tmp_path):
+        """Test that a refined element without an original element raises ValueError."""
+        import pytest
+        from iwfm.refined_lu_factors import refined_lu_index
+
+        files = self._write_files(tmp_path, "refined,original\n72,7\n71,7\n32,3\n")
+        with pytest.raises(ValueError):
+            refined_lu_index(*files)
+
+    def test_duplicate_element(self, tmp_path):
+        """Test that an element listed twice in elem2elem or the original areas raises ValueError."""
+        import pytest
+        from iwfm.refined_lu_factors import refined_lu_index
+
+        files = self._write_files(tmp_path, "refined,original\n72,7\n71,7\n32,3\n31,3\n71,3\n")
+        with pytest.raises(ValueError, match='71 is listed more than once'):
+            refined_lu_index(*files)
+
+        files = self._write_files(tmp_path, "refined,original\n72,7\n71,7\n32,3\n31,3\n")
+        Path(files[0]).write_text("elem,area\n7,400.0\n3,1000.0\n7,500.0\n")
+        with pytest.raises(ValueError, match='7 is listed more than once'):
+            refined_lu_index(*files)
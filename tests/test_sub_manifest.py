@@ -0,0 +1,100 @@
+# test_sub_manifest.py
+# Unit tests for sub/manifest.py - versioned submodel manifest
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+import iwfm
+from iwfm.sub.manifest import SUB_MANIFEST_VERSION
+
+ELEM_LIST = [[1, 11, 1], [2, 12, 1], [3, 15, 2]]
+ELEM_NODES = [[11, 1, 2, 5, 4, 1], [12, 2, 3, 6, 5, 1], [15, 5, 6, 8, 0, 2]]
+NODE_COORDS = [[1, 0.0, 0.0], [2, 10.0, 0.0], [3, 20.0, 0.0], [4, 0.0, 10.0],
+               [5, 10.0, 10.0], [6, 20.0, 10.0], [8, 15.0, 20.0]]
+LAKE_INFO = [['1', '10', '3', '2', 'Lake One', [11, 12]], ['2', '11', '4', '1', '', [15]]]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Write a manifest made from one source file."""
+    source = tmp_path / 'elem_pairs.dat'
+    source.write_text('11 1 1\n')
+    name = iwfm.sub_manifest_name(str(tmp_path / 'sub'))
+    iwfm.sub_manifest_write(name, ELEM_LIST, [1, 2, 3, 4, 5, 6, 8], NODE_COORDS, ELEM_NODES,
+                            {101: 1, 102: 2, 103: 9}, [101, 102], lake_info=LAKE_INFO,
+                            bounding_poly=Polygon([(0, 0), (20, 0), (15, 20)]), sources=[str(source)])
+    return name, source
+
+
+class TestSubManifest:
+    """Tests for writing, reading and checking submodel manifests."""
+
+    def test_round_trip(self, manifest):
+        """Test that every item reads back as the original lists, dicts and polygon."""
+        data = iwfm.sub_manifest_read(manifest[0])
+
+        assert manifest[0].endswith('sub_manifest.npz')
+        assert data['elem_list'] == ELEM_LIST
+        assert data['elem_nodes'] == ELEM_NODES
+        assert data['node_coords'] == NODE_COORDS
+        assert data['node_list'] == [1, 2, 3, 4, 5, 6, 8]
+        assert data['snode_dict'] == {101: 1, 102: 2, 103: 9}
+        assert data['sub_snodes'] == [101, 102]
+        assert data['lake_info'] == LAKE_INFO
+        assert data['bounding_poly'].equals(Polygon([(0, 0), (20, 0), (15, 20)]))
+
+    def test_no_pickled_objects(self, manifest):
+        """Test that the manifest loads without pickle support."""
+        with np.load(manifest[0], allow_pickle=False) as data:
+            assert int(data['schema_version']) == SUB_MANIFEST_VERSION
+
+    def test_empty_items(self, tmp_path):
+        """Test a manifest without stream nodes, lakes or boundary."""
+        name = str(tmp_path / 'empty_manifest.npz')
+        iwfm.sub_manifest_write(name, ELEM_LIST, [1], [[1, 0.0, 0.0]], ELEM_NODES, {}, [])
+
+        data = iwfm.sub_manifest_read(name)
+        assert data['snode_dict'] == {} and data['lake_info'] == []
+        assert data['bounding_poly'] is None
+
+    def test_current(self, manifest):
+        """Test that a manifest is current until a source file changes."""
+        name, source = manifest
+        assert iwfm.sub_manifest_current(name, [str(source)])
+        assert not iwfm.sub_manifest_current(name, [str(source), str(source)])
+
+        source.write_text('11 1 1\n12 2 1\n')
+        assert not iwfm.sub_manifest_current(name, [str(source)])
+        assert not iwfm.sub_manifest_current(name + '.missing', [str(source)])
+
+    def test_schema_version(self, manifest):
+        """Test that a manifest with another schema version is rejected."""
+        name, source = manifest
+        with np.load(name) as data:
+            arrays = {key: data[key] for key in data.files}
+        arrays['schema_version'] = np.array(SUB_MANIFEST_VERSION + 1)
+        np.savez(name, **arrays)
+
+        with pytest.raises(ValueError, match='version'):
+            iwfm.sub_manifest_read(name)
+        assert not iwfm.sub_manifest_current(name, [str(source)])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,65 @@
+# test_sub_points_within.py
+# Unit tests for sub/points_within.py - vectorized submodel boundary clipping
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+from shapely.geometry import MultiPolygon, Point, Polygon
+
+import iwfm
+from iwfm.sub.points_within import _path_contains
+
+SQUARE = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)], holes=[[(4, 4), (6, 4), (6, 6), (4, 6)]])
+AREA = MultiPolygon([SQUARE, Polygon([(20, 0), (30, 0), (30, 10), (20, 10)])])
+
+
+class TestSubPointsWithin:
+    """Tests for sub_points_within()."""
+
+    def test_matches_point_within(self):
+        """Test agreement with Point.within() for interior, hole, outside and boundary points."""
+        x = [1.0, 5.0, 15.0, 25.0, 0.0, 10.0, 4.0, -1.0]
+        y = [1.0, 5.0, 5.0, 5.0, 5.0, 3.0, 5.0, -1.0]
+
+        inside = iwfm.sub_points_within(x, y, AREA)
+
+        assert inside.tolist() == [Point(a, b).within(AREA) for a, b in zip(x, y)]
+        assert inside.tolist() == [True, False, False, True, False, False, False, False]
+
+    def test_many_points(self):
+        """Test a large batch against Point.within()."""
+        rng = np.random.default_rng(0)
+        x, y = rng.uniform(-5, 35, 2000), rng.uniform(-5, 15, 2000)
+
+        inside = iwfm.sub_points_within(x, y, AREA)
+
+        assert inside.tolist() == [Point(a, b).within(AREA) for a, b in zip(x, y)]
+
+    def test_no_points(self):
+        """Test that no points give an empty array."""
+        assert iwfm.sub_points_within([], [], AREA).shape == (0,)
+
+    def test_path_fallback(self):
+        """Test the matplotlib fallback for points away from the boundary."""
+        x = np.array([1.0, 5.0, 15.0, 25.0, 8.0])
+        y = np.array([1.0, 5.0, 5.0, 5.0, 9.0])
+
+        assert _path_contains(x, y, AREA).tolist() == [True, False, False, True, True]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
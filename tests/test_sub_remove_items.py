@@ -490,3 +490,29 @@ class TestSubRemoveItemsEdgeCases:
         # Item 2 should be removed regardless of whitespace
         data_lines = [l for l in file_lines if l.strip() and l[0] not in 'Cc*#']
         assert len(data_lines) == 1
+
+
+class TestSubKeepLines:
+    """Tests for the set-based filtering helpers."""
+
+    def test_keep_lines_by_column(self):
+        """Test that lines are kept by the item number in the given column."""
+        lines = ["1  10  0.5", "2  20  0.6", "3  30  0.7"]
+
+        assert iwfm.sub_keep_lines(lines, [1, 3]) == ["1  10  0.5", "3  30  0.7"]
+        assert iwfm.sub_keep_lines(lines, {20}, column=1) == ["2  20  0.6"]
+
+    def test_item_set(self):
+        """Test that lists become sets and sets are returned unchanged."""
+        items = {1, 2}
+        assert iwfm.sub_item_set(items) is items
+        assert iwfm.sub_item_set([3, 3, 4]) == {3, 4}
+
+    def test_remove_items_with_set(self):
+        """Test that a set of items gives the same result as a list."""
+        file_lines = ["C Header", "1    100.0", "2    150.0", "3    200.0", "C End", "4  1.0"]
+
+        result = iwfm.sub_remove_items(file_lines, 1, {2, 4})
+
+        assert file_lines == ["C Header", "2    150.0", "C End", "4  1.0"]
+        assert result == 2
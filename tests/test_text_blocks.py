@@ -0,0 +1,73 @@
+# test_text_blocks.py
+# Unit tests for _text_blocks.py - shared block reader for IWFM text files
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import io
+
+import pytest
+
+import iwfm._text_blocks
+from iwfm._text_blocks import read_header, iter_blocks, parse_table
+
+TEXT = (b'C header comment\n'
+        b'    2          / NCOL\n'
+        b'*\n'
+        b'    1.0        / FACT\n'
+        b'    1   2   3\n'
+        b'c comment between data lines\n'
+        b'\n'
+        b'  \t\n'
+        b'#   4   5   6\n'
+        b'    7   8   9')
+
+
+class TestTextBlocks:
+    """Tests for the shared header and block reader."""
+
+    def test_read_header(self):
+        """Test header and specification lines, leaving the file at the data."""
+        f = io.BytesIO(TEXT)
+        header, specs = read_header(f, 2)
+
+        assert header == ('C header comment', '    2          / NCOL', '*',
+                          '    1.0        / FACT')
+        assert specs == ['    2          / NCOL', '    1.0        / FACT']
+        assert f.readline() == b'    1   2   3\n'
+
+    @pytest.mark.parametrize('chunk_size', [5, 13, 1 << 20])
+    def test_blocks_skip_comments(self, monkeypatch, chunk_size):
+        """Test that blocks hold every data line once, without comments or blank lines."""
+        monkeypatch.setattr(iwfm._text_blocks, 'CHUNK_SIZE', chunk_size)
+        f = io.BytesIO(TEXT)
+        read_header(f, 2)
+
+        blocks = list(iter_blocks(f))
+
+        assert all(block.startswith(b'\n') and block.endswith(b'\n') for block in blocks)
+        lines = [line for block in blocks for line in block.split(b'\n')[1:-1]]
+        assert lines == [b'    1   2   3', b'    7   8   9']
+
+    def test_parse_table(self):
+        """Test parsing, counting columns and checking lines."""
+        table, ncol = parse_table(b'\n 1 2 3\n 7 8 9\n', 2, None, 'f.dat', 'land use')
+        assert ncol == 3
+        assert table.tolist() == [[1.0, 2.0, 3.0], [7.0, 8.0, 9.0]]
+
+        with pytest.raises(ValueError, match='must all have 2 values'):
+            parse_table(b'\n 1 2 3\n', 1, 2, 'f.dat', 'land use')
+        with pytest.raises(ValueError, match='bad time-series data line'):
+            parse_table(b'\n 1 x 3\n', 1, None, 'f.dat', 'time-series')
@@ -0,0 +1,122 @@
+# test_ts_data.py
+# Unit tests for ts_data.py - IWFM time-series input file reader
+# Copyright (C) 2026 University of California
+# -----------------------------------------------------------------------------
+# This information is free; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This work is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+# -----------------------------------------------------------------------------
+
+import os
+
+import numpy as np
+import pytest
+
+import iwfm._text_blocks
+from iwfm.ts_data import read_ts_data, ts_cache_names
+
+HEADER = ['C IWFM diversion data file',
+          '    3                       / NCOLDV',
+          '    43560.0                 / FACTDV',
+          'C  comment between specification lines',
+          '    1                       / NSPDV',
+          '    0                       / NFQDV',
+          '                            / DSSFL',
+          'C-----',
+          'C   ITDV          ARDV(1)  ARDV(2)  ARDV(3)']
+
+DATES = ['10/31/1973_24:00', '11/30/1973_24:00', '12/31/1973_24:00']
+
+
+@pytest.fixture
+def ts_file(tmp_path):
+    """Time-series file; value = time*10 + column."""
+    lines = list(HEADER)
+    for t, date in enumerate(DATES):
+        lines.append(date + ''.join(f'\t{t * 10 + c:.1f}' for c in range(3)))
+        lines.append('C comment between data lines')
+    path = tmp_path / 'diversions.dat'
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+class TestReadTsData:
+    """Tests for read_ts_data()."""
+
+    def test_arrays_and_header(self, ts_file):
+        """Test values, dates, days and header metadata."""
+        ts = read_ts_data(ts_file)
+
+        assert ts.values.tolist() == [[0.0, 1.0, 2.0], [10.0, 11.0, 12.0], [20.0, 21.0, 22.0]]
+        assert ts.dates.tolist() == DATES
+        assert ts.times.dtype == np.dtype('datetime64[D]')
+        assert str(ts.times[0]) == '1973-10-31'
+        assert (ts.ncol, ts.fact, ts.nsp, ts.nfq, ts.dssfl) == (3, 43560.0, 1, 0, '')
+        assert list(ts.header) == HEADER
+        assert not ts.values.flags.writeable
+
+    def test_small_blocks(self, ts_file, monkeypatch):
+        """Test that parsing in blocks gives the same result."""
+        whole = read_ts_data(ts_file)
+        monkeypatch.setattr(iwfm._text_blocks, 'CHUNK_SIZE', 23)
+        blocks = read_ts_data(ts_file)
+
+        assert np.array_equal(blocks.values, whole.values)
+        assert blocks.dates.tolist() == DATES
+
+    def test_cache(self, ts_file):
+        """Test that the cache is memory-mapped and remade when the file changes."""
+        first = read_ts_data(ts_file, cache=True)
+        assert all(os.path.isfile(name) for name in ts_cache_names(ts_file))
+
+        cached = read_ts_data(ts_file, cache=True)
+        assert isinstance(cached.values, np.memmap)
+        assert np.array_equal(cached.values, first.values)
+        assert cached.dates.tolist() == DATES
+        assert list(cached.header) == HEADER
+        assert (cached.ncol, cached.fact) == (3, 43560.0)
+
+        with open(ts_file, 'a') as f:
+            f.write('01/31/1974_24:00\t30\t31\t32\n')
+        stat = os.stat(ts_file)
+        os.utime(ts_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        changed = read_ts_data(ts_file, cache=True)
+        assert changed.values.shape == (4, 3)
+        assert changed.values[3].tolist() == [30.0, 31.0, 32.0]
+
+    def test_not_a_number(self, tmp_path):
+        """Test that a bad value raises ValueError."""
+        path = tmp_path / 'bad.dat'
+        path.write_text('\n'.join(HEADER + [DATES[0] + '\t1\tx\t3']))
+
+        with pytest.raises(ValueError):
+            read_ts_data(str(path))
+
+    def test_different_columns(self, tmp_path):
+        """Test that data lines with different numbers of values raise ValueError."""
+        path = tmp_path / 'bad.dat'
+        path.write_text('\n'.join(HEADER + [DATES[0] + '\t1\t2\t3', DATES[1] + '\t1\t2']))
+
+        with pytest.raises(ValueError):
+            read_ts_data(str(path))
+
+    def test_no_data(self, tmp_path):
+        """Test that a file with only header lines raises ValueError."""
+        path = tmp_path / 'empty.dat'
+        path.write_text('\n'.join(HEADER))
+
+        with pytest.raises(ValueError):
+            read_ts_data(str(path))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])